@@ -3,10 +3,12 @@ import inspect
 import re
 import time
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from browser_use.agent.message_manager.utils import save_conversation  # type: ignore
+from browser_use.agent.message_manager.views import MessageMetadata  # type: ignore
 from browser_use.agent.service import (  # type: ignore
     Agent,
     AgentStepInfo,
@@ -24,7 +26,7 @@ from browser_use.controller.registry.views import ActionModel  # type: ignore
 from browser_use.utils import time_execution_async  # type: ignore
 from cuid2 import Cuid as CUID
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import BaseMessage, HumanMessage
 
 from bugninja.agents.extensions import BugninjaController
 from bugninja.config import (
@@ -32,14 +34,37 @@ from bugninja.config import (
     create_provider_model_from_settings,
 )
 from bugninja.config.llm_config import LLMConfig
+from bugninja.config.llm_factory import LLMClientPool
+from bugninja.config.llm_hedging import LLMHedger
+from bugninja.config.llm_prompt_cache import (
+    supports_cache_control,
+    with_cache_breakpoints,
+)
+from bugninja.config.llm_rate_limiter import (
+    LLMRequestPriority,
+    llm_request_scope,
+    reset_llm_request_scope,
+    set_llm_request_scope,
+)
+from bugninja.config.llm_routing import LLMRouter, RoutingRole
 from bugninja.config.video_recording import VideoRecordingConfig
 from bugninja.events import EventPublisherManager
-from bugninja.prompts.prompt_factory import get_extra_instructions_related_prompt
+from bugninja.prompts.prompt_factory import (
+    get_extra_instructions_related_prompt,
+    get_task_prompt,
+)
 from bugninja.schemas.models import BugninjaConfig, FileUploadInfo
 from bugninja.schemas.pipeline import BugninjaExtendedAction
+from bugninja.utils.adaptive_vision import AdaptiveVisionPolicy, VisionDecision
+from bugninja.utils.agent_output_stream import AgentOutputStreamParser
+from bugninja.utils.artifact_store import ArtifactStore
+from bugninja.utils.dom_state_diff import DomStateDiffer
+from bugninja.utils.history_window import HistoryWindow
 from bugninja.utils.logging_config import logger
+from bugninja.utils.mutation_epoch import MutationEpochTracker
 from bugninja.utils.screenshot_manager import ScreenshotManager
 from bugninja.utils.selector_factory import SelectorFactory
+from bugninja.utils.tracing import current_span, run_trace, trace_span
 from bugninja.utils.video_recording_manager import VideoRecordingManager
 
 
@@ -69,6 +94,63 @@ ALTERNATIVE_XPATH_SELECTORS_KEY: str = "alternative_relative_xpaths"
 DOM_ELEMENT_DATA_KEY: str = "dom_element_data"
 BRAINSTATE_IDX_DATA_KEY: str = "idx_in_brainstate"
 NAVIGATION_IDENTIFIERS = ["go_back", "go_forward", "go_to_url"]
+DOM_SNAPSHOT_MESSAGE_TYPE: str = "dom_snapshot"
+PAGE_ACTIONS_MESSAGE_TYPE: str = "page_actions"
+
+# model of the model call running in the current task, as (id of the agent, model)
+_call_llm: ContextVar[Optional[Tuple[int, BaseChatModel]]] = ContextVar(
+    "bugninja_call_llm", default=None
+)
+
+
+class SelectorPrefetch:
+    """Selector work for the first action, started while the model output still streams.
+
+    The page HTML is captured and parsed, and the alternative selectors of the first
+    action are generated, so `_before_step_hook` only has to pick up the results.
+
+    Attributes:
+        xpath (str): XPath of the first action's element
+        factory_task (asyncio.Task[SelectorFactory]): Selector factory of the page HTML
+        selectors_task (asyncio.Task[List[str]]): Alternative selectors of `xpath`
+    """
+
+    def __init__(self, page: Page, xpath: str) -> None:
+        self.xpath = xpath
+        self.factory_task: "asyncio.Task[SelectorFactory]" = asyncio.create_task(
+            self._create_factory(page)
+        )
+        self.selectors_task: "asyncio.Task[List[str]]" = asyncio.create_task(
+            self._generate_selectors()
+        )
+
+    @staticmethod
+    async def _create_factory(page: Page) -> SelectorFactory:
+        html = await BugninjaAgentBase.get_raw_html_of_playwright_page(page=page)
+        return await asyncio.to_thread(SelectorFactory, html)
+
+    async def _generate_selectors(self) -> List[str]:
+        factory = await self.factory_task
+        with trace_span(
+            "selector_generation", "selectors", xpath=self.xpath, prefetched=True
+        ) as span:
+            selectors: List[str] = await asyncio.to_thread(
+                factory.generate_relative_xpaths_from_full_xpath, self.xpath
+            )
+            span.set(selector_count=len(selectors))
+        return selectors
+
+    @property
+    def factory_failed(self) -> bool:
+        """Whether capturing or parsing the page HTML failed."""
+        task = self.factory_task
+        return task.done() and (task.cancelled() or task.exception() is not None)
+
+    def cancel(self) -> None:
+        """Cancel the work that is not finished yet."""
+        for task in (self.factory_task, self.selectors_task):
+            if not task.done():
+                task.cancel()
 
 
 class BugninjaAgentBase(Agent, ABC):
@@ -121,6 +203,9 @@ class BugninjaAgentBase(Agent, ABC):
         ```
     """
 
+    #! role of the agent in the LLM routing policy (`LLMRoutingConfig.escalate_agents`)
+    LLM_ROUTING_ROLE: RoutingRole = "navigator"
+
     def __init__(  # type:ignore
         self,
         *args,
@@ -135,6 +220,7 @@ class BugninjaAgentBase(Agent, ABC):
         screenshot_manager: Optional[ScreenshotManager] = None,
         cli_mode: bool = False,
         available_files: Optional[List["FileUploadInfo"]] = None,
+        task_context: Optional[List[str]] = None,
         **kwargs,  # type:ignore
     ) -> None:
         """Initialize BugninjaAgentBase with extended functionality.
@@ -145,11 +231,14 @@ class BugninjaAgentBase(Agent, ABC):
             run_id (Optional[str]): Unique identifier for the current run. If None, generates a new CUID
             extra_instructions (List[str]): Additional instructions to append to the task
             override_system_message (str | None): System message to override the default
-            extend_system_message (str | None): Additional system message to extend the default
+            extend_system_message (str | None): Additional system message to extend the default;
+                it should not depend on the task, so every task shares the cached system prompt
             video_recording_config (Optional[VideoRecordingConfig]): Video recording configuration
             output_base_dir (Optional[Path]): Base directory for all output files (traversals, screenshots, videos)
             screenshot_manager (Optional[ScreenshotManager]): Screenshot manager instance
             cli_mode (bool): Whether running in CLI mode (prevents automatic directory creation)
+            task_context (Optional[List[str]]): Task specific prompts (input data, files, ...)
+                appended to the task after the extra instructions
             **kwargs: Keyword arguments passed to the parent Agent class
         """
         self.raw_task: str = task
@@ -157,11 +246,14 @@ class BugninjaAgentBase(Agent, ABC):
         self.video_recording_config = video_recording_config
         self.bugninja_config = bugninja_config
 
-        if extra_instructions:
-            extra_instructions_prompt: str = get_extra_instructions_related_prompt(
-                extra_instruction_list=extra_instructions
-            )
-            task += f"\n\n{extra_instructions_prompt}"
+        # everything task specific goes to the task message, after the shared system message
+        task = get_task_prompt(
+            task,
+            [
+                get_extra_instructions_related_prompt(extra_instruction_list=extra_instructions),
+                *(task_context or []),
+            ],
+        )
 
         # Store and process available files
         self.available_files = available_files or []
@@ -186,6 +278,8 @@ class BugninjaAgentBase(Agent, ABC):
             extend_system_message=extend_system_message or "",
             available_file_paths=self.available_file_paths,
         )
+        # later agents on the same pooled model skip browser-use's verification call
+        LLMClientPool.get_instance().share_verification(self.llm)
         # Initialize extended actions storage
         self.current_step_extended_actions: List["BugninjaExtendedAction"] = []
         self._action_to_extended_index: Dict[int, int] = {}
@@ -212,13 +306,157 @@ class BugninjaAgentBase(Agent, ABC):
             screenshot_manager
             if screenshot_manager
             else ScreenshotManager(
-                run_id=self.run_id, base_dir=self.output_base_dir, cli_mode=cli_mode
+                run_id=self.run_id,
+                base_dir=self.output_base_dir,
+                cli_mode=cli_mode,
+                artifact_store=(
+                    ArtifactStore.from_config(bugninja_config.artifact_store)
+                    if bugninja_config.artifact_store
+                    else None
+                ),
             )
         )
 
         self.agent_taken_actions: List[BugninjaExtendedAction] = []
         self.agent_brain_states: Dict[str, AgentBrain] = {}
 
+        # Screenshots only for the steps that need them, downscaled (browser-use turns vision
+        # off for models without image input)
+        self.vision_policy = AdaptiveVisionPolicy(
+            mode=bugninja_config.vision_mode if self.settings.use_vision else "never",
+            max_width=bugninja_config.vision_max_width,
+            max_height=bugninja_config.vision_max_height,
+            jpeg_quality=bugninja_config.vision_jpeg_quality,
+        )
+        # the model can only ask for screenshots if they are not always (or never) sent
+        if self.vision_policy.mode != "adaptive":
+            self._exclude_action("request_screenshot")
+
+        # Element diffs between periodic DOM snapshots instead of the full list every step
+        self.dom_state_differ: Optional[DomStateDiffer] = (
+            DomStateDiffer(
+                snapshot_interval=bugninja_config.dom_snapshot_interval,
+                include_attributes=self._message_manager.settings.include_attributes,
+            )
+            if bugninja_config.dom_state_mode == "diff"
+            else None
+        )
+        self._pending_dom_snapshot: Optional[str] = None
+
+        # The last steps verbatim and a running summary of the older ones
+        self.history_window: Optional[HistoryWindow] = (
+            HistoryWindow(keep_steps=bugninja_config.history_window_steps)
+            if bugninja_config.history_window_steps
+            else None
+        )
+
+        # Work of the step that runs in the background of the following work
+        self._selector_tasks: Dict[int, "asyncio.Task[None]"] = {}
+        self._event_publish_task: Optional["asyncio.Task[None]"] = None
+        self._after_step_task: Optional["asyncio.Task[None]"] = None
+
+        # Cheap "did the page change" check between the actions of a step
+        self.mutation_epoch = MutationEpochTracker()
+
+        # Prompt size of every step, to compare prompt modes
+        self.step_token_usage: List[Dict[str, Any]] = []
+        # Leading history messages of the current step that the next step sends unchanged
+        self._prompt_prefix_length = 0
+
+        # Escalation to a stronger model, and per-model usage of all LLM calls of the agent
+        self.llm_router = LLMRouter(
+            primary_llm=self.llm,
+            config=bugninja_config.llm_routing,
+            role=self.LLM_ROUTING_ROLE,
+            temperature=bugninja_config.llm_temperature,
+            cli_mode=cli_mode,
+        )
+        self.settings.page_extraction_llm = self.llm_router.extraction_llm(
+            self.settings.page_extraction_llm
+        )
+
+        # Hedged requests for slow model calls and a hard per-call deadline
+        self.llm_hedger = LLMHedger(
+            config=bugninja_config.llm_hedging,
+            temperature=bugninja_config.llm_temperature,
+            cli_mode=cli_mode,
+            usage=self.llm_router.usage,
+        )
+
+        # Selector work started from the streamed model output of the current step
+        self._stream_browser_state: Optional[BrowserStateSummary] = None
+        self._selector_prefetch: Optional[SelectorPrefetch] = None
+        if bugninja_config.stream_llm_output:
+            self._enable_output_streaming()
+
+    @property
+    def llm(self) -> BaseChatModel:
+        """Model of the agent, or of the model call running in the current task.
+
+        Escalated and hedged calls run `get_next_action()` with another model; the model is
+        bound to the task of the call, so concurrent requests never swap it for each other.
+        """
+        call_llm = _call_llm.get()
+        if call_llm is not None and call_llm[0] == id(self):
+            return call_llm[1]
+        return self._agent_llm
+
+    @llm.setter
+    def llm(self, llm: BaseChatModel) -> None:
+        self._agent_llm = llm
+
+    def _enable_output_streaming(self) -> None:
+        """Stream the agent's model calls and prepare the first action while they stream."""
+        llm = self._agent_llm
+        if "streaming" not in type(llm).model_fields:
+            logger.warning(
+                f"⚠️ {type(llm).__name__} does not support streaming, outputs are not streamed"
+            )
+            return
+        callbacks = list(llm.callbacks) if isinstance(llm.callbacks, list) else []
+        parser = AgentOutputStreamParser(self._prepare_streamed_first_action)
+        # the agent's own copy; the model of page extraction keeps answering as a whole
+        self.llm = llm.model_copy(update={"streaming": True, "callbacks": [*callbacks, parser]})
+        self.llm_router.primary_llm = self.llm
+
+    async def _prepare_streamed_first_action(
+        self, current_state: Dict[str, Any], action: Dict[str, Any]
+    ) -> None:
+        """Start the selector work of the first action of a streamed model output.
+
+        Args:
+            current_state (Dict[str, Any]): Streamed current state of the model output
+            action (Dict[str, Any]): Streamed first action of the model output
+        """
+        browser_state_summary = self._stream_browser_state
+        if browser_state_summary is None or self._selector_prefetch is not None:
+            return
+        try:
+            action_model = self.ActionModel(**action)
+        except Exception:
+            # the complete output is validated by browser-use as before
+            return
+        xpath = self._get_action_xpath(browser_state_summary, action_model)
+        if xpath is None:
+            return
+        current_page: Page = await self.browser_session.get_current_page()
+        self._selector_prefetch = SelectorPrefetch(current_page, xpath)
+        logger.bugninja_log(f"⚡ First action streamed, preparing selectors of {xpath}")
+
+    def _take_selector_prefetch(self) -> Optional[SelectorPrefetch]:
+        """Stop preparing streamed actions and hand over the prepared selector work."""
+        self._stream_browser_state = None
+        prefetch, self._selector_prefetch = self._selector_prefetch, None
+        return prefetch
+
+    def llm_usage_summary(self) -> Dict[str, Any]:
+        """Per-model usage, escalations, hedging and vision use of the agent's model calls."""
+        return {
+            **self.llm_router.summary(),
+            "hedging": self.llm_hedger.summary(),
+            "vision": self.vision_policy.summary(),
+        }
+
     async def handle_taking_screenshot_for_action(
         self, extended_action: BugninjaExtendedAction
     ) -> None:
@@ -228,11 +466,12 @@ class BugninjaAgentBase(Agent, ABC):
 
         await self.wait_proper_load_state(current_page)
         # Take screenshot and get filename
-        screenshot_filename = await self.screenshot_manager.take_screenshot(
-            current_page,  # type: ignore
-            extended_action,
-            self.browser_session,
-        )
+        with trace_span("screenshot", "browser"):
+            screenshot_filename = await self.screenshot_manager.take_screenshot(
+                current_page,  # type: ignore
+                extended_action,
+                self.browser_session,
+            )
 
         extended_action.screenshot_filename = screenshot_filename
 
@@ -267,8 +506,9 @@ class BugninjaAgentBase(Agent, ABC):
 
     @staticmethod
     async def wait_proper_load_state(page: Page) -> None:
-        await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_load_state("load")
+        with trace_span("settle", "browser"):
+            await page.wait_for_load_state("domcontentloaded")
+            await page.wait_for_load_state("load")
 
     @staticmethod
     async def get_raw_html_of_playwright_page(page: Page) -> str:
@@ -447,6 +687,11 @@ class BugninjaAgentBase(Agent, ABC):
         """Clear the action mapping to prevent memory accumulation."""
         self._action_to_extended_index.clear()
 
+    @property
+    def _llm_request_priority(self) -> LLMRequestPriority:
+        """Priority of this agent's LLM requests in the shared rate limiter."""
+        return "healing" if self.LLM_ROUTING_ROLE == "healer" else "normal"
+
     @time_execution_async("--run (agent)")
     async def run(self, max_steps: int = 100) -> Optional[AgentHistoryList]:
         """Execute the task with maximum number of steps.
@@ -457,9 +702,29 @@ class BugninjaAgentBase(Agent, ABC):
         Returns:
             Optional[AgentHistoryList]: The execution history, or None if execution fails
         """
-        await self._before_run_hook()
-        results = await super().run(max_steps=max_steps, on_step_start=None, on_step_end=None)
-        await self._after_run_hook()
+        trace_file: Optional[Path] = None
+        if self.bugninja_config.enable_tracing:
+            trace_file = self.bugninja_config.get_effective_traces_dir() / (
+                f"{self.run_id}.trace.json"
+            )
+
+        with (
+            run_trace(self.run_id, trace_file),
+            llm_request_scope(self.run_id, self._llm_request_priority),
+            trace_span(
+                "run", "agent", run_id=self.run_id, agent=type(self).__name__, max_steps=max_steps
+            ) as run_span,
+        ):
+            await self._before_run_hook()
+            try:
+                results = await super().run(
+                    max_steps=max_steps, on_step_start=None, on_step_end=None
+                )
+            finally:
+                # the last step's after-step work, also when the run raised
+                await self.flush_pending_step_work()
+            await self._after_run_hook()
+            run_span.set(steps=self.state.n_steps)
 
         return results
 
@@ -482,12 +747,21 @@ class BugninjaAgentBase(Agent, ABC):
         result: List[ActionResult] = []
         step_start_time = time.time()
         tokens = 0
+        step_span = trace_span("step", "agent", step=self.state.n_steps + 1).start()
+        # healers are stepped directly by the replicator, outside of `run()`
+        llm_scope_token = set_llm_request_scope(self.run_id, self._llm_request_priority)
 
         try:
-            browser_state_summary = await self.browser_session.get_state_summary(
-                cache_clickable_elements_hashes=True
-            )
+            with trace_span("browser_state", "browser"):
+                browser_state_summary = await self.browser_session.get_state_summary(
+                    cache_clickable_elements_hashes=True
+                )
+            step_span.set(url=browser_state_summary.url)
+            # the previous step's bookkeeping overlapped with the state fetch
+            await self._await_after_step_task()
             current_page = await self.browser_session.get_current_page()
+            # the state the model decides on; later actions check the page against it
+            await self.mutation_epoch.mark(current_page)
             self._log_step_context(current_page, browser_state_summary)
             # generate procedural memory if needed
             if self.memory and self.state.n_steps % self.memory.config.memory_interval == 0:
@@ -497,12 +771,6 @@ class BugninjaAgentBase(Agent, ABC):
             await self._update_action_models_for_page(current_page)
             # Get page-specific filtered actions
             page_filtered_actions = self.controller.registry.get_prompt_description(current_page)
-            # If there are page-specific actions, add them as a special message for this step only
-            if page_filtered_actions:
-                page_action_message = f"For this page, these additional actions are available:\n{page_filtered_actions}"
-                self._message_manager._add_message_with_tokens(
-                    HumanMessage(content=page_action_message)
-                )
             # If using raw tool calling method, we need to update the message context with new actions
             if self.tool_calling_method == "raw":
                 # For raw tool calling, get all non-filtered actions plus the page-filtered ones
@@ -520,12 +788,26 @@ class BugninjaAgentBase(Agent, ABC):
                 else:
                     updated_context = f"Available actions: {all_actions}"
                 self._message_manager.settings.message_context = updated_context
+            vision = await self._decide_vision(current_page)
             self._message_manager.add_state_message(
                 browser_state_summary=browser_state_summary,
                 result=self.state.last_result,
                 step_info=step_info,
-                use_vision=self.settings.use_vision,
+                use_vision=vision.use_vision,
             )
+            dom_state_kind = self._compact_dom_state_message(browser_state_summary)
+            image_bytes = await self._downscale_state_screenshot(vision)
+            state_tokens = self._message_manager.state.history.messages[-1].metadata.tokens
+            # everything from here on is only part of this step's prompt
+            self._prompt_prefix_length = len(self._message_manager.state.history.messages) - 1
+            # If there are page-specific actions, add them as a special message for this step only
+            if page_filtered_actions:
+                page_action_message = f"For this page, these additional actions are available:\n{page_filtered_actions}"
+                self._message_manager._add_message_with_tokens(
+                    HumanMessage(content=page_action_message),
+                    position=-1,
+                    message_type=PAGE_ACTIONS_MESSAGE_TYPE,
+                )
             # Run planner at specified intervals if planner is configured
             if (
                 self.settings.planner_llm
@@ -547,8 +829,26 @@ class BugninjaAgentBase(Agent, ABC):
                 self.AgentOutput = self.DoneAgentOutput
             input_messages = self._message_manager.get_messages()
             tokens = self._message_manager.state.history.current_tokens
+            self._record_step_token_usage(dom_state_kind, state_tokens, tokens)
+            self.step_token_usage[-1].update(
+                {
+                    "vision": vision.use_vision,
+                    "vision_reason": vision.reason,
+                    "image_bytes": image_bytes,
+                }
+            )
+            step_span.set(
+                dom_state=dom_state_kind,
+                input_tokens=tokens,
+                vision=vision.reason or False,
+                image_bytes=image_bytes,
+            )
+            # streamed first actions are resolved against this state
+            self._stream_browser_state = browser_state_summary
+            usage_before_call = self.llm_router.usage.input_token_totals()
             try:
-                model_output = await self.get_next_action(input_messages)
+                with trace_span("llm", "llm", input_tokens=tokens, state_tokens=state_tokens):
+                    model_output = await self.get_next_action(input_messages)
 
                 if (
                     not model_output.action
@@ -560,6 +860,7 @@ class BugninjaAgentBase(Agent, ABC):
                         content="You forgot to return an action. Please respond only with a valid JSON action according to the expected format."
                     )
                     retry_messages = input_messages + [clarification_message]
+                    self.llm_router.request_escalation("empty action")
                     model_output = await self.get_next_action(retry_messages)
                     if not model_output.action or all(
                         action.model_dump() == {} for action in model_output.action
@@ -574,6 +875,7 @@ class BugninjaAgentBase(Agent, ABC):
                             }
                         )
                         model_output.action = [action_instance]
+                self._record_step_cache_usage(usage_before_call)
                 # Check again for paused/stopped state after getting model output
                 await self._raise_if_stopped_or_paused()
                 self.state.n_steps += 1
@@ -594,22 +896,30 @@ class BugninjaAgentBase(Agent, ABC):
                         target,
                         self.settings.save_conversation_path_encoding,
                     )
-                self._message_manager._remove_last_state_message()  # we dont want the whole state in the chat history
+                self._remove_step_messages()  # we dont want the whole state in the chat history
+                # the element list of a snapshot stays as the reference of the following diffs
+                self._store_dom_snapshot_message()
                 # check again if Ctrl+C was pressed before we commit the output to history
                 await self._raise_if_stopped_or_paused()
                 self._message_manager.add_model_output(model_output)
+                if self.history_window is not None:
+                    self.history_window.fold(
+                        self._message_manager.state.history, self._count_message_tokens
+                    )
+                    summarized_steps = self.history_window.summarized_steps
+                    self.step_token_usage[-1]["summarized_steps"] = summarized_steps
 
             except asyncio.CancelledError:
                 # Task was cancelled due to Ctrl+C
-                self._message_manager._remove_last_state_message()
+                self._remove_step_messages()
                 raise InterruptedError("Model query cancelled by user")
             except InterruptedError:
                 # Agent was paused during get_next_action
-                self._message_manager._remove_last_state_message()
+                self._remove_step_messages()
                 raise  # Re-raise to be caught by the outer try/except
             except Exception as e:
                 # model call failed, remove last state message from history
-                self._message_manager._remove_last_state_message()
+                self._remove_step_messages()
                 raise e
 
             await self._before_step_hook(
@@ -623,8 +933,9 @@ class BugninjaAgentBase(Agent, ABC):
                 logger.bugninja_log(f"📄 Result: {result[-1].extracted_content}")
             self.state.consecutive_failures = 0
 
-            await self._after_step_hook(
-                browser_state_summary=browser_state_summary, model_output=model_output
+            # finished while the next step fetches its browser state
+            self._after_step_task = asyncio.create_task(
+                self._run_after_step_hook(browser_state_summary, model_output, self.state.n_steps)
             )
 
         except InterruptedError:
@@ -644,11 +955,23 @@ class BugninjaAgentBase(Agent, ABC):
             ]
             raise InterruptedError("Step cancelled by user")
         except Exception as e:
+            step_span.set(error=f"{type(e).__name__}: {e}")
             result = await self._handle_step_error(e)
             self.state.last_result = result
             if self.video_recording_manager:
+                self.video_recording_manager.mark_for_keep("step failed")
                 await self.video_recording_manager.stop_recording()
         finally:
+            if self.agent_brain_states:
+                step_span.set(brain_state_id=next(reversed(self.agent_brain_states)))
+            step_span.end()
+            reset_llm_request_scope(llm_scope_token)
+            prefetch = self._take_selector_prefetch()
+            if prefetch is not None:
+                # the step failed before `_before_step_hook` picked it up
+                prefetch.cancel()
+            # a failed step leaves the selectors of its unexecuted actions pending
+            self._cancel_selector_tasks()
             step_end_time = time.time()
 
             if result:
@@ -663,6 +986,298 @@ class BugninjaAgentBase(Agent, ABC):
                 # Log step completion summary
                 self._log_step_completion_summary(step_start_time, result)
 
+    async def get_next_action(self, input_messages: List[BaseMessage]) -> AgentOutput:
+        """Get the next action from the primary or, when escalated, the stronger model.
+
+        Calls are escalated according to `BugninjaConfig.llm_routing`. An invalid output of
+        the primary model is retried on the escalation model within the same step. Every
+        call is hedged and bounded according to `BugninjaConfig.llm_hedging`.
+
+        Args:
+            input_messages (List[BaseMessage]): Messages of the current step
+
+        Returns:
+            AgentOutput: Parsed model output
+
+        Raises:
+            LLMDeadlineExceededError: If the model did not answer within the deadline
+        """
+        reason = self.llm_router.escalation_reason(self.state.consecutive_failures)
+        if reason is None:
+            try:
+                return await self._get_next_action_with(self._agent_llm, input_messages, True)
+            except ValueError as e:
+                if not self.llm_router.escalates_on_invalid_output:
+                    raise
+                reason = f"invalid output: {e}"
+
+        self.llm_router.record_escalation(self.state.n_steps + 1, reason)
+        # escalated calls are hedged with the escalation model, not the secondary one
+        return await self._get_next_action_with(
+            self.llm_router.escalation_llm, input_messages, False
+        )
+
+    async def _get_next_action_with(
+        self, llm: BaseChatModel, input_messages: List[BaseMessage], use_secondary: bool
+    ) -> AgentOutput:
+        """Get the next action from a given model, hedged and within the call deadline.
+
+        With the "raw" tool calling method browser-use calls the model synchronously,
+        which blocks the event loop, so such calls can neither be hedged nor cut off.
+        Models that cache prompts only up to explicit breakpoints get them on a copy of the
+        messages, after the system message and after the history shared with the next step.
+        """
+
+        async def call(call_llm: BaseChatModel) -> AgentOutput:
+            messages = input_messages
+            if self.bugninja_config.llm_prompt_caching and supports_cache_control(call_llm):
+                messages = with_cache_breakpoints(input_messages, self._prompt_prefix_length)
+            token = _call_llm.set((id(self), call_llm))
+            try:
+                return await super(BugninjaAgentBase, self).get_next_action(messages)
+            finally:
+                _call_llm.reset(token)
+
+        return await self.llm_hedger.run(call, llm, self.state.n_steps + 1, use_secondary)
+
+    def _compact_dom_state_message(self, browser_state_summary: BrowserStateSummary) -> str:
+        """Replace the element list of the last state message with a diff if possible.
+
+        Args:
+            browser_state_summary (BrowserStateSummary): Browser state of the current step
+
+        Returns:
+            str: "full" without diff mode, otherwise "snapshot" or "diff"
+        """
+        if self.dom_state_differ is None:
+            return "full"
+        if self._pending_dom_snapshot is not None:
+            # the previous snapshot never made it into the history (e.g. the model call failed)
+            self.dom_state_differ.snapshot = None
+            self._pending_dom_snapshot = None
+
+        elements_text = browser_state_summary.element_tree.clickable_elements_to_string(
+            include_attributes=self._message_manager.settings.include_attributes
+        )
+        url = browser_state_summary.url
+        diff = (
+            None
+            if self.dom_state_differ.needs_snapshot(url) or not elements_text
+            else self.dom_state_differ.diff(browser_state_summary.selector_map)
+        )
+
+        managed = self._message_manager.state.history.messages[-1]
+        message = managed.message
+        if diff is not None:
+            replaced = False
+            if isinstance(message.content, str) and elements_text in message.content:
+                message.content = message.content.replace(elements_text, diff.render(), 1)
+                replaced = True
+            elif isinstance(message.content, list):
+                for part in message.content:
+                    if isinstance(part, dict) and elements_text in part.get("text", ""):
+                        part["text"] = part["text"].replace(elements_text, diff.render(), 1)
+                        replaced = True
+                        break
+
+            if replaced:
+                history = self._message_manager.state.history
+                new_tokens = self._count_message_tokens(message)
+                history.current_tokens += new_tokens - managed.metadata.tokens
+                managed.metadata.tokens = new_tokens
+                return "diff"
+
+        # sensitive data filtering may have changed the element text, so fall back to a snapshot
+        self.dom_state_differ.take_snapshot(url, browser_state_summary.selector_map)
+        self._pending_dom_snapshot = (
+            "[Page snapshot - element changes reported in later steps refer to this list]\n"
+            f"Current url: {url}\n{elements_text or 'empty page'}"
+        )
+        return "snapshot"
+
+    def _exclude_action(self, action_name: str) -> None:
+        """Unregister an action after browser-use built the action models from the controller.
+
+        Args:
+            action_name (str): Name of the action to remove
+        """
+        registry = self.controller.registry
+        if registry.registry.actions.pop(action_name, None) is None:
+            return
+        registry.exclude_actions.append(action_name)
+        self._setup_action_models()
+        self.unfiltered_actions = registry.get_prompt_description()
+
+    def _count_message_tokens(self, message: BaseMessage) -> int:
+        """Estimate the tokens of a message the way the message manager does.
+
+        Args:
+            message (BaseMessage): Message to estimate
+
+        Returns:
+            int: Estimated tokens of the message
+        """
+        settings = self._message_manager.settings
+        chars_per_token: int = settings.estimated_characters_per_token
+        image_tokens: int = settings.image_tokens
+        if not isinstance(message.content, list):
+            text = message.content
+            if hasattr(message, "tool_calls"):
+                text += str(message.tool_calls)
+            return len(text) // chars_per_token
+
+        tokens = 0
+        for part in message.content:
+            if isinstance(part, dict) and "image_url" in part:
+                tokens += image_tokens
+            elif isinstance(part, dict) and "text" in part:
+                tokens += len(part["text"]) // chars_per_token
+        return tokens
+
+    def _store_dom_snapshot_message(self) -> None:
+        """Keep the element list of a snapshot step as the last message of the history.
+
+        The previous snapshot is dropped, so the history holds one element list at most.
+        The cached prompt prefix is only rewritten from the dropped snapshot on, i.e. on
+        snapshot steps; diff steps leave the history untouched.
+        """
+        if self._pending_dom_snapshot is None:
+            return
+
+        history = self._message_manager.state.history
+        for idx in range(len(history.messages) - 1, -1, -1):
+            managed = history.messages[idx]
+            if managed.metadata.message_type == DOM_SNAPSHOT_MESSAGE_TYPE:
+                history.current_tokens -= managed.metadata.tokens
+                history.messages.pop(idx)
+
+        message = HumanMessage(content=self._pending_dom_snapshot)
+        history.add_message(
+            message,
+            MessageMetadata(
+                tokens=self._count_message_tokens(message),
+                message_type=DOM_SNAPSHOT_MESSAGE_TYPE,
+            ),
+        )
+        self._pending_dom_snapshot = None
+
+    async def _decide_vision(self, page: Page) -> VisionDecision:
+        """Decide whether the state message of the current step gets a screenshot.
+
+        Args:
+            page (Page): Current page
+
+        Returns:
+            VisionDecision: Whether and why the step uses vision
+        """
+        requested = self.controller.screenshot_requested
+        self.controller.screenshot_requested = False
+        step_failed = self.state.consecutive_failures > 0 or any(
+            result.error for result in self.state.last_result or []
+        )
+        evaluation = (
+            next(reversed(self.agent_brain_states.values())).evaluation_previous_goal
+            if self.agent_brain_states
+            else None
+        )
+        decision = await self.vision_policy.decide(page, step_failed, evaluation, requested)
+        if decision.use_vision and decision.reason != "always":
+            logger.bugninja_log(
+                f"👁️ Step {self.state.n_steps + 1}: sending a screenshot ({decision.reason})"
+            )
+        return decision
+
+    async def _downscale_state_screenshot(self, vision: VisionDecision) -> int:
+        """Replace the screenshot of the last state message with its downscaled JPEG.
+
+        Args:
+            vision (VisionDecision): Vision decision of the step
+
+        Returns:
+            int: Bytes of the sent screenshot, 0 if the step sends none
+        """
+        if not vision.use_vision:
+            return 0
+        managed = self._message_manager.state.history.messages[-1]
+        content = managed.message.content
+        if not isinstance(content, list):
+            # the page had no screenshot
+            return 0
+
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "image_url":
+                screenshot_b64 = part["image_url"]["url"].split(",", 1)[1]
+                try:
+                    image_b64, image_bytes = await self.vision_policy.downscale(screenshot_b64)
+                    part["image_url"] = {"url": f"data:image/jpeg;base64,{image_b64}"}
+                except Exception as e:
+                    # the full size screenshot is sent
+                    logger.warning(f"⚠️ Failed to downscale the screenshot: {e}")
+                    image_bytes = len(screenshot_b64) * 3 // 4
+                self.vision_policy.record_sent(image_bytes)
+                return image_bytes
+        return 0
+
+    def _remove_step_messages(self) -> None:
+        """Remove the state message and the page specific actions of the step from the history."""
+        self._message_manager._remove_last_state_message()
+        history = self._message_manager.state.history
+        for idx in range(len(history.messages) - 1, -1, -1):
+            managed = history.messages[idx]
+            if managed.metadata.message_type == PAGE_ACTIONS_MESSAGE_TYPE:
+                history.current_tokens -= managed.metadata.tokens
+                history.messages.pop(idx)
+
+    def _record_step_token_usage(
+        self, dom_state_kind: str, state_tokens: int, input_tokens: int
+    ) -> None:
+        """Record the prompt size of the current step.
+
+        Args:
+            dom_state_kind (str): How the elements were sent: "full", "snapshot" or "diff"
+            state_tokens (int): Tokens of the state message of the step
+            input_tokens (int): Tokens of the whole prompt of the step
+        """
+        self.step_token_usage.append(
+            {
+                "step": self.state.n_steps,
+                "dom_state": dom_state_kind,
+                "state_tokens": state_tokens,
+                "input_tokens": input_tokens,
+            }
+        )
+        logger.debug(
+            f"🧮 Step {self.state.n_steps}: {input_tokens} input tokens "
+            f"({dom_state_kind} state message: {state_tokens} tokens)"
+        )
+
+    def _record_step_cache_usage(self, usage_before_call: Tuple[int, int]) -> None:
+        """Record the cached and uncached prompt tokens of the model calls of the step.
+
+        Args:
+            usage_before_call (Tuple[int, int]): Input and cached input tokens of the agent's
+                model calls before the step's call
+        """
+        input_tokens, cached_tokens = self.llm_router.usage.input_token_totals()
+        input_tokens -= usage_before_call[0]
+        cached_tokens -= usage_before_call[1]
+        if not self.step_token_usage or not input_tokens:
+            # the provider reported no usage
+            return
+
+        self.step_token_usage[-1].update(
+            {
+                "provider_input_tokens": input_tokens,
+                "cached_input_tokens": cached_tokens,
+                "uncached_input_tokens": input_tokens - cached_tokens,
+            }
+        )
+        current_span().set(cached_input_tokens=cached_tokens)
+        logger.debug(
+            f"🧮 Step {self.state.n_steps}: {cached_tokens}/{input_tokens} "
+            "input tokens read from the prompt cache"
+        )
+
     @time_execution_async("--multi_act")
     async def multi_act(
         self,
@@ -693,7 +1308,14 @@ class BugninjaAgentBase(Agent, ABC):
         await self.browser_session.remove_highlights()
 
         for i, action in enumerate(actions):
-            if action.get_index() is not None and i != 0:
+            if (
+                action.get_index() is not None
+                and i != 0
+                and await self.mutation_epoch.has_changed(
+                    await self.browser_session.get_current_page()
+                )
+            ):
+                # the page mutated since the state the model saw, compare the elements
                 new_browser_state_summary = await self.browser_session.get_state_summary(
                     cache_clickable_elements_hashes=False
                 )
@@ -718,9 +1340,18 @@ class BugninjaAgentBase(Agent, ABC):
                     results.append(ActionResult(extracted_content=msg, include_in_memory=True))
                     break
 
+                # the compared state is still valid for the next actions
+                await self.mutation_epoch.mark(await self.browser_session.get_current_page())
+
+            action_data = action.model_dump(exclude_unset=True)
+            action_name = next(iter(action_data.keys())) if action_data else "unknown"
+            action_span = trace_span("action", "action", type=action_name, index=i).start()
             try:
                 await self._raise_if_stopped_or_paused()
 
+                # selectors of the following actions keep generating in the background
+                await self._await_action_selectors(i)
+
                 await self._before_action_hook(action_idx_in_step=i, action=action)
 
                 result = await self.controller.act(
@@ -735,10 +1366,9 @@ class BugninjaAgentBase(Agent, ABC):
                 await self._after_action_hook(action_idx_in_step=i, action=action)
 
                 results.append(result)
+                if result.error:
+                    action_span.set(error=result.error)
 
-                # Get action name from the action model
-                action_data = action.model_dump(exclude_unset=True)
-                action_name = next(iter(action_data.keys())) if action_data else "unknown"
                 logger.bugninja_log(f"☑️ Executed action {i + 1}/{len(actions)}: {action_name}")
 
                 # Associate action with extended action
@@ -748,9 +1378,9 @@ class BugninjaAgentBase(Agent, ABC):
                 brain_state: AgentBrain
                 brain_state_id, brain_state = list(self.agent_brain_states.items())[-1]
 
-                # Publish action completion event
+                # Publish action completion event (in order, without blocking the next action)
                 if self.event_manager and self.run_id:
-                    await self._publish_action_event(
+                    self._queue_action_event(
                         brain_state_id=brain_state_id,
                         actual_brain_state=brain_state,
                         action_result_data=self.current_step_extended_actions[i],
@@ -773,17 +1403,50 @@ class BugninjaAgentBase(Agent, ABC):
                         )
                     )
                 raise InterruptedError("Action cancelled by user")
+            finally:
+                action_span.end()
+
+        # selectors of actions that were not executed are not needed anymore
+        self._cancel_selector_tasks()
 
         return results
 
     @staticmethod
-    async def extend_action_model(
+    def _get_action_xpath(
+        browser_state_summary: BrowserStateSummary, action: ActionModel
+    ) -> Optional[str]:
+        """Get the XPath of a selector-oriented action's element, formatted like the traversal.
+
+        Returns:
+            Optional[str]: The XPath, or None for other actions and unknown element indexes
+        """
+        short_action_descriptor: Dict[str, Any] = action.model_dump(exclude_none=True)
+        if not short_action_descriptor:
+            return None
+        action_key: str = list(short_action_descriptor.keys())[-1]
+        if action_key not in SELECTOR_ORIENTED_ACTIONS:
+            return None
+        element = browser_state_summary.selector_map.get(
+            short_action_descriptor[action_key].get("index")
+        )
+        if element is None:
+            return None
+        xpath: str = element.xpath
+        return "//" + xpath.strip("/")
+
+    @staticmethod
+    def _build_extended_action(
         brain_state_id: str,
         action_idx: int,
-        current_page: Page,
         browser_state_summary: BrowserStateSummary,
         action: ActionModel,
-    ) -> BugninjaExtendedAction:
+    ) -> Tuple[BugninjaExtendedAction, Optional[str]]:
+        """Build the extended action without the alternative selectors.
+
+        Returns:
+            Tuple[BugninjaExtendedAction, Optional[str]]: The extended action and, for
+                selector-oriented actions, the XPath to generate alternative selectors for
+        """
         short_action_descriptor: Dict[str, Any] = action.model_dump(exclude_none=True)
         logger.bugninja_log(f"📄 Action: {short_action_descriptor}")
 
@@ -799,28 +1462,17 @@ class BugninjaAgentBase(Agent, ABC):
         action_key: str = list(short_action_descriptor.keys())[-1]
 
         #!! these values here were selected by hand, if necessary they can be extended with other actions as well
-        if action_key in SELECTOR_ORIENTED_ACTIONS:
-            selector_data: Dict[str, Any] = browser_state_summary.selector_map[
-                short_action_descriptor[action_key]["index"]
-            ].__json__()
-
-            formatted_xpath: str = "//" + selector_data["xpath"].strip("/")
-            #! adding the raw XPath to the short action descriptor (even though it is not part of the model output)
-            short_action_descriptor[action_key]["xpath"] = formatted_xpath
-            logger.bugninja_log(f"📄 {action_key} on {formatted_xpath}")
-
-            bugninja_action.dom_element_data = await BugninjaAgentBase.__extend_action_with_data(
-                selector_data=selector_data,
-                formatted_xpath=formatted_xpath,
-                current_page=current_page,
-            )
+        if action_key not in SELECTOR_ORIENTED_ACTIONS:
+            return bugninja_action, None
 
-        return bugninja_action
+        selector_data: Dict[str, Any] = browser_state_summary.selector_map[
+            short_action_descriptor[action_key]["index"]
+        ].__json__()
 
-    @staticmethod
-    async def __extend_action_with_data(
-        selector_data: Dict[str, Any], formatted_xpath: str, current_page: Page
-    ) -> Dict[str, Any]:
+        formatted_xpath: str = "//" + selector_data["xpath"].strip("/")
+        #! adding the raw XPath to the short action descriptor (even though it is not part of the model output)
+        short_action_descriptor[action_key]["xpath"] = formatted_xpath
+        logger.bugninja_log(f"📄 {action_key} on {formatted_xpath}")
 
         #! here we only want to keep the first layer of children for specific element in order to avoid unnecessarily large data dump in JSON
         ch: Dict[str, Any]
@@ -832,15 +1484,58 @@ class BugninjaAgentBase(Agent, ABC):
                 sanitised_children.append(ch)
             selector_data["children"] = sanitised_children
 
-        current_page_html: str = await BugninjaAgentBase.get_raw_html_of_playwright_page(
-            page=current_page
+        bugninja_action.dom_element_data = selector_data
+        return bugninja_action, formatted_xpath
+
+    @staticmethod
+    async def extend_action_model(
+        brain_state_id: str,
+        action_idx: int,
+        current_page: Page,
+        browser_state_summary: BrowserStateSummary,
+        action: ActionModel,
+    ) -> BugninjaExtendedAction:
+        bugninja_action, formatted_xpath = BugninjaAgentBase._build_extended_action(
+            brain_state_id=brain_state_id,
+            action_idx=action_idx,
+            browser_state_summary=browser_state_summary,
+            action=action,
         )
 
-        selector_data[ALTERNATIVE_XPATH_SELECTORS_KEY] = SelectorFactory(
-            html_content=current_page_html
-        ).generate_relative_xpaths_from_full_xpath(full_xpath=formatted_xpath)
+        if formatted_xpath is not None:
+            assert bugninja_action.dom_element_data is not None
+            current_page_html: str = await BugninjaAgentBase.get_raw_html_of_playwright_page(
+                page=current_page
+            )
+            bugninja_action.dom_element_data[ALTERNATIVE_XPATH_SELECTORS_KEY] = SelectorFactory(
+                html_content=current_page_html
+            ).generate_relative_xpaths_from_full_xpath(full_xpath=formatted_xpath)
+
+        return bugninja_action
+
+    @staticmethod
+    async def _generate_alternative_selectors(
+        factory_task: "asyncio.Task[SelectorFactory]",
+        previous_task: Optional["asyncio.Task[Any]"],
+        dom_element_data: Dict[str, Any],
+        formatted_xpath: str,
+    ) -> None:
+        factory = await factory_task
+        if previous_task is not None:
+            # one action at a time, the parsed tree is not shared between threads
+            await asyncio.wait([previous_task])
+        with trace_span("selector_generation", "selectors", xpath=formatted_xpath) as span:
+            selectors = await asyncio.to_thread(
+                factory.generate_relative_xpaths_from_full_xpath, formatted_xpath
+            )
+            span.set(selector_count=len(selectors))
+        dom_element_data[ALTERNATIVE_XPATH_SELECTORS_KEY] = selectors
 
-        return selector_data
+    @staticmethod
+    async def _use_prefetched_selectors(
+        prefetched: "asyncio.Task[List[str]]", dom_element_data: Dict[str, Any]
+    ) -> None:
+        dom_element_data[ALTERNATIVE_XPATH_SELECTORS_KEY] = await prefetched
 
     @staticmethod
     async def extend_model_output_with_info(
@@ -848,6 +1543,8 @@ class BugninjaAgentBase(Agent, ABC):
         current_page: Page,
         model_output: AgentOutput,
         browser_state_summary: BrowserStateSummary,
+        selector_tasks: Optional[Dict[int, "asyncio.Task[None]"]] = None,
+        prefetch: Optional[SelectorPrefetch] = None,
     ) -> List["BugninjaExtendedAction"]:
         """Extend agent actions with additional DOM element information and alternative selectors.
 
@@ -861,6 +1558,11 @@ class BugninjaAgentBase(Agent, ABC):
             current_page (Page): Playwright page object representing the current browser page
             model_output (AgentOutput): The output from the agent model containing actions to be processed
             browser_state_summary (BrowserStateSummary): Summary of the current browser state including selector mappings
+            selector_tasks (Optional[Dict[int, asyncio.Task]]): If given, alternative selectors are
+                generated in the background and the task of every action is stored here by
+                action index; otherwise they are generated before returning
+            prefetch (Optional[SelectorPrefetch]): Selector work started while the model
+                output streamed; its page HTML and first action selectors are reused
 
         Returns:
             List[BugninjaExtendedAction]: List of extended actions with enriched DOM element data
@@ -877,18 +1579,141 @@ class BugninjaAgentBase(Agent, ABC):
             4. Generates alternative relative XPath selectors using SelectorFactory
             5. Adds all this data to the action dictionary
             - Non-selector-oriented actions are included in the result but without DOM element data
-            - The function handles exceptions during selector generation gracefully, setting alternative selectors to None if generation fails
+            - The page HTML is captured once, before returning, so background generation
+              still works on the page as it was before the actions
         """
-        return [
-            await BugninjaAgentBase.extend_action_model(
+        extended_actions: List[BugninjaExtendedAction] = []
+        pending: List[Tuple[int, Dict[str, Any], str]] = []
+        for action_idx, action in enumerate(model_output.action):
+            extended_action, formatted_xpath = BugninjaAgentBase._build_extended_action(
                 brain_state_id=brain_state_id,
                 action_idx=action_idx,
-                current_page=current_page,
-                action=action,
                 browser_state_summary=browser_state_summary,
+                action=action,
+            )
+            extended_actions.append(extended_action)
+            if formatted_xpath is not None and extended_action.dom_element_data is not None:
+                pending.append((action_idx, extended_action.dom_element_data, formatted_xpath))
+
+        if not pending:
+            return extended_actions
+
+        prefetched: Optional["asyncio.Task[List[str]]"] = None
+        prefetched_xpath: Optional[str] = None
+        previous_task: Optional["asyncio.Task[Any]"] = None
+        if prefetch is not None and not prefetch.factory_failed:
+            factory_task = prefetch.factory_task
+            prefetched, prefetched_xpath = prefetch.selectors_task, prefetch.xpath
+            # one action at a time, also after the prefetched one
+            previous_task = prefetched
+        else:
+            if prefetch is not None:
+                prefetch.cancel()
+            current_page_html: str = await BugninjaAgentBase.get_raw_html_of_playwright_page(
+                page=current_page
             )
-            for action_idx, action in enumerate(model_output.action)
-        ]
+            factory_task = asyncio.create_task(
+                asyncio.to_thread(SelectorFactory, current_page_html)
+            )
+
+        tasks: Dict[int, "asyncio.Task[None]"] = {}
+        for action_idx, dom_element_data, formatted_xpath in pending:
+            if prefetched is not None and formatted_xpath == prefetched_xpath:
+                task = asyncio.create_task(
+                    BugninjaAgentBase._use_prefetched_selectors(prefetched, dom_element_data)
+                )
+                prefetched = None
+            else:
+                task = asyncio.create_task(
+                    BugninjaAgentBase._generate_alternative_selectors(
+                        factory_task, previous_task, dom_element_data, formatted_xpath
+                    )
+                )
+            previous_task = task
+            tasks[action_idx] = task
+
+        if selector_tasks is None:
+            await asyncio.gather(*tasks.values())
+        else:
+            selector_tasks.update(tasks)
+
+        return extended_actions
+
+    async def _await_action_selectors(self, action_idx_in_step: int) -> None:
+        """Wait until the alternative selectors of an action are generated.
+
+        Args:
+            action_idx_in_step (int): Index of the action in the current step
+        """
+        task = self._selector_tasks.pop(action_idx_in_step, None)
+        if task is not None:
+            await task
+
+    def _cancel_selector_tasks(self) -> None:
+        """Cancel selector generation of actions that will not be executed."""
+        for task in self._selector_tasks.values():
+            task.cancel()
+        self._selector_tasks.clear()
+
+    def _queue_action_event(
+        self,
+        brain_state_id: str,
+        actual_brain_state: AgentBrain,
+        action_result_data: BugninjaExtendedAction,
+    ) -> None:
+        """Publish an action event in the background, after the previously queued ones."""
+        previous_task = self._event_publish_task
+
+        async def publish() -> None:
+            if previous_task is not None:
+                await asyncio.wait([previous_task])
+            with trace_span("publish_event", "events", brain_state_id=brain_state_id):
+                await self._publish_action_event(
+                    brain_state_id=brain_state_id,
+                    actual_brain_state=actual_brain_state,
+                    action_result_data=action_result_data,
+                )
+
+        self._event_publish_task = asyncio.create_task(publish())
+
+    async def _run_after_step_hook(
+        self, browser_state_summary: BrowserStateSummary, model_output: AgentOutput, step: int
+    ) -> None:
+        """Run the `_after_step_hook` of a step in the background.
+
+        A failing hook is logged against its own step, so it does not fail the step that
+        happens to await it.
+
+        Args:
+            browser_state_summary (BrowserStateSummary): Browser state of the step
+            model_output (AgentOutput): Model output of the step
+            step (int): Number of the step
+        """
+        try:
+            await self._after_step_hook(
+                browser_state_summary=browser_state_summary, model_output=model_output
+            )
+        except Exception as e:
+            logger.bugninja_log(f"⚠️ After-step hook of step {step} failed: {e}")
+            logger.debug(f"After-step hook error details: {e}", exc_info=True)
+
+    async def _await_after_step_task(self) -> None:
+        """Wait for the `_after_step_hook` of the previous step."""
+        task, self._after_step_task = self._after_step_task, None
+        if task is not None:
+            await task
+
+    async def flush_pending_step_work(self) -> None:
+        """Wait for all background work of the last step.
+
+        This includes the `_after_step_hook` and the queued action events. Callers that
+        drive `step()` themselves must call this before using the agent's results.
+        """
+        self._cancel_selector_tasks()
+        await self._await_after_step_task()
+        task, self._event_publish_task = self._event_publish_task, None
+        if task is not None:
+            await asyncio.wait([task])
 
     def _resolve_secret_references(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve <secret>KEY</secret> references in extracted data with actual secret values.
@@ -108,6 +108,7 @@ class BugninjaController(Controller):
     3. **wait()** -> `ActionResult`: - Wait for specified number of seconds
     4. **third_party_authentication_wait()** -> `ActionResult`: - Wait for user authentication completion
     5. **input_text()** -> `ActionResult`: - Enhanced text input with element clearing and focus management
+    6. **request_screenshot()** -> `ActionResult`: - Attach a screenshot to the next step
     """
 
     def __init__(
@@ -126,6 +127,8 @@ class BugninjaController(Controller):
         super().__init__(exclude_actions=exclude_actions, output_model=output_model)
         self.verbose = verbose
         self._hover_cleanup_pending: bool = False
+        # set by `request_screenshot`, picked up by the agent's vision policy
+        self.screenshot_requested: bool = False
 
         async def _cleanup_hover(browser_session: BrowserSession) -> None:
             if not self._hover_cleanup_pending:
@@ -291,6 +294,20 @@ class BugninjaController(Controller):
             await asyncio.sleep(seconds)
             return ActionResult(extracted_content=msg, include_in_memory=True)
 
+        @self.registry.action(
+            "Attach a screenshot of the page to your next step. Use it when the element list is not enough to understand the page, e.g. for charts, canvas drawings or visual layout checks",
+        )
+        async def request_screenshot() -> ActionResult:
+            """Attach a screenshot of the page to the next step.
+
+            Returns:
+                ActionResult: Confirmation for the model
+            """
+            self.screenshot_requested = True
+            msg = "📷  A screenshot of the page will be attached to the next step"
+            logger.bugninja_log(msg)
+            return ActionResult(extracted_content=msg, include_in_memory=False)
+
         @self.registry.action(
             "Wait until a third party service/app/user finishes the authentication task for the flow to proceed",
         )
@@ -14,9 +14,11 @@ from bugninja.agents.bugninja_agent_base import (
     BugninjaAgentBase,
 )
 from bugninja.agents.data_extraction_agent import DataExtractionAgent
+from bugninja.config.llm_routing import RoutingRole
 from bugninja.prompts.prompt_factory import (
     BUGNINJA_INITIAL_NAVIGATROR_SYSTEM_PROMPT,
     HEALDER_AGENT_EXTRA_SYSTEM_PROMPT,
+    get_failed_action_prompt,
     get_input_schema_prompt,
     get_io_extraction_prompt,
     get_passed_brainstates_related_prompt,
@@ -74,6 +76,8 @@ class HealerAgent(BugninjaAgentBase):
         ```
     """
 
+    LLM_ROUTING_ROLE: RoutingRole = "healer"
+
     def __init__(  # type:ignore
         self,
         *args,
@@ -84,6 +88,9 @@ class HealerAgent(BugninjaAgentBase):
         override_system_message: str = BUGNINJA_INITIAL_NAVIGATROR_SYSTEM_PROMPT,
         extend_system_message: str | None = None,
         already_completed_brainstates: List[BugninjaBrainState] = [],
+        failed_action: Optional[BugninjaExtendedAction] = None,
+        tried_selectors: Optional[List[str]] = None,
+        failure_reason: Optional[str] = None,
         output_base_dir: Optional[Path] = None,
         screenshot_manager: Optional[ScreenshotManager] = None,
         io_schema: Optional[TestCaseSchema] = None,
@@ -101,9 +108,12 @@ class HealerAgent(BugninjaAgentBase):
             override_system_message (str): System message to override the default (defaults to navigator prompt)
             extend_system_message (str | None): Additional system message to extend the default
             already_completed_brainstates (List[BugninjaBrainState]): Previously completed brain states for context
+            failed_action (Optional[BugninjaExtendedAction]): Replayed action whose failure started the healing
+            tried_selectors (Optional[List[str]]): Selectors the replay tried for the failed action
+            failure_reason (Optional[str]): Error of the failed replayed action
             output_base_dir (Optional[Path]): Base directory for all output files (traversals, screenshots, videos)
             io_schema (Optional[TestCaseSchema]): Input/output schema for data extraction and input handling
-            runtime_inputs (Optional[Dict[str, Any]]): Input data from dependent tasks to be included in system prompt
+            runtime_inputs (Optional[Dict[str, Any]]): Input data from dependent tasks to be included in the task prompt
             **kwargs: Keyword arguments passed to the parent BugninjaAgentBase class
         """
 
@@ -120,28 +130,24 @@ class HealerAgent(BugninjaAgentBase):
                 cli_mode=getattr(self, "cli_mode", False)
             )
 
-        # Add I/O extraction prompt to task description if output schema is defined
+        # I/O extraction prompt if output schema is defined
+        io_prompt = ""
         if self.io_schema and self.io_schema.output_schema:
             io_prompt = get_io_extraction_prompt(self.io_schema.output_schema)
-            if io_prompt:
-                # Append to the task description
-                task += f"\n\n{io_prompt}"
-
-        task += f"\n\n{get_passed_brainstates_related_prompt(completed_brain_states=already_completed_brainstates)}"
 
-        # Prepare input schema system prompt extension if input data is provided
-        input_schema_system_prompt = ""
+        # Input data prompt if input data is provided
+        input_schema_prompt = ""
         if self.io_schema and self.io_schema.input_schema and runtime_inputs:
-            input_schema_system_prompt = get_input_schema_prompt(
+            input_schema_prompt = get_input_schema_prompt(
                 self.io_schema.input_schema, runtime_inputs
             )
-            if input_schema_system_prompt:
+            if input_schema_prompt:
                 input_keys = list(self.io_schema.input_schema.keys())
                 logger.bugninja_log(
                     f"📥 HealerAgent: Task configured with {len(input_keys)} input data keys: {input_keys}"
                 )
 
-        # Prepare available files system prompt extension
+        # Available files prompt
         available_files_prompt = ""
         if available_files:
             from bugninja.prompts.prompt_factory import get_available_files_prompt
@@ -152,25 +158,37 @@ class HealerAgent(BugninjaAgentBase):
                     f"📎 HealerAgent: Task configured with {len(available_files)} available files"
                 )
 
-        system_message_to_extend_by: str = extend_system_message if extend_system_message else ""
-
-        # Combine all system prompt extensions
-        extensions = [input_schema_system_prompt, available_files_prompt]
-        combined_extensions = "\n\n".join([ext for ext in extensions if ext]).strip()
-
-        if combined_extensions:
-            system_message_to_extend_by = (
-                f"{system_message_to_extend_by}\n\n{combined_extensions}".strip()
+        # only the last passed brain states verbatim, older ones as goal/progress bullets
+        passed_brainstates_prompt = get_passed_brainstates_related_prompt(
+            completed_brain_states=already_completed_brainstates,
+            keep_verbatim=bugninja_config.healing_context_verbatim_states,
+        )
+        failed_action_prompt = ""
+        if failed_action is not None:
+            failed_action_prompt = get_failed_action_prompt(
+                failed_action, tried_selectors=tried_selectors, failure_reason=failure_reason
             )
 
+        # the static healer prompt first, so all healers share the cached system message
+        system_message_to_extend_by = HEALDER_AGENT_EXTRA_SYSTEM_PROMPT
+        if extend_system_message:
+            system_message_to_extend_by += f"\n\n{extend_system_message}"
+
         super().__init__(
             *args,
             bugninja_config=bugninja_config,
             override_system_message=override_system_message,
-            extend_system_message=system_message_to_extend_by
-            + f"\n\n{HEALDER_AGENT_EXTRA_SYSTEM_PROMPT}",
+            extend_system_message=system_message_to_extend_by,
             extra_instructions=extra_instructions,
             task=task,
+            # the passed brain states change with every healing, so they come last
+            task_context=[
+                io_prompt,
+                input_schema_prompt,
+                available_files_prompt,
+                passed_brainstates_prompt,
+                failed_action_prompt,
+            ],
             screenshot_manager=screenshot_manager,
             available_files=available_files,
             **kwargs,
@@ -179,10 +197,45 @@ class HealerAgent(BugninjaAgentBase):
         # Store output base directory
         self.output_base_dir = output_base_dir
 
+        # the healing context as all passed brain states verbatim vs. the compacted one
+        keep_verbatim = bugninja_config.healing_context_verbatim_states
+        passed_count = len(already_completed_brainstates)
+        full_context_tokens = self._message_manager._count_text_tokens(
+            get_passed_brainstates_related_prompt(
+                completed_brain_states=already_completed_brainstates
+            )
+        )
+        compact_context_tokens = self._message_manager._count_text_tokens(
+            passed_brainstates_prompt + failed_action_prompt
+        )
+        self.healing_context_usage: Dict[str, Any] = {
+            "brain_states": passed_count,
+            "verbatim_brain_states": (
+                passed_count if keep_verbatim is None else min(keep_verbatim, passed_count)
+            ),
+            "full_context_tokens": full_context_tokens,
+            "compact_context_tokens": compact_context_tokens,
+        }
+        if passed_count:
+            logger.bugninja_log(
+                f"🗜️ Healing context: {passed_count} passed brain states, "
+                f"~{full_context_tokens} -> ~{compact_context_tokens} tokens "
+                "(including the failed action)"
+            )
+
         # Use parent's run_id if provided, otherwise keep the generated one
         if parent_run_id is not None:
             self.run_id = parent_run_id
 
+        if self.data_extraction_agent is not None:
+            self.data_extraction_agent.llm = self.llm_router.extraction_llm(
+                self.data_extraction_agent.llm
+            )
+
+    def llm_usage_summary(self) -> Dict[str, Any]:
+        """Model usage of the healer, with the size of its compacted healing context."""
+        return {**super().llm_usage_summary(), "healing_context": self.healing_context_usage}
+
     async def _before_run_hook(self) -> None:
         """Initialize healing session with event tracking and screenshot management.
 
@@ -322,11 +375,14 @@ class HealerAgent(BugninjaAgentBase):
         current_page: Page = await self.browser_session.get_current_page()
 
         #! generating the alternative CSS and XPath selectors should happen BEFORE the actions are completed
+        self._cancel_selector_tasks()
         extended_taken_actions = await self.extend_model_output_with_info(
             brain_state_id=brain_state_id,
             current_page=current_page,
             model_output=model_output,
             browser_state_summary=browser_state_summary,
+            selector_tasks=self._selector_tasks,
+            prefetch=self._take_selector_prefetch(),
         )
 
         # Store extended actions for hook access
@@ -1,5 +1,3 @@
-import asyncio
-import base64
 import json
 import os
 import re
@@ -8,8 +6,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import cv2
-import numpy as np
 from browser_use.agent.views import (  # type: ignore
     AgentBrain,
     AgentOutput,
@@ -19,7 +15,6 @@ from browser_use.browser.views import BrowserStateSummary  # type: ignore
 from browser_use.controller.registry.views import ActionModel  # type: ignore
 from cuid2 import Cuid as CUID
 from playwright._impl._api_structures import ViewportSize
-from playwright.async_api import CDPSession
 from rich import print as rich_print
 
 from bugninja.agents.bugninja_agent_base import (
@@ -146,7 +141,7 @@ class NavigatorAgent(BugninjaAgentBase):
             io_schema (Optional[TestCaseSchema]): Input/output schema for data extraction and input handling
             dependencies (Optional[List[str]]): List of task dependencies
             original_task_secrets (Optional[Dict[str, Any]]): Original task secrets (kept separate from runtime inputs)
-            runtime_inputs (Optional[Dict[str, Any]]): Input data from dependent tasks to be included in system prompt
+            runtime_inputs (Optional[Dict[str, Any]]): Input data from dependent tasks to be included in the task prompt
             available_files (Optional[List[FileUploadInfo]]): Files available for upload during task execution
             http_auth (Optional[HTTPAuthCredentials]): HTTP authentication credentials for start URL
             **kwargs: Keyword arguments passed to the parent BugninjaAgentBase class
@@ -169,26 +164,24 @@ class NavigatorAgent(BugninjaAgentBase):
                 cli_mode=getattr(self, "cli_mode", False)
             )
 
-        # Add I/O extraction prompt to task description if output schema is defined
+        # I/O extraction prompt if output schema is defined
+        io_prompt = ""
         if self.io_schema and self.io_schema.output_schema:
             io_prompt = get_io_extraction_prompt(self.io_schema.output_schema)
-            if io_prompt:
-                # Append to the task description
-                task += f"\n\n{io_prompt}"
 
-        # Prepare input schema system prompt extension if input data is provided
-        input_schema_system_prompt: Optional[str] = None
+        # Input data prompt if input data is provided
+        input_schema_prompt = ""
         if self.io_schema and self.io_schema.input_schema and runtime_inputs:
-            input_schema_system_prompt = get_input_schema_prompt(
+            input_schema_prompt = get_input_schema_prompt(
                 self.io_schema.input_schema, runtime_inputs
             )
-            if input_schema_system_prompt:
+            if input_schema_prompt:
                 input_keys = list(self.io_schema.input_schema.keys())
                 logger.bugninja_log(
                     f"📥 Agent: Task configured with {len(input_keys)} input data keys: {input_keys}"
                 )
 
-        # Prepare available files system prompt extension
+        # Available files prompt
         available_files_prompt = ""
         if available_files:
             from bugninja.prompts.prompt_factory import get_available_files_prompt
@@ -199,25 +192,27 @@ class NavigatorAgent(BugninjaAgentBase):
                     f"📎 NavigatorAgent: Task configured with {len(available_files)} available files"
                 )
 
-        # Combine all system prompt extensions
-        extensions = [input_schema_system_prompt, available_files_prompt]
-        combined_extension = "\n\n".join([ext for ext in extensions if ext]).strip()
-
         super().__init__(
             *args,
             run_id=run_id,
             bugninja_config=bugninja_config,
             video_recording_config=video_recording_config,
             override_system_message=override_system_message,
-            extend_system_message=combined_extension,
             extra_instructions=extra_instructions,
             task=task,
+            # task specific prompts stay out of the system message shared by all tasks
+            task_context=[io_prompt, input_schema_prompt, available_files_prompt],
             output_base_dir=output_base_dir,
             screenshot_manager=screenshot_manager,
             available_files=available_files,
             **kwargs,
         )
 
+        if self.data_extraction_agent is not None:
+            self.data_extraction_agent.llm = self.llm_router.extraction_llm(
+                self.data_extraction_agent.llm
+            )
+
     async def _before_run_hook(self) -> None:
         """Initialize navigation session with event tracking and screenshot management.
 
@@ -261,29 +256,16 @@ class NavigatorAgent(BugninjaAgentBase):
                 current_page = await self.browser_session.get_current_page()
                 cdp_session = await self.browser_session.browser_context.new_cdp_session(current_page)  # type: ignore
 
-                # Start video recording
+                # Start video recording (starts the CDP screencast as well)
                 output_file = f"run_{self.run_id}"
                 await self.video_recording_manager.start_recording(output_file, cdp_session)
 
-                # Setup CDP screencast
-                await cdp_session.send(
-                    "Page.startScreencast",
-                    {
-                        "format": "jpeg",
-                        "quality": self.video_recording_manager.config.quality,
-                        "maxWidth": self.video_recording_manager.config.width,
-                        "maxHeight": self.video_recording_manager.config.height,
-                        "everyNthFrame": 1,
-                    },
-                )
-
-                # Setup frame handler
-                cdp_session.on(
-                    "Page.screencastFrame",
-                    lambda frame: asyncio.create_task(
-                        self._handle_screencast_frame(frame, cdp_session)
-                    ),
-                )
+                # Reuse the live screencast frames as action screenshots if configured
+                if self.video_recording_manager.config.reuse_frames_for_screenshots:
+                    self.screenshot_manager.use_screencast_frames(
+                        self.video_recording_manager.get_latest_frame,
+                        self.video_recording_manager.config.screenshot_frame_max_age_ms,
+                    )
 
                 self._video_recording_initialized = True
                 logger.bugninja_log(f"🎥 Started video recording: {output_file}")
@@ -345,13 +327,6 @@ class NavigatorAgent(BugninjaAgentBase):
         """
         logger.bugninja_log("✅ AFTER-Run hook called")
 
-        # Stop video recording if enabled
-        if self.video_recording_manager:
-            stats = await self.video_recording_manager.stop_recording()
-            logger.bugninja_log(
-                f"🎥 Stopped video recording. Frames processed: {stats['frames_processed']}"
-            )
-
         # Extract data if test case was successful AND extraction agent is available
         # Use same logic as client for consistency - success means no errors occurred
         if (
@@ -413,9 +388,27 @@ class NavigatorAgent(BugninjaAgentBase):
                     )
                 ]
 
+        # Stop video recording if enabled; a failed data extraction fails the run as well, so
+        # the on_failure keep decision is only made once extraction has finished
+        if self.video_recording_manager:
+            last_result = self.state.last_result
+            if not last_result or not last_result[-1].is_done or any(r.error for r in last_result):
+                self.video_recording_manager.mark_for_keep("run failed")
+
+            stats = await self.video_recording_manager.stop_recording()
+            logger.bugninja_log(
+                f"🎥 Stopped video recording. Frames processed: {stats['frames_processed']}"
+            )
+            # Offsets were captured before it was known which part of the video is kept
+            self.video_recording_manager.rebase_action_timestamps(self.agent_taken_actions)
+
         # Save agent actions and store traversal
         self._traversal = self.save_agent_actions()
 
+        # Index the recorded video per action for fast clip extraction
+        if self.video_recording_manager:
+            await self.video_recording_manager.write_clip_index(self._traversal.actions.values())
+
         # Complete event tracking for navigation run
         if self.event_manager:
             if not self.state.last_result:
@@ -457,11 +450,14 @@ class NavigatorAgent(BugninjaAgentBase):
         self.agent_brain_states[brain_state_id] = model_output.current_state
 
         #! generating the alternative CSS and XPath selectors should happen BEFORE the actions are completed
+        self._cancel_selector_tasks()
         extended_taken_actions = await self.extend_model_output_with_info(
             brain_state_id=brain_state_id,
             current_page=current_page,
             model_output=model_output,
             browser_state_summary=browser_state_summary,
+            selector_tasks=self._selector_tasks,
+            prefetch=self._take_selector_prefetch(),
         )
 
         # Store extended actions for hook access
@@ -510,6 +506,7 @@ class NavigatorAgent(BugninjaAgentBase):
 
             # Calculate video offset
             video_start_offset = self.video_recording_manager.get_video_offset(start_timestamp)
+            self.video_recording_manager.mark_action_boundary(start_timestamp)
 
             # Create timestamps object with only video offsets
             extended_action.timestamps = ActionTimestamps(video_start_offset=video_start_offset)
@@ -686,38 +683,3 @@ class NavigatorAgent(BugninjaAgentBase):
         logger.bugninja_log(f"Traversal saved with ID: {timestamp}_{self.run_id}")
 
         return traversal
-
-    async def _handle_screencast_frame(
-        self, frame: dict[str, Any], cdp_session: CDPSession
-    ) -> None:
-        """Handle incoming screencast frames for video recording.
-
-        Args:
-            frame: CDP screencast frame data
-            cdp_session: CDP session for acknowledgment
-        """
-        if self.video_recording_manager:
-            try:
-                img_data: bytes = base64.b64decode(frame["data"])
-                arr: np.ndarray = np.frombuffer(img_data, np.uint8)  # type: ignore
-                img: Optional[np.ndarray] = cv2.imdecode(arr, cv2.IMREAD_COLOR)  # type: ignore
-
-                if img is not None:
-                    img = cv2.resize(
-                        img,
-                        (
-                            self.video_recording_manager.config.width,
-                            self.video_recording_manager.config.height,
-                        ),
-                    )
-                    frame_bytes: bytes = img.tobytes()
-                    await self.video_recording_manager.add_frame(frame_bytes)
-            except Exception:
-                pass
-            finally:
-                try:
-                    await cdp_session.send(
-                        "Page.screencastFrameAck", {"sessionId": frame["sessionId"]}
-                    )
-                except Exception:
-                    pass
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -19,6 +20,7 @@ from pydantic import BaseModel, Field
 from bugninja.schemas import TaskRunConfig
 from bugninja.schemas.models import BugninjaTask
 from bugninja.utils.logging_config import logger
+from bugninja.utils.tracing import run_trace, trace_span
 
 if TYPE_CHECKING:
     from bugninja.api.client import BugninjaClient
@@ -542,6 +544,7 @@ class BugninjaPipeline:
         mode: str = "auto",
         client: Optional["BugninjaClient"] = None,
         client_factory: Optional[Callable[[Union[TaskRef, TaskSpec]], "BugninjaClient"]] = None,
+        trace_file: Optional[Path] = None,
     ) -> List[Dict[str, Any]]:
         """Run the pipeline (TaskSpec only).
 
@@ -549,6 +552,8 @@ class BugninjaPipeline:
             mode: Execution mode ('agent', 'replay', 'auto')
             client: Optional pre-configured BugninjaClient (for simple library usage)
             client_factory: Optional factory function that creates a task-specific client (for CLI usage)
+            trace_file: Optional Chrome trace-event file for a span trace of the whole pipeline;
+                the runs of all tasks are traced into it
 
         Returns:
             List of execution results with traversal paths and metadata for each task
@@ -598,7 +603,11 @@ class BugninjaPipeline:
 
             return execution_results
 
-        return await _run()
+        with (
+            run_trace("pipeline", trace_file),
+            trace_span("pipeline", "pipeline", tasks=len(exec_list)),
+        ):
+            return await _run()
 
     async def _execute_with_client_factory(
         self,
@@ -618,9 +627,11 @@ class BugninjaPipeline:
             task_client = client_factory(payload)
 
             # Execute single task with its own client
-            result = await self._execute_single_task(
-                task_client, key, payload, parents_map, produced_outputs
-            )
+            with trace_span("pipeline_node", "pipeline", key=key, index=idx) as node_span:
+                result = await self._execute_single_task(
+                    task_client, key, payload, parents_map, produced_outputs
+                )
+                node_span.set(success=result.get("success"))
             execution_results.append(result)
 
         return execution_results
@@ -640,9 +651,11 @@ class BugninjaPipeline:
             assert isinstance(payload, TaskSpec), "Only TaskSpec should reach this point"
 
             # Execute single task
-            result = await self._execute_single_task(
-                client, key, payload, parents_map, produced_outputs
-            )
+            with trace_span("pipeline_node", "pipeline", key=key, index=idx) as node_span:
+                result = await self._execute_single_task(
+                    client, key, payload, parents_map, produced_outputs
+                )
+                node_span.set(success=result.get("success"))
             execution_results.append(result)
 
         return execution_results
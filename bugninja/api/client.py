@@ -43,6 +43,8 @@ from bugninja.config import (
     create_provider_model_from_settings,
 )
 from bugninja.config.llm_config import LLMConfig
+from bugninja.config.llm_factory import LLMClientPool
+from bugninja.config.llm_rate_limiter import LLMRateLimiter
 from bugninja.events import EventPublisherManager
 from bugninja.replication import ReplicatorRun
 from bugninja.schemas.models import (
@@ -58,6 +60,7 @@ from bugninja.schemas.models import (
 )
 from bugninja.schemas.pipeline import Traversal
 from bugninja.utils.logging_config import logger
+from bugninja.utils.video_encoder_manager import VideoEncoderManager
 
 
 class ClientOperationType(Enum):
@@ -189,6 +192,10 @@ class BugninjaClient:
             # Initialize session tracking
             self._active_sessions: List[BrowserSession] = []
 
+            # Agents of this client share pooled LLM clients until `cleanup()`
+            LLMClientPool.get_instance().retain()
+            self._llm_pool_retained = True
+
         except Exception as e:
             raise ConfigurationError(f"Failed to initialize Bugninja client: {e}", original_error=e)
 
@@ -370,6 +377,7 @@ class BugninjaClient:
                 suggested_action=suggested_action,
             ),
             metadata={
+                "run_id": context.get("run_id"),
                 "error_context": context,
                 "operation_type": operation_type.value,
                 "error_classification": error_type.value,
@@ -723,11 +731,14 @@ class BugninjaClient:
                 traversal_file=traversal_file,
                 screenshots_dir=screenshots_dir,
                 metadata={
+                    "run_id": task.run_id,
                     "task_description": task.description,
                     "enable_healing": task.enable_healing,
                     "browser_headless": self.config.headless,
                     "allowed_domains": task.allowed_domains,
                     "has_secrets": task.secrets is not None,
+                    "step_token_usage": agent.step_token_usage,
+                    "llm_usage": agent.llm_usage_summary(),
                 },
                 error=(
                     BugninjaTaskError(
@@ -743,6 +754,7 @@ class BugninjaClient:
         except Exception as e:
             execution_time = time.time() - start_time
             context = {
+                "run_id": task.run_id,
                 "task_description": task.description,
                 "steps_completed": 0,
                 "total_steps": task.max_steps or self.config.default_max_steps,
@@ -893,6 +905,9 @@ class BugninjaClient:
                     "total_tasks": len(task_list),
                     "successful_tasks": successful_tasks,
                     "failed_tasks": failed_tasks,
+                    "video_encoder": VideoEncoderManager.get_instance().get_metrics(),
+                    "llm_rate_limiter": LLMRateLimiter.get_instance().get_metrics(),
+                    "llm_client_pool": LLMClientPool.get_instance().get_metrics(),
                 },
             )
 
@@ -1093,10 +1108,12 @@ class BugninjaClient:
                 screenshots_dir=screenshots_dir,
                 error=error_obj,
                 metadata={
+                    "run_id": replicator.run_id,
                     "replay_type": "session_replay",
                     "session": str(session) if isinstance(session, Path) else "traversal_object",
                     "pause_after_each_step": pause_after_each_step,
                     "healing_enabled": enable_healing,
+                    "healing_llm_usage": replicator.healing_llm_usage,
                 },
             )
 
@@ -1281,6 +1298,7 @@ class BugninjaClient:
                             ),
                             "pause_after_each_step": pause_after_each_step,
                             "healing_enabled": enable_healing,
+                            "healing_llm_usage": replicator.healing_llm_usage,
                         },
                     )
                     individual_results.append(individual_result)
@@ -1508,6 +1526,9 @@ class BugninjaClient:
                     "max_concurrent": max_concurrent,
                     "pause_after_each_step": pause_after_each_step,
                     "healing_enabled": enable_healing,
+                    "video_encoder": VideoEncoderManager.get_instance().get_metrics(),
+                    "llm_rate_limiter": LLMRateLimiter.get_instance().get_metrics(),
+                    "llm_client_pool": LLMClientPool.get_instance().get_metrics(),
                 },
             )
 
@@ -1669,6 +1690,10 @@ class BugninjaClient:
 
             self._active_sessions.clear()
 
+            if self._llm_pool_retained:
+                self._llm_pool_retained = False
+                await LLMClientPool.get_instance().release()
+
         except Exception as e:
             self._handle_execution_error(error=e, operation_type=ClientOperationType.CLEANUP)
 
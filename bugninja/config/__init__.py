@@ -21,6 +21,12 @@ This module provides **comprehensive configuration management** with:
 8. **ProviderRegistry** - Provider-specific configuration registry
 9. **ConfigurationErrorHandler** - Centralized configuration error handling
 10. **create_llm_model_from_config** - Unified LLM model creation
+11. **LLMCassette** - Record/replay of LLM responses for deterministic runs
+12. **LLMRoutingConfig** - Tiered model routing with escalation to a stronger model
+13. **LLMRateLimiter** - Process-wide LLM rate limiting shared by parallel runs
+14. **LLMClientPool** - Reusable LLM clients and connections keyed by configuration
+15. **LLMHedgingConfig** - Hedged requests and deadlines for slow model calls
+16. **with_cache_breakpoints** - Provider prompt cache breakpoints for agent prompts
 
 ## Usage Examples
 
@@ -50,10 +56,15 @@ from .llm_creator import (
     create_llm_model_from_config,
     create_llm_config_from_settings,
 )
-from .llm_factory import LLMFactoryRegistry
+from .llm_factory import LLMClientPool, LLMFactoryRegistry
 from .llm_config import LLMConfig, ModelRegistry
 from .provider_registry import ProviderRegistry
 from .error_handler import ConfigurationErrorHandler
+from .llm_cassette import LLMCassette, LLMCassetteMissError
+from .llm_routing import LLMRouter, LLMRoutingConfig
+from .llm_rate_limiter import LLMRateLimiter, LLMRateLimits, llm_request_scope
+from .llm_hedging import LLMDeadlineExceededError, LLMHedgingConfig
+from .llm_prompt_cache import supports_cache_control, with_cache_breakpoints
 
 __all__ = [
     "ConfigurationFactory",
@@ -62,10 +73,22 @@ __all__ = [
     "LLMConfig",
     "ModelRegistry",
     "LLMFactoryRegistry",
+    "LLMClientPool",
     "TOMLConfigLoader",
     "create_provider_model_from_settings",
     "create_llm_model_from_config",
     "create_llm_config_from_settings",
     "ProviderRegistry",
     "ConfigurationErrorHandler",
+    "LLMCassette",
+    "LLMCassetteMissError",
+    "LLMRouter",
+    "LLMRoutingConfig",
+    "LLMRateLimiter",
+    "LLMRateLimits",
+    "llm_request_scope",
+    "LLMHedgingConfig",
+    "LLMDeadlineExceededError",
+    "supports_cache_control",
+    "with_cache_breakpoints",
 ]
@@ -0,0 +1,61 @@
+"""
+Artifact store configuration for browser automation sessions.
+
+This module provides configuration settings for the content-addressed artifact
+store that deduplicates screenshots and other run artifacts across runs.
+"""
+
+from pathlib import Path
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
+
+
+class ArtifactStoreConfig(BaseModel):
+    """Configuration for the content-addressed artifact store.
+
+    When configured, screenshots are hashed and stored once under a shared
+    content-addressed layout instead of being written as separate files for
+    every run.
+
+    Attributes:
+        store_dir (str): Root directory of the artifact store (default: "./artifacts")
+        perceptual_hash (bool): Also deduplicate visually near-identical images (default: False)
+        perceptual_hash_threshold (int): Maximum Hamming distance between two perceptual
+            hashes for images to be treated as identical (default: 0)
+
+    Example:
+        ```python
+        from bugninja.config.artifact_store import ArtifactStoreConfig
+
+        # Exact deduplication only
+        config = ArtifactStoreConfig()
+
+        # Also collapse near-identical screenshots
+        config = ArtifactStoreConfig(perceptual_hash=True, perceptual_hash_threshold=2)
+        ```
+    """
+
+    store_dir: str = Field(default="./artifacts", description="Artifact store root directory")
+    perceptual_hash: bool = Field(
+        default=False, description="Deduplicate near-identical images by perceptual hash"
+    )
+    perceptual_hash_threshold: int = Field(
+        default=0, ge=0, le=64, description="Maximum perceptual hash Hamming distance"
+    )
+
+    @classmethod
+    def with_base_dir(cls, base_dir: Path, **kwargs: Dict[str, Any]) -> "ArtifactStoreConfig":
+        """Create config with base directory.
+
+        Args:
+            base_dir (Path): Base directory the artifact store lives in
+            **kwargs: Additional configuration parameters
+
+        Returns:
+            ArtifactStoreConfig: Configuration with store directory set
+        """
+        # Remove store_dir from kwargs to avoid conflict
+        kwargs.pop("store_dir", None)
+        store_dir = str(base_dir / "artifacts")
+        return cls(store_dir=store_dir, **kwargs)  # type: ignore
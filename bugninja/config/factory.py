@@ -120,6 +120,15 @@ class ConfigurationFactory:
             "llm.deepseek.base_url": "deepseek_base_url",
             # Ollama configuration
             "llm.ollama.base_url": "ollama_base_url",
+            # LLM cassette configuration
+            "llm.cassette.mode": "llm_cassette_mode",
+            "llm.cassette.path": "llm_cassette_path",
+            "llm.cassette.match": "llm_cassette_match",
+            "llm.cassette.miss_policy": "llm_cassette_miss_policy",
+            # LLM rate limit configuration
+            "llm.rate_limit.requests_per_minute": "llm_rate_limit_requests_per_minute",
+            "llm.rate_limit.tokens_per_minute": "llm_rate_limit_tokens_per_minute",
+            "llm.rate_limit.max_in_flight": "llm_rate_limit_max_in_flight",
             # Logging configuration
             "logging.level": "log_level",
             "logging.format": "log_format",
@@ -133,6 +142,18 @@ class ConfigurationFactory:
             "paths.tasks_dir": "tasks_dir",
             # Events configuration
             "events.publishers": "event_publishers",
+            # Artifact store configuration
+            "artifacts.enabled": "artifacts_enabled",
+            "artifacts.perceptual_hash": "artifacts_perceptual_hash",
+            "artifacts.perceptual_hash_threshold": "artifacts_perceptual_hash_threshold",
+            # Video encoder configuration
+            "video.max_concurrent_encoders": "video_max_concurrent_encoders",
+            "video.fast_preset": "video_fast_preset",
+            # Retention configuration
+            "retention.keep_last_runs": "retention_keep_last_runs",
+            "retention.keep_failed_days": "retention_keep_failed_days",
+            "retention.compact": "retention_compact",
+            "retention.auto_gc": "retention_auto_gc",
             # Jira configuration
             "jira.server": "jira_server",
             "jira.user": "jira_user",
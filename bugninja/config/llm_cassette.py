@@ -0,0 +1,448 @@
+"""
+LLM cassette record/replay for deterministic agent runs.
+
+A cassette stores every chat model request (as a hash of its normalized messages and call
+options) together with the model response in a local JSON Lines file. In replay mode the
+responses are served from that file, so agent runs become fast, free and fully offline,
+which is what regression tests of our own hooks, screenshot and selector logic need.
+
+## Key Components
+
+1. **LLMCassette** - Cassette file with request matching and a miss policy
+2. **cassette_model_class()** - Wraps a LangChain chat model class so that every
+   generation, including structured output and tool calls, goes through a cassette
+3. **LLMCassetteMissError** - Raised when a replayed request is not on the cassette
+
+## Usage Examples
+
+```toml
+# bugninja.toml
+[llm.cassette]
+mode = "record"                          # "off", "record" or "replay"
+path = "./cassettes/login_flow.jsonl"
+match = "lenient"                        # "strict" or "lenient"
+miss_policy = "error"                    # "error", "passthrough" or "record"
+```
+
+```python
+from bugninja.config.llm_cassette import LLMCassette
+
+cassette = LLMCassette.open("./cassettes/login_flow.jsonl", mode="replay", match="strict")
+print(cassette.get_metrics())
+```
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Type
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumpd, load
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from bugninja.utils.logging_config import logger
+
+CassetteMode = Literal["off", "record", "replay"]
+CassetteMatch = Literal["strict", "lenient"]
+CassetteMissPolicy = Literal["error", "passthrough", "record"]
+
+CASSETTE_VERSION = 1
+
+# Values that change on every run even though the request is logically the same
+_DATETIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?")
+_VOLATILE_ID_PATTERN = re.compile(r"\b(?=[0-9a-z_-]*\d)[0-9a-z_-]{20,}\b", re.IGNORECASE)
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class LLMCassetteMissError(Exception):
+    """Raised when a replayed LLM request has no recorded response."""
+
+
+def _normalize_text(text: str, lenient: bool) -> str:
+    text = _DATETIME_PATTERN.sub("<datetime>", text)
+    if lenient:
+        text = _VOLATILE_ID_PATTERN.sub("<id>", text)
+        text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    return text
+
+
+def _normalize_content(content: Any, lenient: bool) -> Any:
+    if isinstance(content, str):
+        return _normalize_text(content, lenient)
+
+    parts: List[Any] = []
+    for part in content or []:
+        if isinstance(part, str):
+            parts.append(_normalize_text(part, lenient))
+        elif isinstance(part, dict) and part.get("type") == "image_url":
+            # screenshots never repeat byte for byte across runs in lenient mode
+            if not lenient:
+                image_url = part.get("image_url", {})
+                url = image_url.get("url", "") if isinstance(image_url, dict) else str(image_url)
+                parts.append({"image": hashlib.sha256(url.encode()).hexdigest()})
+        elif isinstance(part, dict) and "text" in part:
+            parts.append(_normalize_text(str(part["text"]), lenient))
+        else:
+            parts.append(part)
+    return parts
+
+
+def normalize_messages(messages: Sequence[BaseMessage], lenient: bool = False) -> List[Any]:
+    """Reduce messages to the parts that identify a request.
+
+    Args:
+        messages (Sequence[BaseMessage]): Request messages
+        lenient (bool): Also drop images, mask long generated IDs and collapse whitespace
+
+    Returns:
+        List[Any]: JSON-serializable normalized messages
+    """
+    normalized: List[Any] = []
+    for message in messages:
+        entry: Dict[str, Any] = {
+            "type": message.type,
+            "content": _normalize_content(message.content, lenient),
+        }
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            entry["tool_calls"] = [
+                {"name": call.get("name"), "args": call.get("args")} for call in tool_calls
+            ]
+        normalized.append(entry)
+    return normalized
+
+
+def _hash(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _serialize_result(result: ChatResult) -> Dict[str, Any]:
+    return {
+        "generations": [
+            {"message": dumpd(generation.message), "generation_info": generation.generation_info}
+            for generation in result.generations
+        ],
+        "llm_output": result.llm_output,
+    }
+
+
+def _deserialize_result(data: Dict[str, Any]) -> ChatResult:
+    generations = [
+        ChatGeneration(
+            message=load(generation["message"]), generation_info=generation.get("generation_info")
+        )
+        for generation in data["generations"]
+    ]
+    return ChatResult(generations=generations, llm_output=data.get("llm_output"))
+
+
+class LLMCassette:
+    """Record/replay store for chat model requests and responses.
+
+    Every interaction is stored with two request keys: a strict key over the exact
+    normalized messages (only run-dependent date/times are masked) and call options
+    (tools, response format, stop words), and a lenient key that also ignores images,
+    generated IDs and whitespace. Lenient matching tries the strict key, then the lenient
+    key, then the next not yet replayed interaction with the same call options, which
+    keeps a replay going when a page renders slightly differently.
+
+    Identical requests are served in recording order. Cassettes are shared per file, so
+    every model created with the same settings records to and replays from one file.
+    The file holds a version header line and one line per interaction; recorded
+    interactions are appended to it.
+
+    Attributes:
+        path (Path): Cassette file
+        mode (CassetteMode): "record" always calls the model and stores the response;
+            "replay" serves stored responses
+        match (CassetteMatch): Request matching in replay mode
+        miss_policy (CassetteMissPolicy): On a replay miss: "error" raises
+            `LLMCassetteMissError`, "passthrough" calls the model without storing the
+            response, "record" calls the model and appends the response to the cassette
+        hits (int): Requests served from the cassette
+        misses (int): Replayed requests that were not on the cassette
+        recorded (int): Interactions written to the cassette
+    """
+
+    _cassettes: Dict[Tuple[str, str], "LLMCassette"] = {}
+    _cassettes_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Path,
+        mode: CassetteMode = "replay",
+        match: CassetteMatch = "strict",
+        miss_policy: CassetteMissPolicy = "error",
+    ) -> None:
+        """Initialize the cassette, loading existing interactions from `path`.
+
+        Args:
+            path (Path): Cassette file
+            mode (CassetteMode): "record" or "replay"
+            match (CassetteMatch): "strict" or "lenient" request matching
+            miss_policy (CassetteMissPolicy): What to do when a replayed request is missing
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.match = match
+        self.miss_policy = miss_policy
+
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._played: set[int] = set()
+        # False until the file is known to be in the line format interactions append to
+        self._appendable = False
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if self.path.exists():
+            self._load()
+
+    @classmethod
+    def open(
+        cls,
+        path: str | Path,
+        mode: CassetteMode = "replay",
+        match: CassetteMatch = "strict",
+        miss_policy: CassetteMissPolicy = "error",
+    ) -> "LLMCassette":
+        """Get the cassette shared by the process for a file and mode.
+
+        Args:
+            path (str | Path): Cassette file
+            mode (CassetteMode): "record" or "replay"
+            match (CassetteMatch): "strict" or "lenient" request matching
+            miss_policy (CassetteMissPolicy): What to do when a replayed request is missing
+
+        Returns:
+            LLMCassette: The shared cassette
+        """
+        key = (str(Path(path).resolve()), mode)
+        with cls._cassettes_lock:
+            cassette = cls._cassettes.get(key)
+            if cassette is None:
+                # a fresh recording replaces the previous cassette
+                if mode == "record" and Path(path).exists():
+                    Path(path).unlink()
+                cassette = cls(Path(path), mode=mode, match=match, miss_policy=miss_policy)
+                cls._cassettes[key] = cassette
+            cassette.match = match
+            cassette.miss_policy = miss_policy
+            return cassette
+
+    def request_keys(
+        self, model: str, messages: Sequence[BaseMessage], options: Dict[str, Any]
+    ) -> Dict[str, str]:
+        """Compute the strict, lenient and options keys of a request.
+
+        Args:
+            model (str): Model name
+            messages (Sequence[BaseMessage]): Request messages
+            options (Dict[str, Any]): Call options (tools, response format, stop words)
+
+        Returns:
+            Dict[str, str]: Keys under "key", "lenient_key" and "options_key"
+        """
+        options_key = _hash({"model": model, "options": options})
+        return {
+            "key": _hash([options_key, normalize_messages(messages)]),
+            "lenient_key": _hash([options_key, normalize_messages(messages, lenient=True)]),
+            "options_key": options_key,
+        }
+
+    def lookup(self, keys: Dict[str, str]) -> Optional[ChatResult]:
+        """Find the recorded response of a request in replay mode.
+
+        Args:
+            keys (Dict[str, str]): Request keys from `request_keys()`
+
+        Returns:
+            Optional[ChatResult]: Recorded response, or None on a miss
+        """
+        with self._lock:
+            candidates: List[Tuple[str, Optional[str]]] = [("key", keys["key"])]
+            if self.match == "lenient":
+                candidates += [("lenient_key", keys["lenient_key"]), ("options_key", None)]
+
+            for field, value in candidates:
+                idx = self._find(field, keys["options_key"], value)
+                if idx is not None:
+                    self._played.add(idx)
+                    self.hits += 1
+                    return _deserialize_result(self._interactions[idx]["response"])
+
+            self.misses += 1
+            return None
+
+    def _find(self, field: str, options_key: str, value: Optional[str]) -> Optional[int]:
+        matches = [
+            idx
+            for idx, interaction in enumerate(self._interactions)
+            if interaction["options_key"] == options_key
+            and (value is None or interaction[field] == value)
+        ]
+        if not matches:
+            return None
+
+        unplayed = [idx for idx in matches if idx not in self._played]
+        if unplayed:
+            return unplayed[0]
+        # the sequential fallback only hands out every interaction once
+        if value is None:
+            return None
+        return matches[-1]
+
+    def record(self, keys: Dict[str, str], model: str, result: ChatResult) -> None:
+        """Append an interaction to the cassette file.
+
+        Args:
+            keys (Dict[str, str]): Request keys from `request_keys()`
+            model (str): Model name
+            result (ChatResult): Model response
+        """
+        interaction = {**keys, "model": model, "response": _serialize_result(result)}
+        with self._lock:
+            self._interactions.append(interaction)
+            self._played.add(len(self._interactions) - 1)
+            self.recorded += 1
+            if self._appendable:
+                with self.path.open("a", encoding="utf-8") as file:
+                    file.write(json.dumps(interaction, ensure_ascii=False) + "\n")
+            else:
+                self._save()
+
+    def _load(self) -> None:
+        text = self.path.read_text(encoding="utf-8")
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError:
+            lines = text.splitlines()
+            self._interactions = [json.loads(line) for line in lines[1:] if line.strip()]
+            self._appendable = True
+            return
+        # an empty cassette or one written as a single JSON document, rewritten on record
+        self._interactions = document.get("interactions", [])
+
+    def _save(self) -> None:
+        """Write the whole cassette in the line format."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = [json.dumps({"version": CASSETTE_VERSION})]
+        lines += [json.dumps(interaction, ensure_ascii=False) for interaction in self._interactions]
+        tmp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._appendable = True
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get the cassette hit/miss counters.
+
+        Returns:
+            Dict[str, int]: Hits, misses, recorded and total stored interactions
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "recorded": self.recorded,
+                "interactions": len(self._interactions),
+            }
+
+
+class _CassetteChatModelMixin:
+    """Routes `_generate`/`_agenerate` of a chat model through a cassette."""
+
+    __slots__ = ()
+    __bugninja_cassette__: LLMCassette
+
+    def _cassette_request(
+        self, messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]
+    ) -> Tuple[LLMCassette, str, Dict[str, str]]:
+        cassette = type(self).__bugninja_cassette__
+        model = str(getattr(self, "model_name", None) or getattr(self, "model", "unknown"))
+        keys = cassette.request_keys(model, messages, {"stop": stop, **kwargs})
+        return cassette, model, keys
+
+    def _cassette_replay(
+        self, cassette: LLMCassette, keys: Dict[str, str]
+    ) -> Tuple[Optional[ChatResult], bool]:
+        """Returns the replayed result and whether a model response must be recorded."""
+        if cassette.mode == "record":
+            return None, True
+
+        result = cassette.lookup(keys)
+        if result is not None:
+            return result, False
+        if cassette.miss_policy == "error":
+            raise LLMCassetteMissError(
+                f"LLM request {keys['key'][:12]} is not on cassette {cassette.path}"
+            )
+        logger.warning(f"⚠️ LLM cassette miss ({cassette.miss_policy}): {keys['key'][:12]}")
+        return None, cassette.miss_policy == "record"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        cassette, model, keys = self._cassette_request(messages, stop, kwargs)
+        replayed, should_record = self._cassette_replay(cassette, keys)
+        if replayed is not None:
+            return replayed
+
+        result: ChatResult = super()._generate(  # type: ignore[misc]
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        if should_record:
+            cassette.record(keys, model, result)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        cassette, model, keys = self._cassette_request(messages, stop, kwargs)
+        replayed, should_record = self._cassette_replay(cassette, keys)
+        if replayed is not None:
+            return replayed
+
+        result: ChatResult = await super()._agenerate(  # type: ignore[misc]
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        if should_record:
+            cassette.record(keys, model, result)
+        return result
+
+
+def cassette_model_class(
+    model_class: Type[BaseChatModel], cassette: LLMCassette
+) -> Type[BaseChatModel]:
+    """Create a subclass of a chat model class that records to or replays from a cassette.
+
+    The subclass keeps the original class name, so code that inspects the model class
+    (e.g. browser-use choosing a tool calling method) behaves exactly as without cassette.
+
+    Args:
+        model_class (Type[BaseChatModel]): LangChain chat model class to wrap
+        cassette (LLMCassette): Cassette the model records to or replays from
+
+    Returns:
+        Type[BaseChatModel]: The wrapped model class
+    """
+    return type(
+        model_class.__name__,
+        (_CassetteChatModelMixin, model_class),
+        {"__module__": model_class.__module__, "__bugninja_cassette__": cassette},
+    )
@@ -3,16 +3,254 @@ LLM factory pattern using the new deduplicated system.
 
 This module provides a factory pattern for creating LLM instances from different
 providers using the new base factory class to eliminate code duplication.
+
+Models with the same resolved configuration come from a process-wide `LLMClientPool`:
+every caller gets its own lightweight copy (own callbacks and attributes), while the
+provider SDK clients with their HTTP connection pools and keep-alive connections are
+created once per configuration and event loop.
 """
 
+import asyncio
+import hashlib
+import inspect
+import json
+import threading
+import weakref
 from abc import ABC
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from langchain_core.language_models.chat_models import BaseChatModel
+from pydantic import SecretStr
 
+from bugninja.config.llm_cassette import LLMCassette, cassette_model_class
 from bugninja.config.llm_config import LLMConfig
+from bugninja.config.llm_rate_limiter import (
+    LLMRateLimiter,
+    LLMRateLimits,
+    rate_limited_model_class,
+)
 from bugninja.config.provider_registry import ProviderRegistry
 from bugninja.config.settings import BugninjaSettings, LLMProvider
+from bugninja.utils.logging_config import logger
+
+# SDK client attributes of the LangChain chat models that own HTTP connection pools
+_CLIENT_ATTRIBUTES: Tuple[str, ...] = (
+    "root_async_client",
+    "async_client",
+    "_async_client",
+    "root_client",
+    "client",
+    "_client",
+)
+
+# Verification results browser-use caches on the model instance to skip its test call
+_VERIFICATION_ATTRIBUTES: Tuple[str, ...] = ("_verified_api_keys", "_verified_tool_calling_method")
+
+_POOL_KEY_ATTRIBUTE = "_bugninja_pool_key"
+
+
+@dataclass
+class _PooledModel:
+    model: BaseChatModel
+    loop_ref: Optional["weakref.ReferenceType[asyncio.AbstractEventLoop]"]
+    # copies handed out by `get_model()` that are still referenced by an agent
+    copies: "weakref.WeakSet[BaseChatModel]" = field(default_factory=weakref.WeakSet)
+
+    @property
+    def in_use(self) -> bool:
+        return len(self.copies) > 0
+
+    @property
+    def loop_is_gone(self) -> bool:
+        if self.loop_ref is None:
+            return False
+        loop = self.loop_ref()
+        return loop is None or loop.is_closed()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _model_clients(model: BaseChatModel) -> List[Tuple[str, Any]]:
+    """SDK clients of a model with their attribute names, each client once."""
+    clients: Dict[int, Tuple[str, Any]] = {}
+    for attribute in _CLIENT_ATTRIBUTES:
+        client = vars(model).get(attribute)
+        if client is not None and id(client) not in clients:
+            clients[id(client)] = (attribute, client)
+    return list(clients.values())
+
+
+async def _close_model_clients(model: BaseChatModel, close_async: bool) -> None:
+    """Close the SDK clients of a pooled model; async clients only on their own loop."""
+    for attribute, client in _model_clients(model):
+        close = getattr(client, "close", None) or getattr(client, "aclose", None)
+        if close is None:
+            continue
+        is_async = inspect.iscoroutinefunction(close)
+        if is_async and not close_async:
+            continue
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to close pooled LLM client '{attribute}': {e}")
+
+
+def _close_sync_model_clients(model: BaseChatModel) -> None:
+    """Close the synchronous SDK clients of a pooled model whose event loop is gone."""
+    for attribute, client in _model_clients(model):
+        close = getattr(client, "close", None)
+        if close is None or inspect.iscoroutinefunction(close):
+            continue
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to close pooled LLM client '{attribute}': {e}")
+
+
+class LLMClientPool:
+    """Process-wide pool of LLM models keyed by their resolved configuration.
+
+    Agents of concurrent runs get copies of one pooled model, so they share its SDK
+    clients, HTTP connection pools and keep-alive connections. Async HTTP clients are
+    bound to the event loop they were first used on, hence models are pooled per event
+    loop; models of closed event loops are evicted on the next `get_model()`. Every
+    `BugninjaClient` holds the pool via `retain()` and `release()`. When the last one is
+    released, the clients of models without copies in use are closed; models whose copies
+    are still used, e.g. by agents created outside a `BugninjaClient`, stay pooled.
+    """
+
+    _instance: Optional["LLMClientPool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: Dict[Tuple[str, Optional[int]], _PooledModel] = {}
+        self._users = 0
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @classmethod
+    def get_instance(cls) -> "LLMClientPool":
+        """Get the LLM client pool shared by the whole process.
+
+        Returns:
+            LLMClientPool: Process-wide LLM client pool
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def get_model(self, key: str, create: Callable[[], BaseChatModel]) -> BaseChatModel:
+        """Get a copy of the pooled model for a configuration, creating it if needed.
+
+        Args:
+            key (str): Fingerprint of the resolved model configuration
+            create (Callable[[], BaseChatModel]): Creates the model on a pool miss
+
+        Returns:
+            BaseChatModel: A copy sharing the SDK clients of the pooled model
+        """
+        loop = _running_loop()
+        pool_key = (key, id(loop) if loop is not None else None)
+        with self._lock:
+            evicted = self._evict_closed_loops()
+            # evicted before a closed loop's id can be reused by a new loop
+            entry = self._models.get(pool_key)
+            if entry is None:
+                model = create()
+                object.__setattr__(model, _POOL_KEY_ATTRIBUTE, pool_key)
+                entry = _PooledModel(
+                    model=model, loop_ref=weakref.ref(loop) if loop is not None else None
+                )
+                self._models[pool_key] = entry
+                self.created += 1
+            else:
+                self.reused += 1
+            # copies share the SDK clients but not callbacks registered on one of them
+            model_copy = entry.model.model_copy(update={"callbacks": None})
+            entry.copies.add(model_copy)
+
+        for evicted_entry in evicted:
+            _close_sync_model_clients(evicted_entry.model)
+        return model_copy
+
+    def _evict_closed_loops(self) -> List[_PooledModel]:
+        """Drop the models of closed event loops; called with the pool lock held.
+
+        Returns:
+            List[_PooledModel]: Evicted models without copies in use, to close their
+                synchronous clients
+        """
+        gone = [pool_key for pool_key, entry in self._models.items() if entry.loop_is_gone]
+        evicted = [self._models.pop(pool_key) for pool_key in gone]
+        self.evicted += len(evicted)
+        return [entry for entry in evicted if not entry.in_use]
+
+    def share_verification(self, model: BaseChatModel) -> None:
+        """Keep browser-use's verification of a pooled model for the next copies.
+
+        Args:
+            model (BaseChatModel): A verified copy returned by `get_model()`
+        """
+        pool_key = vars(model).get(_POOL_KEY_ATTRIBUTE)
+        with self._lock:
+            entry = self._models.get(pool_key) if pool_key is not None else None
+            if entry is None:
+                return
+            for attribute in _VERIFICATION_ATTRIBUTES:
+                value = vars(model).get(attribute)
+                if value is not None:
+                    object.__setattr__(entry.model, attribute, value)
+
+    def retain(self) -> None:
+        """Register a user of the pool, released again with `release()`."""
+        with self._lock:
+            self._users += 1
+
+    async def release(self) -> None:
+        """Unregister a user of the pool and close the unused pooled clients if it was the last.
+
+        Models with copies still in use stay pooled and are closed by a later release.
+        """
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users:
+                return
+            unused = [pool_key for pool_key, entry in self._models.items() if not entry.in_use]
+            entries = [self._models.pop(pool_key) for pool_key in unused]
+
+        loop = _running_loop()
+        for entry in entries:
+            own_loop = entry.loop_ref is not None and entry.loop_ref() is loop
+            await _close_model_clients(entry.model, close_async=own_loop)
+        if entries:
+            logger.bugninja_log(f"🔌 Closed {len(entries)} pooled LLM client(s)")
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get the pool usage.
+
+        Returns:
+            Dict[str, int]: Pooled models, created, reused and evicted models and users
+        """
+        with self._lock:
+            return {
+                "pooled_clients": len(self._models),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+                "users": self._users,
+            }
+
 
 # Protocol and abstract base class are now handled by BaseLLMFactory
 
@@ -49,11 +287,89 @@ class BaseLLMFactory(ABC):
         # Add provider-specific configuration
         factory_config.update(self._build_provider_config(config))
 
+        return LLMClientPool.get_instance().get_model(
+            self._pool_key(factory_config),
+            lambda: self._create_model(config, factory_config),
+        )
+
+    def _create_model(self, config: LLMConfig, factory_config: Dict[str, Any]) -> BaseChatModel:
+        """Create a new model instance, wrapped by the rate limiter and cassette if enabled."""
+        model_class = self.provider_config.model_class
+        limiter = self._get_rate_limiter()
+        if limiter is not None:
+            deployment = self._deployment_key(config, factory_config)
+            model_class = rate_limited_model_class(model_class, limiter, deployment)
+
+        # The cassette wraps the rate limiter, so replayed responses never wait for it
+        cassette = self._get_cassette()
+        if cassette is not None:
+            # Responses come from (or go to) the cassette as a whole, never as a stream
+            model_class = cassette_model_class(model_class, cassette)
+            factory_config = {**factory_config, "disable_streaming": True}
+
         try:
-            return self.provider_config.model_class(**factory_config)
+            return model_class(**factory_config)
         except Exception as e:
             raise ValueError(f"Failed to create {self.provider_config.name} model: {e}")
 
+    def _pool_key(self, factory_config: Dict[str, Any]) -> str:
+        """Fingerprint of everything that makes a model instance differ.
+
+        Secrets are part of the fingerprint but never stored in the pool in plain text.
+        """
+        settings = self.settings
+        normalized = {
+            "provider": self.provider.value,
+            "model_config": {
+                key: value.get_secret_value() if isinstance(value, SecretStr) else value
+                for key, value in factory_config.items()
+            },
+            "cassette": [
+                settings.llm_cassette_mode,
+                settings.llm_cassette_path,
+                settings.llm_cassette_match,
+                settings.llm_cassette_miss_policy,
+            ],
+            "rate_limit": [
+                settings.llm_rate_limit_requests_per_minute,
+                settings.llm_rate_limit_tokens_per_minute,
+                settings.llm_rate_limit_max_in_flight,
+            ],
+        }
+        payload = json.dumps(normalized, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_cassette(self) -> Optional[LLMCassette]:
+        """Get the LLM cassette configured in the settings, if any."""
+        if self.settings.llm_cassette_mode == "off":
+            return None
+        return LLMCassette.open(
+            self.settings.llm_cassette_path,
+            mode=self.settings.llm_cassette_mode,
+            match=self.settings.llm_cassette_match,
+            miss_policy=self.settings.llm_cassette_miss_policy,
+        )
+
+    def _get_rate_limiter(self) -> Optional[LLMRateLimiter]:
+        """Get the process-wide rate limiter, configured from the settings, if enabled."""
+        limits = LLMRateLimits(
+            requests_per_minute=self.settings.llm_rate_limit_requests_per_minute,
+            tokens_per_minute=self.settings.llm_rate_limit_tokens_per_minute,
+            max_in_flight=self.settings.llm_rate_limit_max_in_flight,
+        )
+        if limits.is_unlimited:
+            return None
+        limiter = LLMRateLimiter.get_instance()
+        if limiter.limits != limits:
+            limiter.configure(limits)
+        return limiter
+
+    def _deployment_key(self, config: LLMConfig, factory_config: Dict[str, Any]) -> str:
+        """Key of the provider deployment whose limits a model's requests count against."""
+        endpoint = factory_config.get("azure_endpoint") or factory_config.get("base_url")
+        deployment = f"{self.provider.value}:{config.model}"
+        return f"{deployment}@{endpoint}" if endpoint else deployment
+
     def _build_common_config(self, config: LLMConfig) -> Dict[str, Any]:
         """Build common configuration parameters."""
         factory_config: Dict[str, Any] = {
@@ -0,0 +1,342 @@
+"""
+Hedged and deadline-bounded LLM calls for agent steps.
+
+LLM latency has a long tail: a call that usually answers in a few seconds sometimes takes
+ten times as long, and the whole step (and the idle browser) waits for it. With a hedging
+policy, a call that has not answered by a latency percentile of the recent calls gets a
+duplicate request, optionally to a secondary deployment, and whichever answers first wins.
+A hard deadline fails the call instead of waiting any longer, which the agent handles like
+any other failed step.
+
+## Key Components
+
+1. **LLMHedgingConfig** - Hedge threshold, secondary deployment and per-call deadline
+2. **LLMHedger** - Per-agent hedging of model calls with hedge rate and win counters
+3. **LLMDeadlineExceededError** - Raised when a call misses its deadline
+
+## Usage Examples
+
+```toml
+# task.toml
+[run_config.llm_hedging]
+hedge_percentile = 0.9          # hedge calls slower than 90% of the recent ones
+secondary_model = "gpt-4o-mini" # optional, defaults to a duplicate of the same request
+deadline_seconds = 60
+```
+
+```python
+from bugninja.config.llm_hedging import LLMHedgingConfig
+from bugninja.schemas.models import BugninjaConfig
+
+config = BugninjaConfig(llm_hedging=LLMHedgingConfig(deadline_seconds=60))
+```
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from pydantic import BaseModel, Field
+
+from bugninja.config.llm_routing import LLMUsageRecorder, get_model_name
+from bugninja.utils.logging_config import logger
+from bugninja.utils.tracing import current_span
+
+T = TypeVar("T")
+
+# recent call latencies per model, shared by all agents of the process
+_LATENCY_WINDOW_SIZE = 200
+_latencies: Dict[str, Deque[float]] = {}
+_latencies_lock = threading.Lock()
+
+
+class LLMDeadlineExceededError(TimeoutError):
+    """Raised when an LLM call does not answer within its deadline."""
+
+
+class LLMHedgingConfig(BaseModel):
+    """Hedging and deadline policy of an agent's model calls.
+
+    Attributes:
+        hedge (bool): Send a duplicate request for slow calls (default: True)
+        hedge_percentile (float): Latency percentile of the recent calls after which a call
+            is hedged (default: 0.9)
+        min_hedge_delay_seconds (float): Lower bound of the hedge threshold (default: 2.0)
+        initial_hedge_delay_seconds (float): Hedge threshold until enough calls were
+            observed (default: 15.0)
+        min_samples (int): Observed calls needed to use the percentile (default: 10)
+        secondary_model (Optional[str]): Model of the hedged request; defaults to the
+            model of the call
+        secondary_provider (Optional[str]): Provider of the secondary model; defaults to
+            the provider of the run
+        deadline_seconds (Optional[float]): Hard deadline of a call including its hedge;
+            None waits indefinitely (default: None)
+
+    Example:
+        ```python
+        from bugninja.config.llm_hedging import LLMHedgingConfig
+
+        # hedge to a second deployment, give up after a minute
+        hedging = LLMHedgingConfig(secondary_model="gpt-4o-mini", deadline_seconds=60)
+        ```
+    """
+
+    hedge: bool = Field(default=True, description="Send a duplicate request for slow calls")
+    hedge_percentile: float = Field(
+        default=0.9, gt=0.0, lt=1.0, description="Latency percentile that triggers a hedge"
+    )
+    min_hedge_delay_seconds: float = Field(
+        default=2.0, ge=0.0, description="Lower bound of the hedge threshold"
+    )
+    initial_hedge_delay_seconds: float = Field(
+        default=15.0, ge=0.0, description="Hedge threshold until enough calls were observed"
+    )
+    min_samples: int = Field(
+        default=10, ge=1, description="Observed calls needed to use the percentile"
+    )
+    secondary_model: Optional[str] = Field(
+        default=None, description="Model of the hedged request (defaults to the same model)"
+    )
+    secondary_provider: Optional[str] = Field(
+        default=None, description="Provider of the secondary model (defaults to the run's)"
+    )
+    deadline_seconds: Optional[float] = Field(
+        default=None, gt=0.0, description="Hard deadline of a call including its hedge"
+    )
+
+
+def record_latency(model_name: str, seconds: float) -> None:
+    """Record the latency of a call for the hedge thresholds of that model.
+
+    Args:
+        model_name (str): Model of the call
+        seconds (float): Latency of the call, or its elapsed time if it was cancelled
+    """
+    with _latencies_lock:
+        window = _latencies.get(model_name)
+        if window is None:
+            window = _latencies[model_name] = deque(maxlen=_LATENCY_WINDOW_SIZE)
+        window.append(seconds)
+
+
+def latency_percentile(model_name: str, percentile: float) -> Optional[float]:
+    """Get a latency percentile of the recent calls of a model.
+
+    Args:
+        model_name (str): Model name
+        percentile (float): Percentile between 0 and 1
+
+    Returns:
+        Optional[float]: Latency in seconds, or None without recorded calls
+    """
+    with _latencies_lock:
+        window = sorted(_latencies.get(model_name, ()))
+    if not window:
+        return None
+    return window[min(len(window) - 1, math.ceil(percentile * len(window)) - 1)]
+
+
+class LLMHedger:
+    """Runs an agent's model calls with hedging and a deadline.
+
+    Without a policy calls run unchanged and only their latency is recorded.
+
+    Attributes:
+        config (Optional[LLMHedgingConfig]): Hedging policy
+        calls (int): Calls made through the hedger
+        hedged (int): Calls that got a hedged request
+        hedge_wins (int): Hedged calls answered by the hedged request
+        deadline_exceeded (int): Calls that missed their deadline
+    """
+
+    def __init__(
+        self,
+        config: Optional[LLMHedgingConfig],
+        temperature: float = 0.0,
+        cli_mode: bool = False,
+        usage: Optional[LLMUsageRecorder] = None,
+    ) -> None:
+        """Initialize the hedger.
+
+        Args:
+            config (Optional[LLMHedgingConfig]): Hedging policy, None to only record latency
+            temperature (float): Temperature of the secondary model
+            cli_mode (bool): Whether the run uses the CLI (TOML) configuration
+            usage (Optional[LLMUsageRecorder]): Recorder the secondary model reports to
+        """
+        self.config = config
+        self.usage = usage
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.deadline_exceeded = 0
+        self._temperature = temperature
+        self._cli_mode = cli_mode
+        self._secondary_llm: Optional[BaseChatModel] = None
+
+    def secondary_llm(self, llm: BaseChatModel) -> BaseChatModel:
+        """Get the model of the hedged request for a call to `llm`.
+
+        Args:
+            llm (BaseChatModel): Model of the original request
+
+        Returns:
+            BaseChatModel: The secondary model, created on first use, or `llm` itself
+        """
+        if self.config is None or not self.config.secondary_model:
+            return llm
+        if self._secondary_llm is None:
+            from bugninja.config.llm_config import LLMConfig
+            from bugninja.config.llm_creator import (
+                create_llm_config_from_settings,
+                create_llm_model_from_config,
+            )
+            from bugninja.config.settings import LLMProvider
+
+            provider = (
+                LLMProvider(self.config.secondary_provider)
+                if self.config.secondary_provider
+                else create_llm_config_from_settings(cli_mode=self._cli_mode).provider
+            )
+            llm_config = LLMConfig(
+                provider=provider,
+                model=self.config.secondary_model,
+                temperature=self._temperature,
+            )
+            self._secondary_llm = create_llm_model_from_config(llm_config, cli_mode=self._cli_mode)
+            if self.usage is not None:
+                self.usage.attach(self._secondary_llm)
+            logger.bugninja_log(
+                f"🪁 Hedge model ready: {llm_config.provider.value} - {llm_config.model}"
+            )
+        return self._secondary_llm
+
+    def hedge_delay(self, model_name: str) -> Optional[float]:
+        """Seconds after which a call to a model is hedged.
+
+        Args:
+            model_name (str): Model of the call
+
+        Returns:
+            Optional[float]: Hedge threshold, or None if calls are not hedged
+        """
+        if self.config is None or not self.config.hedge:
+            return None
+        percentile = latency_percentile(model_name, self.config.hedge_percentile)
+        with _latencies_lock:
+            samples = len(_latencies.get(model_name, ()))
+        if percentile is None or samples < self.config.min_samples:
+            return self.config.initial_hedge_delay_seconds
+        return max(self.config.min_hedge_delay_seconds, percentile)
+
+    async def _timed(
+        self,
+        call: Callable[[BaseChatModel], Awaitable[T]],
+        llm: BaseChatModel,
+        record_cancelled: bool = True,
+    ) -> T:
+        started_at = time.perf_counter()
+        try:
+            result = await call(llm)
+        except asyncio.CancelledError:
+            # a slow call cancelled by a faster hedge or the deadline took at least this long;
+            # leaving it out would pull the percentile down to the calls that answered
+            if record_cancelled:
+                record_latency(get_model_name(llm), time.perf_counter() - started_at)
+            raise
+        record_latency(get_model_name(llm), time.perf_counter() - started_at)
+        return result
+
+    async def _race(
+        self,
+        call: Callable[[BaseChatModel], Awaitable[T]],
+        llm: BaseChatModel,
+        step: int,
+        use_secondary: bool,
+    ) -> T:
+        delay = self.hedge_delay(get_model_name(llm))
+        if delay is None:
+            return await self._timed(call, llm)
+
+        primary = asyncio.ensure_future(self._timed(call, llm))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedged += 1
+            secondary_llm = self.secondary_llm(llm) if use_secondary else llm
+            logger.bugninja_log(
+                f"🪁 Step {step}: no answer after {delay:.1f}s, hedging to "
+                f"{get_model_name(secondary_llm)}"
+            )
+            # a hedge cancelled by the primary says nothing about the latency of its model
+            hedge = asyncio.ensure_future(self._timed(call, secondary_llm, record_cancelled=False))
+            tasks.add(hedge)
+            current_span().set(hedged=True, hedge_delay_ms=round(delay * 1000))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        current_span().set(hedge_won=task is hedge)
+                        return task.result()
+            # both requests failed: surface the error of the original request
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def run(
+        self,
+        call: Callable[[BaseChatModel], Awaitable[T]],
+        llm: BaseChatModel,
+        step: int,
+        use_secondary: bool = True,
+    ) -> T:
+        """Run a model call with hedging and within the deadline of the policy.
+
+        Args:
+            call (Callable[[BaseChatModel], Awaitable[T]]): Makes the call with a given model
+            llm (BaseChatModel): Model of the original request
+            step (int): Agent step the call belongs to
+            use_secondary (bool): Hedge to the secondary model instead of `llm` itself
+
+        Returns:
+            T: Result of the request that answered first
+
+        Raises:
+            LLMDeadlineExceededError: If no request answered within the deadline
+        """
+        self.calls += 1
+        deadline = self.config.deadline_seconds if self.config is not None else None
+        if deadline is None:
+            return await self._race(call, llm, step, use_secondary)
+        try:
+            return await asyncio.wait_for(
+                self._race(call, llm, step, use_secondary), timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            raise LLMDeadlineExceededError(
+                f"LLM call of step {step} did not answer within {deadline:g}s"
+            ) from None
+
+    def summary(self) -> Dict[str, Any]:
+        """Hedge rate and wins of the agent, for the run result."""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 3) if self.calls else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "deadline_exceeded": self.deadline_exceeded,
+        }
@@ -0,0 +1,120 @@
+"""
+Provider-side prompt caching of agent prompts.
+
+Providers serve the longest previously seen prefix of a prompt from a cache, at a fraction
+of the latency and price of uncached input tokens. Agent prompts are laid out for that: a
+system message that is the same for every task, the task message, an append-only history
+and a volatile suffix with the state of the current step (see `bugninja.prompts`).
+
+OpenAI, Azure OpenAI, DeepSeek and Gemini cache such prefixes on their own. Anthropic only
+caches up to explicit cache breakpoints, which are set on a copy of the prompt right before
+the call: after the system message and at the end of the stable prefix of the step.
+
+## Key Components
+
+1. **supports_cache_control()** - Whether a model caches only up to explicit breakpoints
+2. **with_cache_breakpoints()** - Copy of a prompt with breakpoints after its stable parts
+3. **cached_input_tokens()** - Prompt tokens of a call that were read from the cache
+
+## Usage Examples
+
+```python
+from bugninja.config.llm_prompt_cache import supports_cache_control, with_cache_breakpoints
+
+if supports_cache_control(llm):
+    messages = with_cache_breakpoints(messages, prefix_length=len(messages) - 1)
+response = await llm.ainvoke(messages)
+```
+"""
+
+from typing import Any, Dict, List, Mapping, Optional
+
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+CACHE_CONTROL: Dict[str, str] = {"type": "ephemeral"}
+
+
+def supports_cache_control(llm: BaseChatModel) -> bool:
+    """Check whether a model caches prompts only up to explicit cache breakpoints.
+
+    Args:
+        llm (BaseChatModel): Chat model of the call
+
+    Returns:
+        bool: True for Anthropic models
+    """
+    return isinstance(llm, ChatAnthropic)
+
+
+def _last_text_message_index(messages: List[BaseMessage], end: int) -> Optional[int]:
+    """Index of the last system or human message with content before `end`."""
+    for idx in range(min(end, len(messages)) - 1, -1, -1):
+        message = messages[idx]
+        if isinstance(message, (SystemMessage, HumanMessage)) and message.content:
+            return idx
+    return None
+
+
+def _with_cache_control(message: BaseMessage) -> BaseMessage:
+    """Copy of a message whose last content block is a cache breakpoint."""
+    if isinstance(message.content, str):
+        blocks: List[Any] = [{"type": "text", "text": message.content}]
+    else:
+        blocks = list(message.content)
+    last = blocks[-1]
+    if isinstance(last, str):
+        last = {"type": "text", "text": last}
+    blocks[-1] = {**last, "cache_control": dict(CACHE_CONTROL)}
+    return message.model_copy(update={"content": blocks})
+
+
+def with_cache_breakpoints(messages: List[BaseMessage], prefix_length: int) -> List[BaseMessage]:
+    """Copy of a prompt with cache breakpoints after its stable parts.
+
+    Breakpoints are set after the system message, which is shared by all tasks of an agent
+    type, and at the end of the first `prefix_length` messages, which the next step sends
+    again unchanged. The messages of the history are not modified.
+
+    Args:
+        messages (List[BaseMessage]): Prompt of the call
+        prefix_length (int): Number of leading messages that stay the same in the next step
+
+    Returns:
+        List[BaseMessage]: Prompt with at most two cache breakpoints
+    """
+    breakpoints = {
+        idx
+        for idx in (
+            _last_text_message_index(messages, 1),
+            _last_text_message_index(messages, prefix_length),
+        )
+        if idx is not None
+    }
+    return [
+        _with_cache_control(message) if idx in breakpoints else message
+        for idx, message in enumerate(messages)
+    ]
+
+
+def cached_input_tokens(
+    usage_metadata: Optional[Mapping[str, Any]], token_usage: Optional[Mapping[str, Any]] = None
+) -> int:
+    """Get the prompt tokens of a call that were read from the provider's cache.
+
+    Args:
+        usage_metadata (Optional[Mapping[str, Any]]): `usage_metadata` of the response message
+        token_usage (Optional[Mapping[str, Any]]): OpenAI style `token_usage` of the response,
+            used without usage metadata
+
+    Returns:
+        int: Cached prompt tokens, 0 if the provider reported none
+    """
+    if usage_metadata:
+        details = usage_metadata.get("input_token_details") or {}
+        return int(details.get("cache_read") or 0)
+    if token_usage:
+        details = token_usage.get("prompt_tokens_details") or {}
+        return int(details.get("cached_tokens") or 0)
+    return 0
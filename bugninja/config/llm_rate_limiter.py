@@ -0,0 +1,651 @@
+"""
+Process-wide LLM rate limiting and scheduling for parallel runs.
+
+Parallel runs (`parallel_run_tasks`, `parallel_run_mixed`, parallel CLI runs) and their
+healers all call the same provider deployment. Without a shared budget they burst into
+429 responses, and the provider retries then stall whole runs. This module gives every
+deployment one scheduler with token buckets for requests per minute and tokens per minute
+and a cap on in-flight requests, shared by all chat models created by the LLM factory.
+
+Waiting requests are served by priority first (healing before regular steps) and then
+fairly across runs: the run with the fewest granted requests goes next, so one busy run
+cannot starve the others.
+
+## Key Components
+
+1. **LLMRateLimiter** - Process-wide schedulers per deployment with wait-time metrics
+2. **LLMRateLimits** - Requests per minute, tokens per minute and in-flight cap
+3. **llm_request_scope()** - Binds the LLM calls of a run to its run key and priority
+4. **rate_limited_model_class()** - Wraps a LangChain chat model class so that every
+   generation waits for the scheduler of its deployment
+
+## Usage Examples
+
+```toml
+# bugninja.toml
+[llm.rate_limit]
+requests_per_minute = 60
+tokens_per_minute = 150000
+max_in_flight = 4
+```
+
+```python
+from bugninja.config.llm_rate_limiter import LLMRateLimiter, llm_request_scope
+
+with llm_request_scope(run_id, priority="healing"):
+    await healer_agent.step()
+
+print(LLMRateLimiter.get_instance().get_metrics())
+```
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+
+from bugninja.utils.tracing import current_span
+
+LLMRequestPriority = Literal["healing", "normal"]
+_RequestScope = Tuple[str, LLMRequestPriority]
+
+_PRIORITY_ORDER: Dict[str, int] = {"healing": 0, "normal": 1}
+
+#! rough prompt size estimate until the provider reports the real usage
+CHARS_PER_TOKEN: int = 4
+IMAGE_TOKEN_ESTIMATE: int = 1000
+
+# polling interval of synchronous callers, which cannot be woken up by the event loop
+_BLOCKING_POLL_SECONDS: float = 0.05
+# shorter waits are lock handoffs, not rate limiting
+_MIN_REPORTED_WAIT_MS: float = 1.0
+
+_request_scope: ContextVar[_RequestScope] = ContextVar(
+    "bugninja_llm_request_scope", default=("default", "normal")
+)
+# set while a model call holds a slot; e.g. a streaming `_agenerate` calls `_astream`
+_holding_slot: ContextVar[bool] = ContextVar("bugninja_llm_holding_slot", default=False)
+
+
+@dataclass(frozen=True)
+class LLMRateLimits:
+    """Limits of one provider deployment; None leaves a dimension unlimited.
+
+    Attributes:
+        requests_per_minute (Optional[int]): Maximum requests started per minute
+        tokens_per_minute (Optional[int]): Maximum prompt and completion tokens per minute
+        max_in_flight (Optional[int]): Maximum requests running at the same time
+    """
+
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+    @property
+    def is_unlimited(self) -> bool:
+        """Whether no limit is configured at all."""
+        return (
+            self.requests_per_minute is None
+            and self.tokens_per_minute is None
+            and self.max_in_flight is None
+        )
+
+
+def set_llm_request_scope(
+    run_key: str, priority: LLMRequestPriority = "normal"
+) -> Token[_RequestScope]:
+    """Bind the following LLM calls of the current context to a run and priority.
+
+    Args:
+        run_key (str): Run the calls belong to, used for fair queuing
+        priority (LLMRequestPriority): "healing" calls are served before "normal" ones
+
+    Returns:
+        Token: Token to restore the previous scope with `reset_llm_request_scope()`
+    """
+    return _request_scope.set((run_key, priority))
+
+
+def reset_llm_request_scope(token: Token[_RequestScope]) -> None:
+    """Restore the LLM request scope that was active before `set_llm_request_scope()`."""
+    _request_scope.reset(token)
+
+
+@contextmanager
+def llm_request_scope(run_key: str, priority: LLMRequestPriority = "normal") -> Iterator[None]:
+    """Bind the LLM calls made inside the block to a run and priority.
+
+    Args:
+        run_key (str): Run the calls belong to, used for fair queuing
+        priority (LLMRequestPriority): "healing" calls are served before "normal" ones
+    """
+    token = set_llm_request_scope(run_key, priority)
+    try:
+        yield
+    finally:
+        reset_llm_request_scope(token)
+
+
+def estimate_prompt_tokens(messages: List[BaseMessage]) -> int:
+    """Estimate the prompt tokens of a request from the message text and images.
+
+    Args:
+        messages (List[BaseMessage]): Request messages
+
+    Returns:
+        int: Estimated prompt tokens
+    """
+    chars = 0
+    images = 0
+    for message in messages:
+        content = message.content
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content:
+            if isinstance(part, str):
+                chars += len(part)
+            elif part.get("type") == "text":
+                chars += len(str(part.get("text", "")))
+            else:
+                images += 1
+    return chars // CHARS_PER_TOKEN + images * IMAGE_TOKEN_ESTIMATE
+
+
+def _usage_tokens(usage: Any) -> int:
+    if not usage:
+        return 0
+    return int(usage.get("input_tokens", 0)) + int(usage.get("output_tokens", 0))
+
+
+def chat_result_tokens(result: ChatResult) -> Optional[int]:
+    """Get the prompt and completion tokens reported for a chat result.
+
+    Args:
+        result (ChatResult): Result of a chat model generation
+
+    Returns:
+        Optional[int]: Reported tokens, or None if the provider reported no usage
+    """
+    tokens = sum(
+        _usage_tokens(getattr(generation.message, "usage_metadata", None))
+        for generation in result.generations
+    )
+    if not tokens and result.llm_output:
+        token_usage = result.llm_output.get("token_usage") or {}
+        tokens = int(token_usage.get("total_tokens", 0))
+    return tokens or None
+
+
+@dataclass
+class _Waiter:
+    priority: int
+    run_key: str
+    seq: int
+    tokens: int
+    loop: Optional[asyncio.AbstractEventLoop]
+    wakeup: Optional["asyncio.Future[None]"] = None
+
+
+@dataclass
+class LLMRequestSlot:
+    """A granted request of a deployment; set `used_tokens` once the usage is known.
+
+    Attributes:
+        deployment (str): Deployment the request was granted for
+        estimated_tokens (int): Tokens taken from the bucket when the request started
+        waited_ms (float): Time the request waited for the scheduler
+        used_tokens (Optional[int]): Tokens the provider reported for the request
+    """
+
+    deployment: str
+    estimated_tokens: int
+    waited_ms: float
+    used_tokens: Optional[int] = None
+
+
+class _DeploymentScheduler:
+    """Token buckets, in-flight cap and wait queue of one deployment.
+
+    All methods are called with the limiter lock held.
+    """
+
+    def __init__(self, limits: LLMRateLimits) -> None:
+        self.limits = limits
+        self.request_bucket = float(limits.requests_per_minute or 0)
+        self.token_bucket = float(limits.tokens_per_minute or 0)
+        self.in_flight = 0
+        self.waiters: List[_Waiter] = []
+        self.served: Dict[str, int] = {}
+        self._refilled_at = time.monotonic()
+
+        self.total_requests = 0
+        self.waited_requests = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.max_queue_depth = 0
+        self.total_tokens = 0
+
+    def update_limits(self, limits: LLMRateLimits) -> None:
+        self._refill()
+        self.limits = limits
+        if limits.requests_per_minute is not None:
+            self.request_bucket = min(self.request_bucket, limits.requests_per_minute)
+        if limits.tokens_per_minute is not None:
+            self.token_bucket = min(self.token_bucket, limits.tokens_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        rpm, tpm = self.limits.requests_per_minute, self.limits.tokens_per_minute
+        if rpm is not None:
+            self.request_bucket = min(float(rpm), self.request_bucket + elapsed * rpm / 60)
+        if tpm is not None:
+            self.token_bucket = min(float(tpm), self.token_bucket + elapsed * tpm / 60)
+
+    def enqueue(self, waiter: _Waiter) -> None:
+        if waiter.run_key not in self.served:
+            # a run joining late starts level with the runs already waiting
+            waiting = [self.served[w.run_key] for w in self.waiters if w.run_key in self.served]
+            self.served[waiter.run_key] = min(waiting, default=0)
+        self.waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self.waiters))
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        if not self.waiters:
+            return None
+        return min(self.waiters, key=lambda w: (w.priority, self.served.get(w.run_key, 0), w.seq))
+
+    def try_grant(self, waiter: _Waiter) -> Optional[float]:
+        """Grant the request if it is next and fits the limits.
+
+        Returns:
+            Optional[float]: 0 if granted, seconds until the buckets allow it, or None if it
+                has to wait for another request to be granted or released
+        """
+        if self._next_waiter() is not waiter:
+            return None
+        max_in_flight = self.limits.max_in_flight
+        if max_in_flight is not None and self.in_flight >= max_in_flight:
+            return None
+
+        self._refill()
+        delay = 0.0
+        rpm, tpm = self.limits.requests_per_minute, self.limits.tokens_per_minute
+        if rpm is not None and self.request_bucket < 1:
+            delay = max(delay, (1 - self.request_bucket) * 60 / rpm)
+        # requests larger than the whole budget only wait for a full bucket
+        tokens = min(waiter.tokens, tpm) if tpm is not None else waiter.tokens
+        if tpm is not None and self.token_bucket < tokens:
+            delay = max(delay, (tokens - self.token_bucket) * 60 / tpm)
+        if delay > 0:
+            return delay
+
+        if rpm is not None:
+            self.request_bucket -= 1
+        if tpm is not None:
+            self.token_bucket -= tokens
+        self.in_flight += 1
+        self.served[waiter.run_key] = self.served.get(waiter.run_key, 0) + 1
+        self.waiters.remove(waiter)
+        self.total_requests += 1
+        return 0.0
+
+    def settle(self, slot: LLMRequestSlot) -> None:
+        """Finish a request and correct the token bucket by the reported usage."""
+        self.in_flight = max(0, self.in_flight - 1)
+        if slot.used_tokens is None:
+            self.total_tokens += slot.estimated_tokens
+            return
+        self.total_tokens += slot.used_tokens
+        if self.limits.tokens_per_minute is not None:
+            # the bucket may go negative, which delays the following requests
+            self.token_bucket -= slot.used_tokens - slot.estimated_tokens
+
+    def record_wait(self, waited_ms: float) -> None:
+        if waited_ms < _MIN_REPORTED_WAIT_MS:
+            return
+        self.waited_requests += 1
+        self.total_wait_ms += waited_ms
+        self.max_wait_ms = max(self.max_wait_ms, waited_ms)
+
+    def wake_all(self) -> None:
+        for waiter in self.waiters:
+            wakeup = waiter.wakeup
+            if wakeup is not None and waiter.loop is not None and not wakeup.done():
+                waiter.loop.call_soon_threadsafe(_resolve, wakeup)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        avg_wait_ms = self.total_wait_ms / self.waited_requests if self.waited_requests else 0.0
+        return {
+            "requests_per_minute": self.limits.requests_per_minute,
+            "tokens_per_minute": self.limits.tokens_per_minute,
+            "max_in_flight": self.limits.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued_requests": len(self.waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "waited_requests": self.waited_requests,
+            "wait_avg_ms": round(avg_wait_ms),
+            "wait_max_ms": round(self.max_wait_ms),
+        }
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMRateLimiter:
+    """Shared LLM request budget of every deployment used in the process.
+
+    Requests are scheduled under a thread lock and waiters are woken up on their own
+    event loop, so runs on different loops and threads share the same budget.
+
+    Attributes:
+        limits (LLMRateLimits): Limits applied to every deployment
+    """
+
+    _instance: Optional["LLMRateLimiter"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, limits: Optional[LLMRateLimits] = None) -> None:
+        """Initialize the limiter.
+
+        Args:
+            limits (Optional[LLMRateLimits]): Limits applied to every deployment
+        """
+        self.limits = limits or LLMRateLimits()
+        self._lock = threading.Lock()
+        self._schedulers: Dict[str, _DeploymentScheduler] = {}
+        self._seq = itertools.count()
+
+    @classmethod
+    def get_instance(cls) -> "LLMRateLimiter":
+        """Get the rate limiter shared by the whole process.
+
+        Returns:
+            LLMRateLimiter: Process-wide rate limiter
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def configure(self, limits: LLMRateLimits) -> None:
+        """Update the limits of every deployment.
+
+        Args:
+            limits (LLMRateLimits): New limits
+        """
+        with self._lock:
+            self.limits = limits
+            for scheduler in self._schedulers.values():
+                scheduler.update_limits(limits)
+                scheduler.wake_all()
+
+    def _scheduler(self, deployment: str) -> _DeploymentScheduler:
+        scheduler = self._schedulers.get(deployment)
+        if scheduler is None:
+            scheduler = _DeploymentScheduler(self.limits)
+            self._schedulers[deployment] = scheduler
+        return scheduler
+
+    def _new_waiter(
+        self, deployment: str, tokens: int, loop: Optional[asyncio.AbstractEventLoop]
+    ) -> Tuple[_DeploymentScheduler, _Waiter]:
+        run_key, priority = _request_scope.get()
+        waiter = _Waiter(
+            priority=_PRIORITY_ORDER.get(priority, 1),
+            run_key=run_key,
+            seq=next(self._seq),
+            tokens=tokens,
+            loop=loop,
+        )
+        scheduler = self._scheduler(deployment)
+        scheduler.enqueue(waiter)
+        return scheduler, waiter
+
+    def _granted(
+        self, scheduler: _DeploymentScheduler, deployment: str, tokens: int, waited_ms: float
+    ) -> LLMRequestSlot:
+        scheduler.record_wait(waited_ms)
+        # the next request in line may fit now
+        scheduler.wake_all()
+        return LLMRequestSlot(deployment=deployment, estimated_tokens=tokens, waited_ms=waited_ms)
+
+    def _abandon(self, scheduler: _DeploymentScheduler, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter in scheduler.waiters:
+                scheduler.waiters.remove(waiter)
+            scheduler.wake_all()
+
+    async def acquire(self, deployment: str, tokens: int) -> LLMRequestSlot:
+        """Wait until a request of the current run scope may start.
+
+        Args:
+            deployment (str): Deployment the request goes to
+            tokens (int): Estimated tokens of the request
+
+        Returns:
+            LLMRequestSlot: The granted request, to be passed to `release()`
+        """
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        with self._lock:
+            scheduler, waiter = self._new_waiter(deployment, tokens, loop)
+
+        try:
+            while True:
+                with self._lock:
+                    delay = scheduler.try_grant(waiter)
+                    if delay == 0:
+                        waited_ms = (loop.time() - started_at) * 1000
+                        return self._granted(scheduler, deployment, waiter.tokens, waited_ms)
+                    waiter.wakeup = loop.create_future()
+                try:
+                    await asyncio.wait_for(waiter.wakeup, timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(scheduler, waiter)
+            raise
+
+    def acquire_blocking(self, deployment: str, tokens: int) -> LLMRequestSlot:
+        """Blocking variant of `acquire()` for synchronous model calls.
+
+        Args:
+            deployment (str): Deployment the request goes to
+            tokens (int): Estimated tokens of the request
+
+        Returns:
+            LLMRequestSlot: The granted request, to be passed to `release()`
+        """
+        started_at = time.monotonic()
+        with self._lock:
+            scheduler, waiter = self._new_waiter(deployment, tokens, None)
+
+        try:
+            while True:
+                with self._lock:
+                    delay = scheduler.try_grant(waiter)
+                    if delay == 0:
+                        waited_ms = (time.monotonic() - started_at) * 1000
+                        return self._granted(scheduler, deployment, waiter.tokens, waited_ms)
+                time.sleep(min(delay or _BLOCKING_POLL_SECONDS, 1.0))
+        except BaseException:
+            self._abandon(scheduler, waiter)
+            raise
+
+    def release(self, slot: LLMRequestSlot) -> None:
+        """Finish a granted request and let the next waiting request start.
+
+        Args:
+            slot (LLMRequestSlot): The granted request
+        """
+        with self._lock:
+            scheduler = self._scheduler(slot.deployment)
+            scheduler.settle(slot)
+            scheduler.wake_all()
+
+    @asynccontextmanager
+    async def request_slot(self, deployment: str, tokens: int) -> AsyncIterator[LLMRequestSlot]:
+        """Hold a request slot of a deployment for one model call.
+
+        Args:
+            deployment (str): Deployment the request goes to
+            tokens (int): Estimated tokens of the request
+
+        Yields:
+            LLMRequestSlot: The granted request; set `used_tokens` when known
+        """
+        slot = await self.acquire(deployment, tokens)
+        if slot.waited_ms >= _MIN_REPORTED_WAIT_MS:
+            current_span().set(rate_limit_wait_ms=round(slot.waited_ms))
+        holding = _holding_slot.set(True)
+        try:
+            yield slot
+        finally:
+            try:
+                _holding_slot.reset(holding)
+            except ValueError:
+                # a streaming generator closed from another context
+                pass
+            self.release(slot)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get the scheduling metrics of every deployment used so far.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Limits, queue depth, requests, tokens and wait (ms)
+                per deployment
+        """
+        with self._lock:
+            return {name: s.get_metrics() for name, s in self._schedulers.items()}
+
+
+class _RateLimitedChatModelMixin:
+    """Waits for the deployment's scheduler before every generation of a chat model."""
+
+    __slots__ = ()
+    __bugninja_rate_limiter__: LLMRateLimiter
+    __bugninja_deployment__: str
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if _holding_slot.get():
+            return super()._generate(  # type: ignore[misc, no-any-return]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        limiter = type(self).__bugninja_rate_limiter__
+        slot = limiter.acquire_blocking(
+            type(self).__bugninja_deployment__, estimate_prompt_tokens(messages)
+        )
+        token = _holding_slot.set(True)
+        try:
+            result: ChatResult = super()._generate(  # type: ignore[misc]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            slot.used_tokens = chat_result_tokens(result)
+            return result
+        finally:
+            _holding_slot.reset(token)
+            limiter.release(slot)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if _holding_slot.get():
+            return await super()._agenerate(  # type: ignore[misc, no-any-return]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+        limiter = type(self).__bugninja_rate_limiter__
+        async with limiter.request_slot(
+            type(self).__bugninja_deployment__, estimate_prompt_tokens(messages)
+        ) as slot:
+            result: ChatResult = await super()._agenerate(  # type: ignore[misc]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            )
+            slot.used_tokens = chat_result_tokens(result)
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        if _holding_slot.get():
+            async for chunk in super()._astream(  # type: ignore[misc]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            ):
+                yield chunk
+            return
+        limiter = type(self).__bugninja_rate_limiter__
+        async with limiter.request_slot(
+            type(self).__bugninja_deployment__, estimate_prompt_tokens(messages)
+        ) as slot:
+            used_tokens = 0
+            async for chunk in super()._astream(  # type: ignore[misc]
+                messages, stop=stop, run_manager=run_manager, **kwargs
+            ):
+                used_tokens += _usage_tokens(getattr(chunk.message, "usage_metadata", None))
+                yield chunk
+            slot.used_tokens = used_tokens or None
+
+
+def rate_limited_model_class(
+    model_class: Type[BaseChatModel], limiter: LLMRateLimiter, deployment: str
+) -> Type[BaseChatModel]:
+    """Create a subclass of a chat model class that waits for the rate limiter.
+
+    The subclass keeps the original class name, so code that inspects the model class
+    (e.g. browser-use choosing a tool calling method) behaves exactly as without limiter.
+
+    Args:
+        model_class (Type[BaseChatModel]): LangChain chat model class to wrap
+        limiter (LLMRateLimiter): Rate limiter the model waits for
+        deployment (str): Deployment key the model's requests are counted against
+
+    Returns:
+        Type[BaseChatModel]: The wrapped model class
+    """
+    return type(
+        model_class.__name__,
+        (_RateLimitedChatModelMixin, model_class),
+        {
+            "__module__": model_class.__module__,
+            "__bugninja_rate_limiter__": limiter,
+            "__bugninja_deployment__": deployment,
+        },
+    )
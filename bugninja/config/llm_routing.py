@@ -0,0 +1,413 @@
+"""
+Tiered LLM routing with escalation for agent steps.
+
+Most agent steps ("click the obvious button") are handled well by a fast, cheap model.
+With a routing policy the configured model is the primary tier and a stronger escalation
+model takes over the steps that need it: after an invalid or empty model output, after
+repeated step failures, and for whole agents (e.g. the healer) or page data extraction.
+
+Every model call of an agent is recorded per model (calls, errors, latency, tokens), so
+the effect of a policy shows up in the run result.
+
+## Key Components
+
+1. **LLMRoutingConfig** - Routing policy (escalation model and escalation triggers)
+2. **LLMRouter** - Per-agent model selection and escalation bookkeeping
+3. **LLMUsageRecorder** - LangChain callback recording calls, latency and tokens per model
+4. **LLMUsageStats** - Usage counters of one model
+
+## Usage Examples
+
+```toml
+# task.toml
+[run_config.llm_routing]
+escalation_model = "gpt-4o"              # primary tier is the configured model
+escalate_after_failures = 1
+escalate_on_invalid_output = true
+escalate_agents = ["healer", "extraction"]
+```
+
+```python
+from bugninja.config.llm_routing import LLMRoutingConfig
+from bugninja.schemas.models import BugninjaConfig
+
+config = BugninjaConfig(
+    llm_routing=LLMRoutingConfig(escalation_model="gpt-4o", escalate_after_failures=2)
+)
+```
+"""
+
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import LLMResult
+from pydantic import BaseModel, Field
+
+from bugninja.config.llm_prompt_cache import cached_input_tokens
+from bugninja.utils.logging_config import logger
+
+#! roles that can be routed to the escalation model as a whole
+RoutingRole = Literal["navigator", "healer", "extraction"]
+
+
+def _default_escalate_agents() -> List[RoutingRole]:
+    return ["healer"]
+
+
+class LLMRoutingConfig(BaseModel):
+    """Routing policy between the configured model and a stronger escalation model.
+
+    Attributes:
+        escalation_model (str): Model used for escalated calls
+        escalation_provider (Optional[str]): Provider of the escalation model; defaults to
+            the provider of the run
+        escalate_on_invalid_output (bool): Retry an unparsable or empty model output on
+            the escalation model (default: True)
+        escalate_after_failures (int): Use the escalation model once this many steps in a
+            row failed; 0 disables the trigger (default: 1)
+        escalate_agents (List[RoutingRole]): Agents and tasks that always use the escalation
+            model (default: ["healer"])
+
+    Example:
+        ```python
+        from bugninja.config.llm_routing import LLMRoutingConfig
+
+        # fast primary model, escalate healing and every failed step
+        routing = LLMRoutingConfig(escalation_model="gpt-4o")
+        ```
+    """
+
+    escalation_model: str = Field(description="Model used for escalated calls")
+    escalation_provider: Optional[str] = Field(
+        default=None, description="Provider of the escalation model (defaults to the run's)"
+    )
+    escalate_on_invalid_output: bool = Field(
+        default=True, description="Retry invalid or empty outputs on the escalation model"
+    )
+    escalate_after_failures: int = Field(
+        default=1, ge=0, description="Consecutive step failures before escalating (0 = never)"
+    )
+    escalate_agents: List[RoutingRole] = Field(
+        default_factory=_default_escalate_agents,
+        description="Agents and tasks that always use the escalation model",
+    )
+
+
+def get_model_name(llm: BaseChatModel) -> str:
+    """Get a readable model name of a LangChain chat model.
+
+    Args:
+        llm (BaseChatModel): Chat model
+
+    Returns:
+        str: Model or deployment name, or the class name if neither is set
+    """
+    for attribute in ("model_name", "model", "deployment_name"):
+        value = getattr(llm, attribute, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(llm).__name__
+
+
+@dataclass
+class LLMUsageStats:
+    """Usage counters of one model.
+
+    Attributes:
+        calls (int): Completed calls
+        errors (int): Failed calls
+        total_latency_ms (float): Summed latency of completed and failed calls
+        input_tokens (int): Prompt tokens reported by the provider
+        cached_input_tokens (int): Prompt tokens read from the provider's prompt cache
+        output_tokens (int): Completion tokens reported by the provider
+    """
+
+    calls: int = 0
+    errors: int = 0
+    total_latency_ms: float = 0.0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a result dictionary with the average latency."""
+        data = asdict(self)
+        data["total_latency_ms"] = round(self.total_latency_ms, 1)
+        finished = self.calls + self.errors
+        data["avg_latency_ms"] = round(self.total_latency_ms / finished, 1) if finished else 0.0
+        return data
+
+
+class LLMUsageRecorder(BaseCallbackHandler):
+    """LangChain callback that records calls, latency and tokens per model.
+
+    The recorder is attached to the chat models of an agent, so every call is counted,
+    including structured output, retries and page data extraction.
+
+    Attributes:
+        stats (Dict[str, LLMUsageStats]): Usage counters per model name
+    """
+
+    def __init__(self) -> None:
+        """Initialize the recorder."""
+        self.stats: Dict[str, LLMUsageStats] = {}
+        self._started: Dict[UUID, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, llm: BaseChatModel) -> None:
+        """Record the calls of a chat model.
+
+        Args:
+            llm (BaseChatModel): Chat model to record
+        """
+        callbacks = llm.callbacks
+        if callbacks is None:
+            llm.callbacks = [self]
+        elif isinstance(callbacks, list):
+            if self not in callbacks:
+                callbacks.append(self)
+        else:
+            # callback manager
+            callbacks.add_handler(self, inherit=False)
+
+    def _start(self, serialized: Optional[Dict[str, Any]], run_id: UUID, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model_name = (
+            params.get("model_name")
+            or params.get("model")
+            or params.get("deployment_name")
+            or (serialized or {}).get("name")
+            or "unknown"
+        )
+        with self._lock:
+            self._started[run_id] = (str(model_name), time.perf_counter())
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._start(serialized, run_id, **kwargs)
+
+    def on_llm_start(
+        self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._start(serialized, run_id, **kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        input_tokens = cached_tokens = output_tokens = 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    input_tokens += usage.get("input_tokens", 0)
+                    cached_tokens += cached_input_tokens(usage)
+                    output_tokens += usage.get("output_tokens", 0)
+        if not (input_tokens or output_tokens) and response.llm_output:
+            token_usage = response.llm_output.get("token_usage") or {}
+            input_tokens = token_usage.get("prompt_tokens", 0)
+            cached_tokens = cached_input_tokens(None, token_usage)
+            output_tokens = token_usage.get("completion_tokens", 0)
+
+        with self._lock:
+            stats = self._finish(run_id)
+            if stats is not None:
+                stats.calls += 1
+                stats.input_tokens += input_tokens
+                stats.cached_input_tokens += cached_tokens
+                stats.output_tokens += output_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            stats = self._finish(run_id)
+            if stats is not None:
+                stats.errors += 1
+
+    def _finish(self, run_id: UUID) -> Optional[LLMUsageStats]:
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return None
+        model_name, start_time = started
+        stats = self.stats.setdefault(model_name, LLMUsageStats())
+        stats.total_latency_ms += (time.perf_counter() - start_time) * 1000
+        return stats
+
+    def input_token_totals(self) -> Tuple[int, int]:
+        """Prompt tokens and cached prompt tokens of all recorded calls.
+
+        Returns:
+            Tuple[int, int]: Input tokens and the part of them read from the prompt cache
+        """
+        with self._lock:
+            return (
+                sum(stats.input_tokens for stats in self.stats.values()),
+                sum(stats.cached_input_tokens for stats in self.stats.values()),
+            )
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Usage counters per model as a result dictionary."""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+
+class LLMRouter:
+    """Chooses between the primary and the escalation model for an agent's calls.
+
+    Without a routing policy the router only records usage; the agent then always uses
+    its primary model.
+
+    Attributes:
+        primary_llm (BaseChatModel): Model of the primary tier
+        config (Optional[LLMRoutingConfig]): Routing policy
+        role (RoutingRole): Role of the agent the router belongs to
+        usage (LLMUsageRecorder): Usage counters of all models of the agent
+        escalations (List[Dict[str, Any]]): Step and reason of every escalated call
+    """
+
+    def __init__(
+        self,
+        primary_llm: BaseChatModel,
+        config: Optional[LLMRoutingConfig],
+        role: RoutingRole,
+        temperature: float = 0.0,
+        cli_mode: bool = False,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            primary_llm (BaseChatModel): Model of the primary tier
+            config (Optional[LLMRoutingConfig]): Routing policy, None to only record usage
+            role (RoutingRole): Role of the agent the router belongs to
+            temperature (float): Temperature of the escalation model
+            cli_mode (bool): Whether the run uses the CLI (TOML) configuration
+        """
+        self.primary_llm = primary_llm
+        self.config = config
+        self.role = role
+        self.usage = LLMUsageRecorder()
+        self.escalations: List[Dict[str, Any]] = []
+        self._temperature = temperature
+        self._cli_mode = cli_mode
+        self._escalation_llm: Optional[BaseChatModel] = None
+        self._pending_reason: Optional[str] = None
+
+        self.usage.attach(primary_llm)
+
+    @property
+    def escalates_on_invalid_output(self) -> bool:
+        """Whether invalid model outputs are retried on the escalation model."""
+        return self.config is not None and self.config.escalate_on_invalid_output
+
+    def routes_role(self, role: RoutingRole) -> bool:
+        """Whether an agent or task role always uses the escalation model.
+
+        Args:
+            role (RoutingRole): Agent or task role
+
+        Returns:
+            bool: True if the policy escalates the role as a whole
+        """
+        return self.config is not None and role in self.config.escalate_agents
+
+    @property
+    def escalation_llm(self) -> BaseChatModel:
+        """The escalation model, created on first use.
+
+        Raises:
+            ValueError: If no routing policy is configured
+        """
+        if self.config is None:
+            raise ValueError("No LLM routing policy configured")
+        if self._escalation_llm is None:
+            from bugninja.config.llm_config import LLMConfig
+            from bugninja.config.llm_creator import (
+                create_llm_config_from_settings,
+                create_llm_model_from_config,
+            )
+            from bugninja.config.settings import LLMProvider
+
+            provider = (
+                LLMProvider(self.config.escalation_provider)
+                if self.config.escalation_provider
+                else create_llm_config_from_settings(cli_mode=self._cli_mode).provider
+            )
+            llm_config = LLMConfig(
+                provider=provider,
+                model=self.config.escalation_model,
+                temperature=self._temperature,
+            )
+            self._escalation_llm = create_llm_model_from_config(llm_config, cli_mode=self._cli_mode)
+            self.usage.attach(self._escalation_llm)
+            logger.bugninja_log(
+                f"🪜 Escalation model ready: {llm_config.provider.value} - {llm_config.model}"
+            )
+        return self._escalation_llm
+
+    def extraction_llm(self, default_llm: BaseChatModel) -> BaseChatModel:
+        """Get the model for page and output data extraction and record its usage.
+
+        Args:
+            default_llm (BaseChatModel): Model the extraction would use without routing
+
+        Returns:
+            BaseChatModel: The escalation model if extraction is escalated, otherwise
+                `default_llm`
+        """
+        llm = self.escalation_llm if self.routes_role("extraction") else default_llm
+        self.usage.attach(llm)
+        return llm
+
+    def request_escalation(self, reason: str) -> None:
+        """Use the escalation model for the next call, if the policy allows it.
+
+        Args:
+            reason (str): Why the next call is escalated
+        """
+        if self.escalates_on_invalid_output:
+            self._pending_reason = reason
+
+    def escalation_reason(self, consecutive_failures: int) -> Optional[str]:
+        """Decide whether the next call goes to the escalation model.
+
+        Args:
+            consecutive_failures (int): Failed steps in a row of the agent
+
+        Returns:
+            Optional[str]: Reason for escalating, or None to use the primary model
+        """
+        if self.config is None:
+            return None
+
+        reason, self._pending_reason = self._pending_reason, None
+        if reason is not None:
+            return reason
+        if self.routes_role(self.role):
+            return f"{self.role} agent"
+        threshold = self.config.escalate_after_failures
+        if threshold and consecutive_failures >= threshold:
+            return f"{consecutive_failures} consecutive failures"
+        return None
+
+    def record_escalation(self, step: int, reason: str) -> None:
+        """Record an escalated call.
+
+        Args:
+            step (int): Agent step the call belongs to
+            reason (str): Why the call was escalated
+        """
+        self.escalations.append(
+            {"step": step, "reason": reason, "model": get_model_name(self.escalation_llm)}
+        )
+        logger.bugninja_log(f"🪜 Step {step}: escalating to the stronger model ({reason})")
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-model usage and the escalations of the agent, for the run result."""
+        return {
+            "primary_model": get_model_name(self.primary_llm),
+            "escalation_model": self.config.escalation_model if self.config else None,
+            "models": self.usage.to_dict(),
+            "escalations": list(self.escalations),
+        }
@@ -8,7 +8,7 @@ and default values for all Bugninja components.
 
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -100,6 +100,31 @@ class BugninjaSettings(BaseSettings):
         default="http://localhost:11434", description="Ollama base URL (from TOML or env)"
     )
 
+    # LLM Cassette Configuration (from TOML or env)
+    llm_cassette_mode: Literal["off", "record", "replay"] = Field(
+        default="off", description="Record LLM responses to, or replay them from, a cassette"
+    )
+    llm_cassette_path: Path = Field(
+        default=Path("./cassettes/llm_cassette.jsonl"), description="LLM cassette file"
+    )
+    llm_cassette_match: Literal["strict", "lenient"] = Field(
+        default="strict", description="Request matching when replaying the LLM cassette"
+    )
+    llm_cassette_miss_policy: Literal["error", "passthrough", "record"] = Field(
+        default="error", description="What to do when a replayed request is not on the cassette"
+    )
+
+    # LLM Rate Limit Configuration (from TOML or env), shared by all runs of the process
+    llm_rate_limit_requests_per_minute: Optional[int] = Field(
+        default=None, ge=1, description="Maximum LLM requests per minute and deployment"
+    )
+    llm_rate_limit_tokens_per_minute: Optional[int] = Field(
+        default=None, ge=1, description="Maximum LLM tokens per minute and deployment"
+    )
+    llm_rate_limit_max_in_flight: Optional[int] = Field(
+        default=None, ge=1, description="Maximum concurrent LLM requests per deployment"
+    )
+
     # Event Publisher Configuration (from TOML)
     event_publishers: List[EventPublisherType] = Field(
         default=[EventPublisherType.NULL], description="List of event publisher types to use"
@@ -161,6 +186,39 @@ class BugninjaSettings(BaseSettings):
         description="Replicator configuration settings",
     )
 
+    # Artifact Store Configuration (from TOML)
+    artifacts_enabled: bool = Field(
+        default=False, description="Store screenshots in the shared content-addressed store"
+    )
+    artifacts_perceptual_hash: bool = Field(
+        default=False, description="Deduplicate near-identical screenshots by perceptual hash"
+    )
+    artifacts_perceptual_hash_threshold: int = Field(
+        default=0, ge=0, le=64, description="Maximum perceptual hash Hamming distance"
+    )
+
+    # Video Encoder Configuration (from TOML)
+    video_max_concurrent_encoders: Optional[int] = Field(
+        default=None, ge=1, description="Process-wide cap on concurrent FFmpeg encoders"
+    )
+    video_fast_preset: str = Field(
+        default="veryfast", description="FFmpeg preset used while all encoders are busy"
+    )
+
+    # Retention Configuration (from TOML)
+    retention_keep_last_runs: Optional[int] = Field(
+        default=None, ge=1, description="Number of most recent runs to keep per task"
+    )
+    retention_keep_failed_days: Optional[float] = Field(
+        default=None, ge=0, description="Days to keep failed runs regardless of keep_last_runs"
+    )
+    retention_compact: bool = Field(
+        default=False, description="Compact expired runs into a per-task tar.zst archive"
+    )
+    retention_auto_gc: bool = Field(
+        default=False, description="Apply retention policies in the background after each run"
+    )
+
     # Jira Configuration (from TOML and .env)
     jira_server: Optional[str] = Field(
         default=None, alias="JIRA_SERVER", description="Jira server base URL"
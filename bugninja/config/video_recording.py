@@ -7,7 +7,7 @@ encoding parameters.
 """
 
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -31,7 +31,42 @@ class VideoRecordingConfig(BaseModel):
         bitrate (str): Target bitrate for video encoding (default: "25M")
         pixel_format (str): Output pixel format (default: "yuv420p")
         max_queue_size (int): Maximum frame queue size (default: 200)
+        ingest_mode (Literal["jpeg", "raw"]): How screencast frames reach FFmpeg. "raw" decodes
+            and resizes every frame to bgr24 and encodes it live at a constant `fps`; "jpeg"
+            spools the original JPEG bytes to disk and encodes them when the recording stops,
+            timed by their CDP timestamps (default: "raw")
         output_dir (str): Directory for output video files (default: "./screen_recordings")
+        reuse_frames_for_screenshots (bool): Use the latest screencast frame as the action
+            screenshot instead of capturing a separate one. The screencast is then requested
+            at the full viewport resolution and JPEG quality 100; the video is still scaled
+            to `width`/`height`. A frame is only reused while the screencast runs at its full
+            rate and no newer frame is being processed (default: False)
+        screenshot_frame_max_age_ms (int): Maximum age of a screencast frame, relative to the
+            action timestamp, for it to be reused as a screenshot (default: 500)
+        mode (Literal["always", "on_failure"]): "always" encodes every run; "on_failure" keeps
+            a rolling in-memory buffer of screencast JPEGs and only encodes it when the run
+            fails, healing starts or the run is marked for keep (default: "always")
+        buffer_seconds (float): Length of the rolling buffer in "on_failure" mode (default: 60)
+        buffer_max_mb (int): Memory cap of the rolling buffer in "on_failure" mode (default: 256)
+        dedup_frames (Literal["off", "hash", "diff"]): How unchanged screencast frames are
+            detected and skipped. "hash" compares the JPEG payloads, "diff" compares 1/8 scale
+            grayscale decodes against `dedup_diff_threshold` (default: "hash")
+        dedup_diff_threshold (float): Mean absolute pixel difference (0-255) under which a
+            frame counts as unchanged in "diff" mode (default: 1.0)
+        idle_every_nth_frame (int): `everyNthFrame` used for the screencast while the page is
+            idle; 1 keeps the full rate (default: 1)
+        idle_after_ms (int): How long only unchanged frames must arrive before the page is
+            considered idle (default: 2000)
+        max_concurrent_encoders (Optional[int]): Process-wide cap on FFmpeg processes; None
+            keeps the current cap, which is unlimited unless configured (default: None)
+        fast_preset (Optional[str]): Preset used while every encoder slot is busy; None keeps
+            the current one, which defaults to "veryfast" (default: None)
+        keyframe_interval (Optional[float]): Seconds between forced keyframes in live
+            encodes, so action clips can be cut close to their start; None keeps the
+            encoder's own keyframe spacing. Buffered and spooled encodes place keyframes
+            exactly at action starts instead. Only applies with `clip_index` (default: None)
+        clip_index (bool): Write a `<video>.index.json` sidecar mapping actions to seekable
+            clips (default: True)
 
     Example:
         ```python
@@ -62,7 +97,47 @@ class VideoRecordingConfig(BaseModel):
     bitrate: str = Field(default="25M", description="Target bitrate")
     pixel_format: str = Field(default="yuv420p", description="Output pixel format")
     max_queue_size: int = Field(default=200, description="Frame queue size")
+    ingest_mode: Literal["jpeg", "raw"] = Field(
+        default="raw", description="Frame ingest mode for FFmpeg"
+    )
     output_dir: str = Field(default="./videos", description="Output directory")
+    reuse_frames_for_screenshots: bool = Field(
+        default=False, description="Reuse screencast frames as action screenshots"
+    )
+    screenshot_frame_max_age_ms: int = Field(
+        default=500, ge=0, description="Maximum age of a reused screencast frame"
+    )
+    mode: Literal["always", "on_failure"] = Field(
+        default="always", description="Encode every run or only failed/healed runs"
+    )
+    buffer_seconds: float = Field(
+        default=60.0, gt=0, description="Rolling frame buffer length in on_failure mode"
+    )
+    buffer_max_mb: int = Field(
+        default=256, ge=1, description="Rolling frame buffer memory cap in on_failure mode"
+    )
+    dedup_frames: Literal["off", "hash", "diff"] = Field(
+        default="hash", description="Unchanged frame detection"
+    )
+    dedup_diff_threshold: float = Field(
+        default=1.0, ge=0, description="Mean pixel difference of an unchanged frame"
+    )
+    idle_every_nth_frame: int = Field(
+        default=1, ge=1, description="Screencast everyNthFrame while the page is idle"
+    )
+    idle_after_ms: int = Field(
+        default=2000, ge=0, description="Unchanged-frame time before the page counts as idle"
+    )
+    max_concurrent_encoders: Optional[int] = Field(
+        default=None, ge=1, description="Process-wide FFmpeg process cap"
+    )
+    fast_preset: Optional[str] = Field(
+        default=None, description="FFmpeg preset used while all encoders are busy"
+    )
+    keyframe_interval: Optional[float] = Field(
+        default=None, gt=0, description="Seconds between forced keyframes in live encodes"
+    )
+    clip_index: bool = Field(default=True, description="Write a per-action clip index")
 
     @classmethod
     def with_base_dir(cls, base_dir: Path, **kwargs: Dict[str, Any]) -> "VideoRecordingConfig":
@@ -36,16 +36,20 @@ from .prompt_factory import (
     BUGNINJA_INITIAL_NAVIGATROR_SYSTEM_PROMPT,
     HEALDER_AGENT_EXTRA_SYSTEM_PROMPT,
     get_extra_instructions_related_prompt,
+    get_failed_action_prompt,
     get_passed_brainstates_related_prompt,
     get_io_extraction_prompt,
     get_input_schema_prompt,
+    get_task_prompt,
 )
 
 __all__ = [
     "get_extra_instructions_related_prompt",
     "get_passed_brainstates_related_prompt",
+    "get_failed_action_prompt",
     "get_io_extraction_prompt",
     "get_input_schema_prompt",
+    "get_task_prompt",
     "BUGNINJA_INITIAL_NAVIGATROR_SYSTEM_PROMPT",
     "HEALDER_AGENT_EXTRA_SYSTEM_PROMPT",
 ]
@@ -11,6 +11,18 @@ and development file system access for prompt templates.
 2. **__parsed_prompt()** - Parse prompt with variable substitution
 3. **get_extra_instructions_related_prompt()** - Generate extra instructions prompt
 4. **get_passed_brainstates_related_prompt()** - Generate brain states prompt
+5. **get_failed_action_prompt()** - Generate the failed replay action prompt of a healer
+6. **get_task_prompt()** - Assemble the task message of an agent from its context prompts
+
+## Prompt Layout
+
+Providers cache the longest prompt prefix they have seen before, so agent prompts are laid
+out from the most to the least stable part:
+
+1. System message - the same for every task of an agent type
+2. Task message - the task and its context (instructions, input data, files)
+3. History - grows by appending only
+4. Step suffix - page specific actions and the browser state of the current step
 
 ## Template Variables
 
@@ -39,10 +51,13 @@ brain_states_prompt = get_passed_brainstates_related_prompt(completed_brain_stat
 import importlib.resources
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from bugninja.schemas.models import FileUploadInfo
-from bugninja.schemas.pipeline import BugninjaBrainState
+from bugninja.schemas.pipeline import BugninjaBrainState, BugninjaExtendedAction
+
+#! characters of a goal or progress bullet of a summarized brain state
+MAX_BRAINSTATE_SUMMARY_FIELD_LENGTH: int = 200
 
 
 def __get_raw_prompt(prompt_markdown_name: str) -> str:
@@ -140,36 +155,154 @@ def get_extra_instructions_related_prompt(extra_instruction_list: List[str]) ->
     )
 
 
-def get_passed_brainstates_related_prompt(completed_brain_states: List[BugninjaBrainState]) -> str:
+def __short_brainstate_field(text: str) -> str:
+    """Collapse the whitespace of a brain state field and cut it to a bullet's length."""
+    text = " ".join(str(text).split())
+    if len(text) <= MAX_BRAINSTATE_SUMMARY_FIELD_LENGTH:
+        return text
+    return text[: MAX_BRAINSTATE_SUMMARY_FIELD_LENGTH - 3] + "..."
+
+
+def get_passed_brainstates_related_prompt(
+    completed_brain_states: List[BugninjaBrainState], keep_verbatim: Optional[int] = None
+) -> str:
     """Generate brain states prompt from completed brain states.
 
+    The last `keep_verbatim` brain states are included as they are, the older ones only as
+    goal/progress bullets: the goal of a state and the evaluation of that goal, which the
+    model wrote in the following state.
+
     Args:
         completed_brain_states (List[BugninjaBrainState]): List of completed brain states
+        keep_verbatim (Optional[int]): Number of last brain states included verbatim, None
+            includes all of them
 
     Returns:
         str: Formatted prompt with brain states, or empty string if list is empty
 
     Example:
         ```python
-        prompt = get_passed_brainstates_related_prompt(completed_brain_states)
+        prompt = get_passed_brainstates_related_prompt(completed_brain_states, keep_verbatim=3)
         ```
     """
     if not completed_brain_states:
         return ""
 
+    split_at = 0
+    if keep_verbatim is not None:
+        split_at = max(len(completed_brain_states) - max(keep_verbatim, 1), 0)
+
+    earlier_brain_states = ""
+    if split_at:
+        # the progress towards a goal is the evaluation written in the following state
+        bullets = [
+            f"- Goal: {__short_brainstate_field(cbs.next_goal)} | Progress: "
+            f"{__short_brainstate_field(following.evaluation_previous_goal)}"
+            for cbs, following in zip(
+                completed_brain_states[:split_at], completed_brain_states[1 : split_at + 1]
+            )
+        ]
+        earlier_brain_states = (
+            f"\nThe first {split_at} states, summarized:\n"
+            + "\n".join(bullets)
+            + "\n\nThe most recent states:\n"
+        )
+
     return __parsed_prompt(
         "healer_agent_passed_brainstates_prompt.md",
         {
+            "EARLIER_BRAIN_STATES": earlier_brain_states,
             "COMPLETED_BRAIN_STATES": "\n\n".join(
                 [
                     json.dumps(cbs.model_dump(exclude={"id"}), indent=4, ensure_ascii=False)
-                    for cbs in completed_brain_states
+                    for cbs in completed_brain_states[split_at:]
                 ]
-            )
+            ),
+        },
+    )
+
+
+def get_failed_action_prompt(
+    failed_action: BugninjaExtendedAction,
+    tried_selectors: Optional[List[str]] = None,
+    failure_reason: Optional[str] = None,
+) -> str:
+    """Generate the prompt describing the replayed action a healer takes over from.
+
+    Args:
+        failed_action (BugninjaExtendedAction): Recorded action whose replay failed
+        tried_selectors (Optional[List[str]]): Selectors the replay tried for the action
+        failure_reason (Optional[str]): Error of the failed replay
+
+    Returns:
+        str: Formatted prompt with the action, its recorded element and the tried selectors
+
+    Example:
+        ```python
+        prompt = get_failed_action_prompt(
+            failed_action,
+            tried_selectors=["xpath: //button[@id='login']"],
+            failure_reason="Timeout 5000ms exceeded",
+        )
+        ```
+    """
+    dom_element_data = {
+        k: v
+        for k, v in (failed_action.dom_element_data or {}).items()
+        if k != "alternative_relative_xpaths"
+    }
+
+    return __parsed_prompt(
+        "healer_agent_failed_action_prompt.md",
+        {
+            "FAILED_ACTION": json.dumps(
+                {k: v for k, v in failed_action.action.items() if v is not None},
+                indent=4,
+                ensure_ascii=False,
+            ),
+            "DOM_ELEMENT_DATA": (
+                json.dumps(dom_element_data, indent=4, ensure_ascii=False)
+                if dom_element_data
+                else "No element recorded"
+            ),
+            "TRIED_SELECTORS": (
+                "\n- " + "\n- ".join(tried_selectors) if tried_selectors else "\n- None"
+            ),
+            "FAILURE_REASON": failure_reason or "Unknown",
         },
     )
 
 
+def get_task_prompt(task: str, context_prompts: Optional[List[Optional[str]]] = None) -> str:
+    """Assemble the task message of an agent from the task and its context prompts.
+
+    Task specific prompts belong here instead of the system message, which then stays the
+    same for every task and can be served from the provider's prompt cache. Context prompts
+    should be passed from the most to the least stable one.
+
+    Args:
+        task (str): Task description
+        context_prompts (Optional[List[Optional[str]]]): Prompts appended to the task; empty
+            ones are skipped
+
+    Returns:
+        str: Task with its context prompts
+
+    Example:
+        ```python
+        prompt = get_task_prompt(
+            "Log in and open the settings",
+            [get_extra_instructions_related_prompt(["Be careful with forms"])],
+        )
+        ```
+    """
+    sections = [task.strip()]
+    for prompt in context_prompts or []:
+        if prompt and prompt.strip():
+            sections.append(prompt.strip())
+    return "\n\n".join(sections)
+
+
 def get_test_case_analyzer_user_prompt(
     file_contents: Dict[str, str], project_description: str, extra: str = ""
 ) -> str:
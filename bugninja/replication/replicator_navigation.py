@@ -55,6 +55,7 @@ from pydantic import Field
 from bugninja.replication.errors import ActionError, ReplicatorError, SelectorError
 from bugninja.schemas.pipeline import BugninjaExtendedAction, Traversal
 from bugninja.utils.logging_config import logger
+from bugninja.utils.tracing import current_span
 
 
 def get_user_input() -> str:
@@ -207,6 +208,8 @@ class ReplicatorNavigator(ABC):
         self.brain_states: Dict[str, AgentBrain] = self.replay_traversal.brain_states
         self.fail_on_unimplemented_action = fail_on_unimplemented_action
         self.sleep_after_actions = sleep_after_actions
+        #! selectors of the last selector fallback that failed for every selector, for healing
+        self.failed_selectors: List[str] = []
 
         # Generate run_id for browser isolation
         self.run_id = CUID().generate()
@@ -364,6 +367,10 @@ class ReplicatorNavigator(ABC):
         logger.bugninja_log("❌ Tab close requested")
         await self.__handle_not_implemented_action("Tab closing")
 
+    async def _handle_request_screenshot(self) -> None:
+        """Handle a screenshot request of the agent (only affects the agent's prompt)."""
+        logger.bugninja_log("📷 Screenshot request skipped during replay")
+
     async def _handle_get_ax_tree(self) -> None:
         """Handle getting accessibility tree."""
         logger.bugninja_log("🌳 Accessibility tree requested")
@@ -672,6 +679,7 @@ class ReplicatorNavigator(ABC):
         Raises:
             ActionError: If the action fails after trying all selectors
         """
+        self.failed_selectors = []
         if not element_info:
             raise ActionError("No element information provided")
 
@@ -681,7 +689,7 @@ class ReplicatorNavigator(ABC):
         )
 
         last_error = None
-        for selector_type, selector in selectors:
+        for selector_index, (selector_type, selector) in enumerate(selectors):
             logger.bugninja_log(f"🔄 Trying {selector_type} selector: {selector}")
             success, error = await self._try_selector(
                 self.current_page, selector, action_type, **(action_kwargs or {})
@@ -691,16 +699,22 @@ class ReplicatorNavigator(ABC):
                 logger.bugninja_log(
                     f"✅ Successfully {action_type}ed element using {selector_type} selector"
                 )
+                current_span().set(
+                    selector_index=selector_index,
+                    selector_type=selector_type,
+                    selector_count=len(selectors),
+                )
                 return
 
             last_error = error
             logger.warning(f"⚠️ Selector failed: {error}")
 
         # If we get here, all selectors failed
-        failed_selectors = [f"{type}: {sel}" for type, sel in selectors]
+        current_span().set(selector_index=None, selector_count=len(selectors))
+        self.failed_selectors = [f"{type}: {sel}" for type, sel in selectors]
         error_msg = (
             f"Failed to {action_type} element. "
-            f"Tried selectors: {', '.join(failed_selectors)}. "
+            f"Tried selectors: {', '.join(self.failed_selectors)}. "
             f"Last error: {last_error}"
         )
         raise ActionError(error_msg)
@@ -837,6 +851,7 @@ class ReplicatorNavigator(ABC):
             "done": self._handle_done,
             # Additional traversal-parity actions
             "third_party_authentication_wait": self._handle_third_party_authentication_wait,
+            "request_screenshot": self._handle_request_screenshot,
             "close_overlay": self._handle_close_overlay,
             "hover_direct": lambda: self._handle_hover(element_info=element_info),
             # Scrolling variants
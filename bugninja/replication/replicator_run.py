@@ -18,17 +18,13 @@ boundaries.
 """
 
 import asyncio
-import base64
 import json
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import cv2
-import numpy as np
 from cuid2 import Cuid as CUID
 from patchright.async_api import Page  # type: ignore
-from playwright.async_api import CDPSession
 from rich import print as rich_print
 
 from bugninja.agents.healer_agent import HealerAgent
@@ -51,8 +47,10 @@ from bugninja.schemas.pipeline import (
     ReplayWithHealingStateMachine,
     Traversal,
 )
+from bugninja.utils.artifact_store import ArtifactStore
 from bugninja.utils.logging_config import logger
 from bugninja.utils.screenshot_manager import ScreenshotManager
+from bugninja.utils.tracing import NoopSpan, Span, run_trace, trace_span
 from bugninja.utils.video_recording_manager import VideoRecordingManager
 
 
@@ -172,6 +170,8 @@ class ReplicatorRun(ReplicatorNavigator):
         self.retry_delay = 0.5
 
         self.healing_happened = False
+        # per-model LLM usage, escalations and hedging of the healer agent, if healing started
+        self.healing_llm_usage: Optional[Dict[str, Any]] = None
         self._traversal: Optional[Traversal] = None  # Store traversal after successful run
 
         self.pause_after_each_step = pause_after_each_step
@@ -198,7 +198,13 @@ class ReplicatorRun(ReplicatorNavigator):
 
         # Initialize screenshot manager with base directory
         self.screenshot_manager = ScreenshotManager(
-            run_id=self.run_id, base_dir=self.output_base_dir
+            run_id=self.run_id,
+            base_dir=self.output_base_dir,
+            artifact_store=(
+                ArtifactStore.from_config(self.config.artifact_store)
+                if self.config.artifact_store
+                else None
+            ),
         )
 
         # Initialize video recording manager if enabled
@@ -265,10 +271,33 @@ class ReplicatorRun(ReplicatorNavigator):
             # Continue anyway to avoid blocking the process
             logger.bugninja_log("▶️ Continuing to next step...")
 
+    async def start(self) -> None:
+        """Start the replication, traced into its own trace file if tracing is enabled."""
+        trace_file: Optional[Path] = None
+        if self.config.enable_tracing:
+            traces_dir = (
+                self.output_base_dir / "traces"
+                if self.output_base_dir
+                else self.config.get_effective_traces_dir()
+            )
+            trace_file = traces_dir / f"{self.run_id}.trace.json"
+
+        with (
+            run_trace(self.run_id, trace_file),
+            trace_span(
+                "replay_run", "replay", run_id=self.run_id, healing_enabled=self.enable_healing
+            ) as run_span,
+        ):
+            try:
+                await super().start()
+            finally:
+                run_span.set(healing_happened=self.healing_happened)
+
     @staticmethod
     async def wait_proper_load_state(page: Page) -> None:
-        await page.wait_for_load_state("domcontentloaded")
-        await page.wait_for_load_state("load")
+        with trace_span("settle", "browser"):
+            await page.wait_for_load_state("domcontentloaded")
+            await page.wait_for_load_state("load")
 
     async def take_screenshot(self, extended_action: BugninjaExtendedAction) -> None:
         await self.browser_session.remove_highlights()
@@ -277,17 +306,21 @@ class ReplicatorRun(ReplicatorNavigator):
 
         await self.wait_proper_load_state(current_page)
         # Take screenshot and get filename
-        screenshot_filename = await self.screenshot_manager.take_screenshot(
-            current_page,  # type: ignore
-            extended_action,
-            self.browser_session,
-        )
+        with trace_span("screenshot", "browser"):
+            screenshot_filename = await self.screenshot_manager.take_screenshot(
+                current_page,  # type: ignore
+                extended_action,
+                self.browser_session,
+            )
 
         extended_action.screenshot_filename = screenshot_filename
 
-    async def create_self_healing_agent(self) -> HealerAgent:
+    async def create_self_healing_agent(self, failure_reason: Optional[str] = None) -> HealerAgent:
         """
         Start the self-healing agent.
+
+        Args:
+            failure_reason: Error of the replayed action the healer takes over from
         """
         # Use provided LLM config or fall back to default
         if self.healing_llm_config:
@@ -332,6 +365,9 @@ class ReplicatorRun(ReplicatorNavigator):
             parent_run_id=self.run_id,  # Pass parent's run_id to maintain consistency
             extra_instructions=self.replay_traversal.extra_instructions,
             already_completed_brainstates=self.replay_state_machine.passed_brain_states,
+            failed_action=self.replay_state_machine.current_action,
+            tried_selectors=self.failed_selectors,
+            failure_reason=failure_reason,
             output_base_dir=self.output_base_dir,
             screenshot_manager=self.screenshot_manager,
             io_schema=io_schema,
@@ -453,34 +489,18 @@ class ReplicatorRun(ReplicatorNavigator):
                     cdp_session = await self.browser_session.browser_context.new_cdp_session(current_page)  # type: ignore
                     logger.debug(f"✓ Created CDP session: {cdp_session}")
 
-                    # Start video recording
+                    # Start video recording (starts the CDP screencast as well)
                     output_file = f"run_{self.run_id}"
                     logger.debug(f"🎥 Starting video recorder with output: {output_file}")
                     await self.video_recording_manager.start_recording(output_file, cdp_session)
                     logger.debug("✓ Video recorder started successfully")
 
-                    # Setup CDP screencast
-                    logger.debug("📡 Setting up CDP screencast...")
-                    await cdp_session.send(
-                        "Page.startScreencast",
-                        {
-                            "format": "jpeg",
-                            "quality": self.video_recording_manager.config.quality,
-                            "maxWidth": self.video_recording_manager.config.width,
-                            "maxHeight": self.video_recording_manager.config.height,
-                            "everyNthFrame": 1,
-                        },
-                    )
-                    logger.debug("✓ CDP screencast configured")
-
-                    # Setup frame handler
-                    cdp_session.on(
-                        "Page.screencastFrame",
-                        lambda frame: asyncio.create_task(
-                            self._handle_screencast_frame(frame, cdp_session)
-                        ),
-                    )
-                    logger.debug("✓ Frame handler attached")
+                    # Reuse the live screencast frames as action screenshots if configured
+                    if self.video_recording_manager.config.reuse_frames_for_screenshots:
+                        self.screenshot_manager.use_screencast_frames(
+                            self.video_recording_manager.get_latest_frame,
+                            self.video_recording_manager.config.screenshot_frame_max_age_ms,
+                        )
 
                     logger.bugninja_log(f"🎥 Started video recording: {output_file}")
                 except Exception as e:
@@ -519,6 +539,10 @@ class ReplicatorRun(ReplicatorNavigator):
 
         agent_reached_goal: bool = False
 
+        # the span of the brain state the current action belongs to
+        brain_state_span: Optional[Union[Span, NoopSpan]] = None
+        brain_state_span_id: Optional[str] = None
+
         # Process brain states sequentially
         while not self.replay_state_machine.replay_should_stop(
             healing_agent_reached_goal=agent_reached_goal
@@ -528,6 +552,17 @@ class ReplicatorRun(ReplicatorNavigator):
             action = self.replay_state_machine.current_action
             action_type: str = action.get_action_type()
 
+            if action.brain_state_id != brain_state_span_id:
+                if brain_state_span is not None:
+                    brain_state_span.end()
+                brain_state_span_id = action.brain_state_id
+                brain_state_span = trace_span(
+                    "brain_state", "replay", brain_state_id=brain_state_span_id
+                ).start()
+            action_span = trace_span(
+                "action", "action", type=action_type, index=self._get_current_action_index()
+            ).start()
+
             logger.bugninja_log("")
             logger.bugninja_log(f"🔄 === PROCESSING ACTION {action_type} ===")
             logger.bugninja_log(f"📋 Action type: {action_type}")
@@ -558,6 +593,7 @@ class ReplicatorRun(ReplicatorNavigator):
                     video_start_offset = self.video_recording_manager.get_video_offset(
                         start_timestamp
                     )
+                    self.video_recording_manager.mark_action_boundary(start_timestamp)
 
                     # Create timestamps object with only video offsets
                     action.timestamps = ActionTimestamps(video_start_offset=video_start_offset)
@@ -593,6 +629,7 @@ class ReplicatorRun(ReplicatorNavigator):
                 # Take screenshot after action execution
                 screenshot_filename = await self._take_screenshot(action_type)
                 logger.bugninja_log(f"📸 Screenshot saved: {screenshot_filename}")
+                action_span.end()
 
                 logger.bugninja_log("✅ Action executed successfully")
 
@@ -616,12 +653,14 @@ class ReplicatorRun(ReplicatorNavigator):
                     self._wait_for_enter_key()
 
             except UserInterruptionError as e:
+                action_span.end(e)
                 logger.bugninja_log("⏹️ User interrupted replication process")
                 failed = True
                 failed_reason = str(e)
                 break
 
             except Exception as e:
+                action_span.end(e)
                 logger.error("")
                 logger.error(f"❌ === ACTION '{action_type}' FAILED ===")
                 logger.error(f"🚨 Error type: {type(e).__name__}")
@@ -634,11 +673,18 @@ class ReplicatorRun(ReplicatorNavigator):
                     logger.bugninja_log(
                         "🩹 Starting free healing agent to complete entire remaining traversal..."
                     )
+                    if self.video_recording_manager:
+                        self.video_recording_manager.mark_for_keep("healing started")
 
                     try:
 
                         # Use free healing agent to complete the entire remaining traversal
-                        agent_reached_goal, healer_agent = await self._start_free_healing()
+                        with trace_span("healing", "replay") as healing_span:
+                            agent_reached_goal, healer_agent = await self._start_free_healing(
+                                failure_reason=str(e)
+                            )
+                            healing_span.set(reached_goal=agent_reached_goal)
+                        self.healing_llm_usage = healer_agent.llm_usage_summary()
 
                         if agent_reached_goal:
                             self.healing_happened = True
@@ -679,12 +725,37 @@ class ReplicatorRun(ReplicatorNavigator):
                     except Exception as video_error:
                         logger.error(f"❌ Failed to stop video recording: {video_error}")
 
+        if brain_state_span is not None:
+            brain_state_span.end()
+
         logger.bugninja_log("")
         logger.bugninja_log("🏁 === REPLICATION COMPLETED ===")
         logger.bugninja_log(f"📊 Final status: {'❌ FAILED' if failed else '✅ SUCCESS'}")
         if failed:
             logger.bugninja_log(f"🚨 Failure reason: {failed_reason}")
 
+        # Stop video recording if enabled; done before saving the traversal so the action
+        # offsets can be aligned with the part of the video that was kept
+        if self.video_recording_manager:
+            if failed:
+                self.video_recording_manager.mark_for_keep("run failed")
+            try:
+                stats = await self.video_recording_manager.stop_recording()
+                logger.bugninja_log(
+                    f"🎥 Stopped video recording. Frames processed: {stats['frames_processed']}"
+                )
+            except Exception as e:
+                logger.error(f"❌ Failed to stop video recording: {e}")
+
+            recorded_actions = {
+                id(action): action
+                for action in [
+                    *self.replay_traversal.actions.values(),
+                    *self.replay_state_machine.passed_actions,
+                ]
+            }
+            self.video_recording_manager.rebase_action_timestamps(recorded_actions.values())
+
         # Save corrected traversal if healing happened (regardless of final status)
         if self.healing_happened:
             logger.bugninja_log("💾 Saving corrected traversal...")
@@ -694,75 +765,80 @@ class ReplicatorRun(ReplicatorNavigator):
             self._traversal = self.replay_traversal
             logger.warning("⚠️ No healing occurred - using original traversal")
 
-        # Stop video recording if enabled
-        if self.video_recording_manager:
-            try:
-                stats = await self.video_recording_manager.stop_recording()
-                logger.bugninja_log(
-                    f"🎥 Stopped video recording. Frames processed: {stats['frames_processed']}"
-                )
-            except Exception as e:
-                logger.error(f"❌ Failed to stop video recording: {e}")
+        # Index the recorded video per action for fast clip extraction
+        if self.video_recording_manager and self._traversal:
+            await self.video_recording_manager.write_clip_index(self._traversal.actions.values())
 
         return not failed, failed_reason
 
-    async def _start_free_healing(self) -> Tuple[bool, HealerAgent]:
+    async def _start_free_healing(
+        self, failure_reason: Optional[str] = None
+    ) -> Tuple[bool, HealerAgent]:
         """
         Start the healing agent and let it run freely through the entire remaining traversal.
 
         This method allows the healing agent to take over completely and run through
         all remaining actions without stopping for state matching or brain state boundaries.
 
+        Args:
+            failure_reason: Error of the replayed action that failed
+
         Returns:
-            True if healing agent completed the entire traversal successfully, False otherwise
+            True if healing agent completed the entire traversal successfully, False otherwise.
+            The healer's pending step work is flushed before this returns or raises.
         """
         logger.bugninja_log("🩹 === STARTING FREE HEALING MODE ===")
         logger.bugninja_log("🔄 Healing agent will run through entire remaining traversal")
 
         # Create healer agent
-        healer_agent = await self.create_self_healing_agent()
+        healer_agent = await self.create_self_healing_agent(failure_reason=failure_reason)
 
-        max_healing_steps = 50  # Increased limit for full traversal healing
-        logger.bugninja_log(f"🔄 Starting free healing loop (max {max_healing_steps} steps)")
+        try:
+            max_healing_steps = 50  # Increased limit for full traversal healing
+            logger.bugninja_log(f"🔄 Starting free healing loop (max {max_healing_steps} steps)")
 
-        for i in range(max_healing_steps):
-            logger.bugninja_log(f"🩹 === FREE HEALER STEP #{i+1}/{max_healing_steps} ===")
+            for i in range(max_healing_steps):
+                logger.bugninja_log(f"🩹 === FREE HEALER STEP #{i+1}/{max_healing_steps} ===")
 
-            # Execute healer step
-            try:
-                await healer_agent.step()
-            except Exception as e:
-                logger.error(f"❌ Healer step failed: {str(e)}")
-                return False, healer_agent
+                # Execute healer step
+                try:
+                    await healer_agent.step()
+                except Exception as e:
+                    logger.error(f"❌ Healer step failed: {str(e)}")
+                    return False, healer_agent
 
-            if not healer_agent.agent_taken_actions:
-                rich_print(healer_agent.agent_taken_actions)
-                logger.error("❌ Healer agent failed to take any actions")
-                return False, healer_agent
+                if not healer_agent.agent_taken_actions:
+                    rich_print(healer_agent.agent_taken_actions)
+                    logger.error("❌ Healer agent failed to take any actions")
+                    return False, healer_agent
 
-            # Check if healer agent has reached the goal
-            try:
+                # Check if healer agent has reached the goal
+                try:
 
-                # Check if we've reached a completion state (this is a simplified check)
-                # In a real implementation, you might check against the original test case's expected final state
-                if healer_agent.agent_taken_actions[-1].action.get("done") is not None:
-                    logger.bugninja_log("✅ === HEALING AGENT REACHED GOAL ===")
+                    # Check if we've reached a completion state (this is a simplified check)
+                    # In a real implementation, you might check against the original test
+                    # case's expected final state
+                    if healer_agent.agent_taken_actions[-1].action.get("done") is not None:
+                        logger.bugninja_log("✅ === HEALING AGENT REACHED GOAL ===")
 
-                    # Replace remaining replay actions with healing actions
-                    self._replace_remaining_with_healing_actions(healer_agent)
+                        # Replace remaining replay actions with healing actions
+                        self._replace_remaining_with_healing_actions(healer_agent)
 
-                    logger.bugninja_log("🎉 === FREE HEALING COMPLETED SUCCESSFULLY ===")
-                    logger.bugninja_log("📊 Final Summary:")
-                    logger.bugninja_log(f"   - Total healing steps: {i+1}")
+                        logger.bugninja_log("🎉 === FREE HEALING COMPLETED SUCCESSFULLY ===")
+                        logger.bugninja_log("📊 Final Summary:")
+                        logger.bugninja_log(f"   - Total healing steps: {i+1}")
 
-                    return True, healer_agent
+                        return True, healer_agent
 
-            except Exception as goal_check_error:
-                logger.warning(f"⚠️ Goal detection failed: {str(goal_check_error)} - continuing")
+                except Exception as goal_check_error:
+                    logger.warning(f"⚠️ Goal detection failed: {str(goal_check_error)} - continuing")
 
-        logger.error("❌ === FREE HEALING TIMED OUT ===")
-        logger.error(f"🚨 Reached maximum steps ({max_healing_steps}) without completing goal")
-        return False, healer_agent
+            logger.error("❌ === FREE HEALING TIMED OUT ===")
+            logger.error(f"🚨 Reached maximum steps ({max_healing_steps}) without completing goal")
+            return False, healer_agent
+        finally:
+            # the last step's after-step work and action events, also when a step raised
+            await healer_agent.flush_pending_step_work()
 
     def _replace_remaining_with_healing_actions(self, healer_agent: HealerAgent) -> None:
         """
@@ -823,9 +899,10 @@ class ReplicatorRun(ReplicatorNavigator):
         # Get the current extended action for highlighting
         current_action = self.replay_state_machine.current_action
 
-        return await self.screenshot_manager.take_screenshot(
-            page=self.current_page, action=current_action, browser_session=self.browser_session
-        )
+        with trace_span("screenshot", "browser", action_type=action_type):
+            return await self.screenshot_manager.take_screenshot(
+                page=self.current_page, action=current_action, browser_session=self.browser_session
+            )
 
     def get_screenshots_dir(self) -> Path:
         """Get the current screenshots directory for sharing with healing agent"""
@@ -847,41 +924,6 @@ class ReplicatorRun(ReplicatorNavigator):
             pass
         return "unknown"
 
-    async def _handle_screencast_frame(
-        self, frame: dict[str, Any], cdp_session: CDPSession
-    ) -> None:
-        """Handle incoming screencast frames for video recording.
-
-        Args:
-            frame: CDP screencast frame data
-            cdp_session: CDP session for acknowledgment
-        """
-        if self.video_recording_manager:
-            try:
-                img_data: bytes = base64.b64decode(frame["data"])
-                arr: np.ndarray = np.frombuffer(img_data, np.uint8)  # type: ignore
-                img: Optional[np.ndarray] = cv2.imdecode(arr, cv2.IMREAD_COLOR)  # type: ignore
-
-                if img is not None:
-                    img = cv2.resize(
-                        img,
-                        (
-                            self.video_recording_manager.config.width,
-                            self.video_recording_manager.config.height,
-                        ),
-                    )
-                    frame_bytes: bytes = img.tobytes()
-                    await self.video_recording_manager.add_frame(frame_bytes)
-            except Exception:
-                pass
-            finally:
-                try:
-                    await cdp_session.send(
-                        "Page.screencastFrameAck", {"sessionId": frame["sessionId"]}
-                    )
-                except Exception:
-                    pass
-
     # TODO! this has to be implemented properly with the new event publisher setup
     # async def _publish_run_event(self, event_type: str, data: Dict[str, Any]) -> None:
     #     """Publish event to all available publishers (NEW).
@@ -1,8 +1,10 @@
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from bugninja.config.llm_hedging import LLMHedgingConfig
+from bugninja.config.llm_routing import LLMRoutingConfig
 from bugninja.config.video_recording import VideoRecordingConfig
 
 from .models import BugninjaTaskResult
@@ -49,6 +51,90 @@ class TaskRunConfig(BaseModel):
     enable_video_recording: bool = Field(
         default=False, description="Enable video recording for this task"
     )
+    video_frame_screenshots: bool = Field(
+        default=False,
+        description="Reuse the live video frame as the action screenshot while recording",
+    )
+    video_mode: Literal["always", "on_failure"] = Field(
+        default="always",
+        description="Encode the video of every run or only of failed/healed runs",
+    )
+    dom_state_mode: Literal["full", "diff"] = Field(
+        default="full",
+        description="Send the full element list every step or element diffs between snapshots",
+    )
+    dom_snapshot_interval: int = Field(
+        default=5, description="Maximum steps between two full DOM snapshots in diff mode"
+    )
+    history_window_steps: Optional[int] = Field(
+        default=None, description="Steps kept verbatim in the history, older ones are summarized"
+    )
+    healing_context_verbatim_states: Optional[int] = Field(
+        default=3, description="Passed brain states a healer gets verbatim, older ones summarized"
+    )
+    vision_mode: Literal["always", "adaptive", "never"] = Field(
+        default="adaptive", description="Send a screenshot every step, only when needed, or never"
+    )
+    vision_max_width: int = Field(
+        default=1280, description="Maximum width of screenshots sent to the model"
+    )
+    vision_max_height: int = Field(
+        default=800, description="Maximum height of screenshots sent to the model"
+    )
+    vision_jpeg_quality: int = Field(
+        default=80, description="JPEG quality of screenshots sent to the model"
+    )
+    enable_tracing: bool = Field(
+        default=False, description="Write a Chrome trace-event file of the run"
+    )
+    stream_llm_output: bool = Field(
+        default=False, description="Stream model outputs and prepare the first action early"
+    )
+    llm_prompt_caching: bool = Field(
+        default=True, description="Set prompt cache breakpoints for providers that need them"
+    )
+
+    # LLM routing (escalation from the configured model to a stronger one)
+    llm_escalation_model: Optional[str] = Field(
+        default=None, description="Stronger model that escalated steps are routed to"
+    )
+    llm_escalation_provider: Optional[str] = Field(
+        default=None, description="Provider of the escalation model (defaults to the run's)"
+    )
+    llm_escalate_on_invalid_output: bool = Field(
+        default=True, description="Retry invalid or empty model outputs on the escalation model"
+    )
+    llm_escalate_after_failures: int = Field(
+        default=1, description="Consecutive step failures before escalating (0 = never)"
+    )
+    llm_escalate_agents: List[str] = Field(
+        default_factory=lambda: ["healer"],
+        description="Agents and tasks that always use the escalation model",
+    )
+
+    # LLM hedging (duplicate requests for slow calls) and per-call deadline
+    llm_hedging_enabled: bool = Field(
+        default=False, description="Apply the [run_config.llm_hedging] policy to model calls"
+    )
+    llm_hedge: bool = Field(default=True, description="Send a duplicate request for slow calls")
+    llm_hedge_percentile: float = Field(
+        default=0.9, description="Latency percentile of recent calls that triggers a hedge"
+    )
+    llm_hedge_min_delay_seconds: float = Field(
+        default=2.0, description="Lower bound of the hedge threshold"
+    )
+    llm_hedge_initial_delay_seconds: float = Field(
+        default=15.0, description="Hedge threshold until enough calls were observed"
+    )
+    llm_hedge_secondary_model: Optional[str] = Field(
+        default=None, description="Model of hedged requests (defaults to the same model)"
+    )
+    llm_hedge_secondary_provider: Optional[str] = Field(
+        default=None, description="Provider of the secondary model (defaults to the run's)"
+    )
+    llm_deadline_seconds: Optional[float] = Field(
+        default=None, description="Hard deadline of a model call including its hedge"
+    )
 
     # Network and location (per-task overrides)
     proxy_server: Optional[str] = Field(
@@ -82,6 +168,42 @@ class TaskRunConfig(BaseModel):
             enable_healing=config.get("run_config.enable_healing", True),
             headless=config.get("run_config.headless", False),
             enable_video_recording=config.get("run_config.enable_video_recording", False),
+            video_frame_screenshots=config.get("run_config.video_frame_screenshots", False),
+            video_mode=config.get("run_config.video_mode", "always"),
+            dom_state_mode=config.get("run_config.dom_state_mode", "full"),
+            dom_snapshot_interval=config.get("run_config.dom_snapshot_interval", 5),
+            history_window_steps=config.get("run_config.history_window_steps"),
+            healing_context_verbatim_states=config.get(
+                "run_config.healing_context_verbatim_states", 3
+            ),
+            vision_mode=config.get("run_config.vision_mode", "adaptive"),
+            vision_max_width=config.get("run_config.vision_max_width", 1280),
+            vision_max_height=config.get("run_config.vision_max_height", 800),
+            vision_jpeg_quality=config.get("run_config.vision_jpeg_quality", 80),
+            enable_tracing=config.get("run_config.enable_tracing", False),
+            stream_llm_output=config.get("run_config.stream_llm_output", False),
+            llm_prompt_caching=config.get("run_config.llm_prompt_caching", True),
+            llm_escalation_model=config.get("run_config.llm_routing.escalation_model"),
+            llm_escalation_provider=config.get("run_config.llm_routing.escalation_provider"),
+            llm_escalate_on_invalid_output=config.get(
+                "run_config.llm_routing.escalate_on_invalid_output", True
+            ),
+            llm_escalate_after_failures=config.get(
+                "run_config.llm_routing.escalate_after_failures", 1
+            ),
+            llm_escalate_agents=config.get("run_config.llm_routing.escalate_agents", ["healer"]),
+            llm_hedging_enabled=any(key.startswith("run_config.llm_hedging.") for key in config),
+            llm_hedge=config.get("run_config.llm_hedging.hedge", True),
+            llm_hedge_percentile=config.get("run_config.llm_hedging.hedge_percentile", 0.9),
+            llm_hedge_min_delay_seconds=config.get(
+                "run_config.llm_hedging.min_hedge_delay_seconds", 2.0
+            ),
+            llm_hedge_initial_delay_seconds=config.get(
+                "run_config.llm_hedging.initial_hedge_delay_seconds", 15.0
+            ),
+            llm_hedge_secondary_model=config.get("run_config.llm_hedging.secondary_model"),
+            llm_hedge_secondary_provider=config.get("run_config.llm_hedging.secondary_provider"),
+            llm_deadline_seconds=config.get("run_config.llm_hedging.deadline_seconds"),
             proxy_server=config.get("run_config.proxy.server"),
             geolocation_latitude=config.get("run_config.geolocation.latitude"),
             geolocation_longitude=config.get("run_config.geolocation.longitude"),
@@ -106,6 +228,44 @@ class TaskRunConfig(BaseModel):
             output_dir=output_dir,
             width=self.viewport_width,
             height=self.viewport_height,
+            reuse_frames_for_screenshots=self.video_frame_screenshots,
+            mode=self.video_mode,
+        )
+
+    def get_llm_routing_config(self) -> Optional[LLMRoutingConfig]:
+        """Get the LLM routing policy if an escalation model is configured.
+
+        Returns:
+            LLMRoutingConfig if `[run_config.llm_routing]` sets an escalation model, None otherwise
+        """
+        if not self.llm_escalation_model:
+            return None
+
+        return LLMRoutingConfig(
+            escalation_model=self.llm_escalation_model,
+            escalation_provider=self.llm_escalation_provider,
+            escalate_on_invalid_output=self.llm_escalate_on_invalid_output,
+            escalate_after_failures=self.llm_escalate_after_failures,
+            escalate_agents=self.llm_escalate_agents,  # type: ignore
+        )
+
+    def get_llm_hedging_config(self) -> Optional[LLMHedgingConfig]:
+        """Get the LLM hedging policy if `[run_config.llm_hedging]` is configured.
+
+        Returns:
+            LLMHedgingConfig if the task configures hedging or a deadline, None otherwise
+        """
+        if not self.llm_hedging_enabled:
+            return None
+
+        return LLMHedgingConfig(
+            hedge=self.llm_hedge,
+            hedge_percentile=self.llm_hedge_percentile,
+            min_hedge_delay_seconds=self.llm_hedge_min_delay_seconds,
+            initial_hedge_delay_seconds=self.llm_hedge_initial_delay_seconds,
+            secondary_model=self.llm_hedge_secondary_model,
+            secondary_provider=self.llm_hedge_secondary_provider,
+            deadline_seconds=self.llm_deadline_seconds,
         )
 
 
@@ -34,7 +34,7 @@ config = BugninjaConfig(
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from browser_use import BrowserProfile, BrowserSession  # type: ignore
 from browser_use.browser.profile import (  # type: ignore
@@ -46,6 +46,9 @@ from cuid2 import Cuid as CUID
 from playwright._impl._api_structures import ViewportSize
 from pydantic import BaseModel, Field, field_validator
 
+from bugninja.config.artifact_store import ArtifactStoreConfig
+from bugninja.config.llm_hedging import LLMHedgingConfig
+from bugninja.config.llm_routing import LLMRoutingConfig
 from bugninja.config.video_recording import VideoRecordingConfig
 from bugninja.schemas.pipeline import Traversal
 from bugninja.schemas.test_case_io import TestCaseSchema
@@ -763,6 +766,9 @@ class BugninjaConfig(BaseModel):
     Attributes:
         llm_provider (str): LLM provider to use (default: "azure_openai")
         llm_temperature (float): Temperature for LLM responses (0.0-2.0, default: 0.0)
+        llm_routing (Optional[LLMRoutingConfig]): Escalation to a stronger model (default: None)
+        llm_hedging (Optional[LLMHedgingConfig]): Hedged requests and deadline of model calls
+            (default: None)
         headless (bool): Run browser in headless mode (default: False)
         viewport_width (int): Browser viewport width (800-3840, default: 1920)
         viewport_height (int): Browser viewport height (600-2160, default: 1080)
@@ -776,6 +782,24 @@ class BugninjaConfig(BaseModel):
         screenshots_dir (Path): Directory for storing screenshots (default: "./screenshots")
         traversals_dir (Path): Directory for storing traversal files (default: "./traversals")
         video_recording (Optional[VideoRecordingConfig]): Video recording configuration (default: None)
+        artifact_store (Optional[ArtifactStoreConfig]): Content-addressed screenshot storage (default: None)
+        dom_state_mode (Literal["full", "diff"]): Send the full element list every step, or
+            periodic snapshots and element diffs in between (default: "full")
+        dom_snapshot_interval (int): Maximum steps between two full snapshots in "diff" mode (default: 5)
+        history_window_steps (Optional[int]): Steps kept verbatim in the message history; older
+            steps are folded into a summary. None keeps the whole history (default: None)
+        healing_context_verbatim_states (Optional[int]): Passed brain states a healer gets
+            verbatim; older ones are summarized. None includes all verbatim (default: 3)
+        vision_mode (Literal["always", "adaptive", "never"]): Send a screenshot every step,
+            only when a step needs one, or never (default: "adaptive")
+        vision_max_width (int): Maximum width of screenshots sent to the model (default: 1280)
+        vision_max_height (int): Maximum height of screenshots sent to the model (default: 800)
+        vision_jpeg_quality (int): JPEG quality of screenshots sent to the model (default: 80)
+        enable_tracing (bool): Write a Chrome trace-event file of every run (default: False)
+        stream_llm_output (bool): Stream agent model outputs and prepare the first action
+            before the output is complete (default: False)
+        llm_prompt_caching (bool): Set prompt cache breakpoints for providers that need them
+            (default: True)
 
     Example:
         ```python
@@ -813,6 +837,16 @@ class BugninjaConfig(BaseModel):
         default_factory=dict, description="Provider-specific LLM configuration parameters"
     )
 
+    llm_routing: Optional[LLMRoutingConfig] = Field(
+        default=None,
+        description="Routing policy escalating steps from the configured to a stronger model",
+    )
+
+    llm_hedging: Optional[LLMHedgingConfig] = Field(
+        default=None,
+        description="Hedged duplicate requests for slow model calls and a per-call deadline",
+    )
+
     # Browser Configuration
     headless: bool = Field(default=False, description="Run browser in headless mode")
 
@@ -866,6 +900,69 @@ class BugninjaConfig(BaseModel):
         description="Video recording configuration for navigation sessions",
     )
 
+    # Artifact Store Configuration
+    artifact_store: Optional[ArtifactStoreConfig] = Field(
+        default=None,
+        description="Content-addressed deduplicated storage for screenshots (None keeps per-run files)",
+    )
+
+    # Prompt Configuration
+    dom_state_mode: Literal["full", "diff"] = Field(
+        default="full",
+        description="Send the full element list every step or element diffs between snapshots",
+    )
+
+    dom_snapshot_interval: int = Field(
+        default=5, ge=1, le=100, description="Maximum steps between two full DOM snapshots"
+    )
+
+    history_window_steps: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=100,
+        description="Steps kept verbatim in the message history, older ones are summarized",
+    )
+
+    healing_context_verbatim_states: Optional[int] = Field(
+        default=3,
+        ge=1,
+        le=100,
+        description="Passed brain states a healer gets verbatim, older ones are summarized",
+    )
+
+    # Vision Configuration
+    vision_mode: Literal["always", "adaptive", "never"] = Field(
+        default="adaptive",
+        description="Send a screenshot every step, only when a step needs one, or never",
+    )
+    vision_max_width: int = Field(
+        default=1280, ge=320, le=3840, description="Maximum width of screenshots sent to the model"
+    )
+    vision_max_height: int = Field(
+        default=800, ge=240, le=2160, description="Maximum height of screenshots sent to the model"
+    )
+    vision_jpeg_quality: int = Field(
+        default=80, ge=1, le=95, description="JPEG quality of screenshots sent to the model"
+    )
+
+    # Tracing Configuration
+    enable_tracing: bool = Field(
+        default=False,
+        description="Write a span trace of every run as a Chrome trace-event JSON file",
+    )
+
+    # LLM Output Streaming
+    stream_llm_output: bool = Field(
+        default=False,
+        description="Stream model outputs and prepare the first action before they complete",
+    )
+
+    # Provider-side prompt caching
+    llm_prompt_caching: bool = Field(
+        default=True,
+        description="Set prompt cache breakpoints for providers that need explicit ones",
+    )
+
     # Internal flag to indicate CLI usage (excluded from serialization)
     cli_mode: bool = Field(
         default=False,
@@ -924,6 +1021,16 @@ class BugninjaConfig(BaseModel):
             return self.output_base_dir / "videos"
         return Path(self.video_recording.output_dir) if self.video_recording else Path("./videos")
 
+    def get_effective_traces_dir(self) -> Path:
+        """Get the effective span trace directory based on output_base_dir.
+
+        Returns:
+            Path: The traces directory to use
+        """
+        if self.output_base_dir:
+            return self.output_base_dir / "traces"
+        return Path("./traces")
+
     def ensure_directories_exist(self) -> None:
         """Explicitly create directories when needed.
 
@@ -7,6 +7,11 @@ This module provides **utility functions and classes** for:
 - Selector generation and validation
 - Video recording and management
 - Custom video recording with FFmpeg
+- Content-addressed artifact storage
+- Screencast frame ingestion for video recording
+- Process-wide video encoder budget
+- Per-action video clip indexing and extraction
+- Span tracing with Chrome trace-event export
 
 ## Key Components
 
@@ -16,6 +21,11 @@ This module provides **utility functions and classes** for:
 4. **BugninjaVideoRecorder** - High-quality video recorder using FFmpeg
 5. **BugninjaLogger** - Custom logging with Bugninja-specific levels
 6. **configure_logging()** - Logging configuration utility
+7. **ArtifactStore** - Content-addressed, deduplicated screenshot storage
+8. **FrameIngestor** - Off-loop screencast frame ingestion for video recording
+9. **VideoEncoderManager** - Shared cap on concurrent FFmpeg encoders with queue metrics
+10. **VideoClipIndex** - Per-action video index and stream-copy clip extraction
+11. **RunTracer** - Nested span tracing of runs, written as Chrome trace-event JSON
 
 ## Usage Examples
 
@@ -50,15 +60,30 @@ logger.bugninja_log("Custom log message")
 ```
 """
 
+from .artifact_store import ArtifactStore
+from .frame_ingestor import FrameIngestor
 from .screenshot_manager import ScreenshotManager
 from .selector_factory import SelectorFactory
+from .tracing import RunTracer, current_span, run_trace, trace_span
+from .video_clip_index import VideoClipIndex, build_clip_index, extract_action_clip
+from .video_encoder_manager import VideoEncoderManager
 from .video_recording_manager import VideoRecordingManager
 from .custom_video_recorder import BugninjaVideoRecorder
 from .logging_config import logger, configure_logging, BugninjaLogger
 
 __all__ = [
+    "ArtifactStore",
+    "FrameIngestor",
     "ScreenshotManager",
     "SelectorFactory",
+    "RunTracer",
+    "current_span",
+    "run_trace",
+    "trace_span",
+    "VideoClipIndex",
+    "build_clip_index",
+    "extract_action_clip",
+    "VideoEncoderManager",
     "VideoRecordingManager",
     "BugninjaVideoRecorder",
     "logger",
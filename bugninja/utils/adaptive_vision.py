@@ -0,0 +1,232 @@
+"""
+Adaptive vision for agent prompts.
+
+With vision every step sends a full resolution screenshot to the model, which dominates
+the input tokens and the upload time of the step, although the element list is enough for
+most steps. The adaptive policy keeps steps text-only and attaches a screenshot only when
+the text is likely not enough: after a failed step, after a step whose outcome the model
+could not tell, on pages mostly drawn on canvases, or when the model asked for one. Sent
+screenshots are downscaled to a configurable size and re-encoded as JPEG.
+
+## Key Components
+
+1. **AdaptiveVisionPolicy** - Decides per step whether the model gets a screenshot
+2. **VisionDecision** - Whether and why a step uses vision
+3. **downscale_screenshot()** - Screenshot fitted into a maximum size, as JPEG
+
+## Usage Examples
+
+```python
+from bugninja.utils.adaptive_vision import AdaptiveVisionPolicy
+
+policy = AdaptiveVisionPolicy(mode="adaptive", max_width=1280, max_height=800)
+
+decision = await policy.decide(page, step_failed=False, evaluation="Success - clicked")
+if decision.use_vision:
+    image_b64, image_bytes = await policy.downscale(browser_state_summary.screenshot)
+    policy.record_sent(image_bytes)
+```
+"""
+
+import asyncio
+import base64
+import io
+from dataclasses import dataclass
+from typing import Any, Dict, Literal, Optional, Tuple
+
+from browser_use.browser.session import Page  # type: ignore
+from PIL import Image
+
+from bugninja.utils.logging_config import logger
+
+VisionMode = Literal["always", "adaptive", "never"]
+
+#! share of the viewport covered by canvases (or plugins/videos) that makes a page visual
+CANVAS_COVERAGE_THRESHOLD: float = 0.3
+
+CANVAS_COVERAGE_SCRIPT: str = """
+() => {
+    const width = window.innerWidth;
+    const height = window.innerHeight;
+    if (!width || !height) {
+        return 0;
+    }
+    let area = 0;
+    for (const element of document.querySelectorAll('canvas, embed, object, video')) {
+        const rect = element.getBoundingClientRect();
+        const visibleWidth = Math.max(0, Math.min(rect.right, width) - Math.max(rect.left, 0));
+        const visibleHeight = Math.max(0, Math.min(rect.bottom, height) - Math.max(rect.top, 0));
+        area += visibleWidth * visibleHeight;
+    }
+    return Math.min(1, area / (width * height));
+}
+"""
+
+
+@dataclass
+class VisionDecision:
+    """Whether a step sends a screenshot to the model.
+
+    Attributes:
+        use_vision (bool): Whether the step's prompt gets a screenshot
+        reason (Optional[str]): Why vision is used, e.g. "failed step" or "canvas page"
+    """
+
+    use_vision: bool
+    reason: Optional[str] = None
+
+
+def downscale_screenshot(
+    screenshot_b64: str, max_width: int, max_height: int, quality: int
+) -> Tuple[str, int]:
+    """Fit a screenshot into a maximum size and encode it as JPEG.
+
+    Args:
+        screenshot_b64 (str): Base64 encoded screenshot
+        max_width (int): Maximum width in pixels
+        max_height (int): Maximum height in pixels
+        quality (int): JPEG quality (1-95)
+
+    Returns:
+        Tuple[str, int]: Base64 encoded JPEG and its size in bytes
+    """
+    with Image.open(io.BytesIO(base64.b64decode(screenshot_b64))) as original:
+        image = original.convert("RGB")
+        image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    data = buffer.getvalue()
+    return base64.b64encode(data).decode("ascii"), len(data)
+
+
+class AdaptiveVisionPolicy:
+    """Decides per step whether the model gets a screenshot, and prepares it.
+
+    In "always" mode every step uses vision, in "never" mode no step does. In "adaptive"
+    mode a step uses vision after a failed step, after a step the model evaluated as
+    "Unknown", on canvas heavy pages or when the model requested a screenshot.
+
+    Attributes:
+        mode (VisionMode): Vision mode
+        max_width (int): Maximum width of sent screenshots
+        max_height (int): Maximum height of sent screenshots
+        jpeg_quality (int): JPEG quality of sent screenshots
+        steps (int): Steps decided by the policy
+        vision_steps (int): Steps that sent a screenshot
+        image_bytes (int): Bytes of all sent screenshots
+        reasons (Dict[str, int]): Number of vision steps per reason
+    """
+
+    def __init__(
+        self,
+        mode: VisionMode = "adaptive",
+        max_width: int = 1280,
+        max_height: int = 800,
+        jpeg_quality: int = 80,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            mode (VisionMode): "always", "adaptive" or "never"
+            max_width (int): Maximum width of sent screenshots
+            max_height (int): Maximum height of sent screenshots
+            jpeg_quality (int): JPEG quality of sent screenshots
+        """
+        self.mode: VisionMode = mode
+        self.max_width = max_width
+        self.max_height = max_height
+        self.jpeg_quality = jpeg_quality
+        self.steps = 0
+        self.vision_steps = 0
+        self.image_bytes = 0
+        self.reasons: Dict[str, int] = {}
+
+    @staticmethod
+    async def canvas_coverage(page: Page) -> float:
+        """Share of the viewport covered by canvases, embedded plugins and videos.
+
+        Args:
+            page (Page): Current page
+
+        Returns:
+            float: Covered share between 0 and 1, 0 if the page could not be evaluated
+        """
+        try:
+            return float(await page.evaluate(CANVAS_COVERAGE_SCRIPT) or 0)
+        except Exception as e:
+            logger.debug(f"Canvas coverage check failed: {e}")
+            return 0.0
+
+    async def decide(
+        self,
+        page: Page,
+        step_failed: bool,
+        evaluation: Optional[str] = None,
+        requested: bool = False,
+    ) -> VisionDecision:
+        """Decide whether the current step sends a screenshot.
+
+        Args:
+            page (Page): Current page
+            step_failed (bool): Whether the previous step or one of its actions failed
+            evaluation (Optional[str]): The model's evaluation of its previous goal
+            requested (bool): Whether the model requested a screenshot in the previous step
+
+        Returns:
+            VisionDecision: Whether and why the step uses vision
+        """
+        self.steps += 1
+        if self.mode == "never":
+            decision = VisionDecision(use_vision=False)
+        elif self.mode == "always":
+            decision = VisionDecision(use_vision=True, reason="always")
+        elif requested:
+            decision = VisionDecision(use_vision=True, reason="requested")
+        elif step_failed:
+            decision = VisionDecision(use_vision=True, reason="failed step")
+        elif evaluation and evaluation.strip().lower().startswith("unknown"):
+            decision = VisionDecision(use_vision=True, reason="ambiguous step")
+        elif await self.canvas_coverage(page) >= CANVAS_COVERAGE_THRESHOLD:
+            decision = VisionDecision(use_vision=True, reason="canvas page")
+        else:
+            decision = VisionDecision(use_vision=False)
+
+        if decision.use_vision and decision.reason:
+            self.reasons[decision.reason] = self.reasons.get(decision.reason, 0) + 1
+        return decision
+
+    async def downscale(self, screenshot_b64: str) -> Tuple[str, int]:
+        """Downscale a screenshot for the model, off the event loop.
+
+        Args:
+            screenshot_b64 (str): Base64 encoded screenshot of the step
+
+        Returns:
+            Tuple[str, int]: Base64 encoded JPEG and its size in bytes
+        """
+        return await asyncio.to_thread(
+            downscale_screenshot,
+            screenshot_b64,
+            self.max_width,
+            self.max_height,
+            self.jpeg_quality,
+        )
+
+    def record_sent(self, image_bytes: int) -> None:
+        """Count a screenshot sent to the model.
+
+        Args:
+            image_bytes (int): Size of the sent image in bytes
+        """
+        self.vision_steps += 1
+        self.image_bytes += image_bytes
+
+    def summary(self) -> Dict[str, Any]:
+        """Vision use of the agent, for the run result."""
+        return {
+            "mode": self.mode,
+            "steps": self.steps,
+            "vision_steps": self.vision_steps,
+            "image_bytes": self.image_bytes,
+            "reasons": dict(self.reasons),
+        }
@@ -0,0 +1,156 @@
+"""
+Incremental parsing of streamed agent outputs.
+
+The agent output is a JSON object with the `current_state` first and the `action` list
+after it; with several actions the first one is complete long before the last token.
+This module reads the streamed tokens of a model call (the text or the arguments of the
+first tool call) and reports the current state and the first action once both are
+complete, so work for that action can start while the model is still generating.
+
+Nothing is executed from a partial output: the final output is still parsed and
+validated by the agent as a whole.
+
+## Key Components
+
+1. **AgentOutputStreamParser** - LangChain callback reporting the first complete action
+2. **parse_first_action()** - Current state and first action of a partial agent output
+
+## Usage Examples
+
+```python
+from bugninja.utils.agent_output_stream import AgentOutputStreamParser
+
+async def on_first_action(current_state: dict, action: dict) -> None:
+    print("first action:", action)
+
+parser = AgentOutputStreamParser(on_first_action)
+llm = llm.model_copy(update={"streaming": True, "callbacks": [parser]})
+```
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import ChatGenerationChunk, GenerationChunk
+from langchain_core.utils.json import parse_partial_json
+
+from bugninja.utils.logging_config import logger
+
+FirstActionCallback = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[None]]
+
+
+def parse_first_action(text: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Get the current state and the first action of a partial agent output.
+
+    The first action counts as complete once a second action started, since only then
+    its closing brace was streamed; a still growing value such as `"index": 1` of
+    `"index": 12` is never reported.
+
+    Args:
+        text (str): Agent output streamed so far (JSON, possibly after a code fence)
+
+    Returns:
+        Optional[Tuple[Dict[str, Any], Dict[str, Any]]]: Current state and first action,
+            or None while they are incomplete
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    try:
+        partial = parse_partial_json(text[start:])
+    except Exception:
+        return None
+    if not isinstance(partial, dict):
+        return None
+
+    current_state = partial.get("current_state")
+    actions = partial.get("action")
+    if not isinstance(current_state, dict) or not isinstance(actions, list):
+        return None
+    if len(actions) < 2 or not isinstance(actions[0], dict) or not actions[0]:
+        return None
+    return current_state, actions[0]
+
+
+class AgentOutputStreamParser(AsyncCallbackHandler):
+    """LangChain callback that reports the first complete action of streamed agent outputs.
+
+    Tokens are collected per model call, so concurrent (e.g. hedged) calls of the same
+    model do not mix. The callback is awaited once per call, on the event loop the
+    parser was created on; calls made from other threads are ignored.
+
+    Attributes:
+        on_first_action (FirstActionCallback): Called with the current state and the first
+            action of a streamed agent output
+    """
+
+    def __init__(self, on_first_action: FirstActionCallback) -> None:
+        """Initialize the parser.
+
+        Args:
+            on_first_action (FirstActionCallback): Called with the current state and the
+                first action once both are complete
+        """
+        self.on_first_action = on_first_action
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._text: Dict[UUID, List[str]] = {}
+        self._tool_args: Dict[UUID, List[str]] = {}
+        self._reported: Set[UUID] = set()
+
+    async def on_llm_new_token(
+        self,
+        token: str,
+        *,
+        chunk: Optional[Union[GenerationChunk, ChatGenerationChunk]] = None,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        tags: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        if run_id in self._reported:
+            return
+        if self._loop is not None and asyncio.get_running_loop() is not self._loop:
+            return
+
+        new_text = ""
+        message = getattr(chunk, "message", None)
+        tool_call_chunks = getattr(message, "tool_call_chunks", None) or []
+        for tool_call_chunk in tool_call_chunks:
+            if tool_call_chunk.get("index") in (None, 0) and tool_call_chunk.get("args"):
+                self._tool_args.setdefault(run_id, []).append(tool_call_chunk["args"])
+                new_text += tool_call_chunk["args"]
+        content = message.content if message is not None else token
+        if isinstance(content, str) and content:
+            self._text.setdefault(run_id, []).append(content)
+            new_text += content
+        if not new_text:
+            return
+
+        streamed = "".join(self._tool_args.get(run_id) or self._text.get(run_id) or [])
+        # the current state comes first and makes up most of the output
+        if '"action"' not in streamed:
+            return
+        parsed = parse_first_action(streamed)
+        if parsed is None:
+            return
+        self._reported.add(run_id)
+        try:
+            await self.on_first_action(*parsed)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to prepare the streamed first action: {e}")
+
+    def _forget(self, run_id: UUID) -> None:
+        self._text.pop(run_id, None)
+        self._tool_args.pop(run_id, None)
+        self._reported.discard(run_id)
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._forget(run_id)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._forget(run_id)
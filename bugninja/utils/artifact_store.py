@@ -0,0 +1,476 @@
+"""
+Content-addressed artifact store for Bugninja framework.
+
+This module provides a deduplicating store for run artifacts such as screenshots.
+Every artifact is hashed and written once under a content-addressed layout; runs
+only keep references to the hashes they use, and blobs that are no longer
+referenced by any run can be garbage collected.
+
+The index is a SQLite database, so every `put` only inserts the rows it adds instead of
+rewriting the whole index, and parallel processes (CLI runs, `bugninja gc`) serialize
+their writes through SQLite's file lock instead of overwriting each other's updates.
+
+## Layout
+
+```
+artifacts/
+├── index.sqlite3               # artifacts, run references and perceptual hash buckets
+└── objects/ab/abcdef....png    # one blob per unique content hash
+```
+
+## Usage Examples
+
+```python
+from bugninja.config.artifact_store import ArtifactStoreConfig
+from bugninja.utils.artifact_store import ArtifactStore
+
+store = ArtifactStore.from_config(ArtifactStoreConfig(store_dir="./artifacts"))
+
+# Store screenshot bytes for a run, off the event loop
+artifact_hash, blob_path = await store.put_async(png_bytes, extension="png", run_id="run_123")
+
+# Drop the run's references and delete unreferenced blobs
+store.release_run("run_123")
+reclaimed = store.collect_garbage()
+```
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from PIL import Image
+
+from bugninja.config.artifact_store import ArtifactStoreConfig
+from bugninja.utils.logging_config import logger
+
+INDEX_FILE_NAME: str = "index.sqlite3"
+OBJECTS_DIR_NAME: str = "objects"
+
+#! extensions that can be decoded by Pillow and therefore perceptually hashed
+IMAGE_EXTENSIONS: Set[str] = {"png", "jpg", "jpeg", "webp"}
+
+#! a 64-bit dHash is bucketed by 8 bands of 8 bits; two hashes at most 7 bits apart
+#! share at least one band, so lookups up to that threshold only read their buckets
+PHASH_BANDS: int = 8
+PHASH_BAND_BITS: int = 8
+
+#! seconds a writer waits for another process holding the index lock
+INDEX_LOCK_TIMEOUT_SECONDS: float = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    hash TEXT PRIMARY KEY,
+    extension TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    phash TEXT
+);
+CREATE TABLE IF NOT EXISTS refs (
+    run_id TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (run_id, hash)
+);
+CREATE INDEX IF NOT EXISTS refs_by_hash ON refs (hash);
+CREATE TABLE IF NOT EXISTS phash_buckets (
+    band INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (band, value, hash)
+);
+"""
+
+
+def compute_perceptual_hash(data: bytes) -> Optional[int]:
+    """Compute a 64-bit difference hash (dHash) of an encoded image.
+
+    Args:
+        data (bytes): Encoded image bytes
+
+    Returns:
+        Optional[int]: The perceptual hash, or None if the image cannot be decoded
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            small = img.convert("L").resize((9, 8), Image.Resampling.BILINEAR)
+            pixels = list(small.getdata())
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def phash_bands(phash: int) -> List[int]:
+    """Split a 64-bit perceptual hash into its bucket bands.
+
+    Args:
+        phash (int): Perceptual hash
+
+    Returns:
+        List[int]: `PHASH_BANDS` values of `PHASH_BAND_BITS` bits each
+    """
+    mask = (1 << PHASH_BAND_BITS) - 1
+    return [(phash >> (band * PHASH_BAND_BITS)) & mask for band in range(PHASH_BANDS)]
+
+
+class ArtifactStore:
+    """Content-addressed, reference-counted artifact store.
+
+    Artifacts are identified by the SHA-256 of their content. Optionally, images
+    can also be matched by perceptual hash so that visually identical screenshots
+    that differ only in encoding noise are stored once.
+
+    The reference count of an artifact is the number of runs referencing it in the
+    index. Writes run in immediate SQLite transactions, so concurrent processes sharing
+    the store are serialized, and a blob is never collected while a run references it.
+
+    Attributes:
+        root (Path): Root directory of the store
+        perceptual_hash (bool): Whether perceptual deduplication is enabled
+        perceptual_hash_threshold (int): Maximum Hamming distance for perceptual matches
+    """
+
+    _instances: Dict[Path, "ArtifactStore"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        root: Path,
+        perceptual_hash: bool = False,
+        perceptual_hash_threshold: int = 0,
+    ) -> None:
+        """Initialize the artifact store.
+
+        Args:
+            root (Path): Root directory of the store
+            perceptual_hash (bool): Whether to deduplicate near-identical images
+            perceptual_hash_threshold (int): Maximum Hamming distance for perceptual matches
+        """
+        self.root = root
+        self.perceptual_hash = perceptual_hash
+        self.perceptual_hash_threshold = perceptual_hash_threshold
+
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ArtifactStoreConfig) -> "ArtifactStore":
+        """Get the shared store instance for a configuration.
+
+        Args:
+            config (ArtifactStoreConfig): Artifact store configuration
+
+        Returns:
+            ArtifactStore: Store shared by every caller using the same directory
+        """
+        root = Path(config.store_dir).resolve()
+        with cls._instances_lock:
+            store = cls._instances.get(root)
+            if store is None:
+                store = cls(
+                    root=root,
+                    perceptual_hash=config.perceptual_hash,
+                    perceptual_hash_threshold=config.perceptual_hash_threshold,
+                )
+                cls._instances[root] = store
+            return store
+
+    # ---------------- index persistence -----------------
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / OBJECTS_DIR_NAME
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_FILE_NAME
+
+    @contextmanager
+    def _connect(self, write: bool = False) -> Iterator[sqlite3.Connection]:
+        """Open the index; write connections hold the store's write lock until they exit."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.index_path, timeout=INDEX_LOCK_TIMEOUT_SECONDS, isolation_level=None
+        )
+        try:
+            if not self._schema_ready:
+                with self._schema_lock:
+                    # another thread may have created the schema while this one waited
+                    if not self._schema_ready:
+                        connection.execute("PRAGMA journal_mode=WAL")
+                        connection.executescript(_SCHEMA)
+                        self._schema_ready = True
+            if write:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    yield connection
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+            else:
+                yield connection
+        finally:
+            connection.close()
+
+    def _blob_path(self, artifact_hash: str, extension: str) -> Path:
+        return self.objects_dir / artifact_hash[:2] / f"{artifact_hash}.{extension}"
+
+    def _write_blob(self, blob_path: Path, data: bytes) -> None:
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=blob_path.parent, prefix=f".{blob_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, blob_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _find_perceptual_match(self, connection: sqlite3.Connection, phash: int) -> Optional[str]:
+        """Closest stored image within the threshold, looked up through the hash buckets."""
+        if self.perceptual_hash_threshold < PHASH_BANDS:
+            rows = connection.execute(
+                "SELECT DISTINCT a.hash, a.phash FROM phash_buckets b "
+                "JOIN artifacts a ON a.hash = b.hash WHERE "
+                + " OR ".join(["(b.band = ? AND b.value = ?)"] * PHASH_BANDS),
+                [v for band, value in enumerate(phash_bands(phash)) for v in (band, value)],
+            ).fetchall()
+        else:
+            # too far apart for the buckets to guarantee a shared band
+            rows = connection.execute(
+                "SELECT hash, phash FROM artifacts WHERE phash IS NOT NULL"
+            ).fetchall()
+
+        best_hash: Optional[str] = None
+        best_distance = self.perceptual_hash_threshold + 1
+        for artifact_hash, stored in rows:
+            distance = (int(stored, 16) ^ phash).bit_count()
+            if distance < best_distance:
+                best_hash, best_distance = artifact_hash, distance
+        return best_hash
+
+    def _has_artifact(self, artifact_hash: str) -> bool:
+        if not self.index_path.exists():
+            return False
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM artifacts WHERE hash = ?", (artifact_hash,)
+            ).fetchone()
+        return row is not None
+
+    # ---------------- public API -----------------
+
+    def path_for(self, artifact_hash: str) -> Path:
+        """Get the blob path of a stored artifact.
+
+        Args:
+            artifact_hash (str): Content hash of the artifact
+
+        Returns:
+            Path: Path of the blob inside the store
+
+        Raises:
+            KeyError: If the artifact is not in the store
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT extension FROM artifacts WHERE hash = ?", (artifact_hash,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(artifact_hash)
+        return self._blob_path(artifact_hash, row[0])
+
+    def put(self, data: bytes, extension: str, run_id: str) -> Tuple[str, Path]:
+        """Store artifact bytes and reference them from a run.
+
+        Hashing happens before the write lock is taken; only the lookup, a missing blob
+        and the new rows are written while holding it. Blocking; use `put_async` from
+        coroutines.
+
+        Args:
+            data (bytes): Artifact content
+            extension (str): File extension of the artifact (e.g. "png", "html")
+            run_id (str): Run that references the artifact
+
+        Returns:
+            Tuple[str, Path]: Content hash under which the artifact is stored, and its blob
+        """
+        extension = extension.lstrip(".").lower()
+        artifact_hash = hashlib.sha256(data).hexdigest()
+
+        # decoding for the perceptual hash is only worth it for content not stored yet
+        phash: Optional[int] = None
+        if (
+            self.perceptual_hash
+            and extension in IMAGE_EXTENSIONS
+            and not self._has_artifact(artifact_hash)
+        ):
+            phash = compute_perceptual_hash(data)
+
+        with self._connect(write=True) as connection:
+            row = connection.execute(
+                "SELECT extension FROM artifacts WHERE hash = ?", (artifact_hash,)
+            ).fetchone()
+
+            if row is None and phash is not None:
+                match = self._find_perceptual_match(connection, phash)
+                if match is not None:
+                    logger.debug(f"♻️ Perceptual match for artifact: {match[:12]}")
+                    artifact_hash = match
+                    row = connection.execute(
+                        "SELECT extension FROM artifacts WHERE hash = ?", (artifact_hash,)
+                    ).fetchone()
+
+            if row is None:
+                blob_path = self._blob_path(artifact_hash, extension)
+                self._write_blob(blob_path, data)
+                connection.execute(
+                    "INSERT INTO artifacts (hash, extension, size, phash) VALUES (?, ?, ?, ?)",
+                    (
+                        artifact_hash,
+                        extension,
+                        len(data),
+                        f"{phash:016x}" if phash is not None else None,
+                    ),
+                )
+                if phash is not None:
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO phash_buckets (band, value, hash) VALUES (?, ?, ?)",
+                        [
+                            (band, value, artifact_hash)
+                            for band, value in enumerate(phash_bands(phash))
+                        ],
+                    )
+            else:
+                blob_path = self._blob_path(artifact_hash, row[0])
+                logger.debug(f"♻️ Deduplicated artifact: {artifact_hash[:12]}")
+
+            connection.execute(
+                "INSERT OR IGNORE INTO refs (run_id, hash, seq) VALUES (?, ?, "
+                "(SELECT COUNT(*) FROM refs WHERE run_id = ?))",
+                (run_id, artifact_hash, run_id),
+            )
+
+        return artifact_hash, blob_path
+
+    async def put_async(self, data: bytes, extension: str, run_id: str) -> Tuple[str, Path]:
+        """Store artifact bytes from a coroutine, without blocking the event loop.
+
+        Args:
+            data (bytes): Artifact content
+            extension (str): File extension of the artifact
+            run_id (str): Run that references the artifact
+
+        Returns:
+            Tuple[str, Path]: Content hash under which the artifact is stored, and its blob
+        """
+        return await asyncio.to_thread(self.put, data, extension, run_id)
+
+    def get_run_artifacts(self, run_id: str) -> List[str]:
+        """Get the artifact hashes referenced by a run.
+
+        Args:
+            run_id (str): Run identifier
+
+        Returns:
+            List[str]: Referenced artifact hashes in first-use order
+        """
+        if not self.index_path.exists():
+            return []
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT hash FROM refs WHERE run_id = ? ORDER BY seq", (run_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_refcount(self, artifact_hash: str) -> int:
+        """Get the number of runs referencing an artifact.
+
+        Args:
+            artifact_hash (str): Content hash of the artifact
+
+        Returns:
+            int: Number of referencing runs
+        """
+        if not self.index_path.exists():
+            return 0
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT COUNT(*) FROM refs WHERE hash = ?", (artifact_hash,)
+            ).fetchone()
+        return int(row[0])
+
+    def list_runs(self) -> List[str]:
+        """List all runs that hold references in the store.
+
+        Returns:
+            List[str]: Run identifiers
+        """
+        if not self.index_path.exists():
+            return []
+        with self._connect() as connection:
+            rows = connection.execute("SELECT DISTINCT run_id FROM refs").fetchall()
+        return [row[0] for row in rows]
+
+    def release_run(self, run_id: str) -> int:
+        """Drop all references held by a run.
+
+        Args:
+            run_id (str): Run identifier
+
+        Returns:
+            int: Number of references released
+        """
+        if not self.index_path.exists():
+            return 0
+        with self._connect(write=True) as connection:
+            released = connection.execute("DELETE FROM refs WHERE run_id = ?", (run_id,)).rowcount
+        return int(released)
+
+    def collect_garbage(self) -> int:
+        """Delete all blobs that are no longer referenced by any run.
+
+        Returns:
+            int: Number of bytes reclaimed
+        """
+        if not self.index_path.exists():
+            return 0
+
+        reclaimed = 0
+        with self._connect(write=True) as connection:
+            unreferenced = connection.execute(
+                "SELECT hash, extension FROM artifacts "
+                "WHERE NOT EXISTS (SELECT 1 FROM refs WHERE refs.hash = artifacts.hash)"
+            ).fetchall()
+            for artifact_hash, extension in unreferenced:
+                blob_path = self._blob_path(artifact_hash, extension)
+                if blob_path.exists():
+                    reclaimed += blob_path.stat().st_size
+                    blob_path.unlink()
+            connection.executemany(
+                "DELETE FROM phash_buckets WHERE hash = ?", [(h,) for h, _ in unreferenced]
+            )
+            connection.executemany(
+                "DELETE FROM artifacts WHERE hash = ?", [(h,) for h, _ in unreferenced]
+            )
+
+        if reclaimed:
+            logger.bugninja_log(f"🧹 Artifact store reclaimed {reclaimed} bytes")
+        return reclaimed
@@ -8,9 +8,12 @@ queue management, and comprehensive video encoding options for optimal quality a
 ## Key Components
 
 1. **BugninjaVideoRecorder** - Main class for video recording with FFmpeg
-2. **Frame Rate Control** - Precise frame rate management and timing
-3. **Queue Management** - Asynchronous frame processing with queue overflow handling
+2. **Frame Rate Control** - Event-driven frame pacing capped at the target frame rate
+3. **Queue Management** - Latest-frame coalescing with dropped/duplicated/encoded counters
 4. **FFmpeg Integration** - High-quality video encoding with configurable parameters
+5. **JPEG Pass-through** - Screencast JPEGs spooled to disk as-is and encoded when recording
+   stops, timed by their CDP timestamps
+6. **Clip Encoding** - One-shot encoding of buffered JPEG frames for failure-only recording
 
 ## Usage Examples
 
@@ -25,19 +28,23 @@ recorder = BugninjaVideoRecorder(config)
 # Start recording
 await recorder.start_recording("output.mp4")
 
-# Add frames during recording
+# Add frames during recording ("raw" ingest mode)
 await recorder.add_frame(frame_data)
 
+# Add screencast JPEGs during recording ("jpeg" ingest mode)
+await recorder.add_jpeg_frame(jpeg_bytes, timestamp_ms)
+
 # Stop recording
 stats = await recorder.stop_recording()
 ```
 """
 
 import asyncio
+import shutil
+import tempfile
 import time
-from typing import Optional
-
-import numpy as np
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 
 from bugninja.config.video_recording import VideoRecordingConfig
 
@@ -54,10 +61,18 @@ class BugninjaVideoRecorder:
         frame_interval (float): Time interval between frames based on FPS
         ffmpeg_proc (Optional[asyncio.subprocess.Process]): FFmpeg subprocess
         is_recording (bool): Whether recording is currently active
-        frame_queue (asyncio.Queue[bytes]): Queue for frame data
-        last_frame_time (float): Timestamp of last processed frame
-        frames_processed (int): Total number of frames processed
-        last_frame_data (Optional[bytes]): Last frame data for fallback
+        last_frame_time (float): Monotonic time of the last frame written to FFmpeg
+        frames_processed (int): Total number of frames written to FFmpeg (encoded)
+        last_frame_data (Optional[bytes]): Last frame written, repeated to close the video
+        jpeg_queue (asyncio.Queue[Optional[Tuple[bytes, float]]]): Queue of JPEG frames with
+            their CDP timestamps (ms) waiting to be spooled in "jpeg" ingest mode
+        start_timestamp_ms (Optional[float]): UTC timestamp (ms) at which the recording
+            started; a spooled video starts there
+        is_spooling (bool): Whether JPEG frames are spooled to disk and encoded when the
+            recording stops ("jpeg" ingest mode or a recording without a live encoder)
+        frames_dropped (int): Frames dropped because the queue was full or a newer frame
+            replaced them before they could be written
+        frames_duplicated (int): Padding frames (black/last frame) written in "raw" mode
 
     Example:
         ```python
@@ -89,16 +104,105 @@ class BugninjaVideoRecorder:
         self.frame_interval: float = 1.0 / config.fps
         self.ffmpeg_proc: Optional[asyncio.subprocess.Process] = None
         self.is_recording: bool = False
-        self.frame_queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=config.max_queue_size)
         self.last_frame_time: float = 0.0
         self.frames_processed: int = 0
         self.last_frame_data: Optional[bytes] = None
 
-    async def start_recording(self, output_file: str) -> None:
+        # "raw" mode keeps a single pending slot; newer frames replace unsent ones
+        self._pending_frame: Optional[bytes] = None
+        self._frame_event = asyncio.Event()
+        self._black_frame: Optional[bytes] = None
+        self.frames_duplicated: int = 0
+
+        self.jpeg_queue: asyncio.Queue[Optional[Tuple[bytes, float]]] = asyncio.Queue(
+            maxsize=config.max_queue_size
+        )
+        self.start_timestamp_ms: Optional[float] = None
+        self.frames_dropped: int = 0
+        self._writer_task: Optional[asyncio.Task[None]] = None
+
+        # "jpeg" mode spools frames to disk and encodes them when the recording stops
+        self.is_spooling: bool = False
+        self._spool_dir: Optional[Path] = None
+        self._spooled_frames: List[Tuple[str, float]] = []
+        self._output_file: Optional[str] = None
+
+    def _build_input_args(self) -> List[str]:
+        """Build the FFmpeg input arguments of a live "raw" mode recording."""
+        # frames are only written when the page changes; FFmpeg stamps them on arrival and
+        # repeats them itself to produce a constant frame rate output
+        return [
+            "-use_wallclock_as_timestamps",
+            "1",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "bgr24",
+            "-s",
+            f"{self.config.width}x{self.config.height}",
+            "-i",
+            "pipe:0",
+            "-r",
+            str(self.config.fps),
+        ]
+
+    def _build_output_args(
+        self, preset: Optional[str] = None, keyframe_times: Optional[Sequence[float]] = None
+    ) -> List[str]:
+        """Build the FFmpeg video encoding arguments shared by every recording.
+
+        Args:
+            preset (Optional[str]): Encoder preset overriding the configured one
+            keyframe_times (Optional[Sequence[float]]): Exact keyframe times (seconds) when
+                they are known up front; otherwise keyframes are forced every
+                `keyframe_interval` seconds if one is configured. Keyframes are only forced
+                when the clip index is enabled, since nothing else seeks to them
+        """
+        keyframe_args: List[str] = []
+        if self.config.clip_index and keyframe_times:
+            keyframe_args = ["-force_key_frames", ",".join(f"{t:.3f}" for t in keyframe_times)]
+        elif self.config.clip_index and self.config.keyframe_interval:
+            keyframe_args = [
+                "-force_key_frames",
+                f"expr:gte(t,n_forced*{self.config.keyframe_interval})",
+            ]
+
+        return [
+            *keyframe_args,
+            "-c:v",
+            self.config.codec,
+            "-pix_fmt",
+            self.config.pixel_format,
+            "-preset",
+            preset or self.config.preset,
+            "-crf",
+            str(self.config.crf),
+            "-b:v",
+            self.config.bitrate,
+            "-profile:v",
+            "high",
+        ]
+
+    async def start_recording(
+        self,
+        output_file: str,
+        preset: Optional[str] = None,
+        start_timestamp_ms: Optional[float] = None,
+        spool: bool = False,
+    ) -> None:
         """Start the recording process.
 
+        In "raw" ingest mode FFmpeg encodes while recording. In "jpeg" ingest mode the
+        screencast JPEGs are spooled to a temporary directory and encoded when the recording
+        stops, because FFmpeg cannot read their CDP timestamps from a pipe.
+
         Args:
             output_file (str): Path to the output video file
+            preset (Optional[str]): Encoder preset overriding the configured one
+            start_timestamp_ms (Optional[float]): UTC timestamp (ms) the video starts at;
+                defaults to when the first frame of the video is written
+            spool (bool): Spool JPEG frames and encode them when the recording stops,
+                whatever the ingest mode
 
         Example:
             ```python
@@ -109,42 +213,37 @@ class BugninjaVideoRecorder:
         if not output_file.endswith(f".{self.config.output_format}"):
             output_file = f"{output_file}.{self.config.output_format}"
 
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+        self.start_timestamp_ms = start_timestamp_ms
+        self.last_frame_data = None
+        self._pending_frame = None
+        self._frame_event.clear()
+
+        self.is_spooling = spool or self.config.ingest_mode == "jpeg"
+        if self.is_spooling:
+            if self.start_timestamp_ms is None:
+                self.start_timestamp_ms = time.time() * 1000
+            self._output_file = output_file
+            self._spooled_frames = []
+            self._spool_dir = Path(tempfile.mkdtemp(prefix="bugninja_frames_"))
+            self.is_recording = True
+            self._writer_task = asyncio.create_task(self._spool_jpeg_frames())
+            return
+
+        # stderr is piped but never read, so keep FFmpeg quiet to not block on a full pipe
         ffmpeg_cmd = [
             "ffmpeg",
             "-y",
-            "-f",
-            "rawvideo",
-            "-pix_fmt",
-            "bgr24",
-            "-s",
-            f"{self.config.width}x{self.config.height}",
-            "-r",
-            str(self.config.fps),
-            "-i",
-            "pipe:0",
+            "-nostats",
+            "-loglevel",
+            "error",
+            *self._build_input_args(),
+            *self._build_output_args(preset),
+            output_file,
         ]
 
-        # Add video encoding settings
-        ffmpeg_cmd.extend(
-            [
-                "-c:v",
-                self.config.codec,
-                "-pix_fmt",
-                self.config.pixel_format,
-                "-preset",
-                self.config.preset,
-                "-crf",
-                str(self.config.crf),
-                "-b:v",
-                self.config.bitrate,
-                "-profile:v",
-                "high",
-            ]
-        )
-
-        # Add output file
-        ffmpeg_cmd.append(output_file)
-
         self.ffmpeg_proc = await asyncio.create_subprocess_exec(
             *ffmpeg_cmd,
             stdin=asyncio.subprocess.PIPE,
@@ -153,12 +252,24 @@ class BugninjaVideoRecorder:
         )
 
         self.is_recording = True
-        self.frames_processed = 0
-        asyncio.create_task(self._process_frames())
-
-    async def stop_recording(self) -> dict[str, int]:
+        if self.start_timestamp_ms is None:
+            # the black frame opening the video is written right away
+            self.start_timestamp_ms = time.time() * 1000
+        if self._black_frame is None:
+            # allocated once per recorder and reused for every recording
+            self._black_frame = bytes(self.config.width * self.config.height * 3)
+        self._writer_task = asyncio.create_task(self._process_frames())
+
+    async def stop_recording(
+        self, preset: Optional[str] = None, keyframe_times: Optional[Sequence[float]] = None
+    ) -> dict[str, int]:
         """Stop the recording process.
 
+        Args:
+            preset (Optional[str]): Encoder preset for spooled frames
+            keyframe_times (Optional[Sequence[float]]): Video times (seconds) that must start
+                with a keyframe, for spooled frames
+
         Returns:
             dict[str, int]: Recording statistics including frames processed
 
@@ -170,6 +281,22 @@ class BugninjaVideoRecorder:
         """
         self.is_recording = False
 
+        if self._writer_task:
+            if self.is_spooling:
+                # Let the writer spool the queued frames before they are encoded
+                await self.jpeg_queue.put(None)
+            else:
+                # Wake the parked frame scheduler so it can finish
+                self._frame_event.set()
+            try:
+                await self._writer_task
+            except Exception:
+                pass
+            self._writer_task = None
+
+        if self.is_spooling:
+            return await self._encode_spooled_frames(preset, keyframe_times)
+
         if self.ffmpeg_proc:
             if self.ffmpeg_proc.stdin:
                 self.ffmpeg_proc.stdin.close()
@@ -177,7 +304,181 @@ class BugninjaVideoRecorder:
             await self.ffmpeg_proc.wait()
             self.ffmpeg_proc = None
 
-        return {"frames_processed": self.frames_processed}
+        return {
+            "frames_processed": self.frames_processed,
+            "frames_encoded": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "frames_duplicated": self.frames_duplicated,
+        }
+
+    async def _encode_spooled_frames(
+        self, preset: Optional[str], keyframe_times: Optional[Sequence[float]]
+    ) -> dict[str, int]:
+        """Encode the spooled frames of the recording and remove the spool."""
+        spool_dir, frames = self._spool_dir, self._spooled_frames
+        self._spool_dir, self._spooled_frames = None, []
+        stats = {"frames_processed": 0, "frames_encoded": 0, "frames_dropped": self.frames_dropped}
+        if spool_dir is None:
+            return stats
+
+        try:
+            if frames and self._output_file is not None:
+                concat_file = await asyncio.to_thread(
+                    self._write_concat_list,
+                    frames,
+                    spool_dir,
+                    time.time() * 1000,
+                    self.start_timestamp_ms,
+                )
+                await self._run_concat_encode(
+                    concat_file, self._output_file, preset, keyframe_times
+                )
+                self.frames_processed = len(frames)
+        finally:
+            await asyncio.to_thread(shutil.rmtree, spool_dir, True)
+
+        return {
+            **stats,
+            "frames_processed": self.frames_processed,
+            "frames_encoded": self.frames_processed,
+        }
+
+    async def encode_jpeg_frames(
+        self,
+        frames: Sequence[Tuple[bytes, float]],
+        output_file: str,
+        end_timestamp_ms: float,
+        preset: Optional[str] = None,
+        keyframe_times: Optional[Sequence[float]] = None,
+    ) -> dict[str, int]:
+        """Encode already captured JPEG frames into a video in a single FFmpeg run.
+
+        Used by the "on_failure" recording mode to flush its rolling buffer. The frames are
+        written to a temporary directory and fed through the FFmpeg concat demuxer with
+        per-frame durations taken from their CDP timestamps, so the clip keeps the original
+        variable frame timing without being paced in real time.
+
+        Args:
+            frames (Sequence[Tuple[bytes, float]]): JPEG frames with their CDP timestamps (ms),
+                oldest first
+            output_file (str): Path to the output video file
+            end_timestamp_ms (float): UTC timestamp (ms) at which the last frame stops showing
+            preset (Optional[str]): Encoder preset overriding the configured one
+            keyframe_times (Optional[Sequence[float]]): Clip times (seconds) that must start
+                with a keyframe, e.g. action starts
+
+        Returns:
+            dict[str, int]: Recording statistics including frames encoded
+        """
+        if not output_file.endswith(f".{self.config.output_format}"):
+            output_file = f"{output_file}.{self.config.output_format}"
+
+        self.frames_processed = 0
+        if not frames:
+            return {"frames_processed": 0, "frames_encoded": 0}
+
+        with tempfile.TemporaryDirectory(prefix="bugninja_clip_") as tmp_dir:
+            concat_file = await asyncio.to_thread(
+                self._write_concat_input, frames, Path(tmp_dir), end_timestamp_ms
+            )
+            await self._run_concat_encode(concat_file, output_file, preset, keyframe_times)
+
+        self.frames_processed = len(frames)
+        return {"frames_processed": len(frames), "frames_encoded": len(frames)}
+
+    async def _run_concat_encode(
+        self,
+        concat_file: Path,
+        output_file: str,
+        preset: Optional[str],
+        keyframe_times: Optional[Sequence[float]],
+    ) -> None:
+        """Encode the frames listed in an ffconcat file in a single FFmpeg run."""
+        ffmpeg_cmd = [
+            "ffmpeg",
+            "-y",
+            "-nostats",
+            "-loglevel",
+            "error",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(concat_file),
+            "-vf",
+            f"scale={self.config.width}:{self.config.height}",
+            "-vsync",
+            "vfr",
+            *self._build_output_args(preset, keyframe_times),
+            output_file,
+        ]
+        self.ffmpeg_proc = await asyncio.create_subprocess_exec(
+            *ffmpeg_cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await self.ffmpeg_proc.communicate()
+        returncode = self.ffmpeg_proc.returncode
+        self.ffmpeg_proc = None
+
+        if returncode != 0:
+            raise RuntimeError(f"FFmpeg failed to encode clip: {stderr.decode(errors='ignore')}")
+
+    @classmethod
+    def _write_concat_input(
+        cls, frames: Sequence[Tuple[bytes, float]], tmp_dir: Path, end_timestamp_ms: float
+    ) -> Path:
+        """Write frames and an ffconcat list describing how long each one is shown."""
+        frame_files: List[Tuple[str, float]] = []
+        for idx, (jpeg_data, timestamp_ms) in enumerate(frames):
+            frame_path = tmp_dir / f"frame_{idx:06d}.jpg"
+            frame_path.write_bytes(jpeg_data)
+            frame_files.append((frame_path.name, timestamp_ms))
+
+        return cls._write_concat_list(frame_files, tmp_dir, end_timestamp_ms)
+
+    @staticmethod
+    def _write_concat_list(
+        frame_files: Sequence[Tuple[str, float]],
+        tmp_dir: Path,
+        end_timestamp_ms: float,
+        start_timestamp_ms: Optional[float] = None,
+    ) -> Path:
+        """Write an ffconcat list showing each frame until the next frame's CDP timestamp.
+
+        Args:
+            frame_files (Sequence[Tuple[str, float]]): Frame file names in `tmp_dir` with
+                their CDP timestamps (ms), oldest first
+            tmp_dir (Path): Directory holding the frames and the list
+            end_timestamp_ms (float): UTC timestamp (ms) at which the last frame stops showing
+            start_timestamp_ms (Optional[float]): UTC timestamp (ms) the video starts at; the
+                first frame is shown from there. Defaults to the first frame's timestamp
+
+        Returns:
+            Path: Path of the written ffconcat file
+        """
+        lines = ["ffconcat version 1.0"]
+        for idx, (frame_name, timestamp_ms) in enumerate(frame_files):
+            shown_from_ms = timestamp_ms
+            if idx == 0 and start_timestamp_ms is not None:
+                shown_from_ms = min(start_timestamp_ms, timestamp_ms)
+            next_timestamp_ms = (
+                frame_files[idx + 1][1]
+                if idx + 1 < len(frame_files)
+                else max(end_timestamp_ms, timestamp_ms)
+            )
+            duration = max(next_timestamp_ms - shown_from_ms, 1.0) / 1000
+            lines.append(f"file '{frame_name}'")
+            lines.append(f"duration {duration:.6f}")
+
+        # the concat demuxer ignores the duration of the last entry unless it is repeated
+        lines.append(f"file '{frame_files[-1][0]}'")
+
+        concat_file = tmp_dir / "frames.ffconcat"
+        concat_file.write_text("\n".join(lines) + "\n")
+        return concat_file
 
     async def add_frame(self, frame_data: bytes) -> None:
         """Add a frame to the processing queue.
@@ -191,42 +492,114 @@ class BugninjaVideoRecorder:
             ```
         """
         if self.is_recording:
-            self.last_frame_data = frame_data
+            if self._pending_frame is not None:
+                self.frames_dropped += 1
+            self._pending_frame = frame_data
+            self._frame_event.set()
+
+    async def add_jpeg_frame(self, jpeg_data: bytes, timestamp_ms: float) -> None:
+        """Add an encoded screencast frame to a spooling recording.
+
+        Args:
+            jpeg_data (bytes): JPEG bytes exactly as received from `Page.screencastFrame`
+            timestamp_ms (float): CDP frame timestamp (UTC, milliseconds)
+
+        Example:
+            ```python
+            await recorder.add_jpeg_frame(jpeg_bytes, metadata["timestamp"] * 1000)
+            ```
+        """
+        if not self.is_recording:
+            return
+
+        try:
+            self.jpeg_queue.put_nowait((jpeg_data, timestamp_ms))
+        except asyncio.QueueFull:
+            self.frames_dropped += 1
+
+    async def _spool_jpeg_frames(self) -> None:
+        """Write queued JPEG frames to the spool directory, off the event loop.
+
+        Frames are kept exactly as received; their CDP timestamps become per-frame durations
+        when the spool is encoded, so neither event-loop jitter nor the time spent writing
+        affects the video timing.
+        """
+        assert self._spool_dir is not None
+        spool_dir = self._spool_dir
+
+        while True:
+            item = await self.jpeg_queue.get()
+            if item is None:
+                break
+
+            jpeg_data, timestamp_ms = item
+            frame_name = f"frame_{len(self._spooled_frames):06d}.jpg"
             try:
-                self.frame_queue.put_nowait(frame_data)
-            except asyncio.QueueFull:
-                pass
+                await asyncio.to_thread((spool_dir / frame_name).write_bytes, jpeg_data)
+            except OSError:
+                self.frames_dropped += 1
+                continue
+            self._spooled_frames.append((frame_name, timestamp_ms))
+
+    async def _write_frame(self, frame_data: bytes) -> bool:
+        """Write one frame to FFmpeg, waiting for its stdin to drain.
+
+        Args:
+            frame_data (bytes): Frame to write
+
+        Returns:
+            bool: True if the frame was written, False if FFmpeg is no longer accepting input
+        """
+        if not (
+            self.ffmpeg_proc and self.ffmpeg_proc.stdin and not self.ffmpeg_proc.stdin.is_closing()
+        ):
+            return False
+
+        try:
+            self.ffmpeg_proc.stdin.write(frame_data)
+            # waiting for the pipe to drain is the backpressure: while FFmpeg is busy, newer
+            # frames replace the pending one instead of piling up in memory
+            await self.ffmpeg_proc.stdin.drain()
+        except Exception:
+            return False
+
+        self.frames_processed += 1
+        self.last_frame_time = time.monotonic()
+        return True
 
     async def _process_frames(self) -> None:
-        """Process frames from the queue at the target frame rate."""
-        while self.is_recording or not self.frame_queue.empty():
-            current_time: float = time.time()
-
-            if current_time - self.last_frame_time >= self.frame_interval:
-                frame_to_send: Optional[bytes] = None
-
-                try:
-                    frame_to_send = self.frame_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    if self.last_frame_data is not None:
-                        frame_to_send = self.last_frame_data
-                    else:
-                        black_frame: np.ndarray = np.zeros(  # type: ignore
-                            (self.config.height, self.config.width, 3), dtype=np.uint8
-                        )
-                        frame_to_send = black_frame.tobytes()
-
-                if frame_to_send and (
-                    self.ffmpeg_proc
-                    and self.ffmpeg_proc.stdin
-                    and not self.ffmpeg_proc.stdin.is_closing()
-                ):
-                    try:
-                        self.ffmpeg_proc.stdin.write(frame_to_send)
-                        await self.ffmpeg_proc.stdin.drain()
-                        self.frames_processed += 1
-                        self.last_frame_time = current_time
-                    except Exception:
-                        break
-
-            await asyncio.sleep(0.001)
+        """Write frames to FFmpeg as they arrive, at most once per frame interval.
+
+        The scheduler parks on an event while no frames arrive, so an idle page costs no
+        CPU. The preallocated black frame opens the video at the recording start (keeping
+        action offsets aligned) and the last frame is repeated once at the end so that the
+        final still segment lasts until the recording stops.
+        """
+        assert self._black_frame is not None
+
+        if not await self._write_frame(self._black_frame):
+            return
+        self.frames_duplicated += 1
+
+        while self.is_recording or self._pending_frame is not None:
+            if self._pending_frame is None:
+                self._frame_event.clear()
+                await self._frame_event.wait()
+                continue
+
+            # cap the write rate at the target fps; frames arriving meanwhile are coalesced
+            delay = self.last_frame_time + self.frame_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            frame_to_send = self._pending_frame
+            self._pending_frame = None
+            if frame_to_send is None:
+                continue
+
+            if not await self._write_frame(frame_to_send):
+                return
+            self.last_frame_data = frame_to_send
+
+        if await self._write_frame(self.last_frame_data or self._black_frame):
+            self.frames_duplicated += 1
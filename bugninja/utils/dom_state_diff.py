@@ -0,0 +1,277 @@
+"""
+Incremental DOM state for agent prompts.
+
+Every agent step normally sends the complete list of interactive elements to the model,
+although on big pages most of them are unchanged since the previous step. This module
+keeps a reference snapshot of the clickable elements and renders later states as a
+compact diff against it, keyed on the element `branch_path_hash` and its occurrence on the
+page.
+
+## Key Components
+
+1. **ElementSnapshot** - Clickable elements of a page keyed on `branch_path_hash` and occurrence
+2. **DomStateDiff** - Added, removed and changed elements relative to a snapshot
+3. **DomStateDiffer** - Decides between a full snapshot and a diff for every step
+
+## Usage Examples
+
+```python
+from bugninja.utils.dom_state_diff import DomStateDiffer
+
+differ = DomStateDiffer(snapshot_interval=5)
+
+if differ.needs_snapshot(browser_state_summary.url):
+    differ.take_snapshot(browser_state_summary.url, browser_state_summary.selector_map)
+else:
+    diff = differ.diff(browser_state_summary.selector_map)
+    print(diff.render())
+```
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from browser_use.dom.views import DOMElementNode, SelectorMap  # type: ignore
+
+#! text of a single element is cut after this many characters in diff lines
+MAX_ELEMENT_TEXT_LENGTH: int = 200
+
+
+def render_element_line(
+    index: int,
+    element: DOMElementNode,
+    include_attributes: Optional[Sequence[str]] = None,
+) -> str:
+    """Render one clickable element the way browser-use lists it in the state message.
+
+    Args:
+        index (int): Highlight index of the element
+        element (DOMElementNode): The element
+        include_attributes (Optional[Sequence[str]]): Attributes shown to the model
+
+    Returns:
+        str: Element line, e.g. `[12]<button type='submit'>Log in />`
+    """
+    text = element.get_all_text_till_next_clickable_element().strip()
+    text = " ".join(text.split())[:MAX_ELEMENT_TEXT_LENGTH]
+
+    attributes = {
+        key: str(value)
+        for key, value in element.attributes.items()
+        if include_attributes and key in include_attributes
+    }
+    attributes_str = " ".join(f"{key}='{value}'" for key, value in attributes.items())
+
+    line = f"[{index}]<{element.tag_name}"
+    if attributes_str:
+        line += f" {attributes_str}"
+    if text:
+        line += f">{text}"
+    return line + " />"
+
+
+def element_key(path_hash: str, occurrence: int) -> str:
+    """Key of an element within a snapshot.
+
+    Elements on identical branches (e.g. the rows of a list) share their
+    `branch_path_hash`, so the n-th element with a hash, in document order, is keyed on
+    the hash and n.
+
+    Args:
+        path_hash (str): `branch_path_hash` of the element
+        occurrence (int): How many earlier elements share the hash
+
+    Returns:
+        str: Snapshot key, e.g. `<hash>#2`
+    """
+    return f"{path_hash}#{occurrence}"
+
+
+@dataclass
+class ElementSnapshot:
+    """Clickable elements of a page keyed on their `branch_path_hash` and occurrence.
+
+    Attributes:
+        url (str): URL of the page the snapshot was taken on
+        elements (Dict[str, str]): Rendered element line per element key
+        indices (Dict[str, int]): Highlight index per element key
+    """
+
+    url: str
+    elements: Dict[str, str] = field(default_factory=dict)
+    indices: Dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_selector_map(
+        cls,
+        url: str,
+        selector_map: SelectorMap,
+        include_attributes: Optional[Sequence[str]] = None,
+    ) -> "ElementSnapshot":
+        """Build a snapshot from the selector map of a browser state.
+
+        Args:
+            url (str): URL of the page
+            selector_map (SelectorMap): Highlight index to element mapping
+            include_attributes (Optional[Sequence[str]]): Attributes shown to the model
+
+        Returns:
+            ElementSnapshot: Snapshot of the clickable elements
+        """
+        snapshot = cls(url=url)
+        occurrences: Dict[str, int] = {}
+        for index, element in sorted(selector_map.items()):
+            path_hash = element.hash.branch_path_hash
+            occurrence = occurrences.get(path_hash, 0)
+            occurrences[path_hash] = occurrence + 1
+
+            key = element_key(path_hash, occurrence)
+            snapshot.elements[key] = render_element_line(index, element, include_attributes)
+            snapshot.indices[key] = index
+        return snapshot
+
+
+@dataclass
+class DomStateDiff:
+    """Clickable element changes relative to a reference snapshot.
+
+    Attributes:
+        added (List[str]): Lines of elements that were not in the snapshot
+        removed (List[str]): Snapshot lines of elements that disappeared
+        changed (List[str]): Current lines of elements whose index, text or attributes changed
+        unchanged (int): Number of elements identical to the snapshot
+    """
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the clickable elements are identical to the snapshot."""
+        return not (self.added or self.removed or self.changed)
+
+    def render(self) -> str:
+        """Render the diff as the element section of a state message.
+
+        Returns:
+            str: Human readable diff for the model
+        """
+        lines = [
+            "[Element changes since the last page snapshot - every element not listed below "
+            f"is unchanged ({self.unchanged} unchanged elements)]"
+        ]
+        if self.is_empty:
+            lines.append("no changes")
+        for title, entries in (
+            ("Added", self.added),
+            ("Changed (current index/content)", self.changed),
+            ("Removed (no longer available)", self.removed),
+        ):
+            if entries:
+                lines.append(f"{title}:")
+                lines.extend(entries)
+        return "\n".join(lines)
+
+
+class DomStateDiffer:
+    """Chooses between a full element snapshot and a diff for each agent step.
+
+    A full snapshot is sent on the first step, after navigating to another URL, every
+    `snapshot_interval` steps and whenever the diff would not be much smaller than the
+    snapshot itself. All other steps get a diff against the latest snapshot.
+
+    Attributes:
+        snapshot_interval (int): Maximum number of steps between two snapshots
+        max_diff_ratio (float): Diffs touching more than this share of the elements are
+            replaced by a full snapshot
+        snapshot (Optional[ElementSnapshot]): The latest reference snapshot
+        steps_since_snapshot (int): Diff steps sent since the latest snapshot
+    """
+
+    def __init__(
+        self,
+        snapshot_interval: int = 5,
+        max_diff_ratio: float = 0.5,
+        include_attributes: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Initialize the differ.
+
+        Args:
+            snapshot_interval (int): Maximum number of steps between two snapshots
+            max_diff_ratio (float): Share of changed elements above which a snapshot is sent
+            include_attributes (Optional[Sequence[str]]): Attributes shown to the model
+        """
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.max_diff_ratio = max_diff_ratio
+        self.include_attributes = include_attributes
+        self.snapshot: Optional[ElementSnapshot] = None
+        self.steps_since_snapshot = 0
+
+    def needs_snapshot(self, url: str) -> bool:
+        """Whether the next state has to be sent as a full snapshot.
+
+        Args:
+            url (str): URL of the current page
+
+        Returns:
+            bool: True on the first step, after navigation and when the interval is reached
+        """
+        return (
+            self.snapshot is None
+            or self.snapshot.url != url
+            or self.steps_since_snapshot + 1 >= self.snapshot_interval
+        )
+
+    def take_snapshot(self, url: str, selector_map: SelectorMap) -> ElementSnapshot:
+        """Make the current state the reference for the following diffs.
+
+        Args:
+            url (str): URL of the current page
+            selector_map (SelectorMap): Highlight index to element mapping
+
+        Returns:
+            ElementSnapshot: The new reference snapshot
+        """
+        self.snapshot = ElementSnapshot.from_selector_map(
+            url, selector_map, self.include_attributes
+        )
+        self.steps_since_snapshot = 0
+        return self.snapshot
+
+    def diff(self, selector_map: SelectorMap) -> Optional[DomStateDiff]:
+        """Diff the current clickable elements against the reference snapshot.
+
+        Args:
+            selector_map (SelectorMap): Highlight index to element mapping
+
+        Returns:
+            Optional[DomStateDiff]: The diff, or None if a full snapshot should be sent
+                instead because most of the elements changed
+        """
+        if self.snapshot is None:
+            return None
+
+        current = ElementSnapshot.from_selector_map(
+            self.snapshot.url, selector_map, self.include_attributes
+        )
+        result = DomStateDiff()
+        for key, line in current.elements.items():
+            previous = self.snapshot.elements.get(key)
+            if previous is None:
+                result.added.append(line)
+            elif previous != line:
+                result.changed.append(line)
+            else:
+                result.unchanged += 1
+        for key, line in self.snapshot.elements.items():
+            if key not in current.elements:
+                result.removed.append(line)
+
+        touched = len(result.added) + len(result.changed) + len(result.removed)
+        if touched > self.max_diff_ratio * max(len(current.elements), 1):
+            return None
+
+        self.steps_since_snapshot += 1
+        return result
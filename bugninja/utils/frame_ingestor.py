@@ -0,0 +1,390 @@
+"""
+Screencast frame ingestion for Bugninja video recording.
+
+This module provides the single component that receives `Page.screencastFrame` events
+from Chromium and feeds them to a `VideoRecordingManager`. It replaces the per-agent
+frame handlers that spawned one asyncio task per frame and decoded images on the event
+loop.
+
+## Key Components
+
+1. **FrameIngestor** - Acks frames immediately, decodes them on a shared bounded thread pool
+   and coalesces frames when decoding falls behind
+2. **Frame Deduplication** - Unchanged frames are never handed to the encoder, so still
+   periods become a single variable-frame-rate frame
+3. **Adaptive Frame Rate** - Lowers the screencast `everyNthFrame` while the page is idle
+4. **Ingest Metrics** - Per-run ingest latency, queue depth and deduplication counters
+
+## Usage Examples
+
+```python
+from bugninja.utils.frame_ingestor import FrameIngestor
+
+ingestor = FrameIngestor(video_recording_manager, cdp_session)
+await ingestor.start()
+
+# ... run ...
+
+await ingestor.stop()
+print(ingestor.get_metrics())
+```
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from playwright.async_api import CDPSession
+
+from bugninja.utils.logging_config import logger
+
+if TYPE_CHECKING:
+    from bugninja.utils.video_recording_manager import VideoRecordingManager
+
+#! decode workers shared by every recording in the process
+FRAME_DECODE_WORKERS: int = min(4, os.cpu_count() or 1)
+
+_decode_pool: Optional[ThreadPoolExecutor] = None
+_decode_pool_lock = threading.Lock()
+
+
+def _get_decode_pool() -> ThreadPoolExecutor:
+    global _decode_pool
+    with _decode_pool_lock:
+        if _decode_pool is None:
+            _decode_pool = ThreadPoolExecutor(
+                max_workers=FRAME_DECODE_WORKERS, thread_name_prefix="bugninja-frames"
+            )
+        return _decode_pool
+
+
+def _decode_raw_frame(image_data: bytes, width: int, height: int) -> Optional[bytes]:
+    """Decode a JPEG frame and resize it to bgr24 for the "raw" ingest mode."""
+    arr: np.ndarray = np.frombuffer(image_data, np.uint8)  # type: ignore
+    img: Optional[np.ndarray] = cv2.imdecode(arr, cv2.IMREAD_COLOR)  # type: ignore
+    if img is None:
+        return None
+    img = cv2.resize(img, (width, height))
+    frame_bytes: bytes = img.tobytes()
+    return frame_bytes
+
+
+def _decode_frame_payload(data: str) -> Tuple[bytes, bytes]:
+    """Decode a base64 screencast payload and hash the JPEG bytes for deduplication."""
+    image_data = base64.b64decode(data)
+    return image_data, hashlib.blake2b(image_data, digest_size=16).digest()
+
+
+def _downsample_frame(image_data: bytes) -> Optional[np.ndarray]:
+    """Decode a JPEG at 1/8 scale in grayscale, which is enough to compare frames."""
+    arr: np.ndarray = np.frombuffer(image_data, np.uint8)  # type: ignore
+    img: Optional[np.ndarray] = cv2.imdecode(arr, cv2.IMREAD_REDUCED_GRAYSCALE_8)  # type: ignore
+    return img
+
+
+def _frames_differ(previous: np.ndarray, current: np.ndarray, threshold: float) -> bool:
+    if previous.shape != current.shape:
+        return True
+    return float(np.mean(cv2.absdiff(previous, current))) > threshold
+
+
+class FrameIngestor:
+    """Receives CDP screencast frames and hands them to a video recording manager.
+
+    Frames are acknowledged as soon as they arrive so Chromium keeps streaming, while
+    base64/JPEG decoding runs on a bounded thread pool shared by all recordings. Each
+    ingestor processes one frame at a time to keep frames in order; when a newer frame
+    arrives before the previous one was processed, the older one is coalesced away.
+
+    Frames identical to the previously ingested one only refresh the latest frame and are
+    not passed to the recorder. The recorder timestamps frames by arrival, so the previous
+    frame simply stays on screen longer. Once only unchanged frames have arrived for
+    `idle_after_ms`, the screencast is restarted with `idle_every_nth_frame`, and it
+    returns to full rate on the next changed frame.
+
+    Attributes:
+        video_recording_manager (VideoRecordingManager): Manager receiving the frames
+        cdp_session (CDPSession): CDP session streaming the screencast
+        frames_received (int): Frames received from Chromium
+        frames_ingested (int): Frames handed to the recorder
+        frames_coalesced (int): Frames replaced by a newer frame before processing
+        frames_deduplicated (int): Unchanged frames that were not handed to the recorder
+        idle_switches (int): Times the screencast rate was lowered because the page was idle
+        max_queue_depth (int): Largest number of frames waiting for ack or processing
+    """
+
+    def __init__(
+        self, video_recording_manager: "VideoRecordingManager", cdp_session: CDPSession
+    ) -> None:
+        """Initialize the frame ingestor.
+
+        Args:
+            video_recording_manager (VideoRecordingManager): Manager receiving the frames
+            cdp_session (CDPSession): CDP session to start the screencast on
+        """
+        self.video_recording_manager = video_recording_manager
+        self.cdp_session = cdp_session
+
+        self._pending_acks: Deque[Any] = deque()
+        self._pending_frame: Optional[Tuple[Dict[str, Any], float, int]] = None
+        self._ack_event = asyncio.Event()
+        self._frame_event = asyncio.Event()
+        self._running = False
+        self._tasks: list[asyncio.Task[None]] = []
+
+        self.frames_received = 0
+        self.frames_ingested = 0
+        self.frames_coalesced = 0
+        self.frames_deduplicated = 0
+        self.idle_switches = 0
+        self.max_queue_depth = 0
+        self._total_latency_ms = 0.0
+        self._max_latency_ms = 0.0
+
+        self._last_frame_hash: Optional[bytes] = None
+        self._last_frame_thumbnail: Optional[np.ndarray] = None
+        self._last_change_ms: Optional[float] = None
+        self._last_skipped_frame: Optional[Tuple[bytes, float]] = None
+        self._every_nth_frame = 1
+
+    async def start(self) -> None:
+        """Start the screencast and the ack/processing workers."""
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._ack_frames()),
+            asyncio.create_task(self._process_frames()),
+        ]
+
+        self.cdp_session.on("Page.screencastFrame", self._on_frame)
+        await self._start_screencast(every_nth_frame=1)
+
+    async def stop(self) -> None:
+        """Stop the screencast and let the workers process what is still pending."""
+        if not self._running:
+            return
+
+        try:
+            await self.cdp_session.send("Page.stopScreencast")
+        except Exception:
+            pass
+
+        self._running = False
+        self._ack_event.set()
+        self._frame_event.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        # Close a still tail with its last frame; without it the deduplicated still period
+        # would end at the last changed frame instead of at the end of the recording
+        manager = self.video_recording_manager
+        if self._last_skipped_frame is not None and manager.takes_jpeg_frames:
+            image_data, timestamp_ms = self._last_skipped_frame
+            self._last_skipped_frame = None
+            await manager.add_jpeg_frame(image_data, timestamp_ms)
+
+    async def _start_screencast(self, every_nth_frame: int) -> None:
+        config = self.video_recording_manager.config
+        self._every_nth_frame = every_nth_frame
+        params: Dict[str, Any] = {
+            "format": "jpeg",
+            "quality": config.quality,
+            "everyNthFrame": every_nth_frame,
+        }
+        if config.reuse_frames_for_screenshots:
+            # frames reused as screenshots keep the full resolution; the encoder scales the video
+            params["quality"] = 100
+        else:
+            params.update(maxWidth=config.width, maxHeight=config.height)
+        await self.cdp_session.send("Page.startScreencast", params)
+
+    async def _set_frame_rate(self, every_nth_frame: int) -> None:
+        """Restart the screencast with a different `everyNthFrame`."""
+        if every_nth_frame == self._every_nth_frame or not self._running:
+            return
+        try:
+            await self.cdp_session.send("Page.stopScreencast")
+            await self._start_screencast(every_nth_frame)
+        except Exception as e:
+            logger.debug(f"Failed to change screencast frame rate: {e}")
+
+    @property
+    def every_nth_frame(self) -> int:
+        """The screencast's current `everyNthFrame`; 1 while it runs at its full rate."""
+        return self._every_nth_frame
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get the ingest metrics of this run.
+
+        Returns:
+            Dict[str, int]: Frame counters, ingest latency (ms), maximum queue depth and
+                deduplication counters
+        """
+        avg_latency_ms = (
+            self._total_latency_ms / self.frames_ingested if self.frames_ingested else 0.0
+        )
+        return {
+            "frames_received": self.frames_received,
+            "frames_ingested": self.frames_ingested,
+            "frames_coalesced": self.frames_coalesced,
+            "frames_deduplicated": self.frames_deduplicated,
+            "idle_switches": self.idle_switches,
+            "ingest_latency_avg_ms": round(avg_latency_ms),
+            "ingest_latency_max_ms": round(self._max_latency_ms),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def _on_frame(self, frame: Dict[str, Any]) -> None:
+        """CDP event callback; must stay cheap as it runs on the event loop."""
+        if not self._running:
+            return
+
+        self.frames_received += 1
+        self._pending_acks.append(frame["sessionId"])
+
+        if self._pending_frame is not None:
+            self.frames_coalesced += 1
+        sequence = self.video_recording_manager.note_frame_received()
+        self._pending_frame = (frame, time.monotonic(), sequence)
+
+        queue_depth = len(self._pending_acks) + 1
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+
+        self._ack_event.set()
+        self._frame_event.set()
+
+    async def _ack_frames(self) -> None:
+        while self._running or self._pending_acks:
+            if not self._pending_acks:
+                self._ack_event.clear()
+                await self._ack_event.wait()
+                continue
+
+            session_id = self._pending_acks.popleft()
+            try:
+                await self.cdp_session.send("Page.screencastFrameAck", {"sessionId": session_id})
+            except Exception:
+                pass
+
+    async def _process_frames(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while self._running or self._pending_frame is not None:
+            if self._pending_frame is None:
+                self._frame_event.clear()
+                await self._frame_event.wait()
+                continue
+
+            frame, received_at, sequence = self._pending_frame
+            self._pending_frame = None
+
+            try:
+                ingested = await self._ingest_frame(loop, frame, sequence)
+            except Exception as e:
+                logger.debug(f"Failed to ingest screencast frame: {e}")
+                continue
+            if not ingested:
+                continue
+
+            latency_ms = (time.monotonic() - received_at) * 1000
+            self.frames_ingested += 1
+            self._total_latency_ms += latency_ms
+            self._max_latency_ms = max(self._max_latency_ms, latency_ms)
+
+    async def _ingest_frame(
+        self, loop: asyncio.AbstractEventLoop, frame: Dict[str, Any], sequence: int = 0
+    ) -> bool:
+        """Hand one frame to the recorder.
+
+        Returns:
+            bool: True if the frame was passed to the recorder, False if it was unchanged
+        """
+        manager = self.video_recording_manager
+        config = manager.config
+        pool = _get_decode_pool()
+
+        image_data, frame_hash = await loop.run_in_executor(
+            pool, _decode_frame_payload, frame["data"]
+        )
+        # Duplicates still refresh the latest frame, which keeps reused screenshots fresh
+        latest_frame = manager.update_latest_frame(image_data, frame.get("metadata", {}), sequence)
+
+        if await self._is_unchanged(loop, pool, image_data, frame_hash):
+            self.frames_deduplicated += 1
+            self._last_skipped_frame = (image_data, latest_frame.timestamp_ms)
+            await self._update_idle_state(latest_frame.timestamp_ms, changed=False)
+            return False
+        self._last_skipped_frame = None
+        await self._update_idle_state(latest_frame.timestamp_ms, changed=True)
+
+        # Pass the JPEG through untouched and let FFmpeg decode and scale it; the
+        # "on_failure" rolling buffer and spooled recordings always keep compressed frames
+        if manager.takes_jpeg_frames:
+            await manager.add_jpeg_frame(image_data, latest_frame.timestamp_ms)
+            return True
+
+        frame_bytes = await loop.run_in_executor(
+            pool, _decode_raw_frame, image_data, config.width, config.height
+        )
+        if frame_bytes is None:
+            return False
+        await manager.add_frame(frame_bytes)
+        return True
+
+    async def _is_unchanged(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pool: ThreadPoolExecutor,
+        image_data: bytes,
+        frame_hash: bytes,
+    ) -> bool:
+        """Check whether a frame looks the same as the previously ingested one."""
+        config = self.video_recording_manager.config
+        if config.dedup_frames == "off":
+            return False
+
+        # identical payloads are always duplicates, whatever the mode
+        if frame_hash == self._last_frame_hash:
+            return True
+        self._last_frame_hash = frame_hash
+
+        if config.dedup_frames != "diff":
+            return False
+
+        thumbnail = await loop.run_in_executor(pool, _downsample_frame, image_data)
+        if thumbnail is None:
+            return False
+
+        previous = self._last_frame_thumbnail
+        if previous is not None and not _frames_differ(
+            previous, thumbnail, config.dedup_diff_threshold
+        ):
+            return True
+        self._last_frame_thumbnail = thumbnail
+        return False
+
+    async def _update_idle_state(self, timestamp_ms: float, changed: bool) -> None:
+        """Lower the screencast rate on an idle page and restore it on the next change."""
+        config = self.video_recording_manager.config
+        if config.idle_every_nth_frame <= 1:
+            return
+
+        if changed or self._last_change_ms is None:
+            self._last_change_ms = timestamp_ms
+            if changed:
+                await self._set_frame_rate(1)
+            return
+
+        if (
+            self._every_nth_frame == 1
+            and timestamp_ms - self._last_change_ms >= config.idle_after_ms
+        ):
+            self.idle_switches += 1
+            await self._set_frame_rate(config.idle_every_nth_frame)
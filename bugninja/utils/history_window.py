@@ -0,0 +1,212 @@
+"""
+Windowed message history for long agent runs.
+
+The message history of an agent grows by a model output and the action results every
+step, so the late steps of a long run send much bigger prompts than the early ones. This
+module keeps the last steps verbatim and folds older ones into a single running summary,
+built from the agent brains (evaluation, memory, next goal) the model already wrote into
+its outputs, so no extra model call is needed.
+
+Folding rewrites the middle of the history, which invalidates the provider's cached prompt
+prefix from that point. Steps are therefore folded in batches: once twice the window size is
+reached, the history is folded back to the window size.
+
+## Key Components
+
+1. **HistoryWindow** - Folds the steps older than the window into a running summary
+
+## Usage Examples
+
+```python
+from bugninja.utils.history_window import HistoryWindow
+
+window = HistoryWindow(keep_steps=10)
+
+# after the model output of a step was added to the history
+folded = window.fold(history, count_tokens=lambda message: len(str(message.content)) // 3)
+```
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from browser_use.agent.message_manager.views import (  # type: ignore
+    ManagedMessage,
+    MessageHistory,
+    MessageMetadata,
+)
+from browser_use.agent.views import AgentBrain  # type: ignore
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from bugninja.utils.logging_config import logger
+
+HISTORY_SUMMARY_MESSAGE_TYPE: str = "history_summary"
+
+#! step lines kept in the summary; older steps are only covered by the model's memory
+MAX_SUMMARY_STEP_LINES: int = 30
+#! characters of a goal, evaluation or action result in the summary
+MAX_SUMMARY_FIELD_LENGTH: int = 200
+
+_RESULT_PREFIXES = ("Action result: ", "Action error: ")
+
+
+def _shorten(text: str) -> str:
+    text = " ".join(str(text).split())
+    if len(text) <= MAX_SUMMARY_FIELD_LENGTH:
+        return text
+    return text[: MAX_SUMMARY_FIELD_LENGTH - 3] + "..."
+
+
+def _agent_output_args(message: Any) -> Optional[Dict[str, Any]]:
+    """Arguments of the model output recorded in an AI message, if it is one."""
+    if not isinstance(message, AIMessage) or not message.tool_calls:
+        return None
+    tool_call = message.tool_calls[0]
+    if tool_call.get("name") != "AgentOutput":
+        return None
+    return tool_call.get("args") or {}
+
+
+class HistoryWindow:
+    """Keeps the last steps of a message history verbatim and summarizes the older ones.
+
+    Model outputs (with their tool messages), plans and action results of folded steps
+    are removed; all other messages, such as the initial messages or a DOM snapshot, stay.
+
+    Attributes:
+        keep_steps (int): Steps kept verbatim after a fold
+        summarized_steps (int): Steps folded into the summary so far
+        memory (str): Memory of the last folded step
+    """
+
+    def __init__(self, keep_steps: int) -> None:
+        """Initialize the window.
+
+        Args:
+            keep_steps (int): Steps kept verbatim after a fold
+        """
+        self.keep_steps = keep_steps
+        self.summarized_steps = 0
+        self.memory = ""
+        self._step_lines: List[str] = []
+        self._result_lines: List[str] = []
+
+    def _summarize(self, messages: List[ManagedMessage]) -> None:
+        """Add the folded messages to the running summary."""
+        for managed in messages:
+            message = managed.message
+            args = _agent_output_args(message)
+            if args is not None:
+                self.summarized_steps += 1
+                try:
+                    brain = AgentBrain.model_validate(args.get("current_state") or {})
+                except Exception:
+                    continue
+                actions = ", ".join(
+                    name for action in args.get("action") or [] for name in action.keys()
+                )
+                self._step_lines.append(
+                    f"- Step {self.summarized_steps}: evaluation: "
+                    f"{_shorten(brain.evaluation_previous_goal)} | goal: "
+                    f"{_shorten(brain.next_goal)} | actions: {actions or 'none'}"
+                )
+                self.memory = brain.memory
+            elif isinstance(message, HumanMessage) and isinstance(message.content, str):
+                if message.content.startswith(_RESULT_PREFIXES):
+                    self._result_lines.append(f"- {_shorten(message.content)}")
+
+        self._step_lines = self._step_lines[-MAX_SUMMARY_STEP_LINES:]
+        self._result_lines = self._result_lines[-MAX_SUMMARY_STEP_LINES:]
+
+    def render(self) -> str:
+        """Render the running summary as the text of the summary message."""
+        lines = [
+            f"[Summary of your first {self.summarized_steps} steps, "
+            "older than the steps that follow]"
+        ]
+        if self.memory:
+            lines.append(f"Memory: {_shorten(self.memory)}")
+        omitted = self.summarized_steps - len(self._step_lines)
+        if omitted > 0:
+            lines.append(f"- Steps 1-{omitted}: covered by the memory above")
+        lines.extend(self._step_lines)
+        if self._result_lines:
+            lines.append("Action results:")
+            lines.extend(self._result_lines)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _is_foldable(managed: ManagedMessage) -> bool:
+        if managed.metadata.message_type == HISTORY_SUMMARY_MESSAGE_TYPE:
+            return True
+        if managed.metadata.message_type is not None:
+            # initial messages, DOM snapshots, ...
+            return False
+        message = managed.message
+        if isinstance(message, (AIMessage, ToolMessage)):
+            return True
+        return isinstance(message.content, str) and message.content.startswith(_RESULT_PREFIXES)
+
+    def fold(self, history: MessageHistory, count_tokens: Callable[[BaseMessage], int]) -> int:
+        """Fold the steps older than the window once twice the window size is reached.
+
+        Args:
+            history (MessageHistory): Message history ending with a step's model output
+            count_tokens (Callable[[BaseMessage], int]): Token estimate of a message
+
+        Returns:
+            int: Number of steps folded by this call
+        """
+        outputs = [
+            idx
+            for idx, managed in enumerate(history.messages)
+            if managed.metadata.message_type is None
+            and _agent_output_args(managed.message) is not None
+        ]
+        if len(outputs) < 2 * self.keep_steps:
+            return 0
+
+        # up to and including the tool message of the last folded model output
+        cut = outputs[len(outputs) - self.keep_steps - 1] + 1
+        folded: Set[int] = {
+            idx for idx in range(cut + 1) if self._is_foldable(history.messages[idx])
+        }
+        if not folded:
+            return 0
+
+        folded_before = self.summarized_steps
+        self._summarize(
+            [
+                history.messages[idx]
+                for idx in sorted(folded)
+                if history.messages[idx].metadata.message_type != HISTORY_SUMMARY_MESSAGE_TYPE
+            ]
+        )
+        summary = HumanMessage(content=self.render())
+        summary_tokens = count_tokens(summary)
+
+        kept: List[ManagedMessage] = []
+        insert_at: Optional[int] = None
+        for idx, managed in enumerate(history.messages):
+            if idx in folded:
+                if insert_at is None:
+                    insert_at = len(kept)
+                continue
+            kept.append(managed)
+        kept.insert(
+            insert_at if insert_at is not None else len(kept),
+            ManagedMessage(
+                message=summary,
+                metadata=MessageMetadata(
+                    tokens=summary_tokens, message_type=HISTORY_SUMMARY_MESSAGE_TYPE
+                ),
+            ),
+        )
+        history.messages = kept
+        history.current_tokens = sum(managed.metadata.tokens for managed in kept)
+
+        folded_steps = self.summarized_steps - folded_before
+        logger.bugninja_log(
+            f"🗜️ Folded {folded_steps} older steps into the history summary "
+            f"({self.summarized_steps} steps summarized, {self.keep_steps} kept verbatim)"
+        )
+        return folded_steps
@@ -0,0 +1,176 @@
+"""
+In-page mutation epoch for cheap page-change detection.
+
+Before each follow-up action of a multi-action step the agent has to know whether the
+page changed since the state the model decided on. A full DOM extraction answers that,
+but takes hundreds of milliseconds on big pages. This module injects a MutationObserver
+that counts DOM mutations in an epoch counter, so an unchanged page (same URL, same
+epoch) is detected with a single cheap `page.evaluate` call.
+
+## Key Components
+
+1. **MutationEpochTracker** - Installs the observer and compares epochs between actions
+2. **PageEpoch** - URL and mutation epoch of a page at one point in time
+
+## Usage Examples
+
+```python
+from bugninja.utils.mutation_epoch import MutationEpochTracker
+
+tracker = MutationEpochTracker()
+await tracker.mark(page)
+
+await controller.act(...)
+
+if await tracker.has_changed(page):
+    # fall back to the full DOM comparison
+    ...
+```
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from browser_use.browser.session import Page  # type: ignore
+
+from bugninja.utils.logging_config import logger
+
+#! mutations caused by browser-use element highlighting are not page changes
+MUTATION_EPOCH_SCRIPT: str = """
+() => {
+    const HIGHLIGHT_CONTAINER_ID = 'playwright-highlight-container';
+    const HIGHLIGHT_ATTRIBUTE = 'browser-user-highlight-id';
+
+    if (!window.__bugninjaMutationEpoch) {
+        const state = { documentId: Math.random().toString(36).slice(2), epoch: 0 };
+        const isHighlightNode = (node) =>
+            !!node && (
+                node.id === HIGHLIGHT_CONTAINER_ID ||
+                (node.nodeType === 1 && node.closest && node.closest('#' + HIGHLIGHT_CONTAINER_ID))
+            );
+
+        const observer = new MutationObserver((records) => {
+            for (const record of records) {
+                if (record.type === 'attributes' && record.attributeName === HIGHLIGHT_ATTRIBUTE) {
+                    continue;
+                }
+                const target = record.target.nodeType === 1
+                    ? record.target
+                    : record.target.parentElement;
+                if (isHighlightNode(target)) {
+                    continue;
+                }
+                if (record.type === 'childList') {
+                    const nodes = [...record.addedNodes, ...record.removedNodes];
+                    if (nodes.length > 0 && nodes.every(isHighlightNode)) {
+                        continue;
+                    }
+                }
+                state.epoch += 1;
+                return;
+            }
+        });
+        observer.observe(document, {
+            subtree: true,
+            childList: true,
+            attributes: true,
+            characterData: true,
+        });
+        window.__bugninjaMutationEpoch = state;
+    }
+    const state = window.__bugninjaMutationEpoch;
+    return [state.documentId, state.epoch];
+}
+"""
+
+
+@dataclass(frozen=True)
+class PageEpoch:
+    """URL and mutation epoch of a page at one point in time.
+
+    Attributes:
+        url (str): URL of the page
+        document_id (Optional[str]): Random id of the observed document
+        epoch (Optional[int]): Mutation epoch; None if the observer could not be read
+    """
+
+    url: str
+    document_id: Optional[str]
+    epoch: Optional[int]
+
+
+class MutationEpochTracker:
+    """Detects whether a page changed since the last marked point.
+
+    The first read on a document installs the observer under a random document id, so a
+    navigation or reload (new document, counter reset) never matches the marked epoch.
+    Whenever the epoch cannot be read the page is reported as changed, which keeps the
+    full DOM comparison as the safe fallback. Mutations inside closed shadow roots and
+    cross-origin iframes are not observed.
+
+    Attributes:
+        baseline (Optional[PageEpoch]): Epoch marked as "state the model decided on"
+        checks_skipped (int): Checks answered without a full DOM extraction
+        checks_changed (int): Checks that found a change and needed the full comparison
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.baseline: Optional[PageEpoch] = None
+        self.checks_skipped = 0
+        self.checks_changed = 0
+
+    @staticmethod
+    async def read(page: Page) -> PageEpoch:
+        """Read the URL and mutation epoch of a page, installing the observer if needed.
+
+        Args:
+            page (Page): Playwright page
+
+        Returns:
+            PageEpoch: Current URL and epoch of the page
+        """
+        try:
+            document_id, epoch = await page.evaluate(MUTATION_EPOCH_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Mutation epoch could not be read: {e}")
+            return PageEpoch(url=page.url, document_id=None, epoch=None)
+        return PageEpoch(
+            url=page.url,
+            document_id=str(document_id),
+            epoch=epoch if isinstance(epoch, int) else None,
+        )
+
+    async def mark(self, page: Page) -> PageEpoch:
+        """Mark the current page state as the baseline of the following checks.
+
+        Args:
+            page (Page): Playwright page
+
+        Returns:
+            PageEpoch: The new baseline
+        """
+        self.baseline = await self.read(page)
+        return self.baseline
+
+    async def has_changed(self, page: Page) -> bool:
+        """Check whether the page changed since the baseline was marked.
+
+        Args:
+            page (Page): Playwright page
+
+        Returns:
+            bool: True if the URL or epoch moved, or if the epoch could not be read
+        """
+        current = await self.read(page)
+        changed = (
+            self.baseline is None
+            or self.baseline.epoch is None
+            or current.epoch is None
+            or current != self.baseline
+        )
+        if changed:
+            self.checks_changed += 1
+        else:
+            self.checks_skipped += 1
+        return changed
@@ -9,8 +9,10 @@ and organized file storage with automatic naming and timestamping.
 
 1. **ScreenshotManager** - Main class for screenshot capture and management
 2. **Element Highlighting** - Automatic highlighting of target elements
-3. **Coordinate Extraction** - XPath-based element coordinate detection
+3. **Coordinate Extraction** - Batched XPath-based element coordinate detection
 4. **File Organization** - Automatic folder structure and naming
+5. **Artifact Deduplication** - Optional content-addressed storage via `ArtifactStore`
+6. **Screencast Frame Reuse** - Optional reuse of the live video frame as the screenshot
 
 ## Usage Examples
 
@@ -28,18 +30,86 @@ filename = await screenshot_manager.take_screenshot(
 
 """
 
+import asyncio
+import io
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from browser_use import BrowserSession  # type: ignore
 from patchright.async_api import Page  # type: ignore
 from PIL import Image, ImageDraw
 
+from bugninja.utils.artifact_store import ArtifactStore
 from bugninja.utils.logging_config import logger
 
 if TYPE_CHECKING:
     from bugninja.schemas.pipeline import BugninjaExtendedAction
+    from bugninja.utils.video_recording_manager import ScreencastFrame
+
+#! upper bound for how long the page keeps polling for a visible candidate element
+COORDINATE_WAIT_TIMEOUT_MS: int = 50
+#! pause between two polls; timers keep firing in background tabs, unlike animation frames
+COORDINATE_POLL_INTERVAL_MS: int = 10
+#! round trip allowance on top of the in-page deadline before the evaluation is abandoned
+COORDINATE_EVALUATE_GRACE_MS: int = 2000
+
+COORDINATES_WITH_XPATHS_SCRIPT: str = """
+([xpaths, timeoutMs, pollIntervalMs]) => new Promise((resolve) => {
+    const deadline = performance.now() + timeoutMs;
+
+    const findVisible = () => {
+        for (let i = 0; i < xpaths.length; i++) {
+            let element = null;
+            try {
+                element = document.evaluate(
+                    xpaths[i], document, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+            } catch (e) {
+                continue;
+            }
+            if (!element || !(element instanceof Element)) {
+                continue;
+            }
+
+            // Check if element is visible and not clipped
+            const style = window.getComputedStyle(element);
+            const rect = element.getBoundingClientRect();
+            const isVisible = style.display !== 'none' &&
+                             style.visibility !== 'hidden' &&
+                             style.opacity !== '0' &&
+                             rect.width > 0 &&
+                             rect.height > 0;
+
+            if (isVisible) {
+                const scrollX = window.pageXOffset || document.documentElement.scrollLeft;
+                const scrollY = window.pageYOffset || document.documentElement.scrollTop;
+
+                return {
+                    x: rect.left + scrollX,
+                    y: rect.top + scrollY,
+                    width: rect.width,
+                    height: rect.height,
+                    xpath_index: i
+                };
+            }
+        }
+        return null;
+    };
+
+    const poll = () => {
+        const found = findVisible();
+        if (found || performance.now() >= deadline) {
+            resolve(found);
+            return;
+        }
+        setTimeout(poll, pollIntervalMs);
+    };
+    poll();
+})
+"""
 
 
 class ScreenshotManager:
@@ -56,6 +126,11 @@ class ScreenshotManager:
         run_id (str): Unique identifier for the current run
         screenshots_dir (Path): Directory where screenshots are stored
         screenshot_counter (int): Counter for sequential screenshot naming
+        artifact_store (Optional[ArtifactStore]): Content-addressed store used instead of
+            per-run files when configured
+        frame_provider (Optional[Callable[[], Optional[ScreencastFrame]]]): Source of the
+            screencast frame showing the current page, reused as the screenshot when fresh
+        frame_max_age_ms (float): Maximum age of a reusable screencast frame
 
     Example:
         ```python
@@ -71,20 +146,56 @@ class ScreenshotManager:
         ```
     """
 
-    def __init__(self, run_id: str, base_dir: Optional[Path] = None, cli_mode: bool = False):
+    def __init__(
+        self,
+        run_id: str,
+        base_dir: Optional[Path] = None,
+        cli_mode: bool = False,
+        artifact_store: Optional[ArtifactStore] = None,
+    ):
         """Initialize screenshot manager.
 
         Args:
             run_id (str): Unique identifier for the current run
             base_dir (Optional[Path]): Base directory for screenshots (if None, uses default)
             cli_mode (bool): Whether running in CLI mode (prevents directory creation)
+            artifact_store (Optional[ArtifactStore]): Store screenshots content-addressed in
+                this shared store instead of as separate files under `screenshots/{run_id}/`
         """
         self.run_id = run_id
         self.cli_mode = cli_mode
+        self.artifact_store = artifact_store
         self.screenshots_dir = self._get_screenshots_dir(base_dir)
 
         self.screenshot_counter = 0
-        logger.bugninja_log(f"📸 Screenshots will be saved to: {self.screenshots_dir}")
+        self.frame_provider: Optional[Callable[[], Optional["ScreencastFrame"]]] = None
+        self.frame_max_age_ms: float = 0
+        self.frames_reused = 0
+
+        if self.artifact_store:
+            logger.bugninja_log(f"📸 Screenshots will be stored in: {self.artifact_store.root}")
+        else:
+            logger.bugninja_log(f"📸 Screenshots will be saved to: {self.screenshots_dir}")
+
+    def use_screencast_frames(
+        self,
+        frame_provider: Callable[[], Optional["ScreencastFrame"]],
+        max_age_ms: float,
+    ) -> None:
+        """Reuse live screencast frames as action screenshots.
+
+        When the provider has a frame of the current page rendered no earlier than
+        `max_age_ms` before the action timestamp, it is stored as the screenshot and no
+        separate capture is requested from the browser. Otherwise a regular screenshot is
+        taken.
+
+        Args:
+            frame_provider: Callable returning the frame of the current page, or None
+            max_age_ms: Maximum age of a frame relative to the action timestamp
+        """
+        self.frame_provider = frame_provider
+        self.frame_max_age_ms = max_age_ms
+        logger.bugninja_log("📸 Screenshots will reuse live screencast frames when fresh")
 
     def _get_screenshots_dir(self, base_dir: Optional[Path] = None) -> Path:
         """Get the screenshots directory for current session.
@@ -122,11 +233,12 @@ class ScreenshotManager:
         ]
         return action.get_action_type() in interactive_actions
 
-    def _generate_filename(self, action: "BugninjaExtendedAction") -> str:
+    def _generate_filename(self, action: "BugninjaExtendedAction", extension: str = "png") -> str:
         """Generate filename for screenshot.
 
         Args:
             action: The action being captured
+            extension: File extension of the screenshot
 
         Returns:
             str: Generated filename
@@ -134,7 +246,7 @@ class ScreenshotManager:
         self.screenshot_counter += 1
         action_type = action.get_action_type()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"{self.screenshot_counter:03d}_{action_type}_{timestamp}.png"
+        return f"{self.screenshot_counter:03d}_{action_type}_{timestamp}.{extension}"
 
     async def take_screenshot(
         self,
@@ -160,6 +272,8 @@ class ScreenshotManager:
             print(f"Screenshot saved: {filename}")
             ```
         """
+        action_timestamp_ms = time.time() * 1000
+
         # 1. Check if we need coordinates
         coordinates = None
         should_extract = self._should_extract_coordinates(action)
@@ -172,11 +286,19 @@ class ScreenshotManager:
             coordinates = await self._get_element_coordinates(page, action.dom_element_data)
             logger.debug(f"⚔️ Coordinates extracted: {coordinates}")
 
-        # 2. Take screenshot
+        # 2. Reuse the live screencast frame if it shows the current page and is recent enough
+        frame = self._get_fresh_screencast_frame(action_timestamp_ms)
+        if frame is not None:
+            return await self._save_screencast_frame(frame, action, coordinates)
+
+        # 3. Take screenshot (deduplicated through the artifact store if configured)
+        if self.artifact_store:
+            return await self._take_stored_screenshot(page, action, coordinates)
+
         filename = self._generate_filename(action)
         await self._take_clean_screenshot(page, browser_session, filename)
 
-        # 3. Draw rectangle if coordinates were found
+        # 4. Draw rectangle if coordinates were found
         if coordinates:
             logger.debug(f"#️⃣ Drawing rectangle on screenshot: {filename}")
             self._draw_rectangle_on_screenshot(self.screenshots_dir / filename, coordinates)
@@ -189,11 +311,131 @@ class ScreenshotManager:
         # Screenshots are always in screenshots/{run_id}/ relative to the base directory
         return screenshot_directory
 
+    def _get_fresh_screencast_frame(
+        self, action_timestamp_ms: float
+    ) -> Optional["ScreencastFrame"]:
+        """Get the screencast frame of the current page if it was rendered close to the action.
+
+        Args:
+            action_timestamp_ms: UTC timestamp in milliseconds of the screenshot request
+
+        Returns:
+            Optional[ScreencastFrame]: The frame, or None if unavailable, superseded by a
+                frame that is still being processed or stale
+        """
+        if self.frame_provider is None:
+            return None
+
+        frame = self.frame_provider()
+        if frame is None:
+            logger.debug("No current screencast frame, capturing screenshot")
+            return None
+
+        frame_age_ms = action_timestamp_ms - frame.timestamp_ms
+        if frame_age_ms > self.frame_max_age_ms:
+            logger.debug(f"Screencast frame is stale ({frame_age_ms:.0f}ms), capturing screenshot")
+            return None
+
+        return frame
+
+    async def _save_screencast_frame(
+        self,
+        frame: "ScreencastFrame",
+        action: "BugninjaExtendedAction",
+        coordinates: Optional[Dict[str, float]],
+    ) -> str:
+        """Store a screencast frame as the screenshot of an action.
+
+        The frame is kept as JPEG; it is only re-encoded when a highlight is drawn on it.
+
+        Args:
+            frame: Screencast frame to store
+            action: The action being captured
+            coordinates: Element coordinates (CSS pixels) to highlight, if any
+
+        Returns:
+            str: Path of the stored screenshot
+        """
+        screenshot_bytes = frame.data
+
+        if coordinates:
+            try:
+                with Image.open(io.BytesIO(frame.data)) as img:
+                    # screencast frames may be scaled relative to the CSS viewport
+                    scale = img.width / frame.device_width if frame.device_width else 1.0
+                    scaled_coordinates = {
+                        key: coordinates[key] * scale for key in ["x", "y", "width", "height"]
+                    }
+                    rgb_img = img.convert("RGB")
+                    self._draw_rectangle_on_image(rgb_img, scaled_coordinates)
+                    buffer = io.BytesIO()
+                    rgb_img.save(buffer, format="JPEG", quality=95)
+                    screenshot_bytes = buffer.getvalue()
+            except Exception as e:
+                logger.warning(f"Failed to draw rectangle on screencast frame: {e}")
+
+        self.frames_reused += 1
+
+        if self.artifact_store:
+            artifact_hash, blob_path = await self.artifact_store.put_async(
+                screenshot_bytes, extension="jpg", run_id=self.run_id
+            )
+            action.screenshot_hash = artifact_hash
+            return str(blob_path)
+
+        filename = self._generate_filename(action, extension="jpg")
+        self.screenshots_dir.mkdir(parents=True, exist_ok=True)
+        (self.screenshots_dir / filename).write_bytes(screenshot_bytes)
+        logger.debug(f"📸 Reused screencast frame as screenshot: {filename}")
+
+        return str(self._get_screenshots_dir() / filename)
+
+    async def _take_stored_screenshot(
+        self,
+        page: Page,
+        action: "BugninjaExtendedAction",
+        coordinates: Optional[Dict[str, float]],
+    ) -> str:
+        """Capture a screenshot in memory and put it into the artifact store.
+
+        Args:
+            page: Playwright page object
+            action: The action being captured (its `screenshot_hash` is set)
+            coordinates: Element coordinates to highlight, if any
+
+        Returns:
+            str: Path of the deduplicated screenshot blob
+        """
+        assert self.artifact_store is not None
+
+        screenshot_bytes = await self._capture_screenshot_bytes(page)
+
+        if coordinates:
+            try:
+                with Image.open(io.BytesIO(screenshot_bytes)) as img:
+                    self._draw_rectangle_on_image(img, coordinates)
+                    buffer = io.BytesIO()
+                    img.save(buffer, format="PNG")
+                    screenshot_bytes = buffer.getvalue()
+            except Exception as e:
+                logger.warning(f"Failed to draw rectangle on in-memory screenshot: {e}")
+
+        artifact_hash, blob_path = await self.artifact_store.put_async(
+            screenshot_bytes, extension="png", run_id=self.run_id
+        )
+        action.screenshot_hash = artifact_hash
+
+        return str(blob_path)
+
     async def _get_element_coordinates(
         self, page: Page, dom_element_data: Dict[str, Any]
     ) -> Optional[Dict[str, float]]:
         """
-        Extract element coordinates using XPath with simplified logic.
+        Extract element coordinates by resolving every candidate XPath in a single page call.
+
+        The main XPath and all alternative XPaths are sent to the page together and the
+        first visible match wins. If none of them resolve, the page coordinates recorded
+        for the element during DOM extraction are used, so no XPath has to be re-evaluated.
 
         Args:
             page: Playwright page object
@@ -210,96 +452,102 @@ class ScreenshotManager:
             logger.debug("No main XPath found in dom_element_data")
             return None
 
-        # Enhanced debugging: Log the XPath we're trying
-        logger.debug(f"Attempting coordinate extraction for XPath: {main_xpath}")
+        alternative_xpaths: List[str] = dom_element_data.get("alternative_relative_xpaths") or []
+        candidate_xpaths: List[str] = [main_xpath] + [
+            xpath for xpath in alternative_xpaths if xpath and xpath != main_xpath
+        ]
+        logger.debug(f"Attempting coordinate extraction for {len(candidate_xpaths)} XPaths")
 
-        # Try main XPath first
-        coordinates = await self._get_coordinates_with_xpath(page, main_xpath)
+        coordinates = await self._get_coordinates_with_xpaths(page, candidate_xpaths)
         if coordinates:
-            logger.debug(f"Successfully extracted coordinates for main XPath: {coordinates}")
+            logger.debug(f"Successfully extracted coordinates: {coordinates}")
             return coordinates
 
-        # Try alternative XPaths
-        alternative_xpaths = dom_element_data.get("alternative_relative_xpaths", [])
-        logger.debug(f"Trying {len(alternative_xpaths)} alternative XPaths")
-        for i, alt_xpath in enumerate(alternative_xpaths):
-            logger.debug(f"Trying alternative XPath {i+1}: {alt_xpath}")
-            coordinates = await self._get_coordinates_with_xpath(page, alt_xpath)
-            if coordinates:
-                logger.debug(
-                    f"Successfully extracted coordinates for alternative XPath {i+1}: {coordinates}"
-                )
-                return coordinates
+        coordinates = self._get_recorded_page_coordinates(dom_element_data)
+        if coordinates:
+            logger.debug(f"Using recorded page coordinates: {coordinates}")
+            return coordinates
 
         logger.warning("Failed to extract coordinates for any XPath")
         return None
 
-    async def _get_coordinates_with_xpath(
-        self, page: Page, xpath: str
+    async def _get_coordinates_with_xpaths(
+        self, page: Page, xpaths: List[str]
     ) -> Optional[Dict[str, float]]:
         """
-        Extract coordinates using specific XPath with document-relative positioning.
+        Resolve a list of XPaths in one in-page call and return the first visible bounding box.
+
+        The page keeps polling on a timer for up to `COORDINATE_WAIT_TIMEOUT_MS` so that
+        popups and dynamic content that appear right after the action are still found,
+        without paying a separate wait per XPath. The evaluation itself is abandoned if it
+        does not return within the deadline plus `COORDINATE_EVALUATE_GRACE_MS`.
 
         Args:
             page: Playwright page object
-            xpath: XPath selector to find element
+            xpaths: XPath selectors to try, in priority order
 
         Returns:
-            Dictionary with x, y, width, height coordinates, or None if element not found
+            Dictionary with x, y, width, height coordinates (document-relative) and the index
+            of the matching XPath, or None if no element is visible
         """
         try:
-            # Wait for element to be present and visible before extracting coordinates
-            # This handles timing issues with popups and dynamic content
-            try:
-                # Use Playwright's locator to wait for element with timeout
-                locator = page.locator(f"xpath={xpath}")
-                await locator.wait_for(state="visible", timeout=50)  # 0.05 second timeout
-            except Exception as wait_error:
-                logger.debug(f"Element with XPath '{xpath}' not found within timeout: {wait_error}")
-                return None
-
-            # Now extract coordinates since element is confirmed to be visible
-            coordinates: Optional[Dict[str, float]] = await page.evaluate(
-                """
-                (xpath) => {
-                    const element = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                    if (element) {
-                        // Check if element is visible and not clipped
-                        const style = window.getComputedStyle(element);
-                        const isVisible = style.display !== 'none' && 
-                                         style.visibility !== 'hidden' && 
-                                         style.opacity !== '0' &&
-                                         element.offsetWidth > 0 &&
-                                         element.offsetHeight > 0;
-                        
-                        if (isVisible) {
-                            const rect = element.getBoundingClientRect();
-                            const scrollX = window.pageXOffset || document.documentElement.scrollLeft;
-                            const scrollY = window.pageYOffset || document.documentElement.scrollTop;
-                            
-                            return {
-                                x: rect.left + scrollX,
-                                y: rect.top + scrollY,
-                                width: rect.width,
-                                height: rect.height
-                            };
-                        }
-                    }
-                    return null;
-                }
-                """,
-                xpath,
+            coordinates: Optional[Dict[str, float]] = await asyncio.wait_for(
+                page.evaluate(
+                    COORDINATES_WITH_XPATHS_SCRIPT,
+                    [xpaths, COORDINATE_WAIT_TIMEOUT_MS, COORDINATE_POLL_INTERVAL_MS],
+                ),
+                timeout=(COORDINATE_WAIT_TIMEOUT_MS + COORDINATE_EVALUATE_GRACE_MS) / 1000,
             )
 
             if coordinates and coordinates.get("width", 0) > 0 and coordinates.get("height", 0) > 0:
+                logger.debug(f"Matched XPath #{int(coordinates.get('xpath_index', 0))}")
                 return coordinates
 
             return None
 
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out getting coordinates for {len(xpaths)} XPaths")
+            return None
         except Exception as e:
-            logger.warning(f"Failed to get coordinates for XPath '{xpath}': {e}")
+            logger.warning(f"Failed to get coordinates for {len(xpaths)} XPaths: {e}")
             return None
 
+    @staticmethod
+    def _get_recorded_page_coordinates(
+        dom_element_data: Dict[str, Any],
+    ) -> Optional[Dict[str, float]]:
+        """
+        Build coordinates from the page coordinates captured during DOM extraction.
+
+        Args:
+            dom_element_data: DOM element data of the interacted element
+
+        Returns:
+            Dictionary with x, y, width, height coordinates, or None if not recorded
+        """
+        page_coordinates = dom_element_data.get("page_coordinates")
+        if page_coordinates is None:
+            return None
+
+        if hasattr(page_coordinates, "model_dump"):
+            page_coordinates = page_coordinates.model_dump()
+
+        try:
+            top_left = page_coordinates["top_left"]
+            coordinates = {
+                "x": float(top_left["x"]),
+                "y": float(top_left["y"]),
+                "width": float(page_coordinates["width"]),
+                "height": float(page_coordinates["height"]),
+            }
+        except (KeyError, TypeError, ValueError):
+            return None
+
+        if coordinates["width"] <= 0 or coordinates["height"] <= 0:
+            return None
+
+        return coordinates
+
     async def _take_clean_screenshot(
         self, page: Page, browser_session: Optional[BrowserSession], filename: str
     ) -> None:
@@ -329,6 +577,32 @@ class ScreenshotManager:
                 timeout=15000,  # 15 second timeout for fallback
             )
 
+    async def _capture_screenshot_bytes(self, page: Page) -> bytes:
+        """
+        Capture a PNG screenshot in memory with the same settings as `_take_clean_screenshot`.
+
+        Args:
+            page: Playwright page object
+
+        Returns:
+            bytes: Encoded PNG screenshot
+        """
+        try:
+            screenshot: bytes = await page.screenshot(
+                full_page=False,
+                timeout=5000,  # 5 second timeout
+                animations="disabled",
+                caret="hide",
+            )
+        except Exception as e:
+            # Fallback to slower but more reliable method
+            logger.warning(f"Fast screenshot failed, trying fallback: {e}")
+            screenshot = await page.screenshot(
+                full_page=False,
+                timeout=15000,  # 15 second timeout for fallback
+            )
+        return screenshot
+
     def _draw_rectangle_on_screenshot(
         self, screenshot_path: Path, coordinates: Dict[str, float]
     ) -> None:
@@ -342,49 +616,61 @@ class ScreenshotManager:
         try:
             logger.debug(f"Drawing rectangle on {screenshot_path} with coordinates: {coordinates}")
 
-            # Validate coordinates
-            if not all(key in coordinates for key in ["x", "y", "width", "height"]):
-                logger.warning(f"Invalid coordinates missing required keys: {coordinates}")
-                return
-
-            if coordinates["width"] <= 0 or coordinates["height"] <= 0:
-                logger.warning(
-                    f"Invalid coordinates with zero or negative dimensions: {coordinates}"
-                )
-                return
-
             with Image.open(screenshot_path) as img:
-                draw = ImageDraw.Draw(img)
+                if self._draw_rectangle_on_image(img, coordinates):
+                    # Save the modified image
+                    img.save(screenshot_path)
+                    logger.debug(f"Successfully drew rectangle on screenshot: {screenshot_path}")
 
-                # Calculate rectangle coordinates
-                x1 = float(coordinates["x"])
-                y1 = float(coordinates["y"])
-                x2 = float(coordinates["x"] + coordinates["width"])
-                y2 = float(coordinates["y"] + coordinates["height"])
+        except Exception as e:
+            logger.warning(f"Failed to draw rectangle on screenshot {screenshot_path}: {e}")
+            import traceback
 
-                # Ensure coordinates are within image bounds
-                img_width, img_height = img.size
-                x1 = max(0, min(x1, img_width))
-                y1 = max(0, min(y1, img_height))
-                x2 = max(0, min(x2, img_width))
-                y2 = max(0, min(y2, img_height))
+            logger.debug(f"Rectangle drawing error traceback: {traceback.format_exc()}")
 
-                logger.debug(
-                    f"Drawing rectangle from ({x1}, {y1}) to ({x2}, {y2}) on image {img_width}x{img_height}"
-                )
+    @staticmethod
+    def _draw_rectangle_on_image(img: Image.Image, coordinates: Dict[str, float]) -> bool:
+        """
+        Draw red 3px solid rectangle on an opened Pillow image.
 
-                # Draw red 3px solid rectangle
-                draw.rectangle((x1, y1, x2, y2), outline="red", width=3)
+        Args:
+            img: Image to draw on (modified in place)
+            coordinates: Dictionary with x, y, width, height coordinates
 
-                # Save the modified image
-                img.save(screenshot_path)
-                logger.debug(f"Successfully drew rectangle on screenshot: {screenshot_path}")
+        Returns:
+            bool: True if the rectangle was drawn, False if the coordinates were invalid
+        """
+        # Validate coordinates
+        if not all(key in coordinates for key in ["x", "y", "width", "height"]):
+            logger.warning(f"Invalid coordinates missing required keys: {coordinates}")
+            return False
+
+        if coordinates["width"] <= 0 or coordinates["height"] <= 0:
+            logger.warning(f"Invalid coordinates with zero or negative dimensions: {coordinates}")
+            return False
+
+        draw = ImageDraw.Draw(img)
+
+        # Calculate rectangle coordinates
+        x1 = float(coordinates["x"])
+        y1 = float(coordinates["y"])
+        x2 = float(coordinates["x"] + coordinates["width"])
+        y2 = float(coordinates["y"] + coordinates["height"])
+
+        # Ensure coordinates are within image bounds
+        img_width, img_height = img.size
+        x1 = max(0, min(x1, img_width))
+        y1 = max(0, min(y1, img_height))
+        x2 = max(0, min(x2, img_width))
+        y2 = max(0, min(y2, img_height))
 
-        except Exception as e:
-            logger.warning(f"Failed to draw rectangle on screenshot {screenshot_path}: {e}")
-            import traceback
+        logger.debug(
+            f"Drawing rectangle from ({x1}, {y1}) to ({x2}, {y2}) on image {img_width}x{img_height}"
+        )
 
-            logger.debug(f"Rectangle drawing error traceback: {traceback.format_exc()}")
+        # Draw red 3px solid rectangle
+        draw.rectangle((x1, y1, x2, y2), outline="red", width=3)
+        return True
 
     def get_screenshots_dir(self) -> Path:
         """Get the current screenshots directory"""
@@ -0,0 +1,317 @@
+"""
+Span tracing for Bugninja runs with Chrome trace-event export.
+
+The `time_execution_async` decorators only log durations. This module records nested
+spans (run → brain state → step → LLM call → action → screenshot / selector generation /
+settle) with attributes such as token counts, the selector that worked or the URL, and
+writes them per run as a Chrome trace-event JSON file that opens in Perfetto or
+`chrome://tracing`.
+
+The active tracer and the current span live in context variables, so spans nest across
+`await`s and background tasks pick up their parent automatically. Without an active
+tracer `trace_span()` returns a shared no-op span, which keeps the overhead of disabled
+tracing to one context variable lookup per span.
+
+## Key Components
+
+1. **RunTracer** - Collects the spans of one run and writes the trace file
+2. **run_trace()** - Activates a tracer for a run unless an outer one is already active
+3. **trace_span()** - Opens a span under the current span of the active tracer
+4. **current_span()** - The innermost open span, to attach attributes from nested code
+
+## Usage Examples
+
+```python
+from bugninja.utils.tracing import current_span, run_trace, trace_span
+
+with run_trace(run_id, Path("./traces/abc123.trace.json")):
+    with trace_span("step", "agent", step=1) as span:
+        with trace_span("llm", "llm", input_tokens=5120):
+            ...
+        span.set(url=page.url)
+
+# somewhere deeper, without access to the span object
+current_span().set(selector_index=2)
+```
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from bugninja.utils.logging_config import logger
+
+_active_tracer: ContextVar[Optional["RunTracer"]] = ContextVar(
+    "bugninja_active_tracer", default=None
+)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("bugninja_current_span", default=None)
+
+
+class NoopSpan:
+    """Span returned while tracing is disabled; every operation does nothing."""
+
+    def set(self, **attributes: Any) -> "NoopSpan":
+        return self
+
+    def start(self) -> "NoopSpan":
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        return None
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        return None
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    """A timed, named section of a run with attributes.
+
+    Spans are used as context managers; `start()` and `end()` are available for sections
+    that do not fit a `with` block. Spans must end in the reverse order they started
+    within the same task.
+
+    Attributes:
+        name (str): Span name shown in the trace viewer
+        category (str): Span category (e.g. "agent", "llm", "browser")
+        attributes (Dict[str, Any]): Attributes shown as the span arguments
+    """
+
+    __slots__ = ("tracer", "name", "category", "attributes", "_start_us", "_tid", "_token")
+
+    def __init__(
+        self, tracer: "RunTracer", name: str, category: str, attributes: Dict[str, Any]
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self._start_us: Optional[float] = None
+        self._tid = 0
+        self._token: Optional[Token[Optional["Span"]]] = None
+
+    def set(self, **attributes: Any) -> "Span":
+        """Add or update attributes of the span.
+
+        Returns:
+            Span: The span itself
+        """
+        self.attributes.update(attributes)
+        return self
+
+    def start(self) -> "Span":
+        """Start the span and make it the parent of spans opened in the same context.
+
+        Returns:
+            Span: The span itself
+        """
+        self._tid = self.tracer._track_id()
+        self._token = _current_span.set(self)
+        self._start_us = self.tracer._now_us()
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """End the span and record it.
+
+        Args:
+            error (Optional[BaseException]): Exception the span ended with, if any
+        """
+        if self._start_us is None:
+            return
+        end_us = self.tracer._now_us()
+        if error is not None:
+            self.attributes["error"] = f"{type(error).__name__}: {error}"
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # ended from another context than it was started in
+                pass
+            self._token = None
+        self.tracer._record(self, self._start_us, end_us)
+        self._start_us = None
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        self.end(exc)
+
+
+class RunTracer:
+    """Collects the spans of one run and writes them as Chrome trace events.
+
+    Every asyncio task gets its own track, so concurrent background work (selector
+    generation, event publishing) shows up next to the main flow instead of breaking
+    the nesting of its spans.
+
+    Attributes:
+        run_id (str): Run the trace belongs to
+        output_path (Path): Trace file written by `write()`
+        events (List[Dict[str, Any]]): Recorded trace events
+    """
+
+    def __init__(self, run_id: str, output_path: Union[str, Path]) -> None:
+        """Initialize the tracer.
+
+        Args:
+            run_id (str): Run the trace belongs to
+            output_path (Union[str, Path]): Trace file written by `write()`
+        """
+        self.run_id = run_id
+        self.output_path = Path(output_path)
+        self.events: List[Dict[str, Any]] = []
+        self._pid = os.getpid()
+        self._origin_ns = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._tracks: Dict[int, int] = {}
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    def _track_id(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self._lock:
+            tid = self._tracks.get(key)
+            if tid is None:
+                tid = len(self._tracks) + 1
+                self._tracks[key] = tid
+                track_name = "main" if tid == 1 else (task.get_name() if task else "thread")
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "tid": tid,
+                        "args": {"name": track_name},
+                    }
+                )
+            return tid
+
+    def _record(self, span: Span, start_us: float, end_us: float) -> None:
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": round(start_us, 3),
+            "dur": round(end_us - start_us, 3),
+            "pid": self._pid,
+            "tid": span._tid,
+            "args": span.attributes,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def span(self, name: str, category: str = "bugninja", **attributes: Any) -> Span:
+        """Create a span of this tracer; it starts when entered.
+
+        Args:
+            name (str): Span name
+            category (str): Span category
+            **attributes: Initial span attributes
+
+        Returns:
+            Span: The new span
+        """
+        return Span(self, name, category, attributes)
+
+    def write(self) -> Path:
+        """Write the recorded spans as a Chrome trace-event JSON file.
+
+        Returns:
+            Path: Path of the written trace file
+        """
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        trace = {
+            "traceEvents": [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "args": {"name": f"bugninja run {self.run_id}"},
+                },
+                *events,
+            ],
+            "displayTimeUnit": "ms",
+        }
+        self.output_path.write_text(json.dumps(trace, default=str), encoding="utf-8")
+        return self.output_path
+
+
+def get_active_tracer() -> Optional[RunTracer]:
+    """Get the tracer active in the current context, if any."""
+    return _active_tracer.get()
+
+
+def trace_span(name: str, category: str = "bugninja", **attributes: Any) -> Union[Span, NoopSpan]:
+    """Open a span under the current span of the active tracer.
+
+    Args:
+        name (str): Span name
+        category (str): Span category
+        **attributes: Initial span attributes
+
+    Returns:
+        Union[Span, NoopSpan]: The span, or the shared no-op span without an active tracer
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        return NOOP_SPAN
+    return Span(tracer, name, category, attributes)
+
+
+def current_span() -> Union[Span, NoopSpan]:
+    """Get the innermost open span of the current context.
+
+    Returns:
+        Union[Span, NoopSpan]: The span, or the shared no-op span if none is open
+    """
+    if _active_tracer.get() is None:
+        return NOOP_SPAN
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def run_trace(run_id: str, output_path: Optional[Union[str, Path]]) -> Iterator[None]:
+    """Trace a run into its own file, unless it is already part of an outer trace.
+
+    Nested runs (e.g. the tasks of a traced pipeline) add their spans to the outer trace.
+
+    Args:
+        run_id (str): Run to trace
+        output_path (Optional[Union[str, Path]]): Trace file; None disables tracing
+    """
+    if output_path is None or _active_tracer.get() is not None:
+        yield
+        return
+
+    tracer = RunTracer(run_id, output_path)
+    tracer_token = _active_tracer.set(tracer)
+    span_token = _current_span.set(None)
+    try:
+        yield
+    finally:
+        _current_span.reset(span_token)
+        _active_tracer.reset(tracer_token)
+        try:
+            trace_file = tracer.write()
+            logger.bugninja_log(f"🧵 Trace written to {trace_file}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write trace file: {e}")
@@ -0,0 +1,306 @@
+"""
+Per-action clip index for Bugninja run videos.
+
+Recorded videos are long, while reviewing a failure usually only needs the few seconds of
+one action. This module writes a sidecar index next to each video that maps every action
+of the run to its time range and to the keyframe (time and byte offset) it can be cut
+from, so single-action clips can be extracted by stream copy without re-encoding.
+
+## Key Components
+
+1. **VideoClipIndex** - Sidecar index (`<video>.index.json`) of keyframes and action clips
+2. **build_clip_index()** - Probes the video keyframes and writes the index for a run
+3. **extract_action_clip()** - Cuts one action's clip out of a video by stream copy
+
+## Usage Examples
+
+```python
+from bugninja.utils.video_clip_index import build_clip_index, extract_action_clip
+
+# After recording stopped and the traversal was saved
+await build_clip_index("tasks/login/videos/abc123.mp4", list(traversal.actions.values()))
+
+# Extract the clip of the fourth action
+clip_path = await extract_action_clip("tasks/login/videos/abc123.mp4", action_idx=3)
+```
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from bugninja.schemas.pipeline import BugninjaExtendedAction
+
+#! keyframes this close after an action start still count as "at" the action start
+KEYFRAME_TOLERANCE_SECONDS: float = 0.05
+
+
+class KeyframeEntry(BaseModel):
+    """A keyframe of the indexed video."""
+
+    time: float = Field(description="Presentation time in seconds")
+    byte_offset: Optional[int] = Field(default=None, description="Byte offset of the packet")
+
+
+class ActionClipEntry(BaseModel):
+    """The part of the video showing one action."""
+
+    action_idx: int = Field(description="Index of the action in the traversal")
+    action_type: str = Field(description="Type of the action")
+    start_offset: float = Field(description="Action start in seconds from video start")
+    end_offset: float = Field(description="Action end in seconds from video start")
+    keyframe_time: float = Field(description="Keyframe the clip is cut from, in seconds")
+    keyframe_byte_offset: Optional[int] = Field(
+        default=None, description="Byte offset of the keyframe packet"
+    )
+
+
+class VideoClipIndex(BaseModel):
+    """Sidecar index mapping the actions of a run to seekable parts of its video.
+
+    Attributes:
+        video_file (str): File name of the indexed video, relative to the index
+        duration (Optional[float]): Video duration in seconds
+        keyframes (List[KeyframeEntry]): Keyframes of the video, in order
+        actions (List[ActionClipEntry]): Clip of every action that appears in the video
+    """
+
+    video_file: str
+    duration: Optional[float] = None
+    keyframes: List[KeyframeEntry] = Field(default_factory=list)
+    actions: List[ActionClipEntry] = Field(default_factory=list)
+
+    @staticmethod
+    def path_for(video_path: Union[str, Path]) -> Path:
+        """Get the sidecar index path of a video.
+
+        Args:
+            video_path (Union[str, Path]): Path of the video
+
+        Returns:
+            Path: `<video without extension>.index.json`
+        """
+        video_path = Path(video_path)
+        return video_path.with_name(f"{video_path.stem}.index.json")
+
+    @classmethod
+    def load(cls, video_path: Union[str, Path]) -> "VideoClipIndex":
+        """Load the sidecar index of a video.
+
+        Args:
+            video_path (Union[str, Path]): Path of the video
+
+        Returns:
+            VideoClipIndex: The loaded index
+
+        Raises:
+            FileNotFoundError: If the video has no index
+        """
+        index_path = cls.path_for(video_path)
+        if not index_path.exists():
+            raise FileNotFoundError(f"No clip index found for video: {video_path}")
+        return cls.model_validate_json(index_path.read_text(encoding="utf-8"))
+
+    def get_action(self, action_idx: int) -> ActionClipEntry:
+        """Get the clip entry of an action.
+
+        Args:
+            action_idx (int): Index of the action in the traversal
+
+        Returns:
+            ActionClipEntry: The clip entry
+
+        Raises:
+            KeyError: If the action does not appear in the video
+        """
+        for entry in self.actions:
+            if entry.action_idx == action_idx:
+                return entry
+        raise KeyError(f"Action {action_idx} is not part of the video")
+
+
+async def probe_keyframes(
+    video_path: Union[str, Path],
+) -> Tuple[List[KeyframeEntry], Optional[float]]:
+    """List the keyframes of a video with ffprobe, decoding keyframes only.
+
+    Args:
+        video_path (Union[str, Path]): Path of the video
+
+    Returns:
+        Tuple[List[KeyframeEntry], Optional[float]]: Keyframes and the video duration
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-skip_frame",
+        "nokey",
+        "-show_entries",
+        "frame=pts_time,pkt_pts_time,best_effort_timestamp_time,pkt_pos:format=duration",
+        "-of",
+        "json",
+        str(video_path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {stderr.decode(errors='ignore')}")
+
+    probe = json.loads(stdout or b"{}")
+    keyframes: List[KeyframeEntry] = []
+    for frame in probe.get("frames", []):
+        # the timestamp field name differs between FFmpeg versions
+        time_value = (
+            frame.get("pts_time")
+            or frame.get("pkt_pts_time")
+            or frame.get("best_effort_timestamp_time")
+        )
+        if time_value is None:
+            continue
+        pos = frame.get("pkt_pos")
+        keyframes.append(
+            KeyframeEntry(time=float(time_value), byte_offset=int(pos) if pos else None)
+        )
+
+    duration = probe.get("format", {}).get("duration")
+    return keyframes, float(duration) if duration is not None else None
+
+
+def _keyframe_at_or_before(keyframes: List[KeyframeEntry], offset: float) -> KeyframeEntry:
+    candidate = keyframes[0]
+    for keyframe in keyframes:
+        if keyframe.time > offset + KEYFRAME_TOLERANCE_SECONDS:
+            break
+        candidate = keyframe
+    return candidate
+
+
+async def build_clip_index(
+    video_path: Union[str, Path],
+    actions: Sequence["BugninjaExtendedAction"],
+) -> Optional[VideoClipIndex]:
+    """Build and write the sidecar clip index of a run video.
+
+    Args:
+        video_path (Union[str, Path]): Path of the recorded video
+        actions (Sequence[BugninjaExtendedAction]): Actions of the run in traversal order,
+            with timestamps already relative to this video
+
+    Returns:
+        Optional[VideoClipIndex]: The written index, or None if the video has no keyframes
+    """
+    video_path = Path(video_path)
+    keyframes, duration = await probe_keyframes(video_path)
+    if not keyframes:
+        return None
+
+    timed_actions = [
+        (idx, action)
+        for idx, action in enumerate(actions)
+        if action.timestamps is not None and action.timestamps.video_start_offset is not None
+    ]
+
+    entries: List[ActionClipEntry] = []
+    for position, (idx, action) in enumerate(timed_actions):
+        assert action.timestamps is not None and action.timestamps.video_start_offset is not None
+        start_offset = action.timestamps.video_start_offset
+
+        # open-ended actions run until the next action starts or the video ends
+        end_offset = action.timestamps.video_end_offset
+        if end_offset is None:
+            if position + 1 < len(timed_actions):
+                next_action = timed_actions[position + 1][1]
+                assert next_action.timestamps is not None
+                end_offset = next_action.timestamps.video_start_offset
+            else:
+                end_offset = duration
+        end_offset = max(end_offset if end_offset is not None else start_offset, start_offset)
+
+        keyframe = _keyframe_at_or_before(keyframes, start_offset)
+        entries.append(
+            ActionClipEntry(
+                action_idx=idx,
+                action_type=action.get_action_type(),
+                start_offset=start_offset,
+                end_offset=end_offset,
+                keyframe_time=keyframe.time,
+                keyframe_byte_offset=keyframe.byte_offset,
+            )
+        )
+
+    index = VideoClipIndex(
+        video_file=video_path.name, duration=duration, keyframes=keyframes, actions=entries
+    )
+    VideoClipIndex.path_for(video_path).write_text(
+        index.model_dump_json(indent=2), encoding="utf-8"
+    )
+    return index
+
+
+async def extract_action_clip(
+    video_path: Union[str, Path],
+    action_idx: int,
+    output_path: Optional[Union[str, Path]] = None,
+) -> Path:
+    """Extract the clip of one action by stream copy, without re-encoding.
+
+    The clip starts at the keyframe indexed for the action, which recordings place at (or
+    just before) the action start.
+
+    Args:
+        video_path (Union[str, Path]): Path of the indexed video
+        action_idx (int): Index of the action in the traversal
+        output_path (Optional[Union[str, Path]]): Where to write the clip; defaults to
+            `<video>_action_<idx>.<ext>` next to the video
+
+    Returns:
+        Path: Path of the extracted clip
+
+    Raises:
+        FileNotFoundError: If the video has no clip index
+        KeyError: If the action does not appear in the video
+        RuntimeError: If FFmpeg fails
+    """
+    video_path = Path(video_path)
+    entry = VideoClipIndex.load(video_path).get_action(action_idx)
+
+    if output_path is None:
+        output_path = video_path.with_name(
+            f"{video_path.stem}_action_{action_idx}{video_path.suffix}"
+        )
+    output_path = Path(output_path)
+
+    clip_duration = max(entry.end_offset - entry.keyframe_time, 0.001)
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-nostats",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{entry.keyframe_time:.3f}",
+        "-i",
+        str(video_path),
+        "-t",
+        f"{clip_duration:.3f}",
+        "-c",
+        "copy",
+        "-avoid_negative_ts",
+        "make_zero",
+        str(output_path),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed to extract clip: {stderr.decode(errors='ignore')}")
+
+    return output_path
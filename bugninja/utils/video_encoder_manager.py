@@ -0,0 +1,262 @@
+"""
+Process-wide FFmpeg encoder budget for Bugninja video recording.
+
+Parallel runs (`parallel_run_tasks`, `parallel_run_mixed`, parallel CLI runs) each record
+their own video. Without a shared budget every run spawns its own FFmpeg process and the
+encoders compete with the browsers for CPU. This module provides the budget all
+`VideoRecordingManager` instances in the process share.
+
+## Key Components
+
+1. **VideoEncoderManager** - Optionally caps concurrent FFmpeg processes and queues
+   finalization of completed recordings in FIFO order
+2. **Load-based Preset** - Switches to a faster x264 preset while every encoder slot is busy
+3. **Encoder Metrics** - Active encoders, queue depth and queue wait times
+
+## Usage Examples
+
+```python
+from bugninja.utils.video_encoder_manager import VideoEncoderManager
+
+encoders = VideoEncoderManager.get_instance()
+encoders.configure(max_concurrent_encoders=2)
+
+# Live recording: only start FFmpeg if a slot is free right now
+if encoders.try_acquire():
+    ...
+    encoders.release()
+
+# Finalization: wait for a slot in FIFO order
+async with encoders.encoder_slot(preset="slow") as preset:
+    ...
+
+print(encoders.get_metrics())
+```
+"""
+
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+
+class VideoEncoderManager:
+    """Shared budget of FFmpeg encoder processes for every recording in the process.
+
+    Live recordings take a slot with `try_acquire()` when they start and hold it until
+    they stop; a recording that finds no free slot spools its frames to disk and is
+    encoded later. Finalization encodes wait for a slot with `encoder_slot()` and are
+    served in the order they were queued. Slots are handed over under a thread lock, so
+    runs on different event loops share the same budget. The budget is unlimited unless
+    a cap is configured.
+
+    Attributes:
+        max_concurrent_encoders (Optional[int]): Maximum number of FFmpeg processes running
+            at once; None means unlimited
+        fast_preset (Optional[str]): Preset used while all slots are busy; None disables it
+        active_encoders (int): Slots currently held
+        max_queue_depth (int): Largest number of encodes waiting for a slot
+        total_encodes (int): Slots granted so far
+        fast_preset_encodes (int): Encodes that were switched to `fast_preset`
+        deferred_recordings (int): Recordings that started without a live encoder
+    """
+
+    _instance: Optional["VideoEncoderManager"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_concurrent_encoders: Optional[int] = None,
+        fast_preset: Optional[str] = "veryfast",
+    ) -> None:
+        """Initialize the encoder manager.
+
+        Args:
+            max_concurrent_encoders (Optional[int]): Encoder cap; None means unlimited
+            fast_preset (Optional[str]): Preset used under load; None keeps the configured one
+        """
+        self.max_concurrent_encoders = max_concurrent_encoders
+        self.fast_preset = fast_preset
+        self.active_encoders = 0
+
+        self._lock = threading.Lock()
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+        self.max_queue_depth = 0
+        self.total_encodes = 0
+        self.fast_preset_encodes = 0
+        self.deferred_recordings = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._waited_encodes = 0
+
+    @classmethod
+    def get_instance(cls) -> "VideoEncoderManager":
+        """Get the encoder manager shared by the whole process.
+
+        Returns:
+            VideoEncoderManager: Process-wide encoder manager
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def configure(
+        self,
+        max_concurrent_encoders: Optional[int] = None,
+        fast_preset: Optional[str] = None,
+    ) -> None:
+        """Update the process-wide budget; values left as None are not changed.
+
+        Args:
+            max_concurrent_encoders (Optional[int]): New encoder cap
+            fast_preset (Optional[str]): New preset used under load
+        """
+        with self._lock:
+            if max_concurrent_encoders is not None:
+                self.max_concurrent_encoders = max(1, max_concurrent_encoders)
+            if fast_preset is not None:
+                self.fast_preset = fast_preset
+
+    def _has_free_slot(self) -> bool:
+        if self._waiters:
+            return False
+        return (
+            self.max_concurrent_encoders is None
+            or self.active_encoders < self.max_concurrent_encoders
+        )
+
+    @property
+    def queued_encodes(self) -> int:
+        """Number of encodes waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def choose_preset(self, preset: str) -> str:
+        """Pick the preset for an encode that just got a slot.
+
+        Args:
+            preset (str): Preset from the recording configuration
+
+        Returns:
+            str: `fast_preset` while every slot is busy, `preset` otherwise
+        """
+        with self._lock:
+            under_load = (
+                self.max_concurrent_encoders is not None
+                and self.active_encoders + self.queued_encodes >= self.max_concurrent_encoders
+            )
+            if under_load and self.fast_preset and self.fast_preset != preset:
+                self.fast_preset_encodes += 1
+                return self.fast_preset
+        return preset
+
+    def try_acquire(self) -> bool:
+        """Take an encoder slot if one is free right now.
+
+        Returns:
+            bool: True if a slot was taken and must be released with `release()`
+        """
+        with self._lock:
+            if self._has_free_slot():
+                self.active_encoders += 1
+                self.total_encodes += 1
+                return True
+            self.deferred_recordings += 1
+            return False
+
+    async def acquire(self) -> float:
+        """Wait for an encoder slot in FIFO order.
+
+        Returns:
+            float: Time spent waiting for the slot in milliseconds
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._has_free_slot():
+                self.active_encoders += 1
+                self.total_encodes += 1
+                return 0.0
+            waiter: "asyncio.Future[None]" = loop.create_future()
+            self._waiters.append(waiter)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+
+        started_at = loop.time()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # the slot was already handed to us; pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        waited_ms = (loop.time() - started_at) * 1000
+        with self._lock:
+            self.total_encodes += 1
+            self._waited_encodes += 1
+            self._total_wait_ms += waited_ms
+            self._max_wait_ms = max(self._max_wait_ms, waited_ms)
+        return waited_ms
+
+    def release(self) -> None:
+        """Release a slot, handing it straight to the oldest waiting encode if any."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue
+                # the slot stays taken and moves to the waiter, possibly on another loop
+                waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+                return
+            self.active_encoders = max(0, self.active_encoders - 1)
+
+    def _grant(self, waiter: "asyncio.Future[None]") -> None:
+        if waiter.done():
+            # cancelled between hand-over and wake-up
+            self.release()
+            return
+        waiter.set_result(None)
+
+    @asynccontextmanager
+    async def encoder_slot(self, preset: str) -> AsyncIterator[str]:
+        """Hold an encoder slot for one finalization encode.
+
+        Args:
+            preset (str): Preset from the recording configuration
+
+        Yields:
+            str: Preset to encode with
+        """
+        await self.acquire()
+        try:
+            yield self.choose_preset(preset)
+        finally:
+            self.release()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get the encoder queue metrics of the process.
+
+        Returns:
+            Dict[str, int]: Slot usage (a cap of 0 means unlimited), queue depth, preset
+                switches and queue wait (ms)
+        """
+        with self._lock:
+            avg_wait_ms = (
+                self._total_wait_ms / self._waited_encodes if self._waited_encodes else 0.0
+            )
+            return {
+                "max_concurrent_encoders": self.max_concurrent_encoders or 0,
+                "active_encoders": self.active_encoders,
+                "queued_encodes": self.queued_encodes,
+                "max_queue_depth": self.max_queue_depth,
+                "total_encodes": self.total_encodes,
+                "fast_preset_encodes": self.fast_preset_encodes,
+                "deferred_recordings": self.deferred_recordings,
+                "queue_wait_avg_ms": round(avg_wait_ms),
+                "queue_wait_max_ms": round(self._max_wait_ms),
+            }
@@ -8,9 +8,14 @@ integration with the custom video recorder for high-quality video output.
 ## Key Components
 
 1. **VideoRecordingManager** - Main class for video recording session management
-2. **CDP Integration** - Chrome DevTools Protocol integration for frame capture
+2. **CDP Integration** - Screencast frames ingested through a shared `FrameIngestor`
 3. **Session Lifecycle** - Start/stop recording with proper cleanup
 4. **Frame Management** - Coordinated frame addition and processing
+5. **ScreencastFrame** - Latest full-resolution screencast frame, reusable as a screenshot
+6. **Failure-only Recording** - Rolling frame buffer that is only encoded for kept runs
+7. **Encoder Budget** - Live FFmpeg processes and finalization encodes share the
+   process-wide `VideoEncoderManager`
+8. **Clip Index** - Keyframes at action starts and a per-action sidecar index
 
 ## Usage Examples
 
@@ -22,27 +27,57 @@ from bugninja.config.video_recording import VideoRecordingConfig
 config = VideoRecordingConfig()
 video_manager = VideoRecordingManager("test_run", config)
 
-# Start recording
+# Start recording (starts the CDP screencast and frame ingestion)
 await video_manager.start_recording("output", cdp_session)
 
-# Add frames during recording
-await video_manager.add_frame(frame_data)
-
 # Stop recording
 stats = await video_manager.stop_recording()
+
+# "on_failure" mode: keep the buffered clip and align action offsets with it
+video_manager.mark_for_keep("healing started")
+stats = await video_manager.stop_recording()
+video_manager.rebase_action_timestamps(actions)
 ```
 """
 
 import os
 import shutil
 import time
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from playwright.async_api import CDPSession
 
 from bugninja.config.video_recording import VideoRecordingConfig
 from bugninja.utils.custom_video_recorder import BugninjaVideoRecorder
+from bugninja.utils.frame_ingestor import FrameIngestor
+from bugninja.utils.logging_config import logger
+from bugninja.utils.video_clip_index import build_clip_index
+from bugninja.utils.video_encoder_manager import VideoEncoderManager
+
+if TYPE_CHECKING:
+    from bugninja.schemas.pipeline import BugninjaExtendedAction
+
+
+@dataclass
+class ScreencastFrame:
+    """A single screencast frame as delivered by Chromium, before any video resizing.
+
+    Attributes:
+        data (bytes): Encoded JPEG frame
+        timestamp_ms (float): UTC timestamp in milliseconds at which the frame was rendered
+        device_width (Optional[float]): Width of the viewport in CSS pixels
+        device_height (Optional[float]): Height of the viewport in CSS pixels
+        sequence (int): Number of screencast frames received up to and including this one
+    """
+
+    data: bytes
+    timestamp_ms: float
+    device_width: Optional[float] = None
+    device_height: Optional[float] = None
+    sequence: int = 0
 
 
 class VideoRecordingManager:
@@ -60,6 +95,18 @@ class VideoRecordingManager:
         output_dir (str): Directory for output video files
         config (VideoRecordingConfig): Video recording configuration
         video_start_time (Optional[float]): UTC timestamp when video recording started (milliseconds)
+        latest_frame (Optional[ScreencastFrame]): Most recent screencast frame received
+        frame_ingestor (Optional[FrameIngestor]): Ingestor feeding screencast frames while recording
+        output_path (Optional[str]): Path of the video file of the current recording
+        keep_reasons (List[str]): Why the recording is kept in "on_failure" mode; empty means
+            the buffered frames are discarded when recording stops
+        clip_start_offset (Optional[float]): Seconds between `video_start_time` and the start
+            of the written video, or None if no video was written
+        encoder_manager (VideoEncoderManager): Process-wide encoder budget
+        deferred (bool): Whether this "always" recording found no free encoder slot and
+            spools its frames to disk until it can be encoded
+        action_boundaries_ms (List[float]): UTC timestamps (ms) of action starts, used to
+            place keyframes when buffered frames are encoded
 
     Example:
         ```python
@@ -73,9 +120,6 @@ class VideoRecordingManager:
         # Start recording
         await video_manager.start_recording("output", cdp_session)
 
-        # Add frames during recording
-        await video_manager.add_frame(frame_data)
-
         # Stop recording
         stats = await video_manager.stop_recording()
         ```
@@ -96,6 +140,23 @@ class VideoRecordingManager:
         self.output_dir = config.output_dir
         self.cli_mode = cli_mode
         self.video_start_time: Optional[float] = None
+        self.latest_frame: Optional[ScreencastFrame] = None
+        self.frames_received = 0
+        self.frame_ingestor: Optional[FrameIngestor] = None
+        self.output_path: Optional[str] = None
+
+        # "on_failure" rolling frame buffer of (JPEG bytes, CDP timestamp in ms)
+        self._frame_buffer: Deque[Tuple[bytes, float]] = deque()
+        self._frame_buffer_bytes = 0
+        self.frames_evicted = 0
+        self.keep_reasons: List[str] = []
+        self.clip_start_offset: Optional[float] = 0.0
+
+        self.encoder_manager = VideoEncoderManager.get_instance()
+        self.encoder_manager.configure(config.max_concurrent_encoders, config.fast_preset)
+        self.deferred = False
+        self._holds_encoder_slot = False
+        self.action_boundaries_ms: List[float] = []
 
         self.config = config
 
@@ -113,7 +174,7 @@ class VideoRecordingManager:
         return shutil.which("ffmpeg") is not None
 
     async def start_recording(self, output_file: str, cdp_session: CDPSession) -> None:
-        """Start video recording.
+        """Start video recording and the CDP screencast feeding it.
 
         Args:
             output_file (str): Base name for the output file
@@ -143,19 +204,54 @@ class VideoRecordingManager:
                 self.output_dir, f"run_{self.run_id}.{self.recorder.config.output_format}"
             )
 
-        # Start recording
-        await self.recorder.start_recording(output_path)
+        self.output_path = output_path
+        self.keep_reasons = []
+        self.clip_start_offset = 0.0
+        self.action_boundaries_ms = []
+        self._clear_frame_buffer()
+
+        # Single origin of every video offset of this recording, fixed before any frame
+        # arrives; a live FFmpeg recording moves it to the moment its video starts
+        self.video_start_time = time.time() * 1000  # UTC timestamp in milliseconds
+
+        # Start recording; in "on_failure" mode FFmpeg is only spawned if the run is kept.
+        # "jpeg" ingest, and any recording without a free encoder slot, spools every frame
+        # to disk and only needs an encoder once it stops
+        self.deferred = False
+        if self.config.mode == "always":
+            if self.config.ingest_mode == "jpeg":
+                await self.recorder.start_recording(
+                    output_path, start_timestamp_ms=self.video_start_time
+                )
+            elif self.encoder_manager.try_acquire():
+                self._holds_encoder_slot = True
+                preset = self.encoder_manager.choose_preset(self.config.preset)
+                try:
+                    await self.recorder.start_recording(output_path, preset=preset)
+                except Exception:
+                    self._release_encoder_slot()
+                    raise
+                # the live video starts once FFmpeg is up, not when it was requested
+                self.video_start_time = self.recorder.start_timestamp_ms
+            else:
+                self.deferred = True
+                await self.recorder.start_recording(
+                    output_path, start_timestamp_ms=self.video_start_time, spool=True
+                )
+                logger.bugninja_log("🎥 All video encoders busy; spooling frames to disk")
         self.cdp_session = cdp_session
         self.is_recording = True
 
-        # Capture video start time for timestamp calculations
-        self.video_start_time = time.time() * 1000  # UTC timestamp in milliseconds
+        # Start the screencast; frames are acked, decoded and fed to the recorder off-loop
+        self.frame_ingestor = FrameIngestor(self, cdp_session)
+        await self.frame_ingestor.start()
 
     async def stop_recording(self) -> dict[str, int]:
         """Stop video recording.
 
         Returns:
-            dict[str, int]: Recording statistics including frames processed
+            dict[str, int]: Recording statistics including frames processed, ingest latency
+                and queue depth
 
         Example:
             ```python
@@ -164,11 +260,241 @@ class VideoRecordingManager:
             ```
         """
         if self.is_recording:
-            stats = await self.recorder.stop_recording()
+            ingest_metrics: dict[str, int] = {}
+            if self.frame_ingestor:
+                await self.frame_ingestor.stop()
+                ingest_metrics = self.frame_ingestor.get_metrics()
+                self.frame_ingestor = None
+
             self.is_recording = False
-            return stats
+            self.latest_frame = None
+            if self._uses_frame_buffer:
+                stats = await self._flush_frame_buffer()
+            elif self.recorder.is_spooling:
+                stats = await self._encode_spooled_frames()
+            else:
+                try:
+                    stats = await self.recorder.stop_recording()
+                finally:
+                    self._release_encoder_slot()
+            return {**stats, **ingest_metrics}
         return {"frames_processed": 0}
 
+    @property
+    def _uses_frame_buffer(self) -> bool:
+        return self.config.mode == "on_failure"
+
+    @property
+    def is_buffering(self) -> bool:
+        """Whether frames currently go to the in-memory buffer instead of FFmpeg."""
+        return self.is_recording and self._uses_frame_buffer
+
+    @property
+    def takes_jpeg_frames(self) -> bool:
+        """Whether frames go to `add_jpeg_frame()` (buffer or spool) instead of live FFmpeg."""
+        return self.is_buffering or (self.is_recording and self.recorder.is_spooling)
+
+    def _release_encoder_slot(self) -> None:
+        if self._holds_encoder_slot:
+            self._holds_encoder_slot = False
+            self.encoder_manager.release()
+
+    def mark_for_keep(self, reason: str) -> None:
+        """Keep the video of this run in "on_failure" mode.
+
+        Once kept, buffered frames are no longer evicted by age (only by the memory cap), so
+        the clip runs from the buffered lead-up until the recording stops. Has no effect in
+        "always" mode, where every run is encoded anyway.
+
+        Args:
+            reason (str): Why the video is kept (e.g. "run failed", "healing started")
+        """
+        if self.config.mode != "on_failure" or reason in self.keep_reasons:
+            return
+        self.keep_reasons.append(reason)
+        logger.bugninja_log(f"🎥 Keeping video recording: {reason}")
+
+    def mark_action_boundary(self, timestamp_ms: float) -> None:
+        """Record the start of an action so the encoded video has a keyframe there.
+
+        Args:
+            timestamp_ms (float): UTC timestamp of the action start in milliseconds
+        """
+        if self.is_recording:
+            self.action_boundaries_ms.append(timestamp_ms)
+
+    async def write_clip_index(self, actions: Iterable["BugninjaExtendedAction"]) -> Optional[Path]:
+        """Write the per-action clip index next to the recorded video.
+
+        Call after `stop_recording()` and `rebase_action_timestamps()`, with the actions in
+        traversal order.
+
+        Args:
+            actions (Iterable[BugninjaExtendedAction]): Actions of the run in traversal order
+
+        Returns:
+            Optional[Path]: Path of the written index, or None if no index was written
+        """
+        if (
+            not self.config.clip_index
+            or self.clip_start_offset is None
+            or self.output_path is None
+            or not Path(self.output_path).exists()
+        ):
+            return None
+
+        try:
+            index = await build_clip_index(self.output_path, list(actions))
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to write video clip index: {e}")
+            return None
+
+        if index is None:
+            return None
+        index_path = index.path_for(self.output_path)
+        logger.bugninja_log(f"🎞️ Wrote clip index for {len(index.actions)} actions")
+        return index_path
+
+    def rebase_action_timestamps(self, actions: Iterable["BugninjaExtendedAction"]) -> None:
+        """Shift action video offsets so that they are relative to the written video.
+
+        Offsets are captured relative to `video_start_time` while recording. In "on_failure"
+        mode the flushed clip only starts at the oldest buffered frame, and no video exists
+        at all when the run was not kept. Call this once after `stop_recording()`.
+
+        Args:
+            actions (Iterable[BugninjaExtendedAction]): Actions whose timestamps are adjusted
+        """
+        if self.clip_start_offset == 0.0:
+            return
+
+        for action in actions:
+            timestamps = action.timestamps
+            if timestamps is None:
+                continue
+
+            if self.clip_start_offset is None:
+                action.timestamps = None
+                continue
+
+            start = timestamps.video_start_offset
+            end = timestamps.video_end_offset
+            if start is not None:
+                start -= self.clip_start_offset
+            if end is not None:
+                end -= self.clip_start_offset
+
+            # the action happened entirely before the buffered clip
+            last_offset = end if end is not None else start
+            if last_offset is not None and last_offset < 0:
+                action.timestamps = None
+                continue
+
+            timestamps.video_start_offset = max(start, 0.0) if start is not None else None
+            timestamps.video_end_offset = end
+
+        # offsets are now relative to the clip; rebasing again must not shift them twice
+        if self.clip_start_offset is not None:
+            self.clip_start_offset = 0.0
+
+    async def _encode_spooled_frames(self) -> dict[str, int]:
+        """Encode the frames the recorder spooled ("jpeg" ingest or a deferred recording).
+
+        Like buffered flushes, the encode waits for a slot of the process-wide encoder budget.
+        """
+        assert self.video_start_time is not None
+        keyframe_times = [
+            (boundary_ms - self.video_start_time) / 1000.0
+            for boundary_ms in self.action_boundaries_ms
+            if boundary_ms >= self.video_start_time
+        ]
+        wait_started = time.monotonic()
+        try:
+            async with self.encoder_manager.encoder_slot(self.config.preset) as preset:
+                encoder_wait_ms = round((time.monotonic() - wait_started) * 1000)
+                stats = await self.recorder.stop_recording(
+                    preset=preset, keyframe_times=keyframe_times
+                )
+        except Exception as e:
+            logger.error(f"❌ Failed to encode spooled video frames: {e}")
+            self.clip_start_offset = None
+            return {"frames_processed": 0}
+        return {**stats, "encoder_wait_ms": encoder_wait_ms}
+
+    def _buffer_frame(self, image_data: bytes, timestamp_ms: float) -> None:
+        """Append a frame to the rolling buffer and evict frames beyond its bounds."""
+        self._frame_buffer.append((image_data, timestamp_ms))
+        self._frame_buffer_bytes += len(image_data)
+
+        max_bytes = self.config.buffer_max_mb * 1024 * 1024
+        max_age_ms = self.config.buffer_seconds * 1000
+
+        while len(self._frame_buffer) > 1:
+            oldest_data, oldest_timestamp_ms = self._frame_buffer[0]
+            over_memory_cap = self._frame_buffer_bytes > max_bytes
+            # a kept recording grows until it stops, bounded by the memory cap only
+            too_old = not self.keep_reasons and timestamp_ms - oldest_timestamp_ms > max_age_ms
+            if not (over_memory_cap or too_old):
+                break
+
+            self._frame_buffer.popleft()
+            self._frame_buffer_bytes -= len(oldest_data)
+            self.frames_evicted += 1
+
+    def _clear_frame_buffer(self) -> None:
+        self._frame_buffer.clear()
+        self._frame_buffer_bytes = 0
+        self.frames_evicted = 0
+
+    async def _flush_frame_buffer(self) -> dict[str, int]:
+        """Encode the buffer if the run was kept, otherwise discard it.
+
+        The encode waits for a slot of the process-wide encoder budget, so finalizations of
+        concurrently completed recordings are queued instead of running all at once.
+        """
+        frames = list(self._frame_buffer)
+        stats = {
+            "frames_processed": 0,
+            "frames_buffered": len(frames),
+            "frames_evicted": self.frames_evicted,
+            "buffer_bytes": self._frame_buffer_bytes,
+        }
+        self._clear_frame_buffer()
+
+        if not self.keep_reasons or not frames or self.output_path is None:
+            self.clip_start_offset = None
+            logger.bugninja_log("🎥 Run not kept; discarded buffered video frames")
+            return stats
+
+        end_timestamp_ms = time.time() * 1000
+        try:
+            wait_started = time.monotonic()
+            # keyframes exactly at the action starts that fall inside the clip
+            keyframe_times = [
+                (boundary_ms - frames[0][1]) / 1000.0
+                for boundary_ms in self.action_boundaries_ms
+                if boundary_ms >= frames[0][1]
+            ]
+            async with self.encoder_manager.encoder_slot(self.config.preset) as preset:
+                stats["encoder_wait_ms"] = round((time.monotonic() - wait_started) * 1000)
+                encode_stats = await self.recorder.encode_jpeg_frames(
+                    frames,
+                    self.output_path,
+                    end_timestamp_ms=end_timestamp_ms,
+                    preset=preset,
+                    keyframe_times=keyframe_times,
+                )
+        except Exception as e:
+            logger.error(f"❌ Failed to encode buffered video frames: {e}")
+            self.clip_start_offset = None
+            return stats
+
+        assert self.video_start_time is not None
+        self.clip_start_offset = (frames[0][1] - self.video_start_time) / 1000.0
+        reasons = ", ".join(self.keep_reasons)
+        logger.bugninja_log(f"🎥 Encoded {len(frames)} buffered frames ({reasons})")
+        return {**stats, **encode_stats}
+
     async def add_frame(self, frame_data: bytes) -> None:
         """Add a frame to the recording.
 
@@ -183,6 +509,77 @@ class VideoRecordingManager:
         if self.is_recording:
             await self.recorder.add_frame(frame_data)
 
+    async def add_jpeg_frame(self, image_data: bytes, timestamp_ms: float) -> None:
+        """Add an encoded screencast frame to a spooling recording.
+
+        In "on_failure" mode the frame goes to the rolling buffer instead, whatever the
+        ingest mode.
+
+        Args:
+            image_data (bytes): JPEG bytes as received from `Page.screencastFrame`
+            timestamp_ms (float): CDP frame timestamp (UTC, milliseconds)
+        """
+        if self.is_buffering:
+            self._buffer_frame(image_data, timestamp_ms)
+        elif self.is_recording:
+            await self.recorder.add_jpeg_frame(image_data, timestamp_ms)
+
+    def note_frame_received(self) -> int:
+        """Count a screencast frame as soon as Chromium delivers it, before it is processed.
+
+        Returns:
+            int: Sequence number of the frame
+        """
+        self.frames_received += 1
+        return self.frames_received
+
+    def update_latest_frame(
+        self, image_data: bytes, metadata: Dict[str, Any], sequence: int = 0
+    ) -> ScreencastFrame:
+        """Remember the most recent screencast frame so it can be reused as a screenshot.
+
+        Args:
+            image_data (bytes): Encoded JPEG frame as received from `Page.screencastFrame`
+            metadata (Dict[str, Any]): Frame metadata from `Page.screencastFrame`
+            sequence (int): Sequence number from `note_frame_received`
+
+        Returns:
+            ScreencastFrame: The stored frame with its resolved timestamp
+        """
+        # CDP reports the frame timestamp in seconds; fall back to the receive time
+        frame_timestamp = metadata.get("timestamp")
+        timestamp_ms = (
+            float(frame_timestamp) * 1000 if frame_timestamp is not None else time.time() * 1000
+        )
+
+        self.latest_frame = ScreencastFrame(
+            data=image_data,
+            timestamp_ms=timestamp_ms,
+            device_width=metadata.get("deviceWidth"),
+            device_height=metadata.get("deviceHeight"),
+            sequence=sequence,
+        )
+        return self.latest_frame
+
+    def get_latest_frame(self) -> Optional[ScreencastFrame]:
+        """Get the screencast frame showing the page as it looks now.
+
+        Chromium sends a frame for every repaint while the screencast runs at its full rate,
+        so as long as no newer frame was received, the latest one shows the current page.
+        At a lowered idle rate repaints may be skipped, so no frame is returned then.
+
+        Returns:
+            Optional[ScreencastFrame]: Latest frame, or None if not recording, no frame yet,
+                a newer frame is still being processed or the screencast skips frames
+        """
+        if not self.is_recording or self.latest_frame is None:
+            return None
+        if self.frame_ingestor is None or self.frame_ingestor.every_nth_frame != 1:
+            return None
+        if self.latest_frame.sequence < self.frames_received:
+            return None
+        return self.latest_frame
+
     def get_video_offset(self, timestamp: float) -> Optional[float]:
         """Calculate video offset for a given timestamp.
 
@@ -202,4 +599,6 @@ class VideoRecordingManager:
         if self.video_start_time is None:
             return None
 
+        # Every ingest mode starts its video at `video_start_time`; buffered ("on_failure")
+        # offsets are rebased onto the flushed clip after recording stops
         return (timestamp - self.video_start_time) / 1000.0  # Convert to seconds
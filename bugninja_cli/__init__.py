@@ -8,6 +8,8 @@ This module provides a **comprehensive command-line interface** for:
 - task execution and monitoring
 - session replay and healing
 - statistics and reporting
+- run artifact retention
+- per-action video clip extraction
 
 ## Key Components
 
@@ -17,6 +19,8 @@ This module provides a **comprehensive command-line interface** for:
 4. **run** - Task execution and automation
 5. **replay** - Session replay with healing
 6. **stats** - Statistics and reporting
+7. **gc** - Run artifact retention and compaction
+8. **clip** - Per-action video clip extraction
 
 ## Usage Examples
 
@@ -41,6 +45,12 @@ bugninja replay task-name
 
 # View project statistics
 bugninja stats
+
+# Apply retention policies to run artifacts
+bugninja gc
+
+# Extract the video clip of one action of a run
+bugninja clip run_123 3
 ```
 
 ## Architecture
@@ -56,6 +66,8 @@ architecture with utility modules for:
 import rich_click as click
 
 from bugninja_cli.add import add
+from bugninja_cli.clip import clip
+from bugninja_cli.gc import gc
 from bugninja_cli.init import init
 from bugninja_cli.import_cmd import import_cmd
 from bugninja_cli.replay import replay
@@ -83,6 +95,8 @@ bugninja.add_command(import_cmd)
 bugninja.add_command(run)
 bugninja.add_command(replay)
 bugninja.add_command(stats)
+bugninja.add_command(gc)
+bugninja.add_command(clip)
 
 if __name__ == "__main__":
     bugninja()
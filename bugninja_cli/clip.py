@@ -0,0 +1,140 @@
+"""
+Clip extraction command for Bugninja CLI.
+
+This module provides the **clip command** for cutting the part of a run video that shows
+a single action, using the per-action clip index written next to every recorded video.
+
+## Key Features
+
+1. **Fast Extraction** - Stream copy from the indexed keyframe, no re-encoding
+2. **Run Lookup** - Finds the run video in any task's `videos/` directory
+3. **Action Overview** - Lists the indexed actions of a run
+
+## Usage Examples
+
+```bash
+# Extract the clip of the fourth action of a run
+bugninja clip abc123 3
+
+# Write the clip to a specific file
+bugninja clip abc123 3 --output failure.mp4
+
+# List the actions available in the run video
+bugninja clip abc123 --list
+```
+"""
+
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+import rich_click as click
+from rich.console import Console
+from rich.table import Table
+
+from bugninja_cli.utils.project_validator import require_bugninja_project
+from bugninja_cli.utils.style import MARKDOWN_CONFIG
+
+console = Console()
+
+
+def _find_run_videos(project_root: Path, run_id: str) -> List[Path]:
+    videos: List[Path] = []
+    for videos_dir in (project_root / "tasks").glob("*/videos"):
+        for name in (run_id, f"run_{run_id}"):
+            videos.extend(
+                path
+                for path in videos_dir.glob(f"{name}.*")
+                if not path.name.endswith(".index.json")
+            )
+    return videos
+
+
+@click.command()
+@click.rich_config(help_config=MARKDOWN_CONFIG)
+@click.argument("run_id")
+@click.argument("action_idx", type=int, required=False)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Output file for the clip (defaults to `<video>_action_<idx>.mp4` next to the video)",
+)
+@click.option(
+    "--list",
+    "list_actions",
+    is_flag=True,
+    help="List the indexed actions of the run video",
+)
+@require_bugninja_project
+def clip(
+    run_id: str,
+    action_idx: Optional[int],
+    output: Optional[Path],
+    list_actions: bool,
+    project_root: Path,
+) -> None:
+    """Extract the video clip of a single action of a run.
+
+    The clip is cut by stream copy starting at the keyframe indexed for the action, so
+    extraction takes milliseconds regardless of the video length.
+
+    Args:
+        run_id (str): Run ID as used in the video and traversal file names
+        action_idx (Optional[int]): Index of the action in the traversal
+        output (Optional[Path]): Output file for the clip
+        list_actions (bool): List the indexed actions instead of extracting a clip
+        project_root (Path): Root directory of the Bugninja project
+
+    Example:
+        ```bash
+        bugninja clip abc123 3
+        ```
+
+    Notes:
+        - Requires the `<video>.index.json` sidecar written while recording
+        - Actions that happened before a failure-only clip started are not indexed
+    """
+    from bugninja.utils.video_clip_index import VideoClipIndex, extract_action_clip
+
+    videos = _find_run_videos(project_root, run_id)
+    if not videos:
+        console.print(f"❌ No video found for run '{run_id}'", style="red")
+        raise click.Abort()
+    video_path = videos[0]
+
+    try:
+        index = VideoClipIndex.load(video_path)
+    except FileNotFoundError as e:
+        console.print(f"❌ {e}", style="red")
+        raise click.Abort()
+
+    if list_actions or action_idx is None:
+        table = Table(title=f"🎞️ Actions in {video_path.name}", header_style="bold magenta")
+        table.add_column("Action", justify="right", style="cyan")
+        table.add_column("Type")
+        table.add_column("Start", justify="right")
+        table.add_column("End", justify="right")
+        table.add_column("Keyframe", justify="right", style="dim")
+        for entry in index.actions:
+            table.add_row(
+                str(entry.action_idx),
+                entry.action_type,
+                f"{entry.start_offset:.2f}s",
+                f"{entry.end_offset:.2f}s",
+                f"{entry.keyframe_time:.2f}s",
+            )
+        console.print(table)
+        return
+
+    try:
+        clip_path = asyncio.run(extract_action_clip(video_path, action_idx, output))
+    except KeyError as e:
+        console.print(f"❌ {e.args[0]}", style="red")
+        raise click.Abort()
+    except RuntimeError as e:
+        console.print(f"❌ {e}", style="red")
+        raise click.Abort()
+
+    console.print(f"✅ Clip of action {action_idx} written to {clip_path}", style="green")
@@ -0,0 +1,164 @@
+"""
+Garbage collection command for Bugninja CLI.
+
+This module provides the **gc command** for applying the retention policies configured
+in the `[retention]` section of `bugninja.toml` to run artifacts.
+
+## Key Features
+
+1. **Run Retention** - Keep the last N runs per task and failed runs for X days
+2. **Compaction** - Archive expired runs into a single `tar.zst` per task
+3. **Consistent History** - `run_history.json` never points at removed traversals
+4. **Reporting** - Bytes reclaimed per task
+
+## Usage Examples
+
+```bash
+# Apply the configured retention policy to all tasks
+bugninja gc
+
+# Preview what would be removed
+bugninja gc --dry-run
+
+# Override the policy for a single task
+bugninja gc --task login_flow --keep-last 5 --compact
+```
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import rich_click as click
+from rich.console import Console
+from rich.table import Table
+
+from bugninja_cli.utils.project_validator import require_bugninja_project
+from bugninja_cli.utils.style import MARKDOWN_CONFIG
+
+console = Console()
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}" if unit != "B" else f"{int(value)} B"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+@click.command()
+@click.rich_config(help_config=MARKDOWN_CONFIG)
+@click.option(
+    "--task",
+    "tasks",
+    multiple=True,
+    help="Task folder name to collect (can be repeated, defaults to all tasks)",
+)
+@click.option(
+    "--keep-last",
+    type=int,
+    default=None,
+    help="Override `retention.keep_last_runs`",
+)
+@click.option(
+    "--keep-failed-days",
+    type=float,
+    default=None,
+    help="Override `retention.keep_failed_days`",
+)
+@click.option(
+    "--compact/--no-compact",
+    default=None,
+    help="Override `retention.compact`",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Only report what would be removed",
+)
+@require_bugninja_project
+def gc(
+    tasks: Tuple[str, ...],
+    keep_last: Optional[int],
+    keep_failed_days: Optional[float],
+    compact: Optional[bool],
+    dry_run: bool,
+    project_root: Path,
+) -> None:
+    """Apply retention policies to run artifacts.
+
+    Expired runs (traversals, screenshots, videos and `data_dir/run_*` browser profiles)
+    are deleted or, with compaction enabled, archived into a new
+    `tasks/<task>/archive/runs_*.tar.zst` segment.
+
+    Args:
+        tasks (Tuple[str, ...]): Task folder names to collect
+        keep_last (Optional[int]): Override for the number of runs kept per task
+        keep_failed_days (Optional[float]): Override for how long failed runs are kept
+        compact (Optional[bool]): Override for archiving instead of deleting
+        dry_run (bool): Only report what would be removed
+        project_root (Path): Root directory of the Bugninja project
+
+    Example:
+        ```bash
+        bugninja gc --dry-run
+        ```
+
+    Notes:
+        - The latest AI run and the latest successful run of a task are never collected
+        - Runs modified in the last 10 minutes are treated as in progress and skipped
+    """
+    from bugninja.config.factory import ConfigurationFactory
+    from bugninja_cli.utils.retention_manager import RetentionManager, RetentionPolicy
+
+    settings = ConfigurationFactory.get_settings(cli_mode=True)
+    policy = RetentionPolicy.from_settings(settings)
+
+    overrides = {
+        "keep_last_runs": keep_last,
+        "keep_failed_days": keep_failed_days,
+        "compact": compact,
+    }
+    policy = policy.model_copy(
+        update={key: value for key, value in overrides.items() if value is not None}
+    )
+
+    if not policy.is_enabled:
+        console.print(
+            "ℹ️ No retention policy configured. Set `keep_last_runs` in the [retention] "
+            "section of bugninja.toml or pass --keep-last.",
+            style="yellow",
+        )
+        return
+
+    manager = RetentionManager(project_root, policy)
+    report = manager.apply(task_names=list(tasks) or None, dry_run=dry_run)
+
+    title = "🧹 Retention (dry run)" if dry_run else "🧹 Retention"
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Task Name", style="cyan", no_wrap=True)
+    table.add_column("Runs", justify="right")
+    table.add_column("Removed", justify="right", style="red")
+    table.add_column("Archived", justify="right", style="blue")
+    table.add_column("Reclaimed", justify="right", style="green")
+    table.add_column("Error", style="red")
+
+    for task in report.tasks:
+        table.add_row(
+            task.task_name,
+            str(task.runs_total),
+            str(task.runs_removed),
+            str(task.runs_archived),
+            _format_bytes(task.bytes_reclaimed),
+            task.error or "-",
+        )
+
+    console.print(table)
+    if report.artifact_bytes_reclaimed:
+        console.print(
+            f"🗃️ Artifact store reclaimed {_format_bytes(report.artifact_bytes_reclaimed)}"
+        )
+
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    console.print(f"✅ {verb} {_format_bytes(report.bytes_reclaimed)} in total", style="bold")
@@ -0,0 +1,553 @@
+"""
+Run artifact retention utilities for Bugninja CLI.
+
+This module applies the `[retention]` policies of `bugninja.toml` to the artifacts that
+every run leaves behind: traversals, screenshots, videos and the isolated browser
+profiles under `data_dir/run_*`. Expired runs are either deleted or compacted into a
+new `archive/runs_<timestamp>.tar.zst` segment per pass (existing segments are never
+rewritten), and `run_history.json` is updated so that it never points at a removed
+traversal.
+
+## Policy
+
+```toml
+[retention]
+keep_last_runs = 20       # newest runs kept per task
+keep_failed_days = 14     # failed runs are kept this long even if older
+compact = true            # archive expired runs instead of deleting them
+auto_gc = true            # apply in the background after every run
+```
+
+## Usage Examples
+
+```python
+from bugninja_cli.utils.retention_manager import RetentionManager, RetentionPolicy
+
+manager = RetentionManager(project_root, RetentionPolicy(keep_last_runs=10, compact=True))
+report = manager.apply()
+print(f"Reclaimed {report.bytes_reclaimed} bytes")
+```
+"""
+
+import os
+import re
+import shutil
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import zstandard  # type: ignore
+from pydantic import BaseModel, Field
+
+from bugninja.config.settings import BugninjaSettings
+from bugninja.utils.logging_config import logger
+from bugninja_cli.utils.run_history_manager import RunHistoryManager
+
+TRAVERSAL_FILE_PATTERN = re.compile(r"^traverse_\d{8}_\d{6}_(?P<run_id>.+)\.json$")
+ARCHIVE_DIR_NAME: str = "archive"
+ARCHIVE_SEGMENT_PREFIX: str = "runs_"
+ARCHIVE_SEGMENT_SUFFIX: str = ".tar.zst"
+ZSTD_COMPRESSION_LEVEL: int = 10
+
+#! runs touched within this window may still be in progress and are never collected
+IN_PROGRESS_GRACE_SECONDS: int = 600
+
+MAX_WORKERS: int = 8
+
+
+class RetentionPolicy(BaseModel):
+    """Retention policy applied to the runs of every task.
+
+    Attributes:
+        keep_last_runs (Optional[int]): Newest runs kept per task; None disables retention
+        keep_failed_days (Optional[float]): Failed runs younger than this are always kept
+        compact (bool): Archive expired runs into `archive/runs_*.tar.zst` instead of deleting them
+    """
+
+    keep_last_runs: Optional[int] = Field(default=None, ge=1)
+    keep_failed_days: Optional[float] = Field(default=None, ge=0)
+    compact: bool = Field(default=False)
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.keep_last_runs is not None
+
+    @classmethod
+    def from_settings(cls, settings: BugninjaSettings) -> "RetentionPolicy":
+        """Create the policy from the `[retention]` section of the project settings.
+
+        Args:
+            settings (BugninjaSettings): Loaded project settings
+
+        Returns:
+            RetentionPolicy: Configured retention policy
+        """
+        return cls(
+            keep_last_runs=settings.retention_keep_last_runs,
+            keep_failed_days=settings.retention_keep_failed_days,
+            compact=settings.retention_compact,
+        )
+
+
+@dataclass
+class RunArtifacts:
+    """All files and directories produced by a single run of a task."""
+
+    run_id: str
+    paths: List[Path] = field(default_factory=list)
+    profile_dir: Optional[Path] = None
+    has_traversal: bool = False
+    status: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        # runs without history entry and without traversal never completed
+        if self.status is not None:
+            return self.status == "failed"
+        return not self.has_traversal
+
+    @property
+    def all_paths(self) -> List[Path]:
+        return self.paths + ([self.profile_dir] if self.profile_dir else [])
+
+    @property
+    def last_modified(self) -> float:
+        return max((_safe_mtime(path) for path in self.all_paths), default=0.0)
+
+    @property
+    def size(self) -> int:
+        return sum(_path_size(path) for path in self.all_paths)
+
+
+class TaskRetentionResult(BaseModel):
+    """Outcome of applying the retention policy to a single task."""
+
+    task_name: str
+    runs_total: int = 0
+    runs_removed: int = 0
+    runs_archived: int = 0
+    bytes_reclaimed: int = 0
+    removed_run_ids: List[str] = Field(default_factory=list)
+    error: Optional[str] = None
+
+
+class RetentionReport(BaseModel):
+    """Aggregated outcome of a retention pass over the project."""
+
+    tasks: List[TaskRetentionResult] = Field(default_factory=list)
+    artifact_bytes_reclaimed: int = 0
+    dry_run: bool = False
+
+    @property
+    def runs_removed(self) -> int:
+        return sum(task.runs_removed for task in self.tasks)
+
+    @property
+    def runs_archived(self) -> int:
+        return sum(task.runs_archived for task in self.tasks)
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return sum(task.bytes_reclaimed for task in self.tasks) + self.artifact_bytes_reclaimed
+
+
+def _safe_mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _path_size(path: Path) -> int:
+    try:
+        if path.is_dir():
+            return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class RetentionManager:
+    """Applies retention policies to the run artifacts of a Bugninja project.
+
+    Tasks are processed concurrently; each task's archive and `run_history.json` are only
+    touched by the worker handling that task, and a per-project lock prevents two
+    retention passes (e.g. `bugninja gc` and the post-run hook) from overlapping.
+    """
+
+    _project_locks: Dict[Path, threading.Lock] = {}
+    _project_locks_guard = threading.Lock()
+
+    def __init__(self, project_root: Path, policy: RetentionPolicy) -> None:
+        """Initialize the retention manager.
+
+        Args:
+            project_root (Path): Root directory of the Bugninja project
+            policy (RetentionPolicy): Policy to apply
+        """
+        self.project_root = project_root
+        self.tasks_dir = project_root / "tasks"
+        self.data_dir = project_root / "data_dir"
+        self.policy = policy
+
+    def _get_project_lock(self) -> threading.Lock:
+        root = self.project_root.resolve()
+        with self._project_locks_guard:
+            return self._project_locks.setdefault(root, threading.Lock())
+
+    def apply(
+        self, task_names: Optional[List[str]] = None, dry_run: bool = False
+    ) -> RetentionReport:
+        """Apply the retention policy.
+
+        Args:
+            task_names (Optional[List[str]]): Task folder names to process (all tasks if None)
+            dry_run (bool): Only report what would be removed
+
+        Returns:
+            RetentionReport: Removed/archived runs and bytes reclaimed per task
+        """
+        report = RetentionReport(dry_run=dry_run)
+        if not self.policy.is_enabled or not self.tasks_dir.exists():
+            return report
+
+        task_dirs = [
+            task_dir
+            for task_dir in sorted(self.tasks_dir.iterdir())
+            if task_dir.is_dir() and (task_names is None or task_dir.name in task_names)
+        ]
+        if not task_dirs:
+            return report
+
+        with self._get_project_lock():
+            with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(task_dirs))) as executor:
+                report.tasks = list(
+                    executor.map(lambda task_dir: self._apply_to_task(task_dir, dry_run), task_dirs)
+                )
+
+            removed_run_ids = [run_id for task in report.tasks for run_id in task.removed_run_ids]
+            if removed_run_ids and not dry_run:
+                report.artifact_bytes_reclaimed = self._release_stored_artifacts(removed_run_ids)
+
+        logger.bugninja_log(
+            f"🧹 Retention: {report.runs_removed} runs removed "
+            f"({report.runs_archived} archived), {report.bytes_reclaimed} bytes reclaimed"
+        )
+        return report
+
+    # ---------------- per task -----------------
+
+    def _apply_to_task(self, task_dir: Path, dry_run: bool) -> TaskRetentionResult:
+        result = TaskRetentionResult(task_name=task_dir.name)
+        try:
+            history_manager = RunHistoryManager(task_dir)
+            try:
+                history: Optional[Dict[str, Any]] = history_manager.load_history()
+            except (FileNotFoundError, ValueError):
+                history = None
+
+            runs = self._collect_runs(task_dir, history)
+            result.runs_total = len(runs)
+
+            expired = self._select_expired_runs(runs, history)
+            if not expired:
+                return result
+
+            result.removed_run_ids = [run.run_id for run in expired]
+            result.runs_removed = len(expired)
+            if dry_run:
+                result.bytes_reclaimed = sum(run.size for run in expired)
+                return result
+
+            size_before = sum(run.size for run in expired)
+            archive_growth = 0
+            archive_path: Optional[Path] = None
+            if self.policy.compact:
+                archive_path = self._write_archive_segment(task_dir / ARCHIVE_DIR_NAME, expired)
+                archive_growth = _path_size(archive_path)
+                result.runs_archived = len(expired)
+
+            if history is not None:
+                self._update_history(task_dir, history, history_manager, expired, archive_path)
+
+            for run in expired:
+                for path in run.all_paths:
+                    self._remove_path(path)
+
+            result.bytes_reclaimed = max(0, size_before - archive_growth)
+        except Exception as e:
+            logger.warning(f"⚠️ Retention failed for task '{task_dir.name}': {e}")
+            result.error = str(e)
+
+        return result
+
+    def _collect_runs(
+        self, task_dir: Path, history: Optional[Dict[str, Any]]
+    ) -> List[RunArtifacts]:
+        runs: Dict[str, RunArtifacts] = {}
+
+        def get_run(run_id: str) -> RunArtifacts:
+            return runs.setdefault(run_id, RunArtifacts(run_id=run_id))
+
+        traversals_dir = task_dir / "traversals"
+        if traversals_dir.exists():
+            for traversal_file in traversals_dir.glob("*.json"):
+                match = TRAVERSAL_FILE_PATTERN.match(traversal_file.name)
+                if match:
+                    run = get_run(match.group("run_id"))
+                    run.paths.append(traversal_file)
+                    run.has_traversal = True
+
+        screenshots_dir = task_dir / "screenshots"
+        if screenshots_dir.exists():
+            for run_dir in screenshots_dir.iterdir():
+                if run_dir.is_dir():
+                    get_run(run_dir.name).paths.append(run_dir)
+
+        videos_dir = task_dir / "videos"
+        if videos_dir.exists():
+            for video_file in videos_dir.iterdir():
+                if video_file.is_file():
+                    run_id = video_file.name.split(".", 1)[0].removeprefix("run_")
+                    get_run(run_id).paths.append(video_file)
+
+        for run in runs.values():
+            profile_dir = self.data_dir / f"run_{run.run_id}"
+            if profile_dir.exists():
+                run.profile_dir = profile_dir
+
+        # entries are keyed by the run that produced them; a replay's `traversal_path` points
+        # at the original AI run, so it must never decide that run's status
+        history = history or {}
+        for entry in history.get("ai_navigated_runs", []):
+            run_id = entry.get("run_id")
+            if run_id not in runs:
+                # older entries carry a random id, their traversal names the run
+                run_id = self._run_id_from_traversal_path(entry.get("traversal_path", "")) or ""
+            if run_id in runs:
+                runs[run_id].status = entry.get("status")
+
+        for entry in history.get("replay_runs", []):
+            run_id = entry.get("run_id")
+            if run_id in runs:
+                runs[run_id].status = entry.get("status")
+
+        return list(runs.values())
+
+    def _select_expired_runs(
+        self, runs: List[RunArtifacts], history: Optional[Dict[str, Any]]
+    ) -> List[RunArtifacts]:
+        assert self.policy.keep_last_runs is not None
+
+        now = time.time()
+        protected = self._protected_run_ids(history)
+        runs = sorted(runs, key=lambda run: run.last_modified, reverse=True)
+
+        expired: List[RunArtifacts] = []
+        for run in runs[self.policy.keep_last_runs :]:
+            age_seconds = now - run.last_modified
+            if run.run_id in protected or age_seconds < IN_PROGRESS_GRACE_SECONDS:
+                continue
+            if (
+                run.failed
+                and self.policy.keep_failed_days is not None
+                and age_seconds < self.policy.keep_failed_days * 86400
+            ):
+                continue
+            expired.append(run)
+
+        return expired
+
+    def _protected_run_ids(self, history: Optional[Dict[str, Any]]) -> Set[str]:
+        """Runs whose traversal is used for replay must survive retention."""
+        if history is None:
+            return set()
+
+        protected: Set[str] = set()
+        ai_runs = history.get("ai_navigated_runs", [])
+        if ai_runs:
+            run_id = self._run_id_from_traversal_path(ai_runs[-1].get("traversal_path", ""))
+            if run_id:
+                protected.add(run_id)
+
+        successful = [
+            entry
+            for entry in self._iter_history_entries(history)
+            if entry.get("status") == "success" and entry.get("traversal_path")
+        ]
+        if successful:
+            latest = max(successful, key=lambda entry: entry.get("timestamp", ""))
+            run_id = self._run_id_from_traversal_path(latest["traversal_path"])
+            if run_id:
+                protected.add(run_id)
+
+        return protected
+
+    @staticmethod
+    def _iter_history_entries(history: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if history is None:
+            return []
+        entries: List[Dict[str, Any]] = history.get("ai_navigated_runs", []) + history.get(
+            "replay_runs", []
+        )
+        return entries
+
+    @staticmethod
+    def _run_id_from_traversal_path(traversal_path: str) -> Optional[str]:
+        if not traversal_path:
+            return None
+        match = TRAVERSAL_FILE_PATTERN.match(Path(traversal_path).name)
+        return match.group("run_id") if match else None
+
+    def _update_history(
+        self,
+        task_dir: Path,
+        history: Dict[str, Any],
+        history_manager: RunHistoryManager,
+        expired: List[RunArtifacts],
+        archive_path: Optional[Path] = None,
+    ) -> None:
+        """Detach history entries from traversals that are about to be removed."""
+        expired_ids = {run.run_id for run in expired}
+        archive_name = archive_path.relative_to(task_dir).as_posix() if archive_path else None
+
+        changed = False
+        for entry in self._iter_history_entries(history):
+            traversal_path = entry.get("traversal_path", "")
+            if self._run_id_from_traversal_path(traversal_path) not in expired_ids:
+                continue
+
+            if archive_name is not None:
+                entry["archived_traversal_path"] = traversal_path
+                entry["archive_path"] = archive_name
+            else:
+                entry["artifacts_pruned"] = True
+            entry["traversal_path"] = ""
+            changed = True
+
+        if changed:
+            history_manager.save_history(history)
+
+    # ---------------- archive -----------------
+
+    def _write_archive_segment(self, archive_dir: Path, runs: List[RunArtifacts]) -> Path:
+        """Write the given runs into a new archive segment and return its path.
+
+        Every pass writes its own segment so archiving never re-reads or rewrites what
+        earlier passes stored. Browser profiles are caches and are never archived.
+        """
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{ARCHIVE_SEGMENT_PREFIX}{time.strftime('%Y%m%d_%H%M%S')}"
+        archive_path = archive_dir / f"{stem}{ARCHIVE_SEGMENT_SUFFIX}"
+        counter = 1
+        while archive_path.exists():
+            archive_path = archive_dir / f"{stem}_{counter}{ARCHIVE_SEGMENT_SUFFIX}"
+            counter += 1
+        tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+
+        try:
+            with open(tmp_path, "wb") as raw_out:
+                compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL)
+                with compressor.stream_writer(raw_out, closefd=False) as zstd_out:
+                    with tarfile.open(fileobj=zstd_out, mode="w|") as tar_out:
+                        for run in runs:
+                            for path in run.paths:
+                                tar_out.add(path, arcname=self._archive_name(path))
+                            for blob in self._stored_artifact_paths(run.run_id):
+                                tar_out.add(blob, arcname=self._archive_name(blob))
+
+            os.replace(tmp_path, archive_path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return archive_path
+
+    def _archive_name(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            return path.name
+
+    # ---------------- artifact store -----------------
+
+    def _get_artifact_store(self) -> Optional[Any]:
+        store_dir = self.project_root / "artifacts"
+        if not store_dir.exists():
+            return None
+
+        from bugninja.config.artifact_store import ArtifactStoreConfig
+        from bugninja.utils.artifact_store import ArtifactStore
+
+        return ArtifactStore.from_config(ArtifactStoreConfig.with_base_dir(self.project_root))
+
+    def _stored_artifact_paths(self, run_id: str) -> List[Path]:
+        store = self._get_artifact_store()
+        if store is None:
+            return []
+
+        paths: List[Path] = []
+        for artifact_hash in store.get_run_artifacts(run_id):
+            try:
+                paths.append(store.path_for(artifact_hash))
+            except KeyError:
+                continue
+        return [path for path in paths if path.exists()]
+
+    def _release_stored_artifacts(self, run_ids: List[str]) -> int:
+        store = self._get_artifact_store()
+        if store is None:
+            return 0
+
+        for run_id in run_ids:
+            store.release_run(run_id)
+        reclaimed: int = store.collect_garbage()
+        return reclaimed
+
+    # ---------------- helpers -----------------
+
+    @staticmethod
+    def _remove_path(path: Path) -> None:
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to remove {path}: {e}")
+
+
+def schedule_background_retention(project_root: Path, task_name: str) -> Optional[threading.Thread]:
+    """Apply the project's retention policy to a task in a background thread.
+
+    The thread is a daemon so it can never keep the interpreter alive on its own; callers
+    that want the pass to finish before exiting join the returned thread. Segments are
+    written to a temporary file first, so an interrupted pass leaves no partial archive.
+
+    Args:
+        project_root (Path): Root directory of the Bugninja project
+        task_name (str): Folder name of the task that just finished
+
+    Returns:
+        Optional[threading.Thread]: The started thread, or None if `auto_gc` is disabled
+    """
+    from bugninja.config.factory import ConfigurationFactory
+
+    settings = ConfigurationFactory.get_settings(cli_mode=True)
+    policy = RetentionPolicy.from_settings(settings)
+    if not settings.retention_auto_gc or not policy.is_enabled:
+        return None
+
+    manager = RetentionManager(project_root, policy)
+    thread = threading.Thread(
+        target=manager.apply,
+        kwargs={"task_names": [task_name]},
+        name=f"bugninja-retention-{task_name}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
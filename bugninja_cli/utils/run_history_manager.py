@@ -258,6 +258,25 @@ class RunHistoryManager:
         except Exception:
             return "unknown"
 
+    @staticmethod
+    def _get_execution_run_id(result: TaskExecutionResult) -> str:
+        """Get the id of the run that produced the result.
+
+        The run id names the run's screenshots, videos and browser profile, so entries keyed
+        by it can be matched to their artifacts. Results without one get a fresh CUID2.
+
+        Args:
+            result (TaskExecutionResult): Execution result
+
+        Returns:
+            str: Execution run id
+        """
+        if result.result is not None:
+            run_id = result.result.metadata.get("run_id")
+            if run_id:
+                return str(run_id)
+        return str(CUID().generate())
+
     def _create_ai_run_entry(self, result: TaskExecutionResult) -> Dict[str, Any]:
         """Create an AI-navigated run entry.
 
@@ -267,7 +286,7 @@ class RunHistoryManager:
         Returns:
             Dict[str, Any]: Run entry dictionary
         """
-        run_id = CUID().generate()
+        run_id = self._get_execution_run_id(result)
         timestamp = datetime.now(UTC).isoformat()
 
         run_entry = {
@@ -297,7 +316,7 @@ class RunHistoryManager:
         Returns:
             Dict[str, Any]: Replay run entry dictionary
         """
-        run_id = CUID().generate()
+        run_id = self._get_execution_run_id(result)
         timestamp = datetime.now(UTC).isoformat()
 
         replay_entry = {
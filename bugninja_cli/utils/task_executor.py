@@ -32,8 +32,10 @@ results = await executor.execute_multiple_tasks(task_infos)
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
@@ -42,6 +44,7 @@ from rich.console import Console
 
 if TYPE_CHECKING:
     from bugninja.api import BugninjaTask
+    from bugninja.config.artifact_store import ArtifactStoreConfig
     from bugninja.config.video_recording import VideoRecordingConfig
     from bugninja.schemas import TaskExecutionResult, TaskInfo, TaskRunConfig
     from bugninja.schemas.models import BugninjaConfig
@@ -83,6 +86,7 @@ class TaskExecutor:
         from bugninja.utils.logging_config import logger as bugninja_logger
 
         self.client: Optional[BugninjaClient] = None
+        self._retention_threads: List[threading.Thread] = []
 
         self.logger = bugninja_logger
 
@@ -132,6 +136,25 @@ class TaskExecutor:
                 viewport_width=self.task_run_config.viewport_width,
                 viewport_height=self.task_run_config.viewport_height,
                 user_agent=self.task_run_config.user_agent,
+                dom_state_mode=self.task_run_config.dom_state_mode,
+                dom_snapshot_interval=self.task_run_config.dom_snapshot_interval,
+                history_window_steps=self.task_run_config.history_window_steps,
+                healing_context_verbatim_states=(
+                    self.task_run_config.healing_context_verbatim_states
+                ),
+                vision_mode=(
+                    self.task_run_config.vision_mode
+                    if self.task_run_config.enable_vision
+                    else "never"
+                ),
+                vision_max_width=self.task_run_config.vision_max_width,
+                vision_max_height=self.task_run_config.vision_max_height,
+                vision_jpeg_quality=self.task_run_config.vision_jpeg_quality,
+                enable_tracing=self.task_run_config.enable_tracing,
+                stream_llm_output=self.task_run_config.stream_llm_output,
+                llm_prompt_caching=self.task_run_config.llm_prompt_caching,
+                llm_routing=self.task_run_config.get_llm_routing_config(),
+                llm_hedging=self.task_run_config.get_llm_hedging_config(),
                 cli_mode=use_cli_mode,
             )
 
@@ -167,6 +190,10 @@ class TaskExecutor:
                 # and avoid forcing a CLI-style screenshots directory
                 config.screenshots_dir = None
 
+            # Share one content-addressed artifact store across the whole project
+            if task_info:
+                config.artifact_store = self._get_artifact_store_config()
+
             # Handle video recording if enabled and task_info is provided
             if self.task_run_config.enable_video_recording and task_info:
                 try:
@@ -191,6 +218,7 @@ class TaskExecutor:
                         )
                         if video_config:
                             # Set the video recording configuration directly
+                            self._apply_video_encoder_settings(video_config)
                             config.video_recording = video_config
                             self.logger.bugninja_log(
                                 f"🎥 Video recording enabled for task: {task_info.name}"
@@ -215,8 +243,53 @@ class TaskExecutor:
             self.logger.error(f"Failed to initialize Bugninja client: {e}")
             raise
 
+    def _get_artifact_store_config(self) -> Optional["ArtifactStoreConfig"]:
+        """Build the project-wide artifact store configuration from `bugninja.toml`.
+
+        Returns:
+            Optional[ArtifactStoreConfig]: Store configuration rooted at `<project>/artifacts`,
+                or None if the `[artifacts]` section does not enable it
+        """
+        try:
+            from bugninja.config.artifact_store import ArtifactStoreConfig
+            from bugninja.config.factory import ConfigurationFactory
+
+            settings = ConfigurationFactory.get_settings(cli_mode=True)
+            if not settings.artifacts_enabled:
+                return None
+
+            self.logger.bugninja_log("🗃️ Content-addressed artifact store enabled")
+            return ArtifactStoreConfig.with_base_dir(
+                self.project_root,
+                perceptual_hash=settings.artifacts_perceptual_hash,  # type: ignore
+                perceptual_hash_threshold=settings.artifacts_perceptual_hash_threshold,  # type: ignore
+            )
+        except Exception as e:
+            self.logger.warning(f"⚠️ Artifact store setup failed: {e}. Using per-run screenshots.")
+            return None
+
+    def _apply_video_encoder_settings(self, video_config: "VideoRecordingConfig") -> None:
+        """Apply the project-wide `[video]` encoder budget from `bugninja.toml`.
+
+        Args:
+            video_config (VideoRecordingConfig): Task video configuration to update
+        """
+        try:
+            from bugninja.config.factory import ConfigurationFactory
+
+            settings = ConfigurationFactory.get_settings(cli_mode=True)
+            video_config.max_concurrent_encoders = settings.video_max_concurrent_encoders
+            video_config.fast_preset = settings.video_fast_preset
+        except Exception as e:
+            self.logger.warning(f"⚠️ Video encoder settings could not be loaded: {e}")
+
     async def cleanup(self) -> None:
         """Clean up resources."""
+        # retention threads are daemons; wait for scheduled passes so they are not cut short
+        for thread in self._retention_threads:
+            await asyncio.to_thread(thread.join)
+        self._retention_threads.clear()
+
         if self.client:
             try:
                 await self.client.cleanup()
@@ -554,6 +627,18 @@ class TaskExecutor:
             config.video_recording.bitrate = video_config.bitrate
             config.video_recording.pixel_format = video_config.pixel_format
             config.video_recording.max_queue_size = video_config.max_queue_size
+            config.video_recording.ingest_mode = video_config.ingest_mode
+            config.video_recording.reuse_frames_for_screenshots = (
+                video_config.reuse_frames_for_screenshots
+            )
+            config.video_recording.screenshot_frame_max_age_ms = (
+                video_config.screenshot_frame_max_age_ms
+            )
+            config.video_recording.mode = video_config.mode
+            config.video_recording.buffer_seconds = video_config.buffer_seconds
+            config.video_recording.buffer_max_mb = video_config.buffer_max_mb
+            config.video_recording.max_concurrent_encoders = video_config.max_concurrent_encoders
+            config.video_recording.fast_preset = video_config.fast_preset
 
     def _update_task_metadata(
         self, task_info: TaskInfo, result: TaskExecutionResult, run_type: str = "ai_navigated"
@@ -588,9 +673,29 @@ class TaskExecutor:
             if not result.success:
                 self._create_jira_ticket_for_failure(task_info, result, run_type, history_manager)
 
+            self._schedule_retention(task_info)
+
         except Exception as e:
             raise ValueError(f"Failed to update task metadata: {e}")
 
+    def _schedule_retention(self, task_info: TaskInfo) -> None:
+        """Apply the project retention policy to the task in the background (if `auto_gc`).
+
+        Args:
+            task_info (TaskInfo): Task that just finished
+        """
+        try:
+            from bugninja_cli.utils.retention_manager import (
+                schedule_background_retention,
+            )
+
+            thread = schedule_background_retention(self.project_root, task_info.folder_name)
+            if thread is not None:
+                self._retention_threads.append(thread)
+                self.logger.bugninja_log(f"🧹 Retention scheduled for task '{task_info.name}'")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to schedule retention: {e}")
+
     def _create_jira_ticket_for_failure(
         self,
         task_info: TaskInfo,
@@ -732,8 +837,28 @@ class TaskExecutor:
                 viewport_width=browser_config.get("viewport", {}).get("width", 1920),
                 viewport_height=browser_config.get("viewport", {}).get("height", 1080),
                 user_agent=browser_config.get("user_agent"),
+                dom_state_mode=self.task_run_config.dom_state_mode,
+                dom_snapshot_interval=self.task_run_config.dom_snapshot_interval,
+                history_window_steps=self.task_run_config.history_window_steps,
+                healing_context_verbatim_states=(
+                    self.task_run_config.healing_context_verbatim_states
+                ),
+                vision_mode=(
+                    self.task_run_config.vision_mode
+                    if self.task_run_config.enable_vision
+                    else "never"
+                ),
+                vision_max_width=self.task_run_config.vision_max_width,
+                vision_max_height=self.task_run_config.vision_max_height,
+                vision_jpeg_quality=self.task_run_config.vision_jpeg_quality,
+                enable_tracing=self.task_run_config.enable_tracing,
+                stream_llm_output=self.task_run_config.stream_llm_output,
+                llm_prompt_caching=self.task_run_config.llm_prompt_caching,
+                llm_routing=self.task_run_config.get_llm_routing_config(),
+                llm_hedging=self.task_run_config.get_llm_hedging_config(),
                 cli_mode=True,  # Enable CLI mode for TOML configuration
             )
+            config.artifact_store = self._get_artifact_store_config()
 
             # Handle video recording configuration if enabled in task
             if self.task_run_config.enable_video_recording:
@@ -768,8 +893,10 @@ class TaskExecutor:
                             output_dir=str(videos_dir),
                             width=self.task_run_config.viewport_width,
                             height=self.task_run_config.viewport_height,
+                            mode=self.task_run_config.video_mode,
                         )
 
+                        self._apply_video_encoder_settings(video_config)
                         config.video_recording = video_config
                         self.logger.bugninja_log("🎥 Video recording enabled for replay")
 
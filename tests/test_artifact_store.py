@@ -0,0 +1,155 @@
+"""Tests for the content-addressed artifact store (`bugninja.utils.artifact_store`)."""
+
+import asyncio
+import io
+import sqlite3
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from bugninja.utils.artifact_store import (
+    INDEX_FILE_NAME,
+    PHASH_BAND_BITS,
+    PHASH_BANDS,
+    ArtifactStore,
+    compute_perceptual_hash,
+    phash_bands,
+)
+
+
+def _png(invert: bool = False, dot: bool = False) -> bytes:
+    """A horizontal gradient; `dot` changes one pixel, `invert` reverses the gradient."""
+    img = Image.new("L", (90, 80))
+    for x in range(90):
+        for y in range(80):
+            img.putpixel((x, y), 255 - x * 2 if invert else x * 2)
+    if dot:
+        img.putpixel((45, 40), 0)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _blobs(store: ArtifactStore) -> list[Path]:
+    return [path for path in store.objects_dir.rglob("*") if path.is_file()]
+
+
+# ---------------- deduplication -----------------
+
+
+def test_identical_content_is_stored_once(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+
+    first_hash, first_blob = store.put(b"<html></html>", extension=".HTML", run_id="run_1")
+    second_hash, second_blob = store.put(b"<html></html>", extension="html", run_id="run_2")
+
+    assert first_hash == second_hash
+    assert first_blob == second_blob == store.path_for(first_hash)
+    assert first_blob.suffix == ".html"
+    assert _blobs(store) == [first_blob]
+    assert store.get_refcount(first_hash) == 2
+
+
+def test_run_references_keep_first_use_order(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+    hashes = [store.put(data, "txt", "run")[0] for data in (b"b", b"a", b"b", b"c")]
+
+    assert store.get_run_artifacts("run") == [hashes[0], hashes[1], hashes[3]]
+    assert store.get_run_artifacts("unknown") == []
+
+
+# ---------------- release and gc -----------------
+
+
+def test_garbage_collection_keeps_blobs_referenced_by_other_runs(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+    shared_hash, shared_blob = store.put(b"shared", "txt", "run_1")
+    store.put(b"shared", "txt", "run_2")
+    own_hash, own_blob = store.put(b"only run 1", "txt", "run_1")
+
+    assert store.release_run("run_1") == 2
+    reclaimed = store.collect_garbage()
+
+    assert reclaimed == len(b"only run 1")
+    assert not own_blob.exists()
+    assert shared_blob.exists()
+    assert store.get_refcount(shared_hash) == 1
+    assert store.list_runs() == ["run_2"]
+    with pytest.raises(KeyError):
+        store.path_for(own_hash)
+
+
+def test_operations_on_a_missing_index_do_not_create_it(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "store")
+
+    assert store.release_run("run") == 0
+    assert store.collect_garbage() == 0
+    assert store.get_refcount("0" * 64) == 0
+    assert not (tmp_path / "store").exists()
+
+
+# ---------------- index -----------------
+
+
+def test_index_is_shared_by_stores_on_the_same_directory(tmp_path: Path) -> None:
+    ArtifactStore(tmp_path).put(b"data", "txt", "run_1")
+
+    reopened = ArtifactStore(tmp_path)
+    artifact_hash, _ = reopened.put(b"data", "txt", "run_2")
+
+    assert reopened.get_refcount(artifact_hash) == 2
+    connection = sqlite3.connect(tmp_path / INDEX_FILE_NAME)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0] == 1
+    finally:
+        connection.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_puts_on_a_new_store(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path)
+
+    results = await asyncio.gather(
+        *(store.put_async(bytes([idx % 4]), "bin", f"run_{idx}") for idx in range(16))
+    )
+
+    assert len({artifact_hash for artifact_hash, _ in results}) == 4
+    assert len(_blobs(store)) == 4
+    assert len(store.list_runs()) == 16
+
+
+# ---------------- perceptual hash -----------------
+
+
+def test_phash_bands_split_the_hash_into_bytes() -> None:
+    phash = int.from_bytes(bytes(range(1, PHASH_BANDS + 1)), "little")
+
+    bands = phash_bands(phash)
+
+    assert bands == list(range(1, PHASH_BANDS + 1))
+    assert all(band < 1 << PHASH_BAND_BITS for band in bands)
+
+
+def test_perceptual_hash_ignores_small_differences() -> None:
+    original = compute_perceptual_hash(_png())
+    dotted = compute_perceptual_hash(_png(dot=True))
+    inverted = compute_perceptual_hash(_png(invert=True))
+
+    assert original is not None and dotted is not None and inverted is not None
+    assert (original ^ dotted).bit_count() <= 1
+    assert (original ^ inverted).bit_count() > PHASH_BANDS
+    assert compute_perceptual_hash(b"not an image") is None
+
+
+def test_near_identical_images_share_a_blob(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path, perceptual_hash=True, perceptual_hash_threshold=4)
+
+    original_hash, _ = store.put(_png(), "png", "run_1")
+    dotted_hash, _ = store.put(_png(dot=True), "png", "run_2")
+    inverted_hash, _ = store.put(_png(invert=True), "png", "run_2")
+
+    assert dotted_hash == original_hash
+    assert inverted_hash != original_hash
+    assert store.get_refcount(original_hash) == 2
+    assert len(_blobs(store)) == 2
@@ -0,0 +1,221 @@
+"""Tests for the incremental DOM state (`bugninja.utils.dom_state_diff`)."""
+
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from browser_use.agent.message_manager.service import (  # type: ignore
+    MessageManagerSettings,
+)
+from browser_use.agent.message_manager.views import (  # type: ignore
+    MessageHistory,
+    MessageMetadata,
+)
+from langchain_core.messages import AIMessage, HumanMessage
+
+from bugninja.agents.bugninja_agent_base import DOM_SNAPSHOT_MESSAGE_TYPE
+from bugninja.agents.navigator_agent import NavigatorAgent
+from bugninja.utils.dom_state_diff import (
+    DomStateDiffer,
+    ElementSnapshot,
+    element_key,
+    render_element_line,
+)
+
+URL = "https://example.com/list"
+
+
+def _element(
+    path_hash: str, text: str, tag_name: str = "button", **attributes: str
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        hash=SimpleNamespace(branch_path_hash=path_hash),
+        tag_name=tag_name,
+        attributes=attributes,
+        get_all_text_till_next_clickable_element=lambda: text,
+    )
+
+
+def _rows(*texts: str, start: int = 1) -> Dict[int, SimpleNamespace]:
+    """Selector map of list rows that all sit on identical branches."""
+    return {start + offset: _element("row", text) for offset, text in enumerate(texts)}
+
+
+def _differ(snapshot_interval: int = 5, max_diff_ratio: float = 1.0) -> DomStateDiffer:
+    return DomStateDiffer(snapshot_interval=snapshot_interval, max_diff_ratio=max_diff_ratio)
+
+
+# ---------------- snapshot -----------------
+
+
+def test_render_element_line_shows_selected_attributes_only() -> None:
+    element = _element("h", "  Log \n in ", type="submit", style="x")
+
+    line = render_element_line(12, element, include_attributes=["type"])
+
+    assert line == "[12]<button type='submit'>Log in />"
+
+
+def test_snapshot_keeps_every_element_sharing_a_branch_path_hash() -> None:
+    selector_map = {3: _element("row", "C"), 1: _element("row", "A"), 2: _element("row", "B")}
+
+    snapshot = ElementSnapshot.from_selector_map(URL, selector_map)
+
+    assert len(snapshot.elements) == 3
+    # occurrences follow the document order of the highlight indices
+    assert snapshot.indices == {element_key("row", n): n + 1 for n in range(3)}
+    assert snapshot.elements[element_key("row", 1)] == "[2]<button>B />"
+
+
+# ---------------- diff -----------------
+
+
+def _diff_lines(
+    before: Dict[int, SimpleNamespace], after: Dict[int, SimpleNamespace]
+) -> Optional[Dict[str, object]]:
+    differ = _differ()
+    differ.take_snapshot(URL, before)
+    diff = differ.diff(after)
+    if diff is None:
+        return None
+    return {
+        "added": diff.added,
+        "changed": diff.changed,
+        "removed": diff.removed,
+        "unchanged": diff.unchanged,
+    }
+
+
+def test_diff_reports_an_appended_repeated_row_as_added() -> None:
+    lines = _diff_lines(_rows("A", "B"), _rows("A", "B", "C"))
+
+    assert lines == {"added": ["[3]<button>C />"], "changed": [], "removed": [], "unchanged": 2}
+
+
+def test_diff_reports_a_dropped_repeated_row_as_removed() -> None:
+    lines = _diff_lines(_rows("A", "B", "C"), _rows("A", "B"))
+
+    assert lines == {"added": [], "changed": [], "removed": ["[3]<button>C />"], "unchanged": 2}
+
+
+def test_diff_reports_changed_text_of_a_repeated_row() -> None:
+    before = {1: _element("nav", "Home"), **_rows("A", "B", start=2)}
+    after = {1: _element("nav", "Home"), **_rows("A", "B*", start=2)}
+
+    lines = _diff_lines(before, after)
+
+    assert lines is not None
+    assert lines["changed"] == ["[3]<button>B* />"]
+    assert lines["unchanged"] == 2
+
+
+def test_identical_state_renders_no_changes() -> None:
+    differ = _differ()
+    differ.take_snapshot(URL, _rows("A", "B"))
+
+    diff = differ.diff(_rows("A", "B"))
+
+    assert diff is not None and diff.is_empty
+    assert diff.render().splitlines()[-1] == "no changes"
+
+
+def test_diff_touching_too_many_elements_falls_back_to_a_snapshot() -> None:
+    differ = _differ(max_diff_ratio=0.5)
+    differ.take_snapshot(URL, _rows("A", "B", "C", "D"))
+
+    assert differ.diff(_rows("W", "X", "Y", "D")) is None
+    assert differ.steps_since_snapshot == 0
+
+
+# ---------------- snapshot decisions -----------------
+
+
+def test_needs_snapshot_on_first_step_navigation_and_interval() -> None:
+    differ = _differ(snapshot_interval=3)
+    assert differ.needs_snapshot(URL)
+
+    differ.take_snapshot(URL, _rows("A"))
+    assert not differ.needs_snapshot(URL)
+    assert differ.needs_snapshot("https://example.com/other")
+
+    differ.diff(_rows("A"))
+    assert not differ.needs_snapshot(URL)
+    differ.diff(_rows("A"))
+    assert differ.needs_snapshot(URL)
+
+
+# ---------------- agent history -----------------
+
+
+def _agent(snapshot_interval: int = 3) -> NavigatorAgent:
+    """An agent with only the state used to put DOM states into its history."""
+    agent = object.__new__(NavigatorAgent)
+    agent.dom_state_differ = _differ(snapshot_interval=snapshot_interval)
+    agent._pending_dom_snapshot = None
+    agent._message_manager = SimpleNamespace(
+        state=SimpleNamespace(history=MessageHistory()), settings=MessageManagerSettings()
+    )
+    return agent
+
+
+def _run_step(agent: NavigatorAgent, url: str, *texts: str) -> str:
+    """Run the history bookkeeping of one agent step on a page listing the given rows."""
+    selector_map = _rows(*texts)
+    elements_text = "\n".join(
+        render_element_line(index, element) for index, element in selector_map.items()
+    )
+    browser_state_summary = SimpleNamespace(
+        url=url,
+        selector_map=selector_map,
+        element_tree=SimpleNamespace(
+            clickable_elements_to_string=lambda include_attributes: elements_text
+        ),
+    )
+    history = agent._message_manager.state.history
+    state = HumanMessage(content=f"Current url: {url}\nInteractive elements:\n{elements_text}")
+    history.add_message(state, MessageMetadata(tokens=agent._count_message_tokens(state)))
+
+    dom_state_kind = agent._compact_dom_state_message(browser_state_summary)
+
+    # the state message only belongs to the prompt of its own step
+    history.current_tokens -= history.messages.pop().metadata.tokens
+    agent._store_dom_snapshot_message()
+    output = AIMessage(content=f"output of a step on {url}")
+    history.add_message(output, MessageMetadata(tokens=agent._count_message_tokens(output)))
+    return dom_state_kind
+
+
+def _snapshots(agent: NavigatorAgent) -> List[str]:
+    return [
+        str(managed.message.content)
+        for managed in agent._message_manager.state.history.messages
+        if managed.metadata.message_type == DOM_SNAPSHOT_MESSAGE_TYPE
+    ]
+
+
+def test_history_keeps_only_the_latest_snapshot_without_history_window() -> None:
+    agent = _agent(snapshot_interval=2)
+
+    kinds = [
+        _run_step(agent, URL, "A", "B"),
+        _run_step(agent, URL, "A", "B", "C"),
+        _run_step(agent, URL, "A", "B", "C"),
+        _run_step(agent, "https://example.com/other", "X"),
+        _run_step(agent, "https://example.com/other", "X", "Y"),
+    ]
+
+    assert kinds == ["snapshot", "diff", "snapshot", "snapshot", "diff"]
+    snapshots = _snapshots(agent)
+    assert len(snapshots) == 1
+    assert "https://example.com/other" in snapshots[0]
+    history = agent._message_manager.state.history
+    assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
+
+
+def test_diff_steps_leave_the_history_prefix_untouched() -> None:
+    agent = _agent()
+    _run_step(agent, URL, "A", "B")
+    prefix = list(agent._message_manager.state.history.messages)
+
+    assert _run_step(agent, URL, "A", "B", "C") == "diff"
+
+    assert agent._message_manager.state.history.messages[: len(prefix)] == prefix
@@ -0,0 +1,63 @@
+"""Tests for the free healing loop of `bugninja.replication.replicator_run.ReplicatorRun`."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+import pytest
+
+from bugninja.replication.replicator_run import ReplicatorRun
+
+
+class FakeHealer:
+    """Stands in for a healer agent whose steps take the given actions or raise."""
+
+    def __init__(self, step_error: Optional[BaseException] = None) -> None:
+        self.step_error = step_error
+        self.agent_taken_actions: List[Any] = []
+        self.flushed = 0
+
+    async def step(self) -> None:
+        if self.step_error is not None:
+            raise self.step_error
+        self.agent_taken_actions.append(SimpleNamespace(action={"done": {"success": True}}))
+
+    async def flush_pending_step_work(self) -> None:
+        self.flushed += 1
+
+
+def _replicator(healer: FakeHealer) -> ReplicatorRun:
+    replicator = object.__new__(ReplicatorRun)
+
+    async def create_self_healing_agent(failure_reason: Optional[str] = None) -> FakeHealer:
+        return healer
+
+    def replace_remaining_with_healing_actions(healer_agent: FakeHealer) -> None:
+        return None
+
+    replicator.create_self_healing_agent = create_self_healing_agent  # type: ignore[method-assign]
+    replicator._replace_remaining_with_healing_actions = (  # type: ignore[method-assign]
+        replace_remaining_with_healing_actions
+    )
+    return replicator
+
+
+@pytest.mark.asyncio
+async def test_healing_flushes_the_healer_before_returning() -> None:
+    healer = FakeHealer()
+
+    reached_goal, agent = await _replicator(healer)._start_free_healing("failed")
+
+    assert reached_goal
+    assert agent is healer
+    assert healer.flushed == 1
+
+
+@pytest.mark.asyncio
+async def test_healing_flushes_the_healer_when_a_step_raises() -> None:
+    healer = FakeHealer(step_error=asyncio.CancelledError())
+
+    with pytest.raises(asyncio.CancelledError):
+        await _replicator(healer)._start_free_healing("failed")
+
+    assert healer.flushed == 1
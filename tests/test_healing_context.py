@@ -0,0 +1,113 @@
+"""Tests for the compacted healing context (`bugninja.prompts.prompt_factory`)."""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from bugninja.prompts.prompt_factory import (
+    MAX_BRAINSTATE_SUMMARY_FIELD_LENGTH,
+    get_failed_action_prompt,
+    get_passed_brainstates_related_prompt,
+)
+from bugninja.schemas.pipeline import BugninjaBrainState, BugninjaExtendedAction
+
+
+def _brain_states(count: int) -> List[BugninjaBrainState]:
+    return [
+        BugninjaBrainState(
+            id=f"state-{step}",
+            evaluation_previous_goal=f"evaluation {step}",
+            memory=f"memory {step}",
+            next_goal=f"goal {step}",
+        )
+        for step in range(1, count + 1)
+    ]
+
+
+def _failed_action(dom_element_data: Optional[Dict[str, Any]]) -> BugninjaExtendedAction:
+    return BugninjaExtendedAction(
+        brain_state_id="state-1",
+        action={"click_element_by_index": {"index": 4}, "input_text": None},
+        dom_element_data=dom_element_data,
+        idx_in_brainstate=0,
+    )
+
+
+# ---------------- passed brain states -----------------
+
+
+def test_no_passed_brain_states_give_no_prompt() -> None:
+    assert get_passed_brainstates_related_prompt([], keep_verbatim=3) == ""
+
+
+def test_all_brain_states_verbatim_without_limit() -> None:
+    prompt = get_passed_brainstates_related_prompt(_brain_states(4))
+
+    assert "summarized" not in prompt
+    assert prompt.count('"next_goal"') == 4
+    assert "state-1" not in prompt
+
+
+def test_older_brain_states_become_goal_progress_bullets() -> None:
+    prompt = get_passed_brainstates_related_prompt(_brain_states(5), keep_verbatim=2)
+
+    assert "The first 3 states, summarized:" in prompt
+    # the progress of a goal is the evaluation written in the following state
+    assert "- Goal: goal 1 | Progress: evaluation 2" in prompt
+    assert "- Goal: goal 3 | Progress: evaluation 4" in prompt
+    assert prompt.count('"next_goal"') == 2
+    assert '"memory": "memory 4"' in prompt
+    assert '"memory": "memory 3"' not in prompt
+
+
+def test_at_least_the_last_brain_state_stays_verbatim() -> None:
+    prompt = get_passed_brainstates_related_prompt(_brain_states(3), keep_verbatim=0)
+
+    assert "The first 2 states, summarized:" in prompt
+    assert prompt.count('"next_goal"') == 1
+
+
+def test_long_bullet_fields_are_shortened() -> None:
+    states = _brain_states(3)
+    states[0].next_goal = "open\n  the settings " * 50
+
+    prompt = get_passed_brainstates_related_prompt(states, keep_verbatim=1)
+
+    goal_line = next(line for line in prompt.splitlines() if line.startswith("- Goal: open"))
+    goal = goal_line.split(" | Progress: ")[0][len("- Goal: ") :]
+    assert len(goal) == MAX_BRAINSTATE_SUMMARY_FIELD_LENGTH
+    assert goal.endswith("...")
+    assert "\n  " not in goal
+
+
+# ---------------- failed action -----------------
+
+
+def test_failed_action_prompt_lists_element_and_tried_selectors() -> None:
+    action = _failed_action(
+        {
+            "tag_name": "button",
+            "xpath": "html/body/button",
+            "alternative_relative_xpaths": ["//button[@id='login']"],
+        }
+    )
+
+    prompt = get_failed_action_prompt(
+        action,
+        tried_selectors=["xpath: //button[@id='login']", "css: #login"],
+        failure_reason="Timeout 5000ms exceeded",
+    )
+
+    assert json.dumps({"click_element_by_index": {"index": 4}}, indent=4) in prompt
+    assert "input_text" not in prompt
+    assert '"tag_name": "button"' in prompt
+    assert "alternative_relative_xpaths" not in prompt
+    assert "\n- xpath: //button[@id='login']\n- css: #login" in prompt
+    assert "Error: Timeout 5000ms exceeded" in prompt
+
+
+def test_failed_action_prompt_without_element_or_selectors() -> None:
+    prompt = get_failed_action_prompt(_failed_action(None))
+
+    assert "No element recorded" in prompt
+    assert "\n- None" in prompt
+    assert "Error: Unknown" in prompt
@@ -0,0 +1,152 @@
+"""Tests for history folding (`bugninja.utils.history_window`)."""
+
+from typing import List, Optional
+
+from browser_use.agent.message_manager.views import (  # type: ignore
+    MessageHistory,
+    MessageMetadata,
+)
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from bugninja.utils.history_window import (
+    HISTORY_SUMMARY_MESSAGE_TYPE,
+    MAX_SUMMARY_STEP_LINES,
+    HistoryWindow,
+)
+
+SNAPSHOT_TYPE = "dom_snapshot"
+
+
+def _count_tokens(message: BaseMessage) -> int:
+    return len(str(message.content))
+
+
+def _add(history: MessageHistory, message: BaseMessage, message_type: Optional[str] = None) -> None:
+    history.add_message(
+        message, MessageMetadata(tokens=_count_tokens(message), message_type=message_type)
+    )
+
+
+def _add_step(history: MessageHistory, step: int, result: bool = True) -> None:
+    """Add a step the way the agent leaves it in the history: action result, then output."""
+    if result:
+        _add(history, HumanMessage(content=f"Action result: clicked button {step}"))
+    output = AIMessage(
+        content="",
+        tool_calls=[
+            {
+                "name": "AgentOutput",
+                "args": {
+                    "current_state": {
+                        "evaluation_previous_goal": f"Success {step}",
+                        "memory": f"memory after step {step}",
+                        "next_goal": f"goal {step}",
+                    },
+                    "action": [{"click_element_by_index": {"index": step}}],
+                },
+                "id": str(step),
+                "type": "tool_call",
+            }
+        ],
+    )
+    _add(history, output)
+    _add(history, ToolMessage(content="", tool_call_id=str(step)))
+
+
+def _history(steps: int) -> MessageHistory:
+    history = MessageHistory()
+    _add(history, HumanMessage(content="system"), message_type="init")
+    _add(history, HumanMessage(content="task"), message_type="init")
+    for step in range(1, steps + 1):
+        _add_step(history, step, result=step > 1)
+    return history
+
+
+def _types(history: MessageHistory) -> List[Optional[str]]:
+    return [managed.metadata.message_type for managed in history.messages]
+
+
+def _outputs(history: MessageHistory) -> int:
+    return sum(isinstance(managed.message, AIMessage) for managed in history.messages)
+
+
+def _summary(history: MessageHistory) -> str:
+    summaries = [
+        managed.message.content
+        for managed in history.messages
+        if managed.metadata.message_type == HISTORY_SUMMARY_MESSAGE_TYPE
+    ]
+    assert len(summaries) == 1
+    return str(summaries[0])
+
+
+# ---------------- folding -----------------
+
+
+def test_history_below_twice_the_window_is_not_folded() -> None:
+    history = _history(steps=5)
+
+    assert HistoryWindow(keep_steps=3).fold(history, _count_tokens) == 0
+    assert _outputs(history) == 5
+
+
+def test_fold_keeps_the_last_steps_and_summarizes_the_older_ones() -> None:
+    history = _history(steps=6)
+    window = HistoryWindow(keep_steps=3)
+
+    folded = window.fold(history, _count_tokens)
+
+    assert folded == 3
+    assert _outputs(history) == 3
+    # initial messages stay in front, the summary takes the place of the folded steps
+    assert _types(history)[:3] == ["init", "init", HISTORY_SUMMARY_MESSAGE_TYPE]
+    summary = _summary(history)
+    assert "[Summary of your first 3 steps" in summary
+    assert "Memory: memory after step 3" in summary
+    step_line = "- Step 2: evaluation: Success 2 | goal: goal 2 | actions: click_element_by_index"
+    assert step_line in summary
+    assert "- Action result: clicked button 3" in summary
+    assert history.current_tokens == sum(m.metadata.tokens for m in history.messages)
+
+
+def test_later_folds_extend_the_same_summary() -> None:
+    history = _history(steps=6)
+    window = HistoryWindow(keep_steps=3)
+    window.fold(history, _count_tokens)
+    for step in range(7, 10):
+        _add_step(history, step)
+
+    assert window.fold(history, _count_tokens) == 3
+
+    assert window.summarized_steps == 6
+    assert _outputs(history) == 3
+    summary = _summary(history)
+    assert "[Summary of your first 6 steps" in summary
+    assert "- Step 1:" in summary and "- Step 6:" in summary
+
+
+def test_summary_keeps_only_the_latest_step_lines() -> None:
+    steps = MAX_SUMMARY_STEP_LINES + 10
+    history = _history(steps=2 * steps)
+    window = HistoryWindow(keep_steps=steps)
+
+    window.fold(history, _count_tokens)
+
+    summary = _summary(history)
+    assert "- Steps 1-10: covered by the memory above" in summary
+    assert "- Step 10:" not in summary
+    assert f"- Step {steps}:" in summary
+
+
+# ---------------- snapshots -----------------
+
+
+def test_snapshots_stay_when_the_history_is_folded() -> None:
+    history = _history(steps=2)
+    _add(history, HumanMessage(content="snapshot"), message_type=SNAPSHOT_TYPE)
+    for step in range(3, 7):
+        _add_step(history, step)
+
+    HistoryWindow(keep_steps=3).fold(history, _count_tokens)
+
+    assert _types(history).count(SNAPSHOT_TYPE) == 1
@@ -0,0 +1,66 @@
+"""Tests for the LLM cassette file (`bugninja.config.llm_cassette`)."""
+
+import json
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from bugninja.config.llm_cassette import CASSETTE_VERSION, LLMCassette
+
+
+def _record(cassette: LLMCassette, prompt: str, answer: str) -> None:
+    keys = cassette.request_keys("model", [HumanMessage(content=prompt)], {})
+    result = ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+    cassette.record(keys, "model", result)
+
+
+def _replay(cassette: LLMCassette, prompt: str) -> str:
+    keys = cassette.request_keys("model", [HumanMessage(content=prompt)], {})
+    result = cassette.lookup(keys)
+    assert result is not None
+    return str(result.generations[0].message.content)
+
+
+def test_recorded_interactions_are_appended_as_lines(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    cassette = LLMCassette(path, mode="record")
+
+    _record(cassette, "first", "one")
+    first_write = path.read_text(encoding="utf-8")
+    _record(cassette, "second", "two")
+
+    text = path.read_text(encoding="utf-8")
+    assert text.startswith(first_write)
+    lines = text.splitlines()
+    assert json.loads(lines[0]) == {"version": CASSETTE_VERSION}
+    assert [json.loads(line)["model"] for line in lines[1:]] == ["model", "model"]
+
+
+def test_replay_serves_the_recorded_responses(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.jsonl"
+    recorder = LLMCassette(path, mode="record")
+    _record(recorder, "first", "one")
+    _record(recorder, "second", "two")
+
+    cassette = LLMCassette(path, mode="replay")
+
+    assert _replay(cassette, "second") == "two"
+    assert _replay(cassette, "first") == "one"
+    assert cassette.get_metrics()["hits"] == 2
+
+
+def test_single_document_cassette_is_rewritten_as_lines_on_record(tmp_path: Path) -> None:
+    path = tmp_path / "cassette.json"
+    recorder = LLMCassette(tmp_path / "recorded.jsonl", mode="record")
+    _record(recorder, "first", "one")
+    interactions = [json.loads(line) for line in recorder.path.read_text().splitlines()[1:]]
+    path.write_text(json.dumps({"version": CASSETTE_VERSION, "interactions": interactions}))
+
+    cassette = LLMCassette(path, mode="replay", miss_policy="record")
+    assert _replay(cassette, "first") == "one"
+    _record(cassette, "second", "two")
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 3
+    assert _replay(LLMCassette(path, mode="replay"), "second") == "two"
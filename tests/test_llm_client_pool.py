@@ -0,0 +1,143 @@
+"""Tests for the pooled LLM clients (`bugninja.config.llm_factory.LLMClientPool`)."""
+
+import asyncio
+import gc
+from typing import Any, Dict
+
+import pytest
+
+from bugninja.config.llm_factory import LLMClientPool
+
+
+class FakeSyncClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAsyncClient:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeModel:
+    """Stands in for a LangChain chat model holding SDK clients."""
+
+    def __init__(self) -> None:
+        self.client = FakeSyncClient()
+        self.async_client = FakeAsyncClient()
+        self.callbacks: Any = None
+
+    def model_copy(self, update: Dict[str, Any]) -> "FakeModel":
+        copy = FakeModel.__new__(FakeModel)
+        copy.__dict__.update(self.__dict__)
+        copy.__dict__.update(update)
+        return copy
+
+
+@pytest.fixture
+def pool() -> LLMClientPool:
+    return LLMClientPool()
+
+
+def _get(pool: LLMClientPool, key: str = "model") -> FakeModel:
+    return pool.get_model(key, FakeModel)  # type: ignore[arg-type, return-value]
+
+
+def _get_on_new_loop(pool: LLMClientPool, key: str = "model") -> FakeModel:
+    async def get() -> FakeModel:
+        return _get(pool, key)
+
+    return asyncio.run(get())
+
+
+# ---------------- pooling -----------------
+
+
+@pytest.mark.asyncio
+async def test_copies_of_one_configuration_share_clients(pool: LLMClientPool) -> None:
+    first = _get(pool)
+    second = _get(pool)
+    other = _get(pool, "other-model")
+
+    assert first is not second
+    assert first.client is second.client
+    assert other.client is not first.client
+    assert pool.get_metrics()["created"] == 2
+    assert pool.get_metrics()["reused"] == 1
+
+
+def test_models_are_pooled_per_event_loop(pool: LLMClientPool) -> None:
+    first = _get_on_new_loop(pool)
+    second = _get_on_new_loop(pool)
+
+    assert first.client is not second.client
+
+
+# ---------------- eviction -----------------
+
+
+def test_models_of_closed_loops_are_evicted(pool: LLMClientPool) -> None:
+    model = _get_on_new_loop(pool)
+    client = model.client
+    del model
+    gc.collect()
+
+    _get(pool)
+
+    metrics = pool.get_metrics()
+    assert metrics["evicted"] == 1
+    assert metrics["pooled_clients"] == 1
+    assert client.closed
+
+
+def test_evicted_models_in_use_keep_their_clients_open(pool: LLMClientPool) -> None:
+    model = _get_on_new_loop(pool)
+
+    _get(pool)
+
+    assert pool.get_metrics()["evicted"] == 1
+    assert not model.client.closed
+
+
+# ---------------- release -----------------
+
+
+@pytest.mark.asyncio
+async def test_last_release_closes_unused_clients(pool: LLMClientPool) -> None:
+    pool.retain()
+    model = _get(pool)
+    client, async_client = model.client, model.async_client
+    del model
+    gc.collect()
+
+    await pool.release()
+
+    assert client.closed
+    assert async_client.closed
+    assert pool.get_metrics()["pooled_clients"] == 0
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_clients_of_copies_in_use(pool: LLMClientPool) -> None:
+    pool.retain()
+    pool.retain()
+    in_use = _get(pool)
+
+    await pool.release()
+    assert pool.get_metrics()["users"] == 1
+    await pool.release()
+
+    assert not in_use.client.closed
+    assert pool.get_metrics()["pooled_clients"] == 1
+
+    client = in_use.client
+    del in_use
+    gc.collect()
+    await pool.release()
+    assert client.closed
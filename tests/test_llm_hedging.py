@@ -0,0 +1,154 @@
+"""Tests for hedged LLM calls (`bugninja.config.llm_hedging`)."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+from bugninja.config import llm_hedging
+from bugninja.config.llm_hedging import (
+    LLMDeadlineExceededError,
+    LLMHedger,
+    LLMHedgingConfig,
+    latency_percentile,
+    record_latency,
+)
+
+PRIMARY = SimpleNamespace(model_name="primary")
+SECONDARY = SimpleNamespace(model_name="secondary")
+
+
+@pytest.fixture(autouse=True)
+def latencies(monkeypatch: pytest.MonkeyPatch) -> Dict[str, Any]:
+    window: Dict[str, Any] = {}
+    monkeypatch.setattr(llm_hedging, "_latencies", window)
+    return window
+
+
+def _hedger(**config: Any) -> LLMHedger:
+    settings: Dict[str, Any] = {
+        "initial_hedge_delay_seconds": 0.05,
+        "min_hedge_delay_seconds": 0.0,
+        "secondary_model": "secondary",
+    }
+    settings.update(config)
+    hedger = LLMHedger(LLMHedgingConfig(**settings))
+    # never create a real secondary model
+    hedger._secondary_llm = SECONDARY  # type: ignore[assignment]
+    return hedger
+
+
+def _call(
+    seconds: Dict[str, float], errors: Optional[Dict[str, Exception]] = None
+) -> Callable[..., Any]:
+    async def call(llm: Any) -> str:
+        await asyncio.sleep(seconds[llm.model_name])
+        if errors and llm.model_name in errors:
+            raise errors[llm.model_name]
+        return llm.model_name
+
+    return call
+
+
+def _recorded(model_name: str) -> List[float]:
+    return list(llm_hedging._latencies.get(model_name, ()))
+
+
+# ---------------- thresholds -----------------
+
+
+def test_latency_percentile_of_recent_calls() -> None:
+    for seconds in range(1, 11):
+        record_latency("model", float(seconds))
+
+    assert latency_percentile("model", 0.9) == 9.0
+    assert latency_percentile("model", 0.5) == 5.0
+    assert latency_percentile("unknown", 0.9) is None
+
+
+def test_hedge_delay_uses_initial_delay_until_enough_samples() -> None:
+    hedger = _hedger(initial_hedge_delay_seconds=15.0, min_hedge_delay_seconds=2.0, min_samples=3)
+    assert hedger.hedge_delay("model") == 15.0
+
+    for seconds in (0.5, 1.0, 4.0):
+        record_latency("model", seconds)
+    assert hedger.hedge_delay("model") == 4.0
+
+    assert LLMHedger(None).hedge_delay("model") is None
+    assert _hedger(hedge=False).hedge_delay("model") is None
+
+
+def test_hedge_delay_is_bounded_below() -> None:
+    hedger = _hedger(min_hedge_delay_seconds=2.0, min_samples=1)
+    record_latency("model", 0.1)
+
+    assert hedger.hedge_delay("model") == 2.0
+
+
+# ---------------- races -----------------
+
+
+@pytest.mark.asyncio
+async def test_fast_call_is_not_hedged() -> None:
+    hedger = _hedger()
+
+    result = await hedger.run(_call({"primary": 0.0}), PRIMARY, step=1)  # type: ignore[arg-type]
+
+    assert result == "primary"
+    assert hedger.summary()["hedged"] == 0
+    assert len(_recorded("primary")) == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_and_the_faster_request_wins() -> None:
+    hedger = _hedger()
+    call = _call({"primary": 1.0, "secondary": 0.0})
+
+    result = await hedger.run(call, PRIMARY, step=1)  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+
+    assert result == "secondary"
+    assert hedger.summary()["hedge_wins"] == 1
+    # the cancelled primary counts with the time it took until the hedge answered
+    assert len(_recorded("primary")) == 1
+    assert _recorded("primary")[0] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancelled_by_the_primary_is_not_recorded() -> None:
+    hedger = _hedger()
+    call = _call({"primary": 0.1, "secondary": 1.0})
+
+    result = await hedger.run(call, PRIMARY, step=1)  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+
+    assert result == "primary"
+    assert hedger.summary()["hedged"] == 1
+    assert hedger.summary()["hedge_wins"] == 0
+    assert _recorded("secondary") == []
+
+
+@pytest.mark.asyncio
+async def test_failing_hedge_surfaces_the_primary_error() -> None:
+    hedger = _hedger()
+    errors = {"primary": ValueError("primary failed"), "secondary": ValueError("hedge failed")}
+    call = _call({"primary": 0.1, "secondary": 0.0}, errors)
+
+    with pytest.raises(ValueError, match="primary failed"):
+        await hedger.run(call, PRIMARY, step=1)  # type: ignore[arg-type]
+
+
+# ---------------- deadline -----------------
+
+
+@pytest.mark.asyncio
+async def test_deadline_fails_the_call_and_records_the_primary() -> None:
+    hedger = _hedger(hedge=False, deadline_seconds=0.05)
+
+    with pytest.raises(LLMDeadlineExceededError):
+        await hedger.run(_call({"primary": 1.0}), PRIMARY, step=3)  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+
+    assert hedger.summary()["deadline_exceeded"] == 1
+    assert _recorded("primary")[0] >= 0.05
@@ -0,0 +1,231 @@
+"""Tests for the LLM request scheduler (`bugninja.config.llm_rate_limiter`)."""
+
+import asyncio
+import itertools
+import time
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from bugninja.config import llm_rate_limiter
+from bugninja.config.llm_rate_limiter import (
+    LLMRateLimiter,
+    LLMRateLimits,
+    LLMRequestSlot,
+    _DeploymentScheduler,
+    _Waiter,
+    chat_result_tokens,
+    estimate_prompt_tokens,
+    llm_request_scope,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    fake_time = SimpleNamespace(monotonic=fake, sleep=time.sleep)
+    monkeypatch.setattr(llm_rate_limiter, "time", fake_time)
+    return fake
+
+
+_seq = itertools.count()
+
+
+def _waiter(run_key: str = "run", tokens: int = 0, priority: int = 1) -> _Waiter:
+    return _Waiter(priority=priority, run_key=run_key, seq=next(_seq), tokens=tokens, loop=None)
+
+
+def _enqueue(scheduler: _DeploymentScheduler, *waiters: _Waiter) -> List[_Waiter]:
+    for waiter in waiters:
+        scheduler.enqueue(waiter)
+    return list(waiters)
+
+
+def _grant(scheduler: _DeploymentScheduler, waiter: _Waiter) -> Optional[float]:
+    scheduler.enqueue(waiter)
+    return scheduler.try_grant(waiter)
+
+
+# ---------------- token buckets -----------------
+
+
+def test_request_bucket_delays_requests_beyond_the_rate(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(requests_per_minute=2))
+
+    assert _grant(scheduler, _waiter()) == 0
+    assert _grant(scheduler, _waiter()) == 0
+    third = _waiter()
+    assert _grant(scheduler, third) == pytest.approx(30.0)
+
+    clock.now += 30
+    assert scheduler.try_grant(third) == 0
+
+
+def test_token_bucket_delays_until_the_estimate_fits(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(tokens_per_minute=600))
+
+    assert _grant(scheduler, _waiter(tokens=500)) == 0
+    waiter = _waiter(tokens=300)
+    # 200 tokens missing at 10 tokens per second
+    assert _grant(scheduler, waiter) == pytest.approx(20.0)
+
+    clock.now += 20
+    assert scheduler.try_grant(waiter) == 0
+
+
+def test_requests_larger_than_the_budget_wait_for_a_full_bucket(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(tokens_per_minute=600))
+
+    assert _grant(scheduler, _waiter(tokens=5000)) == 0
+    assert scheduler.token_bucket == 0
+
+
+def test_reported_usage_corrects_the_token_bucket(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(tokens_per_minute=600))
+    assert _grant(scheduler, _waiter(tokens=100)) == 0
+
+    scheduler.settle(
+        LLMRequestSlot(deployment="d", estimated_tokens=100, waited_ms=0, used_tokens=900)
+    )
+
+    assert scheduler.token_bucket == -300
+    assert scheduler.total_tokens == 900
+    assert scheduler.in_flight == 0
+
+
+def test_in_flight_cap_holds_requests_until_release(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(max_in_flight=1))
+    assert _grant(scheduler, _waiter()) == 0
+    waiter = _waiter()
+
+    assert _grant(scheduler, waiter) is None
+
+    scheduler.settle(LLMRequestSlot(deployment="d", estimated_tokens=0, waited_ms=0))
+    assert scheduler.try_grant(waiter) == 0
+
+
+def test_lowered_limits_cap_the_buckets(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(requests_per_minute=60))
+
+    scheduler.update_limits(LLMRateLimits(requests_per_minute=5))
+
+    assert scheduler.request_bucket == 5
+
+
+# ---------------- queue order -----------------
+
+
+def test_healing_requests_go_before_normal_ones(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits(max_in_flight=1))
+    normal, healing = _enqueue(scheduler, _waiter("a"), _waiter("b", priority=0))
+
+    assert scheduler.try_grant(normal) is None
+    assert scheduler.try_grant(healing) == 0
+
+
+def test_run_with_fewest_granted_requests_goes_next(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits())
+    assert _grant(scheduler, _waiter("quiet")) == 0
+    for _ in range(3):
+        assert _grant(scheduler, _waiter("busy")) == 0
+    busy, quiet = _enqueue(scheduler, _waiter("busy"), _waiter("quiet"))
+
+    assert scheduler.try_grant(busy) is None
+    assert scheduler.try_grant(quiet) == 0
+
+
+def test_late_run_starts_level_with_waiting_runs(clock: FakeClock) -> None:
+    scheduler = _DeploymentScheduler(LLMRateLimits())
+    for _ in range(3):
+        assert _grant(scheduler, _waiter("early")) == 0
+    early, late = _enqueue(scheduler, _waiter("early"), _waiter("late"))
+
+    # the late run is not served three times in a row before the early one
+    assert scheduler.served["late"] == 3
+    assert scheduler.try_grant(late) is None
+    assert scheduler.try_grant(early) == 0
+
+
+# ---------------- limiter -----------------
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_a_released_slot() -> None:
+    limiter = LLMRateLimiter(LLMRateLimits(max_in_flight=1))
+    first = await limiter.acquire("deployment", 10)
+    with llm_request_scope("other", priority="healing"):
+        second = asyncio.ensure_future(limiter.acquire("deployment", 10))
+    await asyncio.sleep(0.01)
+    assert not second.done()
+
+    limiter.release(first)
+    slot = await asyncio.wait_for(second, timeout=1)
+
+    limiter.release(slot)
+    metrics = limiter.get_metrics()["deployment"]
+    assert metrics["total_requests"] == 2
+    assert metrics["in_flight"] == 0
+    assert metrics["max_queue_depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_leaves_the_queue() -> None:
+    limiter = LLMRateLimiter(LLMRateLimits(max_in_flight=1))
+    first = await limiter.acquire("deployment", 10)
+    waiting = asyncio.ensure_future(limiter.acquire("deployment", 10))
+    await asyncio.sleep(0.01)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert limiter.get_metrics()["deployment"]["queued_requests"] == 0
+    limiter.release(first)
+
+
+# ---------------- token estimates -----------------
+
+
+def test_estimate_prompt_tokens_counts_text_and_images() -> None:
+    messages = [
+        HumanMessage(content="x" * 40),
+        HumanMessage(
+            content=[
+                {"type": "text", "text": "y" * 20},
+                {"type": "image_url", "image_url": {"url": "data:"}},
+            ]
+        ),
+    ]
+
+    assert estimate_prompt_tokens(messages) == 15 + llm_rate_limiter.IMAGE_TOKEN_ESTIMATE
+
+
+def test_chat_result_tokens_prefers_usage_metadata() -> None:
+    usage = {"input_tokens": 100, "output_tokens": 20}
+    result = SimpleNamespace(
+        generations=[SimpleNamespace(message=SimpleNamespace(usage_metadata=usage))],
+        llm_output={"token_usage": {"total_tokens": 999}},
+    )
+
+    assert chat_result_tokens(result) == 120  # type: ignore[arg-type]
+
+
+def test_chat_result_tokens_falls_back_to_llm_output() -> None:
+    result = SimpleNamespace(
+        generations=[SimpleNamespace(message=SimpleNamespace(usage_metadata=None))],
+        llm_output={"token_usage": {"total_tokens": 42}},
+    )
+
+    assert chat_result_tokens(result) == 42  # type: ignore[arg-type]
+    result.llm_output = None
+    assert chat_result_tokens(result) is None  # type: ignore[arg-type]
@@ -0,0 +1,117 @@
+"""Tests for page-change detection by mutation epoch (`bugninja.utils.mutation_epoch`)."""
+
+from typing import Any, List, Optional
+
+import pytest
+
+from bugninja.utils.mutation_epoch import (
+    MUTATION_EPOCH_SCRIPT,
+    MutationEpochTracker,
+    PageEpoch,
+)
+
+
+class FakePage:
+    """Stands in for a Playwright page running the epoch script."""
+
+    def __init__(self, url: str = "https://example.com/") -> None:
+        self.url = url
+        self.document_id = "doc-1"
+        self.epoch = 0
+        self.error: Optional[Exception] = None
+        self.scripts: List[str] = []
+
+    async def evaluate(self, script: str) -> Any:
+        self.scripts.append(script)
+        if self.error is not None:
+            raise self.error
+        return [self.document_id, self.epoch]
+
+
+# ---------------- read -----------------
+
+
+@pytest.mark.asyncio
+async def test_read_runs_the_epoch_script() -> None:
+    page = FakePage()
+    page.epoch = 3
+
+    epoch = await MutationEpochTracker.read(page)
+
+    assert epoch == PageEpoch(url="https://example.com/", document_id="doc-1", epoch=3)
+    assert page.scripts == [MUTATION_EPOCH_SCRIPT]
+
+
+@pytest.mark.asyncio
+async def test_unreadable_epoch_is_none() -> None:
+    page = FakePage()
+    page.error = RuntimeError("Execution context was destroyed")
+
+    epoch = await MutationEpochTracker.read(page)
+
+    assert epoch.epoch is None and epoch.document_id is None
+
+
+# ---------------- changes -----------------
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_skips_the_full_comparison() -> None:
+    page = FakePage()
+    tracker = MutationEpochTracker()
+    await tracker.mark(page)
+
+    assert not await tracker.has_changed(page)
+    assert tracker.checks_skipped == 1
+    assert tracker.checks_changed == 0
+
+
+@pytest.mark.asyncio
+async def test_mutations_change_the_epoch() -> None:
+    page = FakePage()
+    tracker = MutationEpochTracker()
+    await tracker.mark(page)
+
+    page.epoch += 1
+
+    assert await tracker.has_changed(page)
+    assert tracker.checks_changed == 1
+
+
+@pytest.mark.asyncio
+async def test_new_document_with_the_same_epoch_is_a_change() -> None:
+    page = FakePage()
+    tracker = MutationEpochTracker()
+    await tracker.mark(page)
+
+    # a reload installs a fresh observer whose counter starts at the same value
+    page.document_id = "doc-2"
+
+    assert await tracker.has_changed(page)
+
+
+@pytest.mark.asyncio
+async def test_url_change_without_mutations_is_a_change() -> None:
+    page = FakePage()
+    tracker = MutationEpochTracker()
+    await tracker.mark(page)
+
+    page.url = "https://example.com/#section"
+
+    assert await tracker.has_changed(page)
+
+
+@pytest.mark.asyncio
+async def test_missing_or_unreadable_epochs_count_as_changes() -> None:
+    page = FakePage()
+    tracker = MutationEpochTracker()
+    assert await tracker.has_changed(page)
+
+    await tracker.mark(page)
+    page.error = RuntimeError("Execution context was destroyed")
+    assert await tracker.has_changed(page)
+
+    page.error = None
+    tracker.baseline = PageEpoch(url=page.url, document_id=None, epoch=None)
+    assert await tracker.has_changed(page)
+    assert tracker.checks_changed == 3
@@ -0,0 +1,264 @@
+"""Tests for run artifact retention (`bugninja_cli.utils.retention_manager`)."""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from bugninja_cli.utils.retention_manager import (
+    ARCHIVE_DIR_NAME,
+    IN_PROGRESS_GRACE_SECONDS,
+    RetentionManager,
+    RetentionPolicy,
+    RunArtifacts,
+)
+
+DAY_SECONDS = 86400
+
+
+def _traversal_name(run_id: str) -> str:
+    return f"traverse_20250101_120000_{run_id}.json"
+
+
+def _make_ai_run(task_dir: Path, run_id: str, age_seconds: float = 0.0) -> Path:
+    traversal = task_dir / "traversals" / _traversal_name(run_id)
+    traversal.parent.mkdir(parents=True, exist_ok=True)
+    traversal.write_text("{}")
+    screenshots = task_dir / "screenshots" / run_id
+    screenshots.mkdir(parents=True, exist_ok=True)
+    (screenshots / "step_1.png").write_bytes(b"png")
+    _age(age_seconds, traversal, screenshots, screenshots / "step_1.png")
+    return traversal
+
+
+def _make_replay_run(task_dir: Path, run_id: str, age_seconds: float = 0.0) -> None:
+    screenshots = task_dir / "screenshots" / run_id
+    screenshots.mkdir(parents=True, exist_ok=True)
+    video = task_dir / "videos" / f"run_{run_id}.mp4"
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_bytes(b"mp4")
+    _age(age_seconds, screenshots, video)
+
+
+def _age(age_seconds: float, *paths: Path) -> None:
+    timestamp = time.time() - age_seconds
+    for path in paths:
+        os.utime(path, (timestamp, timestamp))
+
+
+def _entry(
+    run_id: str, status: str, traversal_path: str = "", timestamp: str = "2025-01-01T12:00:00"
+) -> Dict[str, Any]:
+    return {
+        "run_id": run_id,
+        "timestamp": timestamp,
+        "status": status,
+        "traversal_path": traversal_path,
+        "execution_time": 1.0,
+    }
+
+
+def _history(
+    ai_runs: List[Dict[str, Any]], replay_runs: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    return {"task_id": "task", "ai_navigated_runs": ai_runs, "replay_runs": replay_runs or []}
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / "tasks" / "login").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def task_dir(project_root: Path) -> Path:
+    return project_root / "tasks" / "login"
+
+
+def _manager(project_root: Path, **policy: Any) -> RetentionManager:
+    return RetentionManager(project_root, RetentionPolicy(**policy))
+
+
+# ---------------- run collection -----------------
+
+
+def test_collect_runs_groups_artifacts_by_run_id(project_root: Path, task_dir: Path) -> None:
+    _make_ai_run(task_dir, "ai1")
+    _make_replay_run(task_dir, "rp1")
+    (project_root / "data_dir" / "run_rp1").mkdir(parents=True)
+
+    runs = {run.run_id: run for run in _manager(project_root)._collect_runs(task_dir, None)}
+
+    assert set(runs) == {"ai1", "rp1"}
+    assert runs["ai1"].has_traversal
+    assert len(runs["ai1"].paths) == 2
+    assert not runs["rp1"].has_traversal
+    assert runs["rp1"].profile_dir == project_root / "data_dir" / "run_rp1"
+
+
+def test_collect_runs_replay_status_does_not_overwrite_ai_run(
+    project_root: Path, task_dir: Path
+) -> None:
+    traversal = _make_ai_run(task_dir, "ai1")
+    _make_replay_run(task_dir, "rp1")
+    history = _history(
+        [_entry("ai1", "success", str(traversal))],
+        [_entry("rp1", "failed", str(traversal))],
+    )
+
+    runs = {run.run_id: run for run in _manager(project_root)._collect_runs(task_dir, history)}
+
+    assert runs["ai1"].status == "success"
+    assert not runs["ai1"].failed
+    assert runs["rp1"].status == "failed"
+
+
+def test_collect_runs_gives_successful_replays_their_own_status(
+    project_root: Path, task_dir: Path
+) -> None:
+    traversal = _make_ai_run(task_dir, "ai1")
+    _make_replay_run(task_dir, "rp1")
+    history = _history(
+        [_entry("ai1", "success", str(traversal))], [_entry("rp1", "success", str(traversal))]
+    )
+
+    runs = {run.run_id: run for run in _manager(project_root)._collect_runs(task_dir, history)}
+
+    assert not runs["rp1"].failed
+
+
+def test_collect_runs_falls_back_to_traversal_for_legacy_ai_entries(
+    project_root: Path, task_dir: Path
+) -> None:
+    traversal = _make_ai_run(task_dir, "ai1")
+    history = _history([_entry("legacy-cuid", "failed", str(traversal))])
+
+    runs = {run.run_id: run for run in _manager(project_root)._collect_runs(task_dir, history)}
+
+    assert runs["ai1"].status == "failed"
+
+
+def test_run_without_history_entry_or_traversal_is_failed() -> None:
+    assert RunArtifacts(run_id="rp1").failed
+    assert not RunArtifacts(run_id="ai1", has_traversal=True).failed
+
+
+# ---------------- retention decisions -----------------
+
+
+def test_keeps_newest_runs(project_root: Path, task_dir: Path) -> None:
+    for index in range(4):
+        _make_ai_run(task_dir, f"ai{index}", age_seconds=DAY_SECONDS * (index + 1))
+    manager = _manager(project_root, keep_last_runs=2)
+
+    expired = manager._select_expired_runs(manager._collect_runs(task_dir, None), None)
+
+    assert sorted(run.run_id for run in expired) == ["ai2", "ai3"]
+
+
+def test_never_expires_runs_within_grace_period(project_root: Path, task_dir: Path) -> None:
+    _make_ai_run(task_dir, "new")
+    _make_ai_run(task_dir, "in_progress", age_seconds=IN_PROGRESS_GRACE_SECONDS / 2)
+    manager = _manager(project_root, keep_last_runs=1)
+
+    expired = manager._select_expired_runs(manager._collect_runs(task_dir, None), None)
+
+    assert expired == []
+
+
+def test_keeps_failed_runs_for_keep_failed_days(project_root: Path, task_dir: Path) -> None:
+    _make_ai_run(task_dir, "newest", age_seconds=DAY_SECONDS)
+    _make_replay_run(task_dir, "recent_failure", age_seconds=2 * DAY_SECONDS)
+    _make_replay_run(task_dir, "old_failure", age_seconds=10 * DAY_SECONDS)
+    _make_replay_run(task_dir, "recent_success", age_seconds=2 * DAY_SECONDS)
+    history = _history(
+        [],
+        [
+            _entry("recent_failure", "failed"),
+            _entry("old_failure", "failed"),
+            _entry("recent_success", "success"),
+        ],
+    )
+    manager = _manager(project_root, keep_last_runs=1, keep_failed_days=5)
+
+    expired = manager._select_expired_runs(manager._collect_runs(task_dir, history), history)
+
+    assert sorted(run.run_id for run in expired) == ["old_failure", "recent_success"]
+
+
+def test_protects_traversals_used_for_replay(project_root: Path, task_dir: Path) -> None:
+    _make_replay_run(task_dir, "newest", age_seconds=DAY_SECONDS)
+    successful = _make_ai_run(task_dir, "successful", age_seconds=3 * DAY_SECONDS)
+    latest_ai = _make_ai_run(task_dir, "latest_ai", age_seconds=2 * DAY_SECONDS)
+    _make_ai_run(task_dir, "unused", age_seconds=4 * DAY_SECONDS)
+    history = _history(
+        [
+            _entry("successful", "success", str(successful), "2025-01-01T12:00:00"),
+            _entry("latest_ai", "failed", str(latest_ai), "2025-01-02T12:00:00"),
+        ]
+    )
+    manager = _manager(project_root, keep_last_runs=1)
+
+    expired = manager._select_expired_runs(manager._collect_runs(task_dir, history), history)
+
+    assert [run.run_id for run in expired] == ["unused"]
+
+
+# ---------------- applying the policy -----------------
+
+
+def test_apply_removes_expired_runs_and_detaches_history(
+    project_root: Path, task_dir: Path
+) -> None:
+    _make_ai_run(task_dir, "kept", age_seconds=DAY_SECONDS)
+    old_traversal = _make_ai_run(task_dir, "old", age_seconds=3 * DAY_SECONDS)
+    newest = _make_ai_run(task_dir, "newest", age_seconds=DAY_SECONDS / 2)
+    history = _history(
+        [
+            _entry("old", "success", str(old_traversal), "2025-01-01T12:00:00"),
+            _entry("newest", "success", str(newest), "2025-01-03T12:00:00"),
+        ]
+    )
+    (task_dir / "run_history.json").write_text(json.dumps(history))
+
+    report = _manager(project_root, keep_last_runs=2).apply()
+
+    assert report.runs_removed == 1
+    assert not old_traversal.exists()
+    assert not (task_dir / "screenshots" / "old").exists()
+    saved = json.loads((task_dir / "run_history.json").read_text())
+    assert saved["ai_navigated_runs"][0]["traversal_path"] == ""
+    assert saved["ai_navigated_runs"][0]["artifacts_pruned"] is True
+
+
+def test_apply_dry_run_keeps_files(project_root: Path, task_dir: Path) -> None:
+    _make_ai_run(task_dir, "newest", age_seconds=DAY_SECONDS)
+    old_traversal = _make_ai_run(task_dir, "old", age_seconds=3 * DAY_SECONDS)
+
+    report = _manager(project_root, keep_last_runs=1).apply(dry_run=True)
+
+    assert report.runs_removed == 1
+    assert report.bytes_reclaimed > 0
+    assert old_traversal.exists()
+
+
+def test_compaction_writes_a_new_segment_per_pass(project_root: Path, task_dir: Path) -> None:
+    pytest.importorskip("zstandard")
+    manager = _manager(project_root, keep_last_runs=1, compact=True)
+
+    _make_ai_run(task_dir, "newest", age_seconds=DAY_SECONDS)
+    _make_ai_run(task_dir, "first", age_seconds=3 * DAY_SECONDS)
+    manager.apply()
+    segments = sorted((task_dir / ARCHIVE_DIR_NAME).iterdir())
+    first_segment_mtime = segments[0].stat().st_mtime
+
+    _make_ai_run(task_dir, "second", age_seconds=2 * DAY_SECONDS)
+    report = manager.apply()
+
+    segments = sorted((task_dir / ARCHIVE_DIR_NAME).iterdir())
+    assert report.runs_archived == 1
+    assert len(segments) == 2
+    assert segments[0].stat().st_mtime == first_segment_mtime
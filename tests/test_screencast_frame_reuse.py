@@ -0,0 +1,107 @@
+"""Tests for screencast frames reused as action screenshots."""
+
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from bugninja.config.video_recording import VideoRecordingConfig
+from bugninja.utils.frame_ingestor import FrameIngestor
+from bugninja.utils.screenshot_manager import ScreenshotManager
+from bugninja.utils.video_recording_manager import (
+    ScreencastFrame,
+    VideoRecordingManager,
+)
+
+
+class FakeCDPSession:
+    def __init__(self) -> None:
+        self.sent: List[Tuple[str, Optional[Dict[str, Any]]]] = []
+
+    async def send(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.sent.append((method, params))
+
+
+def _recording_manager(**config: Any) -> VideoRecordingManager:
+    manager = VideoRecordingManager("run", VideoRecordingConfig(**config), cli_mode=True)
+    manager.is_recording = True
+    manager.frame_ingestor = FrameIngestor(manager, FakeCDPSession())  # type: ignore[arg-type]
+    return manager
+
+
+def _receive_frame(manager: VideoRecordingManager, timestamp_ms: float) -> ScreencastFrame:
+    sequence = manager.note_frame_received()
+    return manager.update_latest_frame(b"jpeg", {"timestamp": timestamp_ms / 1000}, sequence)
+
+
+def _screenshot_manager(frame: Optional[ScreencastFrame]) -> ScreenshotManager:
+    manager = object.__new__(ScreenshotManager)
+    manager.use_screencast_frames(lambda: frame, max_age_ms=500)
+    return manager
+
+
+# ---------------- screencast -----------------
+
+
+@pytest.mark.asyncio
+async def test_screencast_keeps_the_full_resolution_for_reused_frames() -> None:
+    manager = _recording_manager(reuse_frames_for_screenshots=True, quality=80)
+    assert manager.frame_ingestor is not None
+
+    await manager.frame_ingestor._start_screencast(every_nth_frame=1)
+
+    _, params = manager.frame_ingestor.cdp_session.sent[0]  # type: ignore[attr-defined]
+    assert params["quality"] == 100
+    assert "maxWidth" not in params and "maxHeight" not in params
+
+
+@pytest.mark.asyncio
+async def test_screencast_is_capped_at_the_video_size_without_reuse() -> None:
+    manager = _recording_manager(width=1280, height=720, quality=80)
+    assert manager.frame_ingestor is not None
+
+    await manager.frame_ingestor._start_screencast(every_nth_frame=1)
+
+    _, params = manager.frame_ingestor.cdp_session.sent[0]  # type: ignore[attr-defined]
+    assert (params["maxWidth"], params["maxHeight"], params["quality"]) == (1280, 720, 80)
+
+
+# ---------------- latest frame -----------------
+
+
+def test_latest_frame_is_reused_while_no_newer_frame_is_pending() -> None:
+    manager = _recording_manager()
+    frame = _receive_frame(manager, 1000.0)
+
+    assert manager.get_latest_frame() is frame
+
+    manager.note_frame_received()
+    assert manager.get_latest_frame() is None
+
+
+def test_latest_frame_is_not_reused_below_the_full_frame_rate() -> None:
+    manager = _recording_manager()
+    assert manager.frame_ingestor is not None
+    _receive_frame(manager, 1000.0)
+
+    manager.frame_ingestor._every_nth_frame = 3
+
+    assert manager.get_latest_frame() is None
+
+
+# ---------------- freshness -----------------
+
+
+def test_frame_rendered_close_to_the_action_is_reused() -> None:
+    now_ms = time.time() * 1000
+    frame = ScreencastFrame(data=b"jpeg", timestamp_ms=now_ms - 100)
+
+    assert _screenshot_manager(frame)._get_fresh_screencast_frame(now_ms) is frame
+
+
+def test_stale_frame_is_not_reused() -> None:
+    now_ms = time.time() * 1000
+    frame = ScreencastFrame(data=b"jpeg", timestamp_ms=now_ms - 2000)
+
+    assert _screenshot_manager(frame)._get_fresh_screencast_frame(now_ms) is None
+    assert _screenshot_manager(None)._get_fresh_screencast_frame(now_ms) is None
@@ -0,0 +1,144 @@
+"""Tests for the per-action video clip index (`bugninja.utils.video_clip_index`)."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+from bugninja.config.video_recording import VideoRecordingConfig
+from bugninja.utils import video_clip_index
+from bugninja.utils.custom_video_recorder import BugninjaVideoRecorder
+from bugninja.utils.video_clip_index import (
+    KeyframeEntry,
+    VideoClipIndex,
+    build_clip_index,
+)
+
+
+def _action(
+    action_type: str, start: Optional[float], end: Optional[float] = None
+) -> SimpleNamespace:
+    timestamps = (
+        None
+        if start is None and end is None
+        else SimpleNamespace(video_start_offset=start, video_end_offset=end)
+    )
+    return SimpleNamespace(timestamps=timestamps, get_action_type=lambda: action_type)
+
+
+def _keyframes(*times: float) -> List[KeyframeEntry]:
+    return [KeyframeEntry(time=t, byte_offset=int(t * 1000)) for t in times]
+
+
+@pytest.fixture
+def video_path(tmp_path: Path) -> Path:
+    path = tmp_path / "run_abc.mp4"
+    path.write_bytes(b"video")
+    return path
+
+
+def _probe_returning(
+    monkeypatch: pytest.MonkeyPatch, keyframes: List[KeyframeEntry], duration: Optional[float]
+) -> None:
+    async def fake_probe(_: Any) -> Tuple[List[KeyframeEntry], Optional[float]]:
+        return keyframes, duration
+
+    monkeypatch.setattr(video_clip_index, "probe_keyframes", fake_probe)
+
+
+# ---------------- index -----------------
+
+
+def test_index_path_sits_next_to_the_video() -> None:
+    assert VideoClipIndex.path_for("videos/run_abc.mp4") == Path("videos/run_abc.index.json")
+
+
+@pytest.mark.asyncio
+async def test_build_clip_index_maps_actions_to_keyframes(
+    monkeypatch: pytest.MonkeyPatch, video_path: Path
+) -> None:
+    _probe_returning(monkeypatch, _keyframes(0.0, 2.0, 4.03, 6.0), duration=8.0)
+    actions = [
+        _action("click", 2.0, 3.0),
+        _action("input_text", 4.0),
+        _action("go_back", None),
+        _action("scroll", 6.5),
+    ]
+
+    index = await build_clip_index(video_path, actions)
+
+    assert index is not None
+    assert [entry.action_idx for entry in index.actions] == [0, 1, 3]
+    click, input_text, scroll = index.actions
+    assert (click.keyframe_time, click.end_offset) == (2.0, 3.0)
+    # keyframes within the tolerance after the start count as at the start
+    assert input_text.keyframe_time == 4.03
+    assert input_text.keyframe_byte_offset == 4030
+    # open-ended actions run until the next action or the end of the video
+    assert input_text.end_offset == 6.5
+    assert scroll.keyframe_time == 6.0
+    assert scroll.end_offset == 8.0
+
+
+@pytest.mark.asyncio
+async def test_build_clip_index_writes_a_loadable_sidecar(
+    monkeypatch: pytest.MonkeyPatch, video_path: Path
+) -> None:
+    _probe_returning(monkeypatch, _keyframes(0.0, 1.0), duration=2.0)
+
+    await build_clip_index(video_path, [_action("click", 1.2, 1.5)])
+
+    loaded = VideoClipIndex.load(video_path)
+    assert loaded.video_file == video_path.name
+    assert loaded.get_action(0).keyframe_time == 1.0
+    with pytest.raises(KeyError):
+        loaded.get_action(1)
+
+
+@pytest.mark.asyncio
+async def test_build_clip_index_without_keyframes_writes_nothing(
+    monkeypatch: pytest.MonkeyPatch, video_path: Path
+) -> None:
+    _probe_returning(monkeypatch, [], duration=None)
+
+    assert await build_clip_index(video_path, [_action("click", 0.5)]) is None
+    assert not VideoClipIndex.path_for(video_path).exists()
+
+
+def test_load_without_index_raises(video_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        VideoClipIndex.load(video_path)
+
+
+# ---------------- keyframe placement -----------------
+
+
+def _force_key_frames(config: VideoRecordingConfig, **kwargs: Any) -> Optional[str]:
+    args = BugninjaVideoRecorder(config)._build_output_args(**kwargs)
+    if "-force_key_frames" not in args:
+        return None
+    return args[args.index("-force_key_frames") + 1]
+
+
+def test_live_encodes_keep_encoder_keyframes_by_default() -> None:
+    assert _force_key_frames(VideoRecordingConfig()) is None
+
+
+def test_keyframe_interval_is_opt_in() -> None:
+    config = VideoRecordingConfig(keyframe_interval=2.0)
+
+    assert _force_key_frames(config) == "expr:gte(t,n_forced*2.0)"
+
+
+def test_buffered_encodes_place_keyframes_at_action_starts() -> None:
+    forced = _force_key_frames(VideoRecordingConfig(), keyframe_times=[0.5, 1.25])
+
+    assert forced == "0.500,1.250"
+
+
+def test_no_keyframes_are_forced_without_clip_index() -> None:
+    config = VideoRecordingConfig(clip_index=False, keyframe_interval=1.0)
+
+    assert _force_key_frames(config) is None
+    assert _force_key_frames(config, keyframe_times=[0.5]) is None